@@ -0,0 +1,405 @@
+"""Benchmark için deterministik sentetik veritabanı üreteci.
+
+Aynı (scale, seed, bitiş tarihi) her zaman aynı veritabanını üretir; değerler tohumlu
+random.Random'dan, zamanlar sabit bitiş tarihinden geriye doğru gelir. Ölçek 1.0'da
+2 000 ürün ve 100 000 satış satırı; meta bilgisi settings'te 'datagen_meta'.
+
+    python benchmarks/datagen.py --db bench.db --scale 1 --seed 42
+"""
+import argparse
+import json
+import math
+import os
+import random
+import sqlite3
+import sys
+import time
+from bisect import bisect_left
+from datetime import datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from pos.db_handler import TRACKED_TABLES, init_schema  # noqa: E402
+from services import receipt_service as receipt_svc  # noqa: E402
+
+DEFAULT_SEED = 42
+DEFAULT_END = "2025-12-31"
+TERMINAL_ID = 1
+BATCH = 20_000
+
+BASE_SIZES = {
+    "categories": 40,
+    "products": 2_000,
+    "warehouses": 3,
+    "cariler": 1_000,
+    "sales_lines": 100_000,
+    "purchase_documents": 600,
+    "cari_hareketler": 8_000,
+    "expenses": 1_500,
+    "warehouse_movements": 6_000,
+}
+# Katalog tabloları karekökle, hareket tabloları doğrusal büyür
+_CATALOG = {"categories", "products", "warehouses", "cariler"}
+
+_CATEGORY_WORDS = ["Temel Gıda", "İçecek", "Şarküteri", "Kahvaltılık", "Makarna", "Bakliyat", "Yağ",
+                   "Temizlik", "Kişisel Bakım", "Konserve", "Atıştırmalık", "Dondurulmuş", "Baharat",
+                   "Çay-Kahve", "Meyve", "Sebze", "Kuru Meyve", "Un", "Et", "Fırın", "Tatlı", "Kırtasiye",
+                   "Bebek", "Evcil Hayvan", "Elektrik"]
+_PRODUCT_WORDS = ["Ekmek", "Süt", "Yumurta", "Peynir", "Zeytin", "Domates", "Salatalık", "Patates",
+                  "Soğan", "Kola", "Ayran", "Maden Suyu", "Şalgam", "Salam", "Sucuk", "Bal", "Reçel",
+                  "Tahin", "Makarna", "Pirinç", "Bulgur", "Mercimek", "Nohut", "Deterjan", "Şampuan",
+                  "Sabun", "Ton Balığı", "Salça", "Cips", "Bisküvi", "Çikolata", "Gofret", "Dondurma",
+                  "Tuz", "Şeker", "Çay", "Kahve", "Elma", "Muz", "Portakal", "Fındık", "Un", "Kıyma",
+                  "Tavuk", "Simit", "Poğaça", "Baklava", "Peçete", "Pil", "Kibrit"]
+_BRANDS = ["Anadolu", "Ege", "Karadeniz", "Marmara", "Toros", "Uludağ", "Kapadokya", "Efes",
+           "Yayla", "Köy", "Pınar", "Altın", "Doğal", "Ekonomik", "Lüks"]
+_SIZES = ["100g", "250g", "500g", "1Kg", "1L", "2L", "5li", "10lu", "Paket", "Dilim"]
+_FIRST = ["Ahmet", "Mehmet", "Ayşe", "Fatma", "Mustafa", "Emine", "Ali", "Hatice", "Hüseyin", "Zeynep",
+          "İbrahim", "Elif", "Şükrü", "Gülşen", "Ömer", "Özlem", "Çağlar", "İrem", "Uğur", "Ebru"]
+_LAST = ["Yılmaz", "Kaya", "Demir", "Şahin", "Çelik", "Yıldız", "Yıldırım", "Öztürk", "Aydın",
+         "Özdemir", "Arslan", "Doğan", "Kılıç", "Aslan", "Çetin", "Kara", "Koç", "Kurt", "Özkan", "Şimşek"]
+_EXPENSE_TITLES = [("Kira", "Sabit"), ("Elektrik", "Fatura"), ("Su", "Fatura"), ("Doğalgaz", "Fatura"),
+                   ("İnternet", "Fatura"), ("Temizlik", "Genel"), ("Kargo", "Lojistik"), ("Yakıt", "Lojistik"),
+                   ("Kırtasiye", "Genel"), ("Bakım Onarım", "Genel")]
+_PAYMENT_METHODS = ("cash", "credit_card", "open_account", "fragmented")
+_PAYMENT_WEIGHTS = (55, 35, 7, 3)
+
+# Gün içi yoğunluk (saat -> ağırlık): sabah ve akşam tepeleri
+_HOUR_WEIGHTS = [0, 0, 0, 0, 0, 0, 0, 1, 3, 5, 6, 6, 8, 8, 6, 5, 6, 8, 10, 9, 6, 3, 1, 0]
+
+
+def sizes_for(scale: float) -> dict:
+    out = {}
+    for key, base in BASE_SIZES.items():
+        factor = math.sqrt(scale) if key in _CATALOG else scale
+        out[key] = max(1, int(round(base * factor)))
+    return out
+
+
+def _ean13(body12: str) -> str:
+    total = sum(int(d) * (3 if i % 2 else 1) for i, d in enumerate(body12))
+    return body12 + str((10 - total % 10) % 10)
+
+
+def _batched(rows, size=BATCH):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _insert_many(conn, sql, rows) -> int:
+    n = 0
+    for batch in _batched(rows):
+        conn.executemany(sql, batch)
+        n += len(batch)
+    return n
+
+
+def _ts(dt: datetime) -> str:
+    return dt.strftime("%Y-%m-%d %H:%M:%S")
+
+
+class Generator:
+    def __init__(self, conn, scale: float = 1.0, seed: int = DEFAULT_SEED, years: float = 2.0,
+                 end: str = DEFAULT_END, log=None):
+        self.conn = conn
+        self.scale = scale
+        self.seed = seed
+        self.years = years
+        self.end = datetime.strptime(end, "%Y-%m-%d").replace(hour=23, minute=59, second=59)
+        self.start = self.end - timedelta(days=max(1, int(round(365 * years))))
+        self.sizes = sizes_for(scale)
+        self.log = log or (lambda msg: None)
+        self.counts = {}
+        # Tablo başına ayrı akış: bir tablonun boyutu değişse de diğerleri aynı kalır
+        self._rngs = {}
+
+    def rng(self, name: str) -> random.Random:
+        if name not in self._rngs:
+            self._rngs[name] = random.Random(f"{self.seed}:{name}")
+        return self._rngs[name]
+
+    def _random_time(self, rng: random.Random) -> datetime:
+        day = self.start + timedelta(days=rng.randrange((self.end - self.start).days + 1))
+        hour = rng.choices(range(24), weights=_HOUR_WEIGHTS)[0]
+        return day.replace(hour=hour, minute=rng.randrange(60), second=rng.randrange(60))
+
+    # --- katalog ---
+    def categories(self):
+        rng = self.rng("categories")
+        rows = []
+        for i in range(self.sizes["categories"]):
+            base = _CATEGORY_WORDS[i % len(_CATEGORY_WORDS)]
+            name = base if i < len(_CATEGORY_WORDS) else f"{base} {i // len(_CATEGORY_WORDS) + 1}"
+            rows.append((name, "#%06x" % rng.randrange(0x1000000)))
+        self.counts["categories"] = _insert_many(
+            self.conn, "INSERT OR IGNORE INTO categories(name, color) VALUES(?, ?)", rows)
+        self.category_ids = [r[0] for r in self.conn.execute("SELECT id FROM categories ORDER BY id")]
+
+    def warehouses(self):
+        existing = self.conn.execute("SELECT COUNT(*) FROM warehouses").fetchone()[0]
+        rows = [(f"Depo {i + 1}", f"Şube {i + 1}") for i in range(existing, self.sizes["warehouses"])]
+        self.counts["warehouses"] = _insert_many(
+            self.conn, "INSERT OR IGNORE INTO warehouses(name, location) VALUES(?, ?)", rows)
+        self.warehouse_ids = [r[0] for r in self.conn.execute("SELECT id FROM warehouses ORDER BY id")]
+
+    def products(self):
+        rng = self.rng("products")
+        n = self.sizes["products"]
+
+        def gen():
+            for i in range(n):
+                name = (f"{rng.choice(_BRANDS)} {rng.choice(_PRODUCT_WORDS)} "
+                        f"{rng.choice(_SIZES)} #{i + 1}")
+                barcode = _ean13(f"869{i + 1:09d}")
+                buy = round(rng.lognormvariate(3.3, 0.8), 2)
+                sale = round(buy * rng.uniform(1.1, 1.6), 2)
+                unit = "kg" if rng.random() < 0.15 else "adet"
+                stock = float(rng.randrange(0, 500))
+                yield (name, barcode, sale, stock, buy, sale, unit, rng.choice(self.category_ids), buy)
+
+        self.counts["products"] = _insert_many(self.conn, """
+            INSERT INTO products(name, barcode, price, stock, buy_price, sale_price, unit, category_id, avg_cost)
+            VALUES(?,?,?,?,?,?,?,?,?)""", gen())
+        self.product_rows = self.conn.execute(
+            "SELECT id, name, sale_price, buy_price FROM products ORDER BY id").fetchall()
+
+        def stocks():
+            for pid, _, _, buy in self.product_rows:
+                for wh in self.warehouse_ids:
+                    yield (wh, pid, float(rng.randrange(0, 300)), buy)
+        self.counts["warehouse_stocks"] = _insert_many(self.conn, """
+            INSERT OR IGNORE INTO warehouse_stocks(warehouse_id, product_id, quantity, avg_cost)
+            VALUES(?,?,?,?)""", stocks())
+
+    def cariler(self):
+        rng = self.rng("cariler")
+
+        def gen():
+            for i in range(self.sizes["cariler"]):
+                name = f"{rng.choice(_FIRST)} {rng.choice(_LAST)} {i + 1}"
+                phone = f"05{rng.randrange(30, 60)}{rng.randrange(10**7):07d}"
+                kind = "borclu" if rng.random() < 0.8 else "alacakli"
+                created = self._random_time(rng)
+                yield (name, phone, f"Mahalle {rng.randrange(1, 200)}", 0.0, kind, _ts(created))
+
+        self.counts["cariler"] = _insert_many(self.conn, """
+            INSERT INTO cariler(name, phone, address, balance, cari_type, created_at)
+            VALUES(?,?,?,?,?,?)""", gen())
+        self.cari_ids = [r[0] for r in self.conn.execute("SELECT id FROM cariler ORDER BY id")]
+
+    # --- hareketler ---
+    def sales(self):
+        rng = self.rng("sales")
+        total_lines = self.sizes["sales_lines"]
+        days = (self.end - self.start).days + 1
+        products = self.product_rows
+        # Satışlar az sayıda ürüne yığılır (Zipf benzeri)
+        weights = [1.0 / (i + 1) ** 0.8 for i in range(len(products))]
+        cum = []
+        acc = 0.0
+        for w in weights:
+            acc += w
+            cum.append(acc)
+
+        receipts = []
+        first_receipt = self.conn.execute("SELECT COALESCE(MAX(id), 0) FROM receipts").fetchone()[0] + 1
+
+        def gen():
+            written = 0
+            for d in range(days):
+                day = self.start + timedelta(days=d)
+                # Gün başına satır: kalan satır / kalan gün (+/- %30)
+                remaining_days = days - d
+                target = (total_lines - written) / remaining_days
+                day_lines = int(round(target * rng.uniform(0.7, 1.3))) if remaining_days > 1 else total_lines - written
+                day_lines = max(0, min(day_lines, total_lines - written))
+                stamp = int(day.strftime("%Y%m%d"))
+                made = 0
+                no = 0
+                while made < day_lines:
+                    n_lines = min(day_lines - made, rng.randint(1, 8))
+                    no += 1
+                    receipt_id = first_receipt + len(receipts)
+                    fis_id = receipt_svc.format_number(TERMINAL_ID, stamp, no)
+                    hour = rng.choices(range(24), weights=_HOUR_WEIGHTS)[0]
+                    created = _ts(day.replace(hour=hour, minute=rng.randrange(60), second=rng.randrange(60)))
+                    receipts.append((receipt_id, TERMINAL_ID, stamp, no, created))
+                    pm = rng.choices(_PAYMENT_METHODS, weights=_PAYMENT_WEIGHTS)[0]
+                    canceled = 1 if rng.random() < 0.01 else 0
+                    wh = rng.choice(self.warehouse_ids)
+                    for _ in range(n_lines):
+                        idx = min(len(products) - 1, bisect_left(cum, rng.random() * acc))
+                        pid, name, price, buy = products[idx]
+                        qty = float(rng.choices((1, 2, 3, 4, 5), weights=(60, 20, 10, 5, 5))[0])
+                        yield (fis_id, name, qty, price, round(qty * price, 2), pm, canceled, wh, buy, created, receipt_id)
+                    made += n_lines
+                if no:
+                    self.conn.execute("INSERT OR REPLACE INTO receipt_sequences(terminal_id, day, last_no) VALUES(?,?,?)",
+                                      (TERMINAL_ID, stamp, no))
+                written += made
+
+        self.counts["sales"] = _insert_many(self.conn, """
+            INSERT INTO sales(fis_id, product_name, quantity, price, total, payment_method, canceled,
+                              warehouse_id, unit_cost, created_at, receipt_id)
+            VALUES(?,?,?,?,?,?,?,?,?,?,?)""", gen())
+        # Fiş numaraları bu terminalde gün başına 1'den sıralı
+        self.counts["receipts"] = _insert_many(self.conn, """
+            INSERT INTO receipts(id, terminal_id, day, no, created_at) VALUES(?,?,?,?,?)""", receipts)
+
+    def purchases(self):
+        rng = self.rng("purchases")
+        suppliers = self.cari_ids[: max(1, len(self.cari_ids) // 10)]
+        n_docs = self.sizes["purchase_documents"]
+        doc_rows = []
+        item_rows = []
+        first_id = (self.conn.execute("SELECT COALESCE(MAX(id), 0) FROM purchase_documents").fetchone()[0]) + 1
+        for i in range(n_docs):
+            doc_id = first_id + i
+            created = self._random_time(rng)
+            doc_type = "fatura" if rng.random() < 0.6 else "irsaliye"
+            total = 0.0
+            for _ in range(rng.randint(1, 12)):
+                pid, name, _, buy = rng.choice(self.product_rows)
+                qty = float(rng.randrange(5, 100))
+                line = round(qty * buy, 2)
+                total += line
+                item_rows.append((doc_id, pid, name, qty, buy, line))
+            doc_rows.append((doc_id, rng.choice(suppliers), doc_type, f"{doc_type[0].upper()}{doc_id:08d}",
+                             created.strftime("%Y-%m-%d"), round(total, 2), "", _ts(created),
+                             rng.choice(self.warehouse_ids)))
+        self.counts["purchase_documents"] = _insert_many(self.conn, """
+            INSERT INTO purchase_documents(id, supplier_id, doc_type, doc_number, doc_date, total_amount,
+                                           description, created_at, warehouse_id)
+            VALUES(?,?,?,?,?,?,?,?,?)""", doc_rows)
+        self.counts["purchase_items"] = _insert_many(self.conn, """
+            INSERT INTO purchase_items(doc_id, product_id, product_name, quantity, price, total)
+            VALUES(?,?,?,?,?,?)""", item_rows)
+
+    def cari_hareketler(self):
+        rng = self.rng("cari_hareketler")
+        kinds = ("tahsilat", "odeme", "borc", "alacak")
+
+        def gen():
+            for _ in range(self.sizes["cari_hareketler"]):
+                kind = rng.choices(kinds, weights=(40, 15, 35, 10))[0]
+                amount = round(rng.lognormvariate(5.5, 1.0), 2)
+                yield (rng.choice(self.cari_ids), kind, amount, kind.capitalize(), _ts(self._random_time(rng)))
+
+        self.counts["cari_hareketler"] = _insert_many(self.conn, """
+            INSERT INTO cari_hareketler(cari_id, islem_type, tutar, aciklama, created_at)
+            VALUES(?,?,?,?,?)""", gen())
+        # Bakiyeler hareketlerden türetilir (işaretler cari_service ile aynı)
+        self.conn.execute("""
+            UPDATE cariler SET balance = COALESCE((
+                SELECT SUM(CASE WHEN islem_type IN ('odeme','alacak') THEN tutar ELSE -tutar END)
+                FROM cari_hareketler h WHERE h.cari_id = cariler.id), 0)""")
+
+    def expenses(self):
+        rng = self.rng("expenses")
+
+        def gen():
+            for _ in range(self.sizes["expenses"]):
+                title, category = rng.choice(_EXPENSE_TITLES)
+                yield (title, round(rng.lognormvariate(6.0, 0.9), 2), category, "", _ts(self._random_time(rng)))
+
+        self.counts["expenses"] = _insert_many(self.conn, """
+            INSERT INTO expenses(title, amount, category, description, created_at)
+            VALUES(?,?,?,?,?)""", gen())
+
+    def warehouse_movements(self):
+        rng = self.rng("warehouse_movements")
+
+        def gen():
+            for _ in range(self.sizes["warehouse_movements"]):
+                pid = rng.choice(self.product_rows)[0]
+                src, dst = rng.sample(self.warehouse_ids, 2) if len(self.warehouse_ids) > 1 else (None, self.warehouse_ids[0])
+                yield (src, dst, pid, float(rng.randrange(1, 50)), _ts(self._random_time(rng)), "Transfer", 1)
+
+        self.counts["warehouse_movements"] = _insert_many(self.conn, """
+            INSERT INTO warehouse_movements(source_warehouse_id, target_warehouse_id, product_id, quantity,
+                                            movement_date, description, user_id)
+            VALUES(?,?,?,?,?,?,?)""", gen())
+
+    def run(self) -> dict:
+        started = time.perf_counter()
+        for step in (self.categories, self.warehouses, self.products, self.cariler, self.sales,
+                     self.purchases, self.cari_hareketler, self.expenses, self.warehouse_movements):
+            t0 = time.perf_counter()
+            step()
+            self.conn.commit()
+            self.log(f"{step.__name__}: {time.perf_counter() - t0:.1f}s")
+        meta = {
+            "scale": self.scale, "seed": self.seed, "years": self.years,
+            "start": self.start.strftime("%Y-%m-%d"), "end": self.end.strftime("%Y-%m-%d"),
+            "sizes": self.sizes, "counts": self.counts,
+            "seconds": round(time.perf_counter() - started, 2),
+        }
+        self.conn.execute("INSERT OR REPLACE INTO settings(key, value) VALUES('datagen_meta', ?)",
+                          (json.dumps(meta),))
+        self.conn.commit()
+        return meta
+
+
+def _drop_version_triggers(conn) -> None:
+    for tbl in TRACKED_TABLES:
+        for op in ("insert", "update", "delete"):
+            conn.execute(f"DROP TRIGGER IF EXISTS trg_version_{tbl}_{op}")
+
+
+def read_meta(conn) -> dict:
+    row = conn.execute("SELECT value FROM settings WHERE key='datagen_meta'").fetchone()
+    return json.loads(row[0]) if row else {}
+
+
+def generate(db_path: str, scale: float = 1.0, seed: int = DEFAULT_SEED, years: float = 2.0,
+             end: str = DEFAULT_END, log=None) -> dict:
+    """db_path'e (yoksa oluşturarak) sentetik veri yükle; meta bilgisini döndür."""
+    if os.path.exists(db_path):
+        raise FileExistsError(f"{db_path} already exists; generator only fills a fresh database")
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+    init_schema(conn, cursor)
+    try:
+        conn.execute("PRAGMA synchronous=OFF")
+        _drop_version_triggers(conn)
+        conn.commit()
+        meta = Generator(conn, scale=scale, seed=seed, years=years, end=end, log=log).run()
+        # Tetikleyiciler normal şema kurulumuyla geri gelir; ilk kurulumun bıraktığı doldurma
+        # işaretleri (popülerlik sayaçları, fiş ödemeleri, günlük özetler) yüklenen veriden çalışır
+        init_schema(conn, cursor)
+        from services import migration_service
+        migration_service.run(conn, cursor)
+        conn.execute("PRAGMA synchronous=FULL")
+        return meta
+    finally:
+        conn.close()
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--db", required=True, help="oluşturulacak veritabanı dosyası")
+    ap.add_argument("--scale", type=float, default=1.0)
+    ap.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    ap.add_argument("--years", type=float, default=2.0, help="satış geçmişi (yıl)")
+    ap.add_argument("--end", default=DEFAULT_END, help="son satış günü (YYYY-MM-DD)")
+    args = ap.parse_args(argv)
+    try:
+        meta = generate(args.db, args.scale, args.seed, args.years, args.end,
+                        log=lambda msg: print(msg, file=sys.stderr))
+    except FileExistsError as e:
+        print(e, file=sys.stderr)
+        return 2
+    print(json.dumps(meta, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
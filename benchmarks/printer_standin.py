@@ -0,0 +1,135 @@
+"""TCP/9100 fiş yazıcısı yerine geçen yerel dinleyici.
+
+serve gelen baytları dosyaya ekler; demo süreç içinde N fişi receipts.printers
+üzerinden basar ve bağlantı/yazma sayılarını raporlar.
+
+    python benchmarks/printer_standin.py serve --port 9100 --out capture.bin | demo --receipts 200
+"""
+import argparse
+import json
+import os
+import socket
+import sys
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from receipts import printers  # noqa: E402
+from receipts.thermal_printer import build_receipt  # noqa: E402
+
+
+class StandIn:
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, out: str = None, verbose: bool = False):
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.sock.bind((host, port))
+        self.sock.listen(8)
+        self.port = self.sock.getsockname()[1]
+        self.out = out
+        self.verbose = verbose
+        self.connections = 0
+        self.recvs = 0
+        self.bytes = 0
+        self.lock = threading.Lock()
+        self.closed = threading.Event()
+
+    def serve_forever(self) -> None:
+        while not self.closed.is_set():
+            try:
+                conn, addr = self.sock.accept()
+            except OSError:
+                break
+            with self.lock:
+                self.connections += 1
+            if self.verbose:
+                print(f"connection from {addr[0]}:{addr[1]}")
+            threading.Thread(target=self._handle, args=(conn,), daemon=True).start()
+
+    def _handle(self, conn) -> None:
+        fh = open(self.out, "ab") if self.out else None
+        try:
+            while True:
+                data = conn.recv(65536)
+                if not data:
+                    break
+                with self.lock:
+                    self.recvs += 1
+                    self.bytes += len(data)
+                if fh:
+                    fh.write(data)
+                    fh.flush()
+                if self.verbose:
+                    print(f"  recv {len(data)} bytes")
+        finally:
+            conn.close()
+            if fh:
+                fh.close()
+
+    def start(self) -> "StandIn":
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        self.closed.set()
+        self.sock.close()
+
+
+def _sample_lines(i: int):
+    return [(f"Ürün Çeşit {j} Şğİı", 1.0 + j % 3, 12.5 + j, (1.0 + j % 3) * (12.5 + j)) for j in range(3 + i % 6)]
+
+
+def demo(n: int) -> dict:
+    standin = StandIn().start()
+    target = f"tcp://127.0.0.1:{standin.port}"
+    printer = printers.get_printer(target)
+    started = time.perf_counter()
+    sent = 0
+    for i in range(n):
+        data = build_receipt(_sample_lines(i), fis_id=f"FIS-DEMO-{i + 1:04d}", customer_name="Müşteri")
+        printer.send(data)
+        sent += len(data)
+    elapsed = time.perf_counter() - started
+    # Stand-in'in son baytları okuması için kısa bekleme
+    deadline = time.time() + 2.0
+    while standin.bytes < sent and time.time() < deadline:
+        time.sleep(0.01)
+    printers.close_all()
+    standin.stop()
+    return {
+        "receipts": n,
+        "bytes_sent": sent,
+        "bytes_received": standin.bytes,
+        "client_writes": printer.writes,
+        "printer_connections": standin.connections,
+        "receipts_per_second": round(n / elapsed, 1) if elapsed else None,
+    }
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    s = sub.add_parser("serve")
+    s.add_argument("--host", default="127.0.0.1")
+    s.add_argument("--port", type=int, default=printers.DEFAULT_PORT)
+    s.add_argument("--out", default="capture.bin")
+    d = sub.add_parser("demo")
+    d.add_argument("--receipts", type=int, default=100)
+    args = ap.parse_args(argv)
+
+    if args.cmd == "serve":
+        standin = StandIn(args.host, args.port, args.out, verbose=True)
+        print(f"listening on {args.host}:{standin.port}, capturing to {args.out}")
+        try:
+            standin.serve_forever()
+        except KeyboardInterrupt:
+            standin.stop()
+        return 0
+    print(json.dumps(demo(args.receipts), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
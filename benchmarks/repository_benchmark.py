@@ -0,0 +1,273 @@
+"""Sentetik veritabanında repository/servis benchmark'ı.
+
+Kasanın ve arka ofisin sıcak yollarını datagen veritabanında ölçer; yazan
+durumlar geçici kopyada çalışır. Sonuç JSON'a yazılır, --compare öncekiyle kıyaslar.
+
+    python benchmarks/repository_benchmark.py --scale 1 --json bench_s1.json [--compare eski.json]
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+import datagen  # noqa: E402
+from services import product_service as product_svc  # noqa: E402
+from services import sales_service as sales_svc  # noqa: E402
+from services import cash_service as cash_svc  # noqa: E402
+from services import purchase_service as purchase_svc  # noqa: E402
+from services import warehouse_service as warehouse_svc  # noqa: E402
+from services import cari_service as cari_svc  # noqa: E402
+from repositories import category_repository  # noqa: E402
+
+DATA_DIR = os.path.join(ROOT, "benchmarks", "data")
+
+
+class Context:
+    """Vakalara verilen ortak durum: bağlantı, sabit tohumlu rng ve veri kümesi bilgisi."""
+
+    def __init__(self, conn, seed: int):
+        self.conn = conn
+        self.cursor = conn.cursor()
+        self.rng = random.Random(seed)
+        self.meta = datagen.read_meta(conn)
+        self.end = datetime.strptime(self.meta.get("end", datagen.DEFAULT_END), "%Y-%m-%d")
+        self.products = self.cursor.execute(
+            "SELECT id, name, barcode, COALESCE(sale_price, price), buy_price FROM products ORDER BY id").fetchall()
+        self.warehouse_ids = [r[0] for r in self.cursor.execute("SELECT id FROM warehouses ORDER BY id")]
+        self.supplier_ids = [r[0] for r in self.cursor.execute("SELECT id FROM cariler ORDER BY id LIMIT 100")]
+        self.seq = 0
+
+    def day(self, days_back: int = 0) -> str:
+        return (self.end - timedelta(days=days_back)).strftime("%Y-%m-%d")
+
+    def range(self, days: int):
+        return f"{self.day(days - 1)} 00:00:00", f"{self.day(0)} 23:59:59"
+
+
+# --- vakalar: fn(ctx) ---
+def case_barcode_lookup(ctx):
+    p = ctx.rng.choice(ctx.products)
+    product_svc.get_by_barcode(ctx.cursor, p[2], ctx.rng.choice(ctx.warehouse_ids))
+
+
+def case_barcode_lookup_miss(ctx):
+    product_svc.get_by_barcode(ctx.cursor, f"2{ctx.rng.randrange(10**12):012d}", ctx.warehouse_ids[0])
+
+
+def case_checkout(ctx):
+    # on_confirm_sale ile aynı yol: fiş numarası, stok ve satırlar tek transaction'da
+    wh = ctx.rng.choice(ctx.warehouse_ids)
+    lines = []
+    for _ in range(3):
+        _, name, _, price, _ = ctx.rng.choice(ctx.products)
+        lines.append((name, 1.0, price, price))
+    sales_svc.checkout(ctx.conn, ctx.cursor, lines, "cash", warehouse_id=wh)
+
+
+def case_receipts_recent(ctx):
+    sales_svc.list_recent_receipts(ctx.cursor, 200)
+
+
+def case_receipts_month(ctx):
+    sales_svc.list_receipts_between(ctx.cursor, *ctx.range(30))
+
+
+def case_profit_month(ctx):
+    sales_svc.get_profit_loss_stats(ctx.cursor, *ctx.range(30))
+
+
+def case_profit_year(ctx):
+    sales_svc.get_profit_loss_stats(ctx.cursor, *ctx.range(365))
+
+
+def case_cash_movements_week(ctx):
+    cash_svc.get_cash_movements(ctx.cursor, ctx.day(6), ctx.day(0))
+
+
+def case_cash_summary_day(ctx):
+    cash_svc.get_cash_summary(ctx.cursor, ctx.day(ctx.rng.randrange(30)))
+
+
+def case_stock_report(ctx):
+    product_svc.list_products(ctx.cursor)
+    warehouse_svc.list_all_stocks(ctx.cursor)
+
+
+def case_screen_lists(ctx):
+    # Ekranların tekrar tekrar okuduğu listeler (sorgu önbelleğinden gelir)
+    product_svc.list_products(ctx.cursor)
+    category_repository.list_all(ctx.cursor)
+    warehouse_svc.list_warehouses(ctx.cursor)
+    cari_svc.get_total_alacak(ctx.cursor)
+    cari_svc.get_total_borc(ctx.cursor)
+
+
+def case_purchase_posting(ctx):
+    ctx.seq += 1
+    items = []
+    for _ in range(5):
+        pid, name, _, _, buy = ctx.rng.choice(ctx.products)
+        items.append({"product_id": pid, "name": name, "qty": float(ctx.rng.randrange(5, 50)), "price": buy or 1.0})
+    purchase_svc.create_purchase(ctx.conn, ctx.cursor, ctx.rng.choice(ctx.supplier_ids), "fatura",
+                                 f"BENCH{ctx.seq:06d}", ctx.day(0), items, "benchmark",
+                                 warehouse_id=ctx.rng.choice(ctx.warehouse_ids))
+    ctx.conn.commit()
+
+
+CASES = {
+    "barcode_lookup": case_barcode_lookup,
+    "barcode_lookup_miss": case_barcode_lookup_miss,
+    "checkout": case_checkout,
+    "receipts_recent": case_receipts_recent,
+    "receipts_month": case_receipts_month,
+    "profit_month": case_profit_month,
+    "profit_year": case_profit_year,
+    "cash_movements_week": case_cash_movements_week,
+    "cash_summary_day": case_cash_summary_day,
+    "stock_report": case_stock_report,
+    "screen_lists": case_screen_lists,
+    "purchase_posting": case_purchase_posting,
+}
+
+
+def _percentile(values, pct: float) -> float:
+    ordered = sorted(values)
+    idx = min(len(ordered) - 1, max(0, int(round(pct / 100.0 * (len(ordered) - 1)))))
+    return ordered[idx]
+
+
+def run_case(fn, ctx, iterations: int, warmup: int) -> dict:
+    for _ in range(warmup):
+        fn(ctx)
+    samples = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        fn(ctx)
+        samples.append((time.perf_counter() - started) * 1000.0)
+    return {
+        "iterations": iterations,
+        "min_ms": round(min(samples), 3),
+        "median_ms": round(statistics.median(samples), 3),
+        "p95_ms": round(_percentile(samples, 95), 3),
+        "max_ms": round(max(samples), 3),
+        "mean_ms": round(statistics.fmean(samples), 3),
+    }
+
+
+def _git_rev():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                              text=True, timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def ensure_database(path: str, scale: float, seed: int, years: float) -> str:
+    if not os.path.exists(path):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        print(f"generating {path} (scale={scale}, seed={seed})", file=sys.stderr)
+        datagen.generate(path, scale=scale, seed=seed, years=years,
+                         log=lambda msg: print(f"  {msg}", file=sys.stderr))
+    return path
+
+
+def compare(current: dict, previous: dict) -> None:
+    print(f"{'case':<22}{'before ms':>12}{'after ms':>12}{'change':>10}")
+    for name, res in current["cases"].items():
+        old = previous.get("cases", {}).get(name)
+        if not old:
+            print(f"{name:<22}{'-':>12}{res['median_ms']:>12.3f}{'new':>10}")
+            continue
+        before, after = old["median_ms"], res["median_ms"]
+        change = (after - before) / before * 100.0 if before else 0.0
+        print(f"{name:<22}{before:>12.3f}{after:>12.3f}{change:>+9.1f}%")
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--db", help="benchmark veritabanı (varsayılan: benchmarks/data/bench_s<scale>_<seed>.db)")
+    ap.add_argument("--scale", type=float, default=1.0)
+    ap.add_argument("--seed", type=int, default=datagen.DEFAULT_SEED)
+    ap.add_argument("--years", type=float, default=2.0)
+    ap.add_argument("--iterations", type=int, default=30)
+    ap.add_argument("--warmup", type=int, default=3)
+    ap.add_argument("--cases", help="virgülle ayrılmış vaka adları (varsayılan: hepsi)")
+    ap.add_argument("--in-place", action="store_true", help="yazma vakalarını kopya yerine asıl veritabanında çalıştır")
+    ap.add_argument("--json", dest="json_path", help="sonuçları bu dosyaya yaz")
+    ap.add_argument("--compare", help="önceki sonuç dosyası ile karşılaştır")
+    args = ap.parse_args(argv)
+
+    names = [n.strip() for n in args.cases.split(",")] if args.cases else list(CASES)
+    unknown = [n for n in names if n not in CASES]
+    if unknown:
+        print(f"unknown cases: {', '.join(unknown)}", file=sys.stderr)
+        return 2
+
+    db_path = args.db or os.path.join(DATA_DIR, f"bench_s{args.scale:g}_{args.seed}.db")
+    ensure_database(db_path, args.scale, args.seed, args.years)
+
+    workdir = None
+    run_path = db_path
+    if not args.in_place:
+        workdir = tempfile.mkdtemp(prefix="smartpos_bench_")
+        run_path = os.path.join(workdir, "bench.db")
+        src = sqlite3.connect(db_path)
+        dst = sqlite3.connect(run_path)
+        src.backup(dst)
+        src.close()
+        dst.close()
+
+    conn = sqlite3.connect(run_path)
+    try:
+        ctx = Context(conn, args.seed)
+        results = {}
+        for name in names:
+            results[name] = run_case(CASES[name], ctx, max(1, args.iterations), max(0, args.warmup))
+            print(f"{name:<22}{results[name]['median_ms']:>10.3f} ms", file=sys.stderr)
+        row_counts = {tbl: conn.execute(f"SELECT COUNT(*) FROM {tbl}").fetchone()[0]
+                      for tbl in ("products", "sales", "cariler", "cari_hareketler", "purchase_documents",
+                                  "expenses", "warehouse_movements")}
+    finally:
+        conn.close()
+        if workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    summary = {
+        "generated_at": datetime.now().isoformat(timespec="seconds"),
+        "git_rev": _git_rev(),
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "platform": platform.platform(),
+        "database": os.path.abspath(db_path),
+        "dataset": ctx.meta,
+        "row_counts": row_counts,
+        "iterations": args.iterations,
+        "warmup": args.warmup,
+        "cases": results,
+    }
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2, ensure_ascii=False)
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            compare(summary, json.load(f))
+    else:
+        print(json.dumps(summary["cases"], indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
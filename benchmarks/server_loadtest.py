@@ -0,0 +1,142 @@
+"""Yerel POS sunucusu (pos.server) için N kasalı yük testi.
+
+Sunucu datagen veritabanının geçici kopyasında ayrı süreçte başlar; kasa süreçleri
+barkod okutup satış yapar. Saniyedeki satış, gecikme ve çerçeve sayıları raporlanır.
+
+    python benchmarks/server_loadtest.py --tills 1,2,4,8 --seconds 5 [--no-batch] [--json load.json]
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import shutil
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+import datagen  # noqa: E402
+from pos import remote  # noqa: E402
+
+DATA_DIR = os.path.join(ROOT, "benchmarks", "data")
+
+
+def start_server(db_path: str):
+    proc = subprocess.Popen([sys.executable, "-m", "pos.server", "--db", db_path, "--port", "0"],
+                            cwd=ROOT, stdout=subprocess.PIPE, text=True)
+    line = proc.stdout.readline()
+    if not line.startswith("listening on "):
+        proc.kill()
+        raise RuntimeError(f"server did not start: {line!r}")
+    return proc, line.split()[2]
+
+
+def till(address: str, terminal_id: int, barcodes, seconds: float, batch: bool, seed: int, out) -> None:
+    rng = random.Random(seed + terminal_id)
+    client = remote.Client(address, pool_size=1)
+    latencies = []
+    errors = 0
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        scans = rng.sample(barcodes, rng.randint(1, 8))
+        t0 = time.perf_counter()
+        try:
+            if batch:
+                found = [r.get("value") for r in client.batch([("product.get_by_barcode", [b]) for b in scans])]
+            else:
+                found = [client.call("product.get_by_barcode", b) for b in scans]
+            lines = []
+            for row in found:
+                if row:
+                    qty = float(rng.randint(1, 3))
+                    lines.append((row[1], qty, float(row[2] or 0), qty * float(row[2] or 0)))
+            client.call("sales.checkout", lines, payment_method="cash", terminal_id=terminal_id)
+            latencies.append((time.perf_counter() - t0) * 1000.0)
+        except remote.RemoteError:
+            errors += 1
+    client.close()
+    out.put({"terminal_id": terminal_id, "checkouts": len(latencies), "errors": errors,
+             "latencies": latencies, "frames": client.frames, "connects": client.connects})
+
+
+def run(db_path: str, tills: int, seconds: float, batch: bool, seed: int) -> dict:
+    with sqlite3.connect(db_path) as conn:
+        barcodes = [r[0] for r in conn.execute(
+            "SELECT barcode FROM products WHERE barcode IS NOT NULL AND barcode<>'' ORDER BY id LIMIT 2000")]
+    proc, address = start_server(db_path)
+    try:
+        ctx = multiprocessing.get_context("spawn")
+        out = ctx.Queue()
+        procs = [ctx.Process(target=till, args=(address, i + 1, barcodes, seconds, batch, seed, out))
+                 for i in range(tills)]
+        started = time.perf_counter()
+        for p in procs:
+            p.start()
+        results = [out.get() for _ in procs]
+        for p in procs:
+            p.join()
+        elapsed = time.perf_counter() - started
+    finally:
+        proc.terminate()
+        proc.wait(timeout=10)
+    latencies = sorted(x for r in results for x in r["latencies"])
+    checkouts = sum(r["checkouts"] for r in results)
+    q = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else [0.0] * 99
+    return {
+        "tills": tills,
+        "batch": batch,
+        "seconds": round(elapsed, 2),
+        "checkouts": checkouts,
+        "errors": sum(r["errors"] for r in results),
+        "checkouts_per_second": round(checkouts / seconds, 1),
+        "p50_ms": round(q[49], 2),
+        "p95_ms": round(q[94], 2),
+        "frames": sum(r["frames"] for r in results),
+        "connections": sum(r["connects"] for r in results),
+    }
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--tills", default="4", help="till counts, comma separated")
+    ap.add_argument("--seconds", type=float, default=10.0)
+    ap.add_argument("--scale", type=float, default=0.1)
+    ap.add_argument("--seed", type=int, default=datagen.DEFAULT_SEED)
+    ap.add_argument("--batch", action=argparse.BooleanOptionalAction, default=True)
+    ap.add_argument("--json", help="write results to this file")
+    args = ap.parse_args(argv)
+
+    source = os.path.join(DATA_DIR, f"bench_s{args.scale:g}_{args.seed}.db")
+    if not os.path.exists(source):
+        os.makedirs(DATA_DIR, exist_ok=True)
+        print(f"generating {source}", file=sys.stderr)
+        datagen.generate(source, scale=args.scale, seed=args.seed, log=lambda m: print(f"  {m}", file=sys.stderr))
+
+    runs = []
+    for n in [int(x) for x in str(args.tills).split(",") if x.strip()]:
+        tmp = tempfile.mkdtemp(prefix="pos_load_")
+        try:
+            db_path = os.path.join(tmp, "database.db")
+            shutil.copy(source, db_path)
+            res = run(db_path, n, args.seconds, args.batch, args.seed)
+        finally:
+            shutil.rmtree(tmp, ignore_errors=True)
+        runs.append(res)
+        print(f"tills={res['tills']:<3} checkouts/s={res['checkouts_per_second']:<8} "
+              f"p50={res['p50_ms']}ms p95={res['p95_ms']}ms frames={res['frames']} "
+              f"connections={res['connections']} errors={res['errors']}")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"scale": args.scale, "runs": runs}, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
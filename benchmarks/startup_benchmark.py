@@ -0,0 +1,97 @@
+"""Soğuk açılış benchmark'ı: süreç başlangıcından giriş penceresinin ilk çizimine.
+
+Medyan süre bütçeyi aşarsa ya da ağır modüller (ReportLab, escpos) erken yüklenirse
+1 ile çıkar. Ekran yoksa (--headless) yalnız Tk öncesi kısım ölçülür.
+
+    python benchmarks/startup_benchmark.py --runs 5 --budget-ms 1500 [--headless] [--json startup.json]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_BUDGET_MS = 1500.0
+DEFAULT_HEADLESS_BUDGET_MS = 500.0
+# Başsız mod: main modül olarak yüklenir, giriş penceresi açılmaz
+HEADLESS_CODE = ("import json, main\n"
+                 "from pos import startup_profile\n"
+                 "print(json.dumps(startup_profile.report()), flush=True)")
+
+
+def has_display() -> bool:
+    if sys.platform.startswith("linux"):
+        return bool(os.environ.get("DISPLAY") or os.environ.get("WAYLAND_DISPLAY"))
+    return True
+
+
+def run_once(python: str, timeout: float, headless: bool = False) -> dict:
+    if headless:
+        cmd = [python, "-c", HEADLESS_CODE, "--profile-startup"]
+    else:
+        cmd = [python, os.path.join(ROOT, "main.py"), "--profile-startup"]
+    started = time.perf_counter()
+    proc = subprocess.run(cmd, cwd=ROOT, capture_output=True, text=True, timeout=timeout)
+    wall_ms = (time.perf_counter() - started) * 1000.0
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip() or f"exit code {proc.returncode}")
+    # Son JSON satırı profil raporudur
+    lines = [ln for ln in proc.stdout.splitlines() if ln.startswith("{")]
+    if not lines:
+        raise RuntimeError("no profile output")
+    result = json.loads(lines[-1])
+    result["wall_ms"] = round(wall_ms, 2)
+    return result
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--runs", type=int, default=5)
+    ap.add_argument("--budget-ms", type=float, default=None,
+                    help=f"varsayılan {DEFAULT_BUDGET_MS:g} (başsız: {DEFAULT_HEADLESS_BUDGET_MS:g})")
+    ap.add_argument("--headless", action="store_true", help="ekran olmadan sadece Tk öncesini ölç")
+    ap.add_argument("--timeout", type=float, default=60.0)
+    ap.add_argument("--python", default=sys.executable)
+    ap.add_argument("--json", dest="json_path", help="sonuçları bu dosyaya yaz")
+    args = ap.parse_args(argv)
+    headless = args.headless or not has_display()
+    budget = args.budget_ms
+    if budget is None:
+        budget = DEFAULT_HEADLESS_BUDGET_MS if headless else DEFAULT_BUDGET_MS
+
+    runs = []
+    for _ in range(max(1, args.runs)):
+        try:
+            runs.append(run_once(args.python, args.timeout, headless))
+        except (RuntimeError, subprocess.TimeoutExpired) as e:
+            print(f"startup run failed: {e}", file=sys.stderr)
+            return 2
+
+    walls = [r["wall_ms"] for r in runs]
+    last_mark = "db_init" if headless else "first_paint"
+    marks = [r["marks_ms"].get(last_mark, 0.0) for r in runs]
+    heavy = sorted({m for r in runs for m in r["heavy_modules_loaded"]})
+    summary = {
+        "mode": "headless" if headless else "window",
+        "runs": len(runs),
+        "budget_ms": budget,
+        "median_wall_ms": round(statistics.median(walls), 2),
+        "max_wall_ms": round(max(walls), 2),
+        f"median_{last_mark}_ms": round(statistics.median(marks), 2),
+        "heavy_modules_loaded": heavy,
+        "samples": runs,
+    }
+    summary["passed"] = summary["median_wall_ms"] <= budget and not heavy
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2)
+    print(json.dumps({k: v for k, v in summary.items() if k != "samples"}, indent=2))
+    return 0 if summary["passed"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
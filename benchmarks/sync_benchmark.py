@@ -0,0 +1,162 @@
+"""Kasa değişiklik günlüğü için senkron hızı benchmark'ı.
+
+Kasada N günlük kaydı üretir ve merkeze önce doğrudan dosyaya, sonra pos.server
+üzerinden gönderir; saniyedeki değişikliği ölçer ve tekrar gönderimin etkisiz olduğunu doğrular.
+
+    python benchmarks/sync_benchmark.py --changes 20000 --batch 1000 [--json sync.json]
+"""
+import argparse
+import json
+import os
+import random
+import shutil
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+import datagen  # noqa: E402
+from pos.db_handler import init_schema  # noqa: E402
+from services import cari_service as cari_svc  # noqa: E402
+from services import migration_service  # noqa: E402
+from services import product_service as product_svc  # noqa: E402
+from services import receipt_service as receipt_svc  # noqa: E402
+from services import sales_service as sales_svc  # noqa: E402
+from services import sync_service as sync_svc  # noqa: E402
+
+DATA_DIR = os.path.join(ROOT, "benchmarks", "data")
+TERMINAL_ID = 2
+
+
+def record_changes(db_path: str, n: int, seed: int) -> int:
+    rng = random.Random(seed)
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+    init_schema(conn, cursor)
+    migration_service.run(conn, cursor)
+    conn.execute("PRAGMA synchronous=OFF")
+    receipt_svc.set_terminal_id(conn, cursor, TERMINAL_ID)
+    cursor.execute("INSERT OR REPLACE INTO settings(key,value) VALUES('sync_target','-')")
+    conn.commit()
+    products = cursor.execute("SELECT name, COALESCE(sale_price, price, 1) FROM products LIMIT 2000").fetchall()
+    caris = [r[0] for r in cursor.execute("SELECT id FROM cariler LIMIT 200")]
+    for i in range(n):
+        r = rng.random()
+        if r < 0.8 or not caris:
+            lines = []
+            for name, price in rng.sample(products, rng.randint(1, 6)):
+                qty = float(rng.randint(1, 3))
+                lines.append((name, qty, float(price), qty * float(price)))
+            sales_svc.checkout(conn, cursor, lines, payment_method=rng.choice(("cash", "credit_card")))
+        elif r < 0.9:
+            name, _ = rng.choice(products)
+            product_svc.increment_stock(conn, cursor, name, float(rng.randint(1, 24)))
+        else:
+            cari_svc.add_borc(conn, cursor, rng.choice(caris), round(rng.uniform(10, 500), 2), "Bench")
+    cursor.execute("SELECT COUNT(*) FROM change_journal WHERE terminal_id=? AND synced=0", (TERMINAL_ID,))
+    pending = cursor.fetchone()[0]
+    conn.execute("PRAGMA synchronous=FULL")
+    conn.close()
+    return pending
+
+
+def hub_counts(db_path: str) -> dict:
+    with sqlite3.connect(db_path) as conn:
+        return {
+            "sales": conn.execute("SELECT COUNT(*) FROM sales").fetchone()[0],
+            "receipts": conn.execute("SELECT COUNT(*) FROM receipts").fetchone()[0],
+            "cari_hareketler": conn.execute("SELECT COUNT(*) FROM cari_hareketler").fetchone()[0],
+            "stock_sum": round(conn.execute("SELECT TOTAL(stock) FROM products").fetchone()[0], 3),
+            "conflicts": conn.execute("SELECT COUNT(*) FROM sync_conflicts").fetchone()[0],
+        }
+
+
+def push(till_path: str, target: str, batch: int, reset: bool = False) -> dict:
+    conn = sqlite3.connect(till_path)
+    cursor = conn.cursor()
+    if reset:
+        cursor.execute("UPDATE change_journal SET synced=0")
+        conn.commit()
+    started = time.perf_counter()
+    totals = sync_svc.push(conn, cursor, target, batch_size=batch)
+    elapsed = time.perf_counter() - started
+    conn.close()
+    totals["seconds"] = round(elapsed, 3)
+    totals["changes_per_second"] = round(totals["sent"] / elapsed, 1) if elapsed else None
+    return totals
+
+
+def start_hub(db_path: str):
+    proc = subprocess.Popen([sys.executable, "-m", "pos.server", "--db", db_path, "--port", "0"],
+                            cwd=ROOT, stdout=subprocess.PIPE, text=True)
+    line = proc.stdout.readline()
+    if not line.startswith("listening on "):
+        proc.kill()
+        raise RuntimeError(f"hub did not start: {line!r}")
+    return proc, "tcp://" + line.split()[2]
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--changes", type=int, default=5000)
+    ap.add_argument("--batch", type=int, default=sync_svc.BATCH_SIZE)
+    ap.add_argument("--scale", type=float, default=0.1)
+    ap.add_argument("--seed", type=int, default=datagen.DEFAULT_SEED)
+    ap.add_argument("--json", help="write results to this file")
+    args = ap.parse_args(argv)
+
+    source = os.path.join(DATA_DIR, f"bench_s{args.scale:g}_{args.seed}.db")
+    if not os.path.exists(source):
+        os.makedirs(DATA_DIR, exist_ok=True)
+        print(f"generating {source}", file=sys.stderr)
+        datagen.generate(source, scale=args.scale, seed=args.seed, log=lambda m: print(f"  {m}", file=sys.stderr))
+
+    tmp = tempfile.mkdtemp(prefix="pos_sync_")
+    results = {"changes": args.changes, "batch": args.batch}
+    try:
+        till = os.path.join(tmp, "till.db")
+        shutil.copy(source, till)
+        t0 = time.perf_counter()
+        results["journal_entries"] = record_changes(till, args.changes, args.seed)
+        results["record_seconds"] = round(time.perf_counter() - t0, 2)
+        snapshot = os.path.join(tmp, "till_snapshot.db")
+        shutil.copy(till, snapshot)
+
+        # 1) Merkez veritabanı dosyasına doğrudan
+        hub_file = os.path.join(tmp, "hub_file.db")
+        shutil.copy(source, hub_file)
+        results["file"] = push(till, hub_file, args.batch)
+        before = hub_counts(hub_file)
+        results["file_resend"] = push(till, hub_file, args.batch, reset=True)
+        after = hub_counts(hub_file)
+        results["file_hub"] = after
+        results["idempotent"] = before == after and results["file_resend"]["applied"] == 0
+
+        # 2) Stand-in merkez süreci üzerinden
+        shutil.copy(snapshot, till)
+        hub_tcp = os.path.join(tmp, "hub_tcp.db")
+        shutil.copy(source, hub_tcp)
+        proc, target = start_hub(hub_tcp)
+        try:
+            results["tcp"] = push(till, target, args.batch)
+        finally:
+            proc.terminate()
+            proc.wait(timeout=10)
+        results["tcp_hub_matches_file_hub"] = hub_counts(hub_tcp) == before
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+    print(json.dumps(results, indent=2))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
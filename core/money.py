@@ -0,0 +1,75 @@
+"""Tam sayı kuruş ile para.
+
+Para kolonlarının SQLite'ın ürettiği INTEGER `<kolon>_kurus` ikizleri vardır; raporlar
+bunları SUM ile toplar, servisler Money ile toplar. to_kurus() ve KURUS_SQL aynı
+yuvarlar (sıfırdan uzağa), Python ve SQL toplamları kuruşu kuruşuna tutar.
+"""
+from dataclasses import dataclass
+from typing import Iterable, Union
+
+# SQL ifadesi: REAL kolonun kuruş karşılığı (generated kolonlar ve ad-hoc toplamlar için)
+KURUS_SQL = "CAST(round({col} * 100) AS INTEGER)"
+
+
+def to_kurus(value) -> int:
+    """float/str/Money -> kuruş (SQLite round() ile aynı yuvarlama)."""
+    if isinstance(value, Money):
+        return value.kurus
+    if isinstance(value, str):
+        value = value.strip().replace(",", ".") or 0
+    x = float(value or 0) * 100
+    return int(x + 0.5) if x >= 0 else int(x - 0.5)
+
+
+def from_kurus(kurus) -> float:
+    return int(kurus or 0) / 100
+
+
+@dataclass(frozen=True, order=True)
+class Money:
+    kurus: int = 0
+
+    @classmethod
+    def of(cls, value: Union[float, int, str, "Money", None]) -> "Money":
+        """TL tutarından (12.5, "12,50") Money."""
+        return value if isinstance(value, Money) else cls(to_kurus(value))
+
+    @classmethod
+    def total(cls, values: Iterable) -> "Money":
+        """Tutarları kuruş olarak topla."""
+        return cls(sum(to_kurus(v) for v in values))
+
+    def __add__(self, other) -> "Money":
+        return Money(self.kurus + to_kurus(other))
+
+    def __radd__(self, other) -> "Money":
+        # sum() 0 ile başlar
+        return Money(to_kurus(other) + self.kurus)
+
+    def __sub__(self, other) -> "Money":
+        return Money(self.kurus - to_kurus(other))
+
+    def __rsub__(self, other) -> "Money":
+        return Money(to_kurus(other) - self.kurus)
+
+    def __neg__(self) -> "Money":
+        return Money(-self.kurus)
+
+    def __abs__(self) -> "Money":
+        return Money(abs(self.kurus))
+
+    def __mul__(self, qty) -> "Money":
+        """Birim fiyat x miktar (kg için ondalık miktar), kuruşa yuvarlanır."""
+        return Money(to_kurus(self.kurus * float(qty) / 100))
+
+    __rmul__ = __mul__
+
+    def __bool__(self) -> bool:
+        return self.kurus != 0
+
+    def __float__(self) -> float:
+        return from_kurus(self.kurus)
+
+    def __str__(self) -> str:
+        sign = "-" if self.kurus < 0 else ""
+        return f"{sign}{abs(self.kurus) // 100}.{abs(self.kurus) % 100:02d}"
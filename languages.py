@@ -110,6 +110,92 @@ LANGUAGES = {
         "delete": "Sil",
         "details": "Detaylar",
         "refresh": "Yenile",
+        "loading": "Yükleniyor...",
+        "diagnostics": "Tanılama",
+        "diagnostics_enabled": "Ölçümleri etkinleştir",
+        "diag_statements": "SQL İfadeleri",
+        "diag_slow_queries": "Yavaş Sorgular",
+        "diag_repository": "Repository Çağrıları",
+        "diag_screens": "Ekran Süreleri",
+        "diag_histograms": "Gecikme Histogramları",
+        "diag_reset": "Sıfırla",
+        "diag_query_cache": "Sorgu önbelleği: %{rate:.1f} isabet ({hits}/{misses}), {entries} kayıt",
+        "diag_col_sql": "SQL",
+        "diag_col_count": "Adet",
+        "diag_col_avg_ms": "Ort. ms",
+        "diag_col_max_ms": "En yüksek ms",
+        "diag_col_total_ms": "Toplam ms",
+        "diag_col_last_ms": "Son ms",
+        "diag_col_at": "Zaman",
+        "diag_col_kind": "Tür",
+        "diag_col_ms": "ms",
+        "diag_col_name": "Ad",
+        "diag_col_bucket": "Aralık",
+        "backup_settings": "Yedekleme",
+        "backup_interval_hours": "Otomatik yedek aralığı (saat, 0 = kapalı)",
+        "backup_keep": "Saklanacak yedek sayısı",
+        "backup_on_close": "Kapanışta yedek al",
+        "backup_now": "Şimdi Yedekle",
+        "backup_verify": "Doğrula",
+        "backup_verified": "Yedek doğrulandı",
+        "backup_running": "Yedek alınıyor...",
+        "backup_done": "Yedek tamamlandı",
+        "backup_integrity": "Bütünlük",
+        "backup_restore_hint": "Geri yükleme (uygulama kapalıyken):",
+        "size_mb": "Boyut (MB)",
+        "archive": "Yıllık Arşiv",
+        "archive_year": "Yıl",
+        "archive_col_cari": "Cari Hareket",
+        "archive_col_movements": "Depo Hareketi",
+        "archive_col_expenses": "Masraf",
+        "archive_closable_years": "Arşivlenebilir yıl:",
+        "archive_year_button": "Yılı Arşivle",
+        "archive_nothing": "Arşivlenecek kapanmış yıl yok",
+        "archive_confirm": "{year} yılının satış, cari, depo ve masraf kayıtları arşiv dosyasına taşınacak. Devam edilsin mi?",
+        "archive_running": "{year} arşivleniyor...",
+        "archive_done": "{year} arşivlendi ({rows} satır)",
+        "terminal_id": "Kasa (Terminal) No",
+        "invalid_terminal_id": "Kasa numarası 1-99 arasında olmalı",
+        "page": "Sayfa",
+        "printer_target": "Termal Yazıcı Adresi",
+        "printer_codepage": "Yazıcı Kod Sayfası",
+        "receipts_export": "Fişler PDF",
+        "receipts_export_customer": "Müşteri adı (tümü için boş bırakın):",
+        "receipts_export_running": "Hazırlanıyor...",
+        "receipts_export_done": "{receipts} fiş, {pages} sayfa",
+        "pos_server": "Mağaza Sunucusu (adres:port)",
+        "pos_server_unreachable": "Ayarlar kaydedildi ancak mağaza sunucusuna bağlanılamadı.",
+        "sync_target": "Senkron Merkezi (tcp://adres:port veya dosya)",
+        "refund_type": "İade",
+        "shift_cash": "Kasa Nakdi (açılış / sayım)",
+        "shift_report": "Vardiya Raporu",
+        "opening_cash": "Açılış Nakdi",
+        "cash_sales": "Nakit Satış",
+        "cash_refunds": "Nakit İade/İptal",
+        "expected_cash": "Beklenen Nakit",
+        "counted_cash": "Sayılan Nakit",
+        "cash_difference": "Kasa Farkı",
+        "cashier": "Kasiyer",
+        "voids": "İptal",
+        "returns": "İade",
+        "return_lines": "Satır İadesi",
+        "return_qty": "İade Adedi",
+        "returned": "İade Edilen",
+        "return_success": "İade kaydedildi",
+        "refund_amount": "İade Tutarı",
+        "nothing_to_return": "İade edilecek satır yok",
+        "invalid_quantity": "Geçersiz miktar",
+        "receipt_archived": "Fiş arşivlenmiş (kapanmış) bir yıla ait; iade veya iptal edilemez",
+        "receipt_not_active": "Fişte iptal edilecek satır kalmadı",
+        "sale_intents_failed": "Bazı satışların cari kaydı birkaç denemede yazılamadı ve artık otomatik denenmiyor. Bu fişlerin cari hesaplarını kontrol edin:",
+        "live_dashboard": "Canlı Satış Paneli",
+        "today_revenue": "Bugünkü Ciro",
+        "receipt_count": "Fiş Sayısı",
+        "avg_basket": "Ortalama Sepet",
+        "items_sold": "Satılan Ürün",
+        "hourly_sales": "Saatlik Satış",
+        "payment_split": "Ödeme Türleri",
+        "top_items": "En Çok Satanlar",
         "save": "Kaydet",
         "update_btn": "Güncelle",
         "clear_form": "Formu Temizle",
@@ -212,6 +298,7 @@ LANGUAGES = {
     "settings": "Ayarlar",
     "quick_menu_settings": "Hızlı Menü Ayarları",
     "quick_menu_title": "Hızlı Menü Yönetimi",
+    "quick_main_auto": "ANA listeyi saate göre otomatik doldur",
     "button_text": "Buton Metni",
     "button_price": "Fiyat",
     "list_code": "Liste Kodu",
@@ -382,7 +469,7 @@ LANGUAGES = {
         "thermal_printer": "Termal Yazıcı",
         "no_print": "Yazdırma",
         "printer_setup": "Yazıcı Ayarı",
-        "enter_printer_name": "Yazıcı adını girin (Cihazlar ve Yazıcılar'dan bakın):",
+        "enter_printer_name": "Yazıcı adresini girin (tcp://IP:9100, device:///dev/usb/lp0, win32://POS-58, file://yakalama.bin):",
         "receipt_printed": "Fiş yazıcıya gönderildi!",
         "print_error": "Yazıcı hatası",
         
@@ -533,6 +620,92 @@ LANGUAGES = {
         "edit": "Edit",
         "delete": "Delete",
         "refresh": "Refresh",
+        "loading": "Loading...",
+        "diagnostics": "Diagnostics",
+        "diagnostics_enabled": "Enable measurements",
+        "diag_statements": "SQL Statements",
+        "diag_slow_queries": "Slow Queries",
+        "diag_repository": "Repository Calls",
+        "diag_screens": "Screen Timings",
+        "diag_histograms": "Latency Histograms",
+        "diag_reset": "Reset",
+        "diag_query_cache": "Query cache: {rate:.1f}% hits ({hits}/{misses}), {entries} entries",
+        "diag_col_sql": "SQL",
+        "diag_col_count": "Count",
+        "diag_col_avg_ms": "Avg ms",
+        "diag_col_max_ms": "Max ms",
+        "diag_col_total_ms": "Total ms",
+        "diag_col_last_ms": "Last ms",
+        "diag_col_at": "Time",
+        "diag_col_kind": "Kind",
+        "diag_col_ms": "ms",
+        "diag_col_name": "Name",
+        "diag_col_bucket": "Bucket",
+        "backup_settings": "Backups",
+        "backup_interval_hours": "Automatic backup interval (hours, 0 = off)",
+        "backup_keep": "Backups to keep",
+        "backup_on_close": "Back up on close",
+        "backup_now": "Back Up Now",
+        "backup_verify": "Verify",
+        "backup_verified": "Backup verified",
+        "backup_running": "Backing up...",
+        "backup_done": "Backup finished",
+        "backup_integrity": "Integrity",
+        "backup_restore_hint": "Restore (with the app closed):",
+        "size_mb": "Size (MB)",
+        "archive": "Yearly Archive",
+        "archive_year": "Year",
+        "archive_col_cari": "Account Moves",
+        "archive_col_movements": "Stock Moves",
+        "archive_col_expenses": "Expenses",
+        "archive_closable_years": "Closable year:",
+        "archive_year_button": "Archive Year",
+        "archive_nothing": "No closed year to archive",
+        "archive_confirm": "Sales, account, stock and expense records of {year} will be moved to the archive file. Continue?",
+        "archive_running": "Archiving {year}...",
+        "archive_done": "{year} archived ({rows} rows)",
+        "terminal_id": "Till (Terminal) No",
+        "invalid_terminal_id": "Till number must be between 1 and 99",
+        "page": "Page",
+        "printer_target": "Thermal Printer Address",
+        "printer_codepage": "Printer Code Page",
+        "receipts_export": "Receipts PDF",
+        "receipts_export_customer": "Customer name (leave empty for all):",
+        "receipts_export_running": "Preparing...",
+        "receipts_export_done": "{receipts} receipts, {pages} pages",
+        "pos_server": "Store Server (host:port)",
+        "pos_server_unreachable": "Settings saved, but the store server could not be reached.",
+        "sync_target": "Sync Hub (tcp://host:port or file)",
+        "refund_type": "Refund",
+        "shift_cash": "Drawer Cash (opening / counted)",
+        "shift_report": "Shift Report",
+        "opening_cash": "Opening Cash",
+        "cash_sales": "Cash Sales",
+        "cash_refunds": "Cash Refunds/Voids",
+        "expected_cash": "Expected Cash",
+        "counted_cash": "Counted Cash",
+        "cash_difference": "Cash Difference",
+        "cashier": "Cashier",
+        "voids": "Voids",
+        "returns": "Returns",
+        "return_lines": "Return Lines",
+        "return_qty": "Return Qty",
+        "returned": "Returned",
+        "return_success": "Return recorded",
+        "refund_amount": "Refund Amount",
+        "nothing_to_return": "Nothing to return",
+        "invalid_quantity": "Invalid quantity",
+        "receipt_archived": "The receipt belongs to an archived (closed) year and cannot be returned or cancelled",
+        "receipt_not_active": "The receipt has no lines left to cancel",
+        "sale_intents_failed": "The account postings of some sales could not be written after several attempts and are no longer retried. Check the customer accounts of these receipts:",
+        "live_dashboard": "Live Sales Dashboard",
+        "today_revenue": "Today's Revenue",
+        "receipt_count": "Receipts",
+        "avg_basket": "Average Basket",
+        "items_sold": "Items Sold",
+        "hourly_sales": "Hourly Sales",
+        "payment_split": "Payment Methods",
+        "top_items": "Top Items",
         "save": "Save",
         "update_btn": "Update",
         "clear_form": "Clear Form",
@@ -631,6 +804,7 @@ LANGUAGES = {
     "settings": "Settings",
     "quick_menu_settings": "Quick Menu Settings",
     "quick_menu_title": "Quick Menu Management",
+    "quick_main_auto": "Auto-fill MAIN list by time of day",
     "button_text": "Button Text",
     "button_price": "Price",
     "list_code": "List Code",
@@ -801,7 +975,7 @@ LANGUAGES = {
         "thermal_printer": "Thermal Printer",
         "no_print": "No Print",
         "printer_setup": "Printer Setup",
-        "enter_printer_name": "Enter printer name (check Devices and Printers):",
+        "enter_printer_name": "Enter printer address (tcp://IP:9100, device:///dev/usb/lp0, win32://POS-58, file://capture.bin):",
         "receipt_printed": "Receipt sent to printer!",
         "print_error": "Printer error",
 
@@ -1,13 +1,23 @@
+from pos import startup_profile
 import tkinter as tk
 from tkinter import ttk, messagebox, simpledialog
-import sqlite3, os, csv, subprocess, time, glob, tempfile
+import sqlite3, os, time
 from datetime import datetime, date
 from languages import LANGUAGES
 from pos.db_handler import get_connection, init_schema
+from pos.db_executor import get_executor
+from pos import instrumentation
+from pos import backup
+from pos import events
+from pos import query_cache
+from pos import session
+from core.money import Money
 from services import product_service as product_svc
-from services import expense_service as expense_svc
-from services import purchase_service as purchase_svc
-from receipts import print_receipt, print_thermal_receipt
+from services import sale_intent_service as intent_svc
+from services import live_sales_service as live_sales_svc
+from services import migration_service
+from ui.screen_manager import ScreenManager
+startup_profile.mark("imports")
 
 # ==========================
 # Tema & Genel Ayarlar (v2.4)
@@ -29,7 +39,6 @@ APP_VERSION = "v2.4"
 CURRENT_LANGUAGE = "tr"
 CURRENT_CURRENCY = "₺" # Varsayılan para birimi
 CURRENT_USER = ""
-PARTIAL_PAYMENT_DATA = {}
 
 def t(key: str) -> str:
     """Çeviri fonksiyonu - Translation function"""
@@ -99,10 +108,23 @@ def load_theme_settings():
         # Türetilmiş renkler
         TEXT_LIGHT = FG_COLOR
         # Basitçe okunabilirlik için griyi de ana metin rengi yapalım veya yakın bir ton
-        TEXT_GRAY = FG_COLOR 
+        TEXT_GRAY = FG_COLOR
     except Exception:
         pass
 
+def load_diagnostics_preference():
+    """Tanılama ölçümleri açık mı? (ayar veya SMARTPOS_DIAGNOSTICS=1)"""
+    enabled = os.environ.get("SMARTPOS_DIAGNOSTICS") == "1"
+    try:
+        cursor.execute("SELECT value FROM settings WHERE key='diagnostics_enabled'")
+        result = cursor.fetchone()
+        if result and result[0] == '1':
+            enabled = True
+    except Exception:
+        pass
+    if enabled:
+        instrumentation.enable()
+
 def set_theme(window):
     style = ttk.Style(window)
     try:
@@ -155,9 +177,19 @@ def center_window(win, width: int, height: int):
 # ==========================
 conn, cursor = get_connection()
 init_schema(conn, cursor)
+# Yeni türetilmiş tablolar satış geçmişinden doldurulur (bir kez)
+migration_service.run(conn, cursor)
+# Önceki oturumda yarıda kalan satışlar (kısmi indeksle hızlı; genelde boş)
+intent_svc.recover(conn, cursor)
+# Canlı panel sayaçları günlük özetten (bugünün birkaç satırı)
+live_sales_svc.get_counters().seed(cursor)
+instrumentation.attach(conn)
+instrumentation.register_source("query_cache", query_cache.get_cache().stats)
 load_language_preference()
 load_currency_preference()
 load_theme_settings()
+load_diagnostics_preference()
+startup_profile.mark("db_init")
 
 # Yardımcı dönüştürücüler ve yardımcı fonksiyonlar
 def parse_float_safe(val, default: float | None = 0.0):
@@ -190,11 +222,33 @@ def refresh_product_values_for_combo():
 # ==========================
 # Gömülü Modüller (tek pencere)
 # ==========================
+def mount_backup_settings(parent):
+    from ui.backup_view import mount_backup_settings as _mount_backup_view
+    return _mount_backup_view(parent, conn, cursor, t, FG_COLOR, BG_COLOR, CARD_COLOR, ACCENT)
+
+def mount_receipts(parent):
+    from ui.receipts_view import mount_receipts as _mount_receipts_view
+    return _mount_receipts_view(parent, conn, cursor, t, FG_COLOR, BG_COLOR, CARD_COLOR, ACCENT,
+                                language_code=CURRENT_LANGUAGE)
+
+def mount_archive(parent):
+    from ui.archive_view import mount_archive as _mount_archive_view
+    return _mount_archive_view(parent, conn, cursor, t, FG_COLOR, BG_COLOR, CARD_COLOR, ACCENT)
+
+def mount_diagnostics(parent):
+    from ui.diagnostics_view import mount_diagnostics as _mount_diagnostics_view
+    return _mount_diagnostics_view(parent, conn, cursor, t, FG_COLOR, BG_COLOR, CARD_COLOR, ACCENT)
+
+def mount_dashboard(parent):
+    from ui.dashboard_view import mount_dashboard as _mount_dashboard_view
+    return _mount_dashboard_view(parent, conn, cursor, t, FG_COLOR, BG_COLOR, CARD_COLOR, ACCENT, currency=CURRENT_CURRENCY)
+
 def mount_products(parent):
     from ui.products_view import mount_products as _mount_products_view
     return _mount_products_view(parent, conn, cursor, t, FG_COLOR, BG_COLOR, CARD_COLOR, ACCENT)
 
 def _mount_purchase_screen(parent, doc_type):
+    from services import purchase_service as purchase_svc
     # doc_type: 'irsaliye' or 'fatura'
     title_key = 'dispatch_entry' if doc_type == 'irsaliye' else 'invoice_entry'
     icon = "📥" if doc_type == 'irsaliye' else "🧾"
@@ -475,6 +529,7 @@ def mount_fatura_listesi(parent):
     _mount_purchase_list(parent, 'fatura')
 
 def _mount_purchase_list(parent, doc_type):
+    from services import purchase_service as purchase_svc
     for w in parent.winfo_children(): w.destroy()
     
     title_key = 'dispatch_list' if doc_type == 'irsaliye' else 'invoice_list'
@@ -547,6 +602,7 @@ def _mount_purchase_list(parent, doc_type):
     tk.Button(btn_frame, text="👁 " + t('details'), command=lambda: on_double_click(None), bg="#17a2b8", fg="white", relief="flat", padx=15, pady=8).pack(side="right", padx=5)
 
 def show_purchase_details(parent, doc_id):
+    from services import purchase_service as purchase_svc
     dialog = tk.Toplevel(parent)
     dialog.title(t('details'))
     dialog.geometry("800x600")
@@ -603,6 +659,7 @@ def show_purchase_details(parent, doc_id):
     tk.Button(btn_frame, text=t('close'), command=dialog.destroy, bg="#6c757d", fg="white", relief="flat", padx=15, pady=8).pack(side="right", padx=5)
 
 def _mount_purchase_edit(parent, doc_id):
+    from services import purchase_service as purchase_svc
     # Similar to _mount_purchase_screen but pre-filled and updates instead of creates
     for w in parent.winfo_children(): w.destroy()
     
@@ -1598,6 +1655,7 @@ def _mount_cari_islem(parent, mode: str):
         cb.set(cari_names[0]); load_moves()
 
 def mount_hizmet_listesi(parent):
+    from services import expense_service as expense_svc
     for w in parent.winfo_children(): w.destroy()
     
     header = ttk.Frame(parent, style="Card.TFrame"); header.pack(fill="x", padx=12, pady=(12,8))
@@ -1667,6 +1725,7 @@ def mount_hizmet_listesi(parent):
     load_services()
 
 def mount_masraf_ekle(parent):
+    from services import expense_service as expense_svc
     for w in parent.winfo_children(): w.destroy()
     
     header = ttk.Frame(parent, style="Card.TFrame"); header.pack(fill="x", padx=12, pady=(12,8))
@@ -1728,6 +1787,7 @@ def mount_masraf_ekle(parent):
     load_recent_expenses()
 
 def mount_masraf_raporu(parent):
+    from services import expense_service as expense_svc
     for w in parent.winfo_children(): w.destroy()
     
     header = ttk.Frame(parent, style="Card.TFrame"); header.pack(fill="x", padx=12, pady=(12,8))
@@ -1804,12 +1864,52 @@ def mount_personel_vardiya(parent):
     ttk.Label(right_panel, text=t('note')).pack(anchor="w", padx=10)
     e_note = ttk.Entry(right_panel); e_note.pack(fill="x", padx=10, pady=(0,10))
     
+    # Başlatırken açılış nakdi, bitirirken sayılan nakit
+    ttk.Label(right_panel, text=t('shift_cash')).pack(anchor="w", padx=10)
+    e_cash = ttk.Entry(right_panel); e_cash.pack(fill="x", padx=10, pady=(0,10))
+    
     lbl_status = ttk.Label(right_panel, text="", font=("Segoe UI", 9, "bold"))
     lbl_status.pack(pady=5)
     
     btn_action = ttk.Button(right_panel, text="-")
     btn_action.pack(fill="x", padx=10, pady=10)
     
+    def show_report(report):
+        """Vardiya mutabakatı: beklenen/sayılan nakit ve kasiyer başına satış/iptal"""
+        win = tk.Toplevel(parent); win.title(f"{t('shift_report')} #{report['shift_id']}")
+        set_theme(win)
+        frm = ttk.Frame(win, style="Card.TFrame"); frm.pack(fill="both", expand=True, padx=12, pady=12)
+        ttk.Label(frm, text=f"{report['user']}  {report['start']} - {report['end'] or '...'}", style="Sub.TLabel").pack(anchor="w")
+        grid = ttk.Frame(frm); grid.pack(fill="x", pady=8)
+        rows = [(t('opening_cash'), report['opening']), (t('cash_sales'), report['cash_sales']),
+                (t('cash_refunds'), -report['cash_refunds']), (t('account_collection_type'), report['tahsilat']),
+                (t('account_payment_type'), -report['odeme']), (t('expense_type'), -report['expenses']),
+                (t('expected_cash'), report['expected'])]
+        if report['counted'] is not None:
+            rows += [(t('counted_cash'), report['counted']), (t('cash_difference'), report['difference'])]
+        for i, (label, amount) in enumerate(rows):
+            ttk.Label(grid, text=f"{label}:").grid(row=i, column=0, sticky="e", padx=6, pady=2)
+            ttk.Label(grid, text=f"{amount} {CURRENT_CURRENCY}", font=("Segoe UI", 10, "bold")).grid(row=i, column=1, sticky="w", padx=6, pady=2)
+        cols = ("cashier", "receipts", "items", "revenue", "voids", "void_amount", "returns", "return_amount")
+        ct = ttk.Treeview(frm, columns=cols, show="headings", height=6)
+        for col, head, w in (("cashier", t('cashier'), 120), ("receipts", t('receipt_count'), 80), ("items", t('items_sold'), 80),
+                             ("revenue", t('total'), 100), ("voids", t('voids'), 60), ("void_amount", t('voids') + " " + t('total'), 100),
+                             ("returns", t('returns'), 60), ("return_amount", t('returns') + " " + t('total'), 100)):
+            ct.heading(col, text=head); ct.column(col, width=w, anchor="w" if col == "cashier" else "e")
+        for c in report['cashiers']:
+            ct.insert("", "end", values=(c['username'], c['receipts'], f"{c['items']:g}", str(c['revenue']), c['voids'], str(c['void_amount']),
+                                         c['returns'], str(c['return_amount'])))
+        ct.pack(fill="both", expand=True, pady=(8, 0))
+    
+    def open_selected_report():
+        sel = tree.selection()
+        if not sel:
+            messagebox.showwarning(t('warning'), t('select_record'))
+            return
+        show_report(ps.shift_reconciliation(cursor, int(tree.item(sel[0], "text"))))
+    
+    ttk.Button(right_panel, text=t('shift_report'), command=open_selected_report).pack(fill="x", padx=10, pady=(0,10))
+    
     def load_shifts():
         for i in tree.get_children(): tree.delete(i)
         shifts = ps.list_shifts(cursor)
@@ -1837,17 +1937,27 @@ def mount_personel_vardiya(parent):
             
     def do_start_shift(uid):
         note = e_note.get().strip()
-        ps.start_shift(conn, cursor, uid, note)
+        try:
+            ps.start_shift(conn, cursor, uid, note, opening_cash=e_cash.get().strip() or None)
+        except ValueError:
+            messagebox.showerror(t('error'), t('invalid_amount'))
+            return
         messagebox.showinfo(t('success'), t('shift_started'))
         e_note.delete(0, tk.END)
+        e_cash.delete(0, tk.END)
         load_shifts()
         check_status()
         
     def do_end_shift(sid):
-        ps.end_shift(conn, cursor, sid)
-        messagebox.showinfo(t('success'), t('shift_ended'))
+        try:
+            report = ps.end_shift(conn, cursor, sid, counted_cash=e_cash.get().strip() or None)
+        except ValueError:
+            messagebox.showerror(t('error'), t('invalid_amount'))
+            return
+        e_cash.delete(0, tk.END)
         load_shifts()
         check_status()
+        show_report(report)
         
     cb_user.bind("<<ComboboxSelected>>", check_status)
     if user_names: cb_user.set(user_names[0]); check_status()
@@ -2241,26 +2351,50 @@ def mount_depo_stok_listesi(parent):
     tree.pack(fill="both", expand=True, padx=10, pady=10)
     
     def load_stocks(event=None):
-        for i in tree.get_children(): tree.delete(i)
-        
         selected_wh = cb_wh.get()
         search_txt = e_search.get().lower()
         
         if selected_wh == t('all'):
-            stocks = ws.list_all_stocks(cursor)
             # stocks: (wh_name, prod_name, qty, unit)
+            fetch = lambda cur: ws.list_all_stocks(cur)
         else:
             wh_id = wh_map.get(selected_wh)
             if not wh_id: return
-            raw_stocks = ws.list_warehouse_stocks(cursor, wh_id)
             # raw_stocks: (prod_name, qty, unit)
-            stocks = [(selected_wh, s[0], s[1], s[2]) for s in raw_stocks]
-            
-        for s in stocks:
-            wh_name, p_name, qty, unit = s
-            if search_txt and search_txt not in p_name.lower():
-                continue
-            tree.insert("", "end", values=(wh_name, p_name, f"{qty}", unit))
+            fetch = lambda cur: [(selected_wh, s[0], s[1], s[2]) for s in ws.list_warehouse_stocks(cur, wh_id)]
+
+        def render(stocks):
+            for i in tree.get_children(): tree.delete(i)
+            row_items.clear()
+            for s in stocks:
+                wh_name, p_name, qty, unit = s
+                if search_txt and search_txt not in p_name.lower():
+                    continue
+                row_items[(wh_name, p_name)] = tree.insert("", "end", values=(wh_name, p_name, f"{qty}", unit))
+
+        # Arka planda oku; yeni tuş vuruşu eski isteği iptal eder
+        get_executor().submit(fetch, on_done=render, owner=tree, key=("depo_stok", id(tree)))
+
+    # (depo, ürün) -> tree satırı
+    row_items = {}
+
+    def on_stock_changed(product_ids):
+        # Yalnızca stoğu değişen ürünlerin depo satırları okunur ve yerinde güncellenir
+        selected_wh = cb_wh.get()
+        wh_id = None if selected_wh == t('all') else wh_map.get(selected_wh)
+        search_txt = e_search.get().lower()
+
+        def patch(rows):
+            for _, wh_name, _, p_name, qty, unit in rows:
+                iid = row_items.get((wh_name, p_name))
+                if iid is not None:
+                    tree.set(iid, "qty", f"{qty}")
+                elif not search_txt or search_txt in p_name.lower():
+                    row_items[(wh_name, p_name)] = tree.insert("", "end", values=(wh_name, p_name, f"{qty}", unit))
+
+        get_executor().submit(lambda cur: ws.list_stocks_for_products(cur, product_ids, wh_id), on_done=patch, owner=tree)
+
+    events.subscribe(events.STOCK_CHANGED, on_stock_changed, owner=tree)
             
     cb_wh.bind("<<ComboboxSelected>>", load_stocks)
     e_search.bind("<KeyRelease>", load_stocks)
@@ -2318,12 +2452,13 @@ def mount_kasa_hareket(parent):
         
         moves = cs.get_cash_movements(cursor, s_date, e_date)
         
-        t_in = 0.0
-        t_out = 0.0
+        t_in = Money()
+        t_out = Money()
         
         # Translation maps
         type_map = {
             'Satış': 'sale_type',
+            'İade': 'refund_type',
             'Cari Tahsilat': 'account_collection_type',
             'Cari Ödeme': 'account_payment_type',
             'Masraf': 'expense_type'
@@ -2377,9 +2512,9 @@ def mount_kasa_hareket(parent):
             else:
                 t_out += m['amount']
                 
-        lbl_total_in.config(text=f"{t('total_in_lbl')}: {t_in:.2f}")
-        lbl_total_out.config(text=f"{t('total_out_lbl')}: {t_out:.2f}")
-        lbl_balance.config(text=f"{t('balance_lbl')}: {t_in - t_out:.2f}")
+        lbl_total_in.config(text=f"{t('total_in_lbl')}: {t_in}")
+        lbl_total_out.config(text=f"{t('total_out_lbl')}: {t_out}")
+        lbl_balance.config(text=f"{t('balance_lbl')}: {t_in - t_out}")
         
     tk.Button(filter_frame, text="🔍 " + t('refresh'), command=load_movements, 
               bg=ACCENT, fg="white", relief="flat").pack(side="left", padx=5)
@@ -2410,8 +2545,12 @@ def mount_kasa_devir(parent):
     ttk.Label(f_summary, text=f"{t('total_out_lbl')}:", font=("Segoe UI", 12)).grid(row=2, column=0, padx=20, pady=10, sticky="e")
     ttk.Label(f_summary, text=f"{summary['out']:.2f} {CURRENT_CURRENCY}", font=("Segoe UI", 12, "bold"), foreground="red").grid(row=2, column=1, padx=20, pady=10, sticky="w")
     
-    ttk.Label(f_summary, text=f"{t('end_day_balance')}:", font=("Segoe UI", 14, "bold")).grid(row=3, column=0, padx=20, pady=20, sticky="e")
-    ttk.Label(f_summary, text=f"{summary['balance']:.2f} {CURRENT_CURRENCY}", font=("Segoe UI", 14, "bold"), foreground="#00b0ff").grid(row=3, column=1, padx=20, pady=20, sticky="w")
+    # Kart tahsilatı kasaya girmez; bilgi olarak (parçalı ödemelerin kart kısmı dahil)
+    ttk.Label(f_summary, text=f"{t('credit_card')}:", font=("Segoe UI", 12)).grid(row=3, column=0, padx=20, pady=10, sticky="e")
+    ttk.Label(f_summary, text=f"{summary['card']:.2f} {CURRENT_CURRENCY}", font=("Segoe UI", 12, "bold")).grid(row=3, column=1, padx=20, pady=10, sticky="w")
+    
+    ttk.Label(f_summary, text=f"{t('end_day_balance')}:", font=("Segoe UI", 14, "bold")).grid(row=4, column=0, padx=20, pady=20, sticky="e")
+    ttk.Label(f_summary, text=f"{summary['balance']:.2f} {CURRENT_CURRENCY}", font=("Segoe UI", 14, "bold"), foreground="#00b0ff").grid(row=4, column=1, padx=20, pady=20, sticky="w")
     
     def close_day():
         # Basitçe bir rapor oluşturup kaydedebiliriz veya sadece mesaj gösterebiliriz
@@ -2721,6 +2860,19 @@ def mount_quick_menu_settings(parent):
     cb_list = ttk.Combobox(filter_frame, values=list_names, state="readonly", width=15)
     cb_list.set(list_names[0])
     cb_list.pack(side="left", padx=5)
+
+    # Ana liste: günün saatine göre en çok satanları otomatik göster
+    cursor.execute("SELECT value FROM settings WHERE key='quick_main_auto'")
+    r = cursor.fetchone()
+    auto_var = tk.BooleanVar(value=bool(r and r[0] == '1'))
+
+    def on_auto_toggle():
+        cursor.execute("INSERT OR REPLACE INTO settings(key,value) VALUES('quick_main_auto', ?)",
+                       ('1' if auto_var.get() else '0',))
+        conn.commit()
+
+    ttk.Checkbutton(filter_frame, text=t('quick_main_auto'), variable=auto_var,
+                    command=on_auto_toggle).pack(side="left", padx=10)
     
     cols = ("name", "price", "sort")
     tree = ttk.Treeview(left_panel, columns=cols, show="headings", height=15)
@@ -3171,96 +3323,8 @@ def mount_users(parent):
     refresh_btn.bind("<Leave>", refresh_hover_out)
     load()
 
-def mount_receipts(parent):
-    for w in parent.winfo_children(): w.destroy()
-    
-    # Modern header
-    header = ttk.Frame(parent, style="Card.TFrame")
-    header.pack(fill="x", padx=12, pady=(12, 8))
-    ttk.Label(header, text="🧾 " + t('receipts_title'), style="Header.TLabel",
-              font=("Segoe UI", 16, "bold")).pack(side="left", padx=8)
-
-    body = ttk.Frame(parent, style="Card.TFrame")
-    body.pack(fill="both", expand=True, padx=12, pady=8)
-    
-    # Modern table
-    tree = ttk.Treeview(body, columns=(t('file'), t('date')), show="headings", height=14)
-    tree.heading(t('file'), text=t('file'))
-    tree.heading(t('date'), text=t('date'))
-    tree.column(t('file'), width=480)
-    tree.column(t('date'), width=200, anchor="center")
-    
-    # Zebrastripe
-    tree.tag_configure('oddrow', background=BG_COLOR)
-    tree.tag_configure('evenrow', background=CARD_COLOR)
-    
-    original_insert = tree.insert
-    def insert_with_tags(*args, **kwargs):
-        item = original_insert(*args, **kwargs)
-        idx = tree.index(item)
-        tree.item(item, tags=('evenrow',) if idx % 2 == 0 else ('oddrow',))
-        return item
-    tree.insert = insert_with_tags
-    
-    tree.pack(fill="both", expand=True, padx=10, pady=10)
-
-    temp_dir = os.path.join(tempfile.gettempdir(), "SmartPOS_Receipts")
-    os.makedirs(temp_dir, exist_ok=True)
-
-    def load():
-        for r in tree.get_children(): tree.delete(r)
-        files = sorted(glob.glob(os.path.join(temp_dir, "*.pdf")), reverse=True)
-        for f in files:
-            ts = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(os.path.getmtime(f)))
-            tree.insert("", "end", values=(os.path.basename(f), ts))
-
-    def open_selected():
-        sel = tree.selection()
-        if not sel: return messagebox.showwarning(t('warning'), t('select_item'))
-        fname = tree.item(sel[0])["values"][0]
-        full = os.path.join(temp_dir, fname)
-        if os.path.exists(full):
-            try:
-                if os.name=="nt": os.startfile(full)  # type: ignore
-                else: subprocess.call(("open", full))
-            except Exception as e:
-                messagebox.showerror(t('error'), f"{t('open_failed')}\n{e}")
-
-    # Modern butonlar
-    btns = ttk.Frame(parent, style="Card.TFrame")
-    btns.pack(fill="x", padx=12, pady=(0,12))
-    
-    def create_receipt_button(parent, text, command, bg_color):
-        btn = tk.Button(parent, text=text, command=command,
-                       bg=bg_color, fg="white", font=("Segoe UI", 10, "bold"),
-                       activebackground=bg_color, activeforeground="white",
-                       relief="flat", padx=16, pady=10, cursor="hand2", borderwidth=0)
-        
-        def on_enter(e):
-            factor = 1.15
-            new_color = adjust_receipt_brightness(bg_color, factor)
-            btn.config(bg=new_color)
-        
-        def on_leave(e):
-            btn.config(bg=bg_color)
-        
-        btn.bind("<Enter>", on_enter)
-        btn.bind("<Leave>", on_leave)
-        return btn
-    
-    def adjust_receipt_brightness(hex_color, factor):
-        hex_color = hex_color.lstrip('#')
-        r, g, b = int(hex_color[0:2], 16), int(hex_color[2:4], 16), int(hex_color[4:6], 16)
-        r = int(min(255, max(0, r * factor)))
-        g = int(min(255, max(0, g * factor)))
-        b = int(min(255, max(0, b * factor)))
-        return f"#{r:02x}{g:02x}{b:02x}"
-    
-    create_receipt_button(btns, "🖨 " + t('open_print'), open_selected, "#00b0ff").pack(side="left", padx=4, pady=8)
-    create_receipt_button(btns, "🔄 " + t('refresh'), load, "#8b5cf6").pack(side="right", padx=4, pady=8)
-    load()
-
 def mount_reports(parent):
+    import csv, subprocess
     for w in parent.winfo_children(): w.destroy()
     
     # Modern header
@@ -3356,6 +3420,7 @@ def mount_reports(parent):
 
     from services import sales_service as sales_svc
     from services import expense_service as expense_svc
+    from services import daily_summary_service as summary_svc
 
     def show_profit_loss():
         frm, to = sv_from.get().strip(), sv_to.get().strip()
@@ -3364,10 +3429,16 @@ def mount_reports(parent):
         
         to_plus = datetime.strptime(to, "%Y-%m-%d").replace(hour=23,minute=59,second=59).strftime("%Y-%m-%d %H:%M:%S")
         
-        # Get data
-        total_revenue, total_cogs = sales_svc.get_profit_loss_stats(cursor, f"{frm} 00:00:00", to_plus)
-        total_expenses = expense_svc.get_total_expenses(cursor, frm, to)
-        
+        # Get data (arka planda)
+        def fetch(cur):
+            revenue, cogs = sales_svc.get_profit_loss_stats(cur, f"{frm} 00:00:00", to_plus)
+            # İadeler satış satırlarında eksi olarak zaten düşülü; tutarı günlük özetten okunur
+            returns = summary_svc.get_totals(cur, frm, to)["returns_amount"]
+            return revenue, cogs, expense_svc.get_total_expenses(cur, frm, to), float(returns)
+        get_executor().submit(fetch, on_done=lambda res: show_profit_loss_dialog(frm, to, *res),
+                              on_error=lambda e: messagebox.showerror(t('error'), str(e)), owner=parent)
+
+    def show_profit_loss_dialog(frm, to, total_revenue, total_cogs, total_expenses, total_returns=0.0):
         gross_profit = total_revenue - total_cogs
         net_profit = gross_profit - total_expenses
         
@@ -3375,7 +3446,7 @@ def mount_reports(parent):
         dialog = tk.Toplevel(parent)
         dialog.title("💰 Kar/Zarar Raporu")
         set_theme(dialog)
-        center_window(dialog, 400, 450)
+        center_window(dialog, 400, 490)
         
         header = tk.Frame(dialog, bg=BG_COLOR)
         header.pack(fill="x", pady=20)
@@ -3393,6 +3464,8 @@ def mount_reports(parent):
             tk.Label(row, text=f"{value:.2f} {CURRENT_CURRENCY}", font=font_style, bg=CARD_COLOR, fg=color).pack(side="right")
             
         add_row("Toplam Satış:", total_revenue, "#10b981")
+        if total_returns:
+            add_row("İadeler (düşüldü):", total_returns, "#f59e0b")
         add_row("Satılan Malın Maliyeti:", total_cogs, "#ef4444")
         
         tk.Frame(content, bg=TEXT_GRAY, height=1).pack(fill="x", padx=15, pady=5)
@@ -3414,32 +3487,111 @@ def mount_reports(parent):
         if not (valid_date(frm) and valid_date(to)):
             return messagebox.showwarning(t('warning'), t('date_format_warning'))
         to_plus = datetime.strptime(to, "%Y-%m-%d").replace(hour=23,minute=59,second=59).strftime("%Y-%m-%d %H:%M:%S")
+        lbl_sum.config(text="⏳ " + t('loading'))
+        shown.update(frm=f"{frm} 00:00:00", to=to_plus)
+        get_executor().submit(lambda cur: sales_svc.list_sales_between(cur, f"{frm} 00:00:00", to_plus),
+                              on_done=render_report, on_error=lambda e: messagebox.showerror(t('error'), str(e)),
+                              owner=tree, key=("reports", id(tree)))
+
+    # satır -> receipt_id (çift tıklamada fiş satırları tamsayı anahtarla çekilir)
+    row_receipts = {}
+    # Ekrandaki aralık ve toplamlar (satış/iptal olaylarıyla yerinde güncellenir)
+    shown = {"frm": None, "to": None, "qty": 0.0, "sum": 0.0}
+
+    def fmt_qty(q):
+        # miktarı virgüllü göstermek için
+        return f"{q:.3f}" if abs(q - round(q)) > 1e-6 else str(int(round(q)))
+
+    def show_totals():
+        lbl_sum.config(text=f"{t('quantity')}: {fmt_qty(shown['qty'])} | {t('total')}: {shown['sum']:.2f} {CURRENT_CURRENCY}")
+
+    def insert_row(index, idx, row):
+        fis_id, ts, pname, qty, price, total, receipt_id = row
+        ts_disp = (ts or "").replace("T"," ")
+        iid = tree.insert("", index, text=str(fis_id), values=(idx, ts_disp, pname, fmt_qty(float(qty)), f"{float(price):.2f}", f"{float(total):.2f}"))
+        row_receipts[iid] = receipt_id
+        shown["qty"] += float(qty); shown["sum"] += float(total)
+
+    def render_report(rows):
         for r in tree.get_children(): tree.delete(r)
-        rows = sales_svc.list_sales_between(cursor, f"{frm} 00:00:00", to_plus)
+        row_receipts.clear()
+        shown.update(qty=0.0, sum=0.0)
+        for idx, row in enumerate(rows, 1):
+            insert_row("end", idx, row)
+        show_totals()
+
+    def renumber():
+        for idx, iid in enumerate(tree.get_children(), 1):
+            tree.set(iid, "no", idx)
+            tree.item(iid, tags=('evenrow',) if idx % 2 == 1 else ('oddrow',))
+
+    def on_sale_committed(receipt_ids):
+        # Yeni fişin satırları yalnızca ekrandaki aralığa düşüyorsa okunur ve en üste eklenir
+        if not shown["to"] or datetime.now().strftime("%Y-%m-%d %H:%M:%S") > shown["to"]:
+            return
+        frm, to = shown["frm"], shown["to"]
+
+        def patch(rows):
+            rows = [r for r in rows if frm <= (r[1] or "").replace("T", " ") <= to]
+            for pos, row in enumerate(rows):
+                insert_row(pos, 0, row)
+            if rows:
+                renumber(); show_totals()
+        get_executor().submit(lambda cur: sales_svc.list_sales_for_receipts(cur, receipt_ids), on_done=patch, owner=tree)
+
+    def on_sale_cancelled(receipt_ids):
+        removed = [iid for iid, rid in row_receipts.items() if rid in receipt_ids]
+        for iid in removed:
+            values = tree.item(iid)["values"]
+            shown["qty"] -= float(values[3]); shown["sum"] -= float(values[5])
+            tree.delete(iid)
+            del row_receipts[iid]
+        if removed:
+            renumber(); show_totals()
+
+    def on_sale_returned(return_ids):
+        # İade satırları (eksi miktar) aralıktaysa en üste eklenir; fiş iptal edilirse onlar da silinir
+        if not shown["to"] or datetime.now().strftime("%Y-%m-%d %H:%M:%S") > shown["to"]:
+            return
+        frm, to = shown["frm"], shown["to"]
 
-        t_qty=0; t_sum=0.0
-        for idx, (fis_id, ts, pname, qty, price, total) in enumerate(rows, 1):
-            ts_disp = (ts or "").replace("T"," ")
-            # miktarı virgüllü göstermek için
-            qty_disp = f"{float(qty):.3f}" if abs(float(qty) - round(float(qty))) > 1e-6 else str(int(round(float(qty))))
-            tree.insert("", "end", text=str(fis_id), values=(idx, ts_disp, pname, qty_disp, f"{float(price):.2f}", f"{float(total):.2f}"))
-            t_qty += float(qty); t_sum += float(total)
-        qty_total_disp = f"{t_qty:.3f}" if abs(t_qty - round(t_qty)) > 1e-6 else str(int(round(t_qty)))
-        lbl_sum.config(text=f"{t('quantity')}: {qty_total_disp} | {t('total')}: {t_sum:.2f} {CURRENT_CURRENCY}")
+        def patch(rows):
+            rows = [r for r in rows if frm <= (r[1] or "").replace("T", " ") <= to]
+            for pos, row in enumerate(rows):
+                insert_row(pos, 0, row)
+            if rows:
+                renumber(); show_totals()
+        get_executor().submit(lambda cur: sales_svc.list_return_lines(cur, return_ids), on_done=patch, owner=tree)
+
+    events.subscribe(events.SALE_COMMITTED, on_sale_committed, owner=tree)
+    events.subscribe(events.SALE_CANCELLED, on_sale_cancelled, owner=tree)
+    events.subscribe(events.SALE_RETURNED, on_sale_returned, owner=tree)
 
     def export_csv():
         frm, to = sv_from.get().strip(), sv_to.get().strip()
         if not (valid_date(frm) and valid_date(to)):
             return messagebox.showwarning(t('warning'), t('date_format_warning'))
         to_plus = datetime.strptime(to, "%Y-%m-%d").replace(hour=23,minute=59,second=59).strftime("%Y-%m-%d %H:%M:%S")
-        rows = sales_svc.list_sales_between(cursor, f"{frm} 00:00:00", to_plus)
-        if not rows: return messagebox.showinfo(t('info'), t('no_sales_in_range'))
-        os.makedirs("reports", exist_ok=True)
+        header = [t('receipt_no'), t('date'), t('product'), t('quantity'), t('price'), t('total')]
         fname = os.path.join("reports", f"rapor_{frm}_to_{to}.csv")
-        with open(fname, "w", newline="", encoding="utf-8-sig") as f:
-            w = csv.writer(f, delimiter=';')
-            w.writerow([t('receipt_no'), t('date'), t('product'), t('quantity'), t('price'), t('total')])
-            for r in rows: w.writerow([r[0],r[1],r[2],r[3],f"{float(r[4]):.2f}".replace('.', ','),f"{float(r[5]):.2f}".replace('.', ',')])
+
+        # Okuma ve dosya yazımı arka planda; sonuç UI'da gösterilir
+        def write_csv(cur):
+            rows = sales_svc.list_sales_between(cur, f"{frm} 00:00:00", to_plus)
+            if not rows:
+                return None
+            os.makedirs("reports", exist_ok=True)
+            with open(fname, "w", newline="", encoding="utf-8-sig") as f:
+                w = csv.writer(f, delimiter=';')
+                w.writerow(header)
+                for r in rows: w.writerow([r[0],r[1],r[2],r[3],f"{float(r[4]):.2f}".replace('.', ','),f"{float(r[5]):.2f}".replace('.', ',')])
+            return fname
+
+        get_executor().submit(write_csv, on_done=csv_written,
+                              on_error=lambda e: messagebox.showerror(t('error'), str(e)), owner=parent)
+
+    def csv_written(fname):
+        if not fname: return messagebox.showinfo(t('info'), t('no_sales_in_range'))
         messagebox.showinfo(t('success'), f"{t('report_saved')}\n{fname}")
         try:
             if os.name=="nt": os.startfile(fname)  # type: ignore
@@ -3451,7 +3603,11 @@ def mount_reports(parent):
         if not (valid_date(frm) and valid_date(to)):
             return messagebox.showwarning(t('warning'), t('date_format_warning'))
         to_plus = datetime.strptime(to, "%Y-%m-%d").replace(hour=23,minute=59,second=59).strftime("%Y-%m-%d %H:%M:%S")
-        rows = sales_svc.list_sales_between(cursor, f"{frm} 00:00:00", to_plus)
+        get_executor().submit(lambda cur: sales_svc.list_sales_between(cur, f"{frm} 00:00:00", to_plus),
+                              on_done=lambda rows: build_pdf(frm, to, rows),
+                              on_error=lambda e: messagebox.showerror(t('error'), str(e)), owner=parent)
+
+    def build_pdf(frm, to, rows):
         if not rows: return messagebox.showinfo(t('info'), t('no_sales_in_range'))
         
         try:
@@ -3498,7 +3654,7 @@ def mount_reports(parent):
             data = [[t('receipt_no'), t('date'), t('product'), t('quantity'), t('price'), t('total')]]
             t_qty = 0.0
             t_sum = 0.0
-            for fis_id, ts, pname, qty, price, total in rows:
+            for fis_id, ts, pname, qty, price, total, _ in rows:
                 ts_disp = (ts or "").replace("T", " ")
                 qty_disp = f"{float(qty):.3f}" if abs(float(qty) - round(float(qty))) > 1e-6 else str(int(round(float(qty))))
                 data.append([str(fis_id), ts_disp, str(pname), qty_disp, f"{float(price):.2f}", f"{float(total):.2f}"])
@@ -3535,11 +3691,53 @@ def mount_reports(parent):
         except Exception as e:
             messagebox.showerror(t('error'), f"PDF oluşturma hatası:\n\n{str(e)}")
 
+    def export_receipts_pdf():
+        """Aralıktaki fişleri (isteğe bağlı müşteri süzgeci ile) tek PDF'e, ayrı süreçte yaz."""
+        frm, to = sv_from.get().strip(), sv_to.get().strip()
+        if not (valid_date(frm) and valid_date(to)):
+            return messagebox.showwarning(t('warning'), t('date_format_warning'))
+        customer = simpledialog.askstring(t('receipts_export'), t('receipts_export_customer'), parent=parent)
+        if customer is None:
+            return
+        from services import receipt_export_service as export_svc
+        db_path = next((r[2] for r in cursor.execute("PRAGMA database_list") if r[1] == "main"), "database.db")
+        fname = os.path.join("reports", f"fisler_{frm}_to_{to}.pdf")
+        try:
+            job = export_svc.start(db_path, fname, f"{frm} 00:00:00", f"{to} 23:59:59", customer.strip() or None)
+        except Exception as e:
+            return messagebox.showerror(t('error'), str(e))
+        btn_receipts.config(state="disabled", text="⏳ " + t('receipts_export_running'))
+
+        def poll():
+            try:
+                result = job.poll()
+            except Exception as e:
+                result = e
+            if result is None:
+                if btn_receipts.winfo_exists():
+                    parent.after(300, poll)
+                return
+            if btn_receipts.winfo_exists():
+                btn_receipts.config(state="normal", text="🧾 " + t('receipts_export'))
+            if isinstance(result, Exception):
+                return messagebox.showerror(t('error'), f"PDF oluşturma hatası:\n\n{result}")
+            if not result.get("path"):
+                return messagebox.showinfo(t('info'), t('no_sales_in_range'))
+            messagebox.showinfo(t('success'), f"{t('report_saved')}\n{result['path']}\n"
+                                f"{t('receipts_export_done').format(receipts=result['receipts'], pages=result['pages'])}")
+            try:
+                if os.name == "nt": os.startfile(result["path"])  # type: ignore
+                else: subprocess.call(("open", result["path"]))
+            except Exception: pass
+
+        parent.after(300, poll)
+
     # Butonları oluştur (yukarıda tanımlandı)
     create_report_button(btns, "🔍 " + t('list'), load_report, "#00b0ff")
     create_report_button(btns, "💰 Kar/Zarar", show_profit_loss, "#f59e0b")
     create_report_button(btns, "� PDF", export_pdf, "#9333ea")
     create_report_button(btns, "📥 CSV", export_csv, "#10b981")
+    btn_receipts = create_report_button(btns, "🧾 " + t('receipts_export'), export_receipts_pdf, "#0ea5e9")
 
     load_report()
 
@@ -3548,54 +3746,15 @@ def mount_reports(parent):
         try:
             sel = tree.selection()
             if not sel: return
-            values = tree.item(sel[0]).get("values", [])
-            if not values: return
-            fis_id = str(values[0])
-
-            # Fiş satırlarını DB'den çek
-            cursor.execute("""
-                SELECT product_name, quantity, price, total
-                FROM sales
-                WHERE fis_id=? AND (canceled IS NULL OR canceled=0)
-                ORDER BY created_at ASC
-            """, (fis_id,))
-            rows = cursor.fetchall()
-            if not rows:
-                return messagebox.showinfo(t('info'), t('no_sales_in_range'))
-
-            # Satış listesi: (pname, qty, base_price_for_display, line_gross)
-            # PDF'te fiyatı KDV dahil göstermek için base_price olarak brüt birim fiyatı geçiyoruz
-            sales_list = []
-            for pname, qty, unit_net, line_gross in rows:
-                q = float(qty) if qty else 1.0
-                unit_gross = float(line_gross) / q if q else float(unit_net)
-                sales_list.append((str(pname), float(q), float(unit_gross), float(line_gross)))
+            receipt_id = row_receipts.get(sel[0])
+            if receipt_id is None: return
 
-            # Etkin KDV oranını yaklaşık hesapla (bilgi amaçlı)
-            try:
-                ratios = []
-                for _, qty, unit_net, line_gross in rows:
-                    q = float(qty) if qty else 1.0
-                    unit_net_f = float(unit_net)
-                    unit_gross_f = float(line_gross) / q if q else unit_net_f
-                    if unit_net_f > 0:
-                        ratios.append(max(0.0, (unit_gross_f/unit_net_f - 1.0)*100.0))
-                kdv_rate_guess = round(sum(ratios)/len(ratios), 2) if ratios else 0.0
-            except Exception:
-                kdv_rate_guess = 0.0
-
-            # Fişi PDF olarak üret ve aç (fiyatları KDV dahil göster)
-            print_receipt(
-                sales_list,
-                fis_id=fis_id,
-                customer_name=t('customer'),
-                kdv_rate=kdv_rate_guess,
-                discount_rate=0.0,
-                vat_included=True,
-                open_after=True,
-                show_message=False,
-                language_code=CURRENT_LANGUAGE
-            )
+            # Kayıtlı belge açılır; dosya yoksa fiş satırlarından (arşiv dahil) yeniden üretilir
+            from services import receipt_document_service as receipt_doc_svc
+            path = receipt_doc_svc.ensure_document(conn, cursor, receipt_id, CURRENT_LANGUAGE)
+            if not path:
+                return messagebox.showinfo(t('info'), t('no_sales_in_range'))
+            receipt_doc_svc.open_file(path)
         except Exception as e:
             messagebox.showerror(t('error'), str(e))
 
@@ -3626,9 +3785,10 @@ def mount_cariler(parent):
     total_borc_label = ttk.Label(summary, text="", style="Sub.TLabel", font=("Segoe UI", 11, "bold"))
     total_borc_label.pack(side="left", padx=12)
     
-    def update_summary():
-        alacak = cari_service.get_total_alacak(cursor)
-        borc = cari_service.get_total_borc(cursor)
+    def update_summary(alacak=None, borc=None):
+        if alacak is None:
+            alacak = cari_service.get_total_alacak(cursor)
+            borc = cari_service.get_total_borc(cursor)
         total_alacak_label.config(text=f"✅ {t('total_alacak')} {alacak:.2f} {CURRENT_CURRENCY}", foreground="#10b981")
         total_borc_label.config(text=f"❌ {t('total_borc')} {borc:.2f} {CURRENT_CURRENCY}", foreground="#ef4444")
 
@@ -3709,23 +3869,33 @@ def mount_cariler(parent):
     ttk.Radiobutton(type_frame, text=t('borclu'), variable=cari_type_var, value='borclu').pack(side="left", padx=4)
 
     def load(search=""):
+        # Arama her tuşta tetiklenir; arka planda oku, eski istekleri iptal et
+        fetch = (lambda cur: cari_service.search_by_name(cur, search)) if search else cari_service.list_all
+        get_executor().submit(fetch, on_done=render, owner=tree, key=("cariler", id(tree)))
+
+    # cari_id -> tree satırı (olayla gelen carileri yerinde güncellemek için)
+    row_items = {}
+
+    def row_view(idx, row):
+        # Unpack with new columns (8 columns total now)
+        if len(row) == 8:
+            cari_id, name, phone, address, balance, ctype, vd, vn = row
+        else:
+            # Fallback for old data if any issue
+            cari_id, name, phone, address, balance, ctype = row[:6]
+            vd, vn = "", ""
+        balance_str = f"{float(balance):.2f} {CURRENT_CURRENCY}"
+        type_str = t('alacakli') if ctype == 'alacakli' else t('borclu')
+        tag = 'evenrow' if idx % 2 == 0 else 'oddrow'
+        color_tag = 'positive' if float(balance) >= 0 else 'negative'
+        return (idx+1, name, phone, vd, vn, balance_str, type_str), (tag, color_tag)
+
+    def render(results):
         for r in tree.get_children():
             tree.delete(r)
-        results = cari_service.search_by_name(cursor, search) if search else cari_service.list_all(cursor)
+        row_items.clear()
         for idx, row in enumerate(results):
-            # Unpack with new columns (8 columns total now)
-            if len(row) == 8:
-                cari_id, name, phone, address, balance, ctype, vd, vn = row
-            else:
-                # Fallback for old data if any issue
-                cari_id, name, phone, address, balance, ctype = row[:6]
-                vd, vn = "", ""
-
-            balance_str = f"{float(balance):.2f} {CURRENT_CURRENCY}"
-            type_str = t('alacakli') if ctype == 'alacakli' else t('borclu')
-            
-            tag = 'evenrow' if idx % 2 == 0 else 'oddrow'
-            color_tag = 'positive' if float(balance) >= 0 else 'negative'
+            cari_id = row[0]
             
             # ID yerine sıra numarası göster (idx + 1)
             # Ancak gerçek ID'yi saklamamız lazım. Treeview'da values listesinde ID'yi tutuyoruz ama
@@ -3745,10 +3915,48 @@ def mount_cariler(parent):
             # Gerçek ID'yi tree.insert(..., text=cari_id) ile saklayalım.
             # Seçim yaparken tree.item(sel)['text'] ile ID'yi alalım.
             
-            item = tree.insert("", "end", text=str(cari_id), values=(idx+1, name, phone, vd, vn, balance_str, type_str), tags=(tag, color_tag))
+            values, tags = row_view(idx, row)
+            row_items[cari_id] = tree.insert("", "end", text=str(cari_id), values=values, tags=tags)
         
         update_summary()
 
+    def patch(ids, rows, alacak, borc):
+        """Sadece değişen carileri güncelle/ekle/sil; sıra no ve zebra, değişen noktadan itibaren."""
+        found = {row[0]: row for row in rows}
+        search = search_var.get().strip().lower()
+        first = len(tree.get_children())
+        for cari_id in ids:
+            row = found.get(cari_id)
+            iid = row_items.get(cari_id)
+            if row is None or (search and search not in str(row[1]).lower()):
+                # Silindi ya da artık aramaya uymuyor
+                if iid is not None:
+                    first = min(first, tree.index(iid))
+                    tree.delete(iid)
+                    del row_items[cari_id]
+                continue
+            if iid is None:
+                # Liste ada göre sıralı: yeni cariyi yerine ekle
+                children = tree.get_children()
+                pos = next((i for i, c in enumerate(children) if str(tree.item(c)["values"][1]) > str(row[1])), len(children))
+                iid = row_items[cari_id] = tree.insert("", pos, text=str(cari_id))
+                first = min(first, pos)
+            values, tags = row_view(tree.index(iid), row)
+            tree.item(iid, values=values, tags=tags)
+        for idx, iid in enumerate(tree.get_children()[first:], first):
+            item = tree.item(iid)
+            tree.item(iid, values=[idx+1] + list(item["values"][1:]),
+                      tags=('evenrow' if idx % 2 == 0 else 'oddrow', item["tags"][-1]))
+        update_summary(alacak, borc)
+
+    def on_cari_posted(ids):
+        # Olay yolu: yalnızca etkilenen satırlar ve iki toplam arka planda okunur
+        def fetch(cur):
+            return cari_service.list_by_ids(cur, ids), cari_service.get_total_alacak(cur), cari_service.get_total_borc(cur)
+        get_executor().submit(fetch, on_done=lambda res: patch(ids, *res), owner=tree)
+
+    events.subscribe(events.CARI_POSTED, on_cari_posted, owner=tree)
+
     def add_cari():
         try:
             cari_service.add_cari(
@@ -3763,7 +3971,6 @@ def mount_cariler(parent):
             )
             messagebox.showinfo(t('success'), t('cari_added'))
             clear_form()
-            load()
         except Exception as e:
             messagebox.showerror(t('error'), str(e))
 
@@ -3786,7 +3993,6 @@ def mount_cariler(parent):
             )
             messagebox.showinfo(t('success'), t('cari_updated'))
             clear_form()
-            load()
         except Exception as e:
             messagebox.showerror(t('error'), str(e))
 
@@ -3804,7 +4010,6 @@ def mount_cariler(parent):
             cari_service.delete_cari(conn, cursor, cari_id)
             messagebox.showinfo(t('success'), t('cari_deleted'))
             clear_form()
-            load()
         except Exception as e:
             messagebox.showerror(t('error'), str(e))
 
@@ -3900,10 +4105,19 @@ def mount_sales(parent):
     for w in parent.winfo_children():
         w.destroy()
     
-    from services import product_service as product_svc
     from services import sales_service as sales_svc
     from services import cari_service
     from services import warehouse_service as wh_svc
+    from services import popularity_service as popularity_svc
+    from pos import remote
+    from receipts import print_receipt, print_thermal_receipt
+    from ui.quick_grid import QuickGrid
+    # Çok kasalı modda ürün, fiyat ve stok mağaza sunucusundaki ortak veritabanından okunur
+    pos_server = remote.configured_client(cursor)
+    if pos_server:
+        product_svc = remote.service(pos_server, "product")
+    else:
+        from services import product_service as product_svc
     
     # Ana konteynır (sol menü için)
     main_container = tk.Frame(parent, bg=BG_COLOR)
@@ -4111,21 +4325,17 @@ def mount_sales(parent):
         if not messagebox.askyesno(t('reprint'), "Sepet boş. Son kesilen fişi tekrar yazdırmak ister misiniz?"):
             return
 
-        cursor.execute("SELECT fis_id FROM sales ORDER BY id DESC LIMIT 1")
-        r = cursor.fetchone()
+        r = sales_svc.get_last_receipt(cursor)
         if not r:
             messagebox.showwarning(t('warning'), "Henüz fiş bulunamadı!")
             return
-        fis_id = r[0]
-        cursor.execute("SELECT product_name, quantity, price, total FROM sales WHERE fis_id=?", (fis_id,))
-        sales_list = [(row[0], row[1], row[2], row[3]) for row in cursor.fetchall()]
-        
-        if not sales_list:
+        from services import receipt_document_service as receipt_doc_svc
+        path = receipt_doc_svc.ensure_document(conn, cursor, r[0], CURRENT_LANGUAGE)
+        if not path:
             return
-        
-        print_receipt(sales_list, fis_id=fis_id, customer_name=t('customer'),
-                     kdv_rate=18.0, discount_rate=0.0, vat_included=False,
-                     language_code=CURRENT_LANGUAGE)
+        messagebox.showinfo(t('receipt_created'), f"{t('receipt_saved')}\n{path}")
+        try: receipt_doc_svc.open_file(path)
+        except Exception: pass
     
     # Ara butonu
     search_btn = tk.Button(top_section, text="🔍 " + t('search'), font=("Segoe UI", 12, "bold"),
@@ -4298,7 +4508,7 @@ def mount_sales(parent):
                 except Exception:
                     price = 0.0
                 vals[4] = format_qty(new_q)
-                vals[6] = f"{price * float(new_q):.2f}"
+                vals[6] = str(Money.of(price) * float(new_q))
                 product_tree.item(item_id, values=vals)
                 update_totals()
 
@@ -4505,7 +4715,7 @@ def mount_sales(parent):
             price = 0.0
         qty_text = f"{new_qty:.3f}" if (unit.lower().startswith("kg")) else f"{int(round(new_qty))}"
         vals[4] = qty_text
-        vals[6] = f"{price * float(new_qty):.2f}"
+        vals[6] = str(Money.of(price) * float(new_qty))
         product_tree.item(item, values=vals)
         # Görsel miktar çerçevesini güncelle
         build_qty_frame(item)
@@ -4688,13 +4898,13 @@ def mount_sales(parent):
             messagebox.showwarning(t('warning'), t('cart_empty'))
             return
         
-        total_amount = 0.0
+        total_amount = Money()
         for item in items:
             vals = product_tree.item(item)["values"]
-            try: total_amount += float(str(vals[6]).replace(",", "."))
+            try: total_amount += Money.of(vals[6])
             except: pass
             
-        show_partial_payment_dialog(total_amount)
+        show_partial_payment_dialog(float(total_amount))
 
     nakit_btn = tk.Button(payment_methods_frame, text="💵 " + t('cash_register') + "\n(F8)",
                          font=("Segoe UI", 10, "bold"), bg="#28a745", fg="white",
@@ -4760,24 +4970,26 @@ def mount_sales(parent):
         conn.commit()
     
     def db_get_top_products(limit=10):
-        """En çok satılan ürünleri getir"""
+        """En çok satılan ürünleri getir [(ad, fiyat)] (popülerlik sayaçlarından)"""
         try:
-            cursor.execute("""
-                SELECT product_name, SUM(quantity) as total_qty, 
-                       (SELECT COALESCE(sale_price, price) FROM products WHERE name=sales.product_name LIMIT 1) as price
-                FROM sales 
-                WHERE (canceled IS NULL OR canceled=0)
-                GROUP BY product_name 
-                ORDER BY total_qty DESC 
-                LIMIT ?
-            """, (limit,))
-            return cursor.fetchall()
+            return popularity_svc.top_products(cursor, "all", limit)
         except Exception:
             return []
+
+    def quick_main_auto_enabled():
+        """Ana liste günün saatine göre otomatik mi?"""
+        try:
+            cursor.execute("SELECT value FROM settings WHERE key='quick_main_auto'")
+            r = cursor.fetchone()
+            return bool(r and r[0] == '1')
+        except Exception:
+            return False
     
     def db_get_all_products():
         """Tüm ürünleri getir (ürün ekleme için)"""
         try:
+            if pos_server:
+                return sorted((p[1], p[3]) for p in product_svc.list_products(cursor))
             cursor.execute("SELECT name, COALESCE(sale_price, price) FROM products ORDER BY name")
             return cursor.fetchall()
         except Exception:
@@ -4819,12 +5031,7 @@ def mount_sales(parent):
     quick_products_grid = tk.Frame(canvas, bg=BG_COLOR)
     canvas_window = canvas.create_window((0, 0), window=quick_products_grid, anchor="nw")
     
-    # Canvas scroll bölgesini güncelle
-    def update_scroll_region(event=None):
-        canvas.update_idletasks()
-        canvas.configure(scrollregion=canvas.bbox("all"))
-    
-    quick_products_grid.bind("<Configure>", update_scroll_region)
+    # Not: scroll bölgesi QuickGrid tarafından yerleşimden sonra güncellenir
     
     # Canvas genişliğini ayarla
     def resize_canvas(event=None):
@@ -4855,10 +5062,6 @@ def mount_sales(parent):
         except Exception as e:
             messagebox.showerror("Hata", f"Ürün eklenirken hata: {e}")
     
-    # Kartları ve meta bilgilerini tut
-    quick_product_cards = []
-    quick_card_meta: dict[int, dict] = {}
-    
     # Hızlı ürün ekleme formu
     def show_add_quick_product_dialog(existing: dict | None = None):
         """Hızlı ürün ekleme popup penceresi"""
@@ -5018,79 +5221,46 @@ def mount_sales(parent):
         dialog.bind("<Return>", lambda e: save_quick_product())
         dialog.bind("<Escape>", lambda e: dialog.destroy())
     
-    def make_quick_card(pname, pprice, is_add_button=False, pid: int | None = None, list_code: str | None = None):
-        """Her kart için closure oluşturan yardımcı fonksiyon"""
-        card = tk.Frame(quick_products_grid, bg="#343a40" if not is_add_button else "#28a745",
-                       relief="solid", bd=1, cursor="hand2", highlightthickness=0)
-        
-        if is_add_button:
-            # "+" ekleme butonu - kompakt
-            def on_add_click(e):
-                show_add_quick_product_dialog()
-            
-            card.bind("<Button-1>", on_add_click)
-            
-            icon_label = tk.Label(card, text="➕", font=("Segoe UI", 16, "bold"),
-                                 bg="#28a745", fg="white", cursor="hand2")
-            icon_label.place(relx=0.5, rely=0.5, anchor="center")
-            icon_label.bind("<Button-1>", on_add_click)
-            
-            return card
-        else:
-            # Normal ürün kartı - daha kompakt
-            def on_click(e):
-                quick_product_click(pname)
-            
-            card.bind("<Button-1>", on_click)
-
-            name_label = tk.Label(card, text=pname, font=("Segoe UI", 7, "bold"),
-                                  bg="#343a40", fg="white", cursor="hand2",
-                                  wraplength=100, justify="center", anchor="center")
-            name_label.place(relx=0.5, rely=0.35, anchor="center")
-            name_label.bind("<Button-1>", on_click)
-
-            price_label = tk.Label(card, text=pprice, font=("Segoe UI", 9, "bold"),
-                                   bg="#343a40", fg="#ffc107", cursor="hand2", anchor="center")
-            price_label.place(relx=0.5, rely=0.70, anchor="center")
-            price_label.bind("<Button-1>", on_click)
-
-            # Sağ tık menüsü (Düzenle / Sil)
-            if pid is not None:
-                def show_ctx(event):
-                    menu = None
-                    try:
-                        menu = tk.Menu(card, tearoff=0)
-                        menu.add_command(label="✏️ Düzenle", command=lambda: show_add_quick_product_dialog({
-                            'id': pid, 'list_code': list_code or 'main', 'name': pname, 'price': float(str(pprice).replace(CURRENT_CURRENCY,'').strip())
-                        }))
-                        def do_delete():
-                            if messagebox.askyesno("Sil", f"'{pname}' silinsin mi?"):
-                                db_quick_delete(pid); reload_quick_products()
-                        menu.add_command(label="🗑 Sil", command=do_delete)
-                        menu.tk_popup(event.x_root, event.y_root)
-                    finally:
-                        if menu is not None:
-                            try:
-                                menu.grab_release()
-                            except Exception:
-                                pass
-                card.bind("<Button-3>", show_ctx)
-
-            return card
+    def show_quick_card_menu(event, item):
+        """Sağ tık menüsü (Düzenle / Sil)"""
+        menu = None
+        try:
+            menu = tk.Menu(quick_products_grid, tearoff=0)
+            menu.add_command(label="✏️ Düzenle", command=lambda: show_add_quick_product_dialog({
+                'id': item['id'], 'list_code': item.get('list_code') or 'main', 'name': item['name'], 'price': float(item['price'])
+            }))
+            def do_delete():
+                if messagebox.askyesno("Sil", f"'{item['name']}' silinsin mi?"):
+                    db_quick_delete(item['id']); reload_quick_products()
+            menu.add_command(label="🗑 Sil", command=do_delete)
+            menu.tk_popup(event.x_root, event.y_root)
+        finally:
+            if menu is not None:
+                try:
+                    menu.grab_release()
+                except Exception:
+                    pass
+
+    # Kart havuzlu ızgara: liste değişiminde kartlar yok edilmez, sadece farklar çizilir
+    quick_grid = QuickGrid(quick_products_grid, canvas,
+                           on_click=quick_product_click,
+                           on_add=show_add_quick_product_dialog,
+                           on_context=show_quick_card_menu,
+                           format_price=lambda p: f"{CURRENT_CURRENCY} {p:g}")
+    instrumentation.register_source("quick_grid", quick_grid.stats)
     
     def reload_quick_products():
-        # Temizle mevcut kartlar
-        for c in quick_product_cards:
-            try:
-                c.destroy()
-            except Exception:
-                pass
-        quick_product_cards.clear(); quick_card_meta.clear()
-
         current_list = active_list_code.get()
         
         # ANA sekmesi için en çok satılan ürünleri göster
-        if current_list == 'main':
+        if current_list == 'main' and quick_main_auto_enabled():
+            # Otomatik mod: bu saatte en çok satanlar (kayıt tutulmaz, her saat yenilenir)
+            try:
+                top_products = popularity_svc.top_for_hour(cursor, limit=12)
+            except Exception:
+                top_products = []
+            rows = [(None, 'main', name, price, i) for i, (name, price) in enumerate(top_products)]
+        elif current_list == 'main':
             # Önce veritabanından kayıtlı hızlı ürünleri kontrol et
             rows = db_quick_list('main')
             
@@ -5099,7 +5269,7 @@ def mount_sales(parent):
                 top_products = db_get_top_products(limit=10)
                 if top_products:
                     try:
-                        for product_name, total_qty, price in top_products:
+                        for product_name, price in top_products:
                             if price is not None:
                                 db_quick_insert('main', product_name, price)
                         rows = db_quick_list('main')
@@ -5109,71 +5279,43 @@ def mount_sales(parent):
             # Diğer listeler için normal yükleme
             rows = db_quick_list(current_list)
 
-        for pid, list_code_val, name, price, sort_order in rows:
-            card = make_quick_card(name, f"{CURRENT_CURRENCY} {price:g}", False, pid=pid, list_code=list_code_val)
-            quick_product_cards.append(card)
-            quick_card_meta[id(card)] = {'id': pid, 'name': name, 'price': price, 'list_code': list_code_val}
-
-        # Son olarak "+" butonu
-        quick_product_cards.append(make_quick_card("", "", is_add_button=True))
-        relayout_quick_products()
-
-    def relayout_quick_products(event=None):
-        """Dinamik grid yerleşimi - genişliğe göre responsive"""
-        try:
-            quick_products_grid.update_idletasks()
-            width = quick_products_grid.winfo_width()
-            if width <= 1:
-                width = 420
-        except Exception:
-            width = 420
-        
-        # Responsive sütun sayısı (daha kompakt için daha fazla sütun)
-        if width >= 360:
-            cols = 3
-            card_h = 65  # daha küçük
-        elif width >= 240:
-            cols = 2
-            card_h = 60
-        else:
-            cols = 1
-            card_h = 55
-        
-        # Tüm kartları grid'den kaldır
-        for card in quick_product_cards:
-            card.grid_forget()
-
-        # Grid sütunlarını yapılandır
-        for i in range(4):
-            quick_products_grid.grid_columnconfigure(i, weight=0, minsize=0)
-        for i in range(cols):
-            quick_products_grid.grid_columnconfigure(i, weight=1, uniform="qp")
-
-        # Tüm kartları yerleştir (hiçbirini gizleme)
-        row = col = 0
-        for card in quick_product_cards:
-            card.grid(row=row, column=col, padx=2, pady=2, sticky="nsew")  # padding küçültüldü
-            col += 1
-            if col >= cols:
-                col = 0
-                row += 1
-        
-        # Satır yüksekliklerini ayarla
-        for r in range(row + 1):
-            quick_products_grid.grid_rowconfigure(r, weight=0, minsize=card_h)
-        
-        # Canvas scroll bölgesini güncelle
-        canvas.update_idletasks()
-        canvas.configure(scrollregion=canvas.bbox("all"))
+        quick_grid.render([{'id': pid, 'list_code': list_code_val, 'name': name, 'price': price}
+                           for pid, list_code_val, name, price, sort_order in rows])
 
     # İlk yükleme
     quick_products_grid.after(100, reload_quick_products)
+
+    def schedule_hourly_quick_refresh():
+        """Otomatik ana listede saat başlarında listeyi yenile"""
+        now = datetime.now()
+        delay_ms = ((60 - now.minute) * 60 - now.second) * 1000 + 500
+        def tick():
+            try:
+                if not quick_products_grid.winfo_exists():
+                    return
+            except Exception:
+                return
+            if active_list_code.get() == 'main' and quick_main_auto_enabled():
+                reload_quick_products()
+            schedule_hourly_quick_refresh()
+        quick_products_grid.after(delay_ms, tick)
+
+    schedule_hourly_quick_refresh()
     
-    # Boyut değişimlerinde otomatik yeniden yerleşim
-    quick_products_grid.bind("<Configure>", relayout_quick_products)
-    
-    # Global referans: menü toggle'dan tetiklemek için
-    parent._relayout_quick_products = relayout_quick_products
+    # Global referans: menü toggle'dan tetiklemek için (boyut değişimleri QuickGrid içinde birleştirilir)
+    parent._relayout_quick_products = quick_grid.relayout
+    parent._quick_grid = quick_grid
+    # Ekran yöneticisi: ürünler değiştiğinde sepeti koruyarak sadece hızlı ürünleri yenile
+    parent._screen_refresh = reload_quick_products
+
+    def on_products_updated(ids):
+        # Kartlardan biri değişen/silinen ürünse (ada göre) listeyi yenile
+        def check(products):
+            if quick_grid.names() & {p[1] for p in products} or len(products) < len(ids):
+                reload_quick_products()
+        get_executor().submit(lambda cur: product_svc.list_by_ids(cur, ids), on_done=check, owner=quick_products_grid)
+
+    events.subscribe(events.PRODUCT_UPDATED, on_products_updated, owner=quick_products_grid)
     
     # === ALT BÖLÜM: Müşteri Bilgileri ve Satış Yap ===
     bottom_section = tk.Frame(content_container, bg=CARD_COLOR)
@@ -5189,10 +5331,9 @@ def mount_sales(parent):
     customer_entry.grid(row=1, column=0, sticky="ew", pady=2, padx=(0,8))
     
     # Otomatik cari arama (yazarken açılan öneri penceresi)
-    customer_cache_rows = None  # [(id, name, phone, balance), ...]
     customer_popup_win = None   # Toplevel
     customer_popup_list = None  # Listbox
-    current_results = []        # filtrelenmiş satırlar
+    current_results = []        # eşleşen satırlar [(id, name, phone), ...]
     selected_customer_id = tk.IntVar(value=0) # Seçilen cari ID
 
     def hide_customer_popup():
@@ -5210,7 +5351,7 @@ def mount_sales(parent):
         nonlocal current_results
         if index < 0 or index >= len(current_results):
             hide_customer_popup(); return
-        _cid, name, phone, _bal = current_results[index]
+        _cid, name, phone = current_results[index]
         selected_customer_id.set(_cid)
         customer_entry.delete(0, tk.END); customer_entry.insert(0, str(name))
         phone_entry.delete(0, tk.END); phone_entry.insert(0, str(phone or ""))
@@ -5249,7 +5390,7 @@ def mount_sales(parent):
         if lb is None:
             return
         lb.delete(0, tk.END)
-        for _cid, name, phone, bal in current_results[:50]:
+        for _cid, name, phone in current_results[:50]:
             lb.insert(tk.END, f"{name} | {phone or ''}")
         lb.selection_clear(0, tk.END)
         lb.selection_set(0)
@@ -5257,20 +5398,14 @@ def mount_sales(parent):
 
     def on_customer_typed(e=None):
         from services import cari_service as cs
-        q = customer_entry.get().strip().lower()
-        nonlocal customer_cache_rows, current_results
-        if customer_cache_rows is None:
-            try:
-                customer_cache_rows = cs.list_all(cursor)
-            except Exception:
-                customer_cache_rows = []
+        nonlocal current_results
+        q = customer_entry.get().strip()
         if not q:
             hide_customer_popup(); return
-        res = []
-        for cid, name, phone, address, balance, cari_type in customer_cache_rows:
-            if q in str(name).lower() or q in str(phone or "").lower():
-                res.append((cid, name, phone, balance))
-        current_results = res
+        try:
+            current_results = cs.lookup_customers(cursor, q, limit=50)
+        except Exception:
+            current_results = []
         show_customer_popup()
 
     def on_customer_keydown(e):
@@ -5372,25 +5507,25 @@ def mount_sales(parent):
             cat_name = category_repository.get_name_by_product_name(cursor, pname) or "-"
         except Exception:
             cat_name = "-"
-        iid = product_tree.insert("", "end", values=("❌", barcode_val, pname, cat_name, qty_text, f"{price:.2f}", f"{price*float(qty):.2f}"), tags=tags)
+        iid = product_tree.insert("", "end", values=("❌", barcode_val, pname, cat_name, qty_text, f"{price:.2f}", str(Money.of(price) * float(qty))), tags=tags)
         # Satır eklendikten sonra miktar/fiyat çerçevesini oluştur
         product_tree.after(90, lambda: (build_qty_frame(iid), build_price_frame(iid)))
         update_totals()
     
     def update_totals():
         """Toplamları güncelle"""
-        total = 0.0
+        total = Money()
         count = 0
         for item in product_tree.get_children():
             vals = product_tree.item(item)["values"]
             if len(vals) >= 7:
                 try:
-                    total += float(str(vals[6]).replace(",", "."))
+                    total += Money.of(vals[6])
                 except Exception:
                     pass
                 count += 1
         
-        total_label.config(text=f"{total:.2f}")
+        total_label.config(text=str(total))
         # Ürün sayısını güncelle
         for widget in left_panel.winfo_children():
             if isinstance(widget, tk.Frame):
@@ -5428,7 +5563,7 @@ def mount_sales(parent):
             barcode_entry.insert(0, t('scan_product_placeholder'))
             barcode_entry.config(fg="#999999")
     
-    def show_sale_options_dialog(fis_id, sales_list, customer_name, total_amount, on_confirm):
+    def show_sale_options_dialog(sales_list, customer_name, total_amount, on_confirm):
         dialog = tk.Toplevel()
         dialog.title(t('print_receipt'))
         set_theme(dialog)
@@ -5608,25 +5743,15 @@ def mount_sales(parent):
                 pos = float(sv_pos.get().replace(",", ".") or 0)
             except: pos = 0.0
             
-            remaining = total_amount - (cash + pos)
-            
-            if remaining < -0.01: # Allow small float error
+            # Kuruş karşılaştırması: kalan açık hesaba yazılır, fazla ödeme kabul edilmez
+            if Money.of(cash) + pos > Money.of(total_amount):
                 messagebox.showwarning("Hata", "Ödenen tutar toplam tutardan fazla olamaz!", parent=dialog)
                 return
 
-            # Store data
-            global PARTIAL_PAYMENT_DATA
-            PARTIAL_PAYMENT_DATA = {
-                "total": total_amount,
-                "cash": cash,
-                "pos": pos,
-                "remaining": remaining
-            }
-            
             payment_var.set("PARÇALI")
             update_payment_visuals()
             dialog.destroy()
-            complete_sale()
+            complete_sale(split=[("cash", cash), ("credit_card", pos)])
 
         tk.Button(btn_frame, text="Kapat", font=("Segoe UI", 10), bg="#007bff", fg="white", command=dialog.destroy, width=10).pack(side="right", padx=5)
         tk.Button(btn_frame, text="Satış Yap", font=("Segoe UI", 10), bg="#28a745", fg="white", command=do_sale, width=10).pack(side="right", padx=5)
@@ -5634,8 +5759,8 @@ def mount_sales(parent):
         entry_cash.focus_set()
         dialog.wait_window()
 
-    def complete_sale():
-        """Satışı başlat ve onay iste"""
+    def complete_sale(split=None):
+        """Satışı başlat ve onay iste. split: parçalı ödemede [(ödeme türü, tutar)]"""
         items = product_tree.get_children()
         if not items:
             messagebox.showwarning(t('warning'), t('cart_empty'))
@@ -5646,7 +5771,7 @@ def mount_sales(parent):
         
         # Verileri hazırla
         sales_data = []
-        total_amount = 0.0
+        total_amount = Money()
         
         for item in items:
             vals = product_tree.item(item)["values"]
@@ -5659,10 +5784,10 @@ def mount_sales(parent):
             total = num(vals[6])
             sales_data.append({'pname': pname, 'qty': qty, 'price': price, 'total': total})
             total_amount += total
-            
-        fis_id = f"FIS-{datetime.now().strftime('%Y%m%d')}-{os.urandom(3).hex().upper()}"
+        total_amount = float(total_amount)
         
         def on_confirm_sale(mode):
+            t0 = time.perf_counter()
             # 1. Veritabanı işlemleri
             # Ödeme yöntemini standartlaştır
             pm_map = {
@@ -5673,60 +5798,49 @@ def mount_sales(parent):
             }
             final_pm = pm_map.get(payment_method, "cash")
 
-            sales_list_for_print = []
+            sales_list_for_print = [(d['pname'], d['qty'], d['price'], d['total']) for d in sales_data]
             wh_id = selected_wh_id.get()
-            for d in sales_data:
-                product_svc.decrement_stock(conn, cursor, d['pname'], d['qty'], warehouse_id=wh_id)
-                sales_svc.insert_sale_line(conn, cursor, fis_id, d['pname'], d['qty'], d['price'], d['total'], payment_method=final_pm, warehouse_id=wh_id)
-                sales_list_for_print.append((d['pname'], d['qty'], d['price'], d['total']))
-            
-            # CARİ İŞLEMLERİ (Otomatik Cari Oluşturma ve Kayıt)
-            # Müşteri adı girildiyse işlem yap
+            # Cari kayıtları (müşteri adı girildiyse); açıklamadaki {fis_id} satıştan sonra doldurulur
+            postings = []
             if customer and customer != t('customer'):
-                try:
-                    from services import cari_service as cs
-                    cid = selected_customer_id.get()
-                    
-                    # ID yoksa isme göre bul veya oluştur
-                    if cid == 0:
-                        found = cs.get_by_name(cursor, customer)
-                        if found:
-                            cid = found[0]
-                        else:
-                            # Yeni cari oluştur (Varsayılan: Borçlu)
-                            try:
-                                cs.add_cari(conn, cursor, customer, "", "", 0.0, "borclu")
-                                # Yeni oluşturulan ID'yi al
-                                found_new = cs.get_by_name(cursor, customer)
-                                if found_new:
-                                    cid = found_new[0]
-                            except Exception as e:
-                                print(f"Yeni cari oluşturma hatası: {e}")
-                    
-                    if cid > 0:
-                        # 1. AÇIK HESAP: Sadece borç kaydet
-                        if payment_method == "AÇIK HESAP":
-                            cs.add_borc(conn, cursor, cid, total_amount, f"Satış Fişi: {fis_id}")
-                            
-                        # 2. NAKİT veya KART: Borç kaydet VE Alacak (Ödeme) kaydet
-                        elif payment_method in ["NAKİT", "credit_card"]:
-                            # Satışı borç olarak işle
-                            cs.add_borc(conn, cursor, cid, total_amount, f"Satış Fişi: {fis_id}")
-                            
-                            # Ödemeyi alacak olarak işle
-                            desc = "Nakit Ödeme" if payment_method == "NAKİT" else "Kredi Kartı Ödemesi"
-                            cs.add_alacak(conn, cursor, cid, total_amount, f"{desc} - Fiş: {fis_id}")
-                            
-                        # 3. PARÇALI ÖDEME: Sadece kalanı borç kaydet (Mevcut mantık)
-                        elif payment_method == "PARÇALI":
-                            remaining = PARTIAL_PAYMENT_DATA.get("remaining", 0.0)
-                            if remaining > 0.01:
-                                cs.add_borc(conn, cursor, cid, remaining, f"Satış Fişi (Parçalı): {fis_id}")
-
-                except Exception as e:
-                    print(f"Cari işlem hatası: {e}")
+                # 1. AÇIK HESAP: Sadece borç kaydet
+                if payment_method == "AÇIK HESAP":
+                    postings = [("borc", total_amount, "Satış Fişi: {fis_id}")]
+                # 2. NAKİT veya KART: Borç kaydet VE Alacak (Ödeme) kaydet
+                elif payment_method in ["NAKİT", "credit_card"]:
+                    desc = "Nakit Ödeme" if payment_method == "NAKİT" else "Kredi Kartı Ödemesi"
+                    postings = [("borc", total_amount, "Satış Fişi: {fis_id}"),
+                                ("alacak", total_amount, desc + " - Fiş: {fis_id}")]
+                # 3. PARÇALI ÖDEME: Sadece kalanı borç kaydet
+                elif payment_method == "PARÇALI":
+                    remaining = Money.of(total_amount) - Money.total(amount for _, amount in split or ())
+                    if remaining > Money():
+                        postings = [("borc", float(remaining), "Satış Fişi (Parçalı): {fis_id}")]
+
+            # Çok kasalı modda satış mağaza sunucusundaki ortak veritabanına yazılır
+            pos_client = remote.configured_client(cursor)
+            if pos_client:
+                from services import receipt_service as receipt_svc
+                # Satış ve cari kayıtları tek çerçevede, sunucuda tek transaction; kasiyer ve vardiya
+                # açıkça gönderilir (sunucu kasanın oturumunu bilmez). Cari, kasadaki id ile değil adla eşlenir
+                user_id, shift_id = session.current()
+                receipt_id, fis_id = pos_client.call("intent.post_sale", sales_list_for_print, payment_method=final_pm,
+                                                     warehouse_id=wh_id, customer_name=customer, cari_name=customer,
+                                                     postings=postings, payments=split,
+                                                     terminal_id=receipt_svc.get_terminal_id(cursor),
+                                                     user_id=user_id, shift_id=shift_id)
+            else:
+                # Niyet kaydı -> satış (tek transaction) -> cari kayıtları; yarıda kalırsa açılışta tamamlanır
+                receipt_id, fis_id = intent_svc.post_sale(conn, cursor, sales_list_for_print, payment_method=final_pm,
+                                                          warehouse_id=wh_id, customer_name=customer,
+                                                          cari_id=selected_customer_id.get() or None,
+                                                          cari_name=customer, postings=postings, payments=split)
+                # Çevrimdışı kasa modunda satış günlüğü hemen gönderilmeye çalışılır
+                from pos import sync as journal_sync
+                journal_sync.get_worker().request()
 
             conn.commit()
+            instrumentation.observe("checkout_db", (time.perf_counter() - t0) * 1000.0)
             
             # 2. UI Temizle
             for item in product_tree.get_children():
@@ -5750,41 +5864,42 @@ def mount_sales(parent):
             update_totals()
             
             # 3. Yazdırma İşlemleri
+            from services import receipt_document_service as receipt_doc_svc
             msg = t('receipt_created') + f"\n{t('receipt_no')} {fis_id}"
+
+            def render_pdf():
+                # Sunucudaki fiş yerel belge kaydında yok: PDF kayıtsız üretilir
+                if pos_client:
+                    from receipts import print_receipt
+                    return print_receipt(sales_list_for_print, fis_id=fis_id, customer_name=customer,
+                                         kdv_rate=receipt_doc_svc.KDV_RATE, discount_rate=0.0, vat_included=False,
+                                         open_after=False, show_message=False, language_code=CURRENT_LANGUAGE)
+                return receipt_doc_svc.render(conn, cursor, receipt_id, sales_list_for_print, customer, CURRENT_LANGUAGE)
             
             if mode == 'thermal':
                 try:
                     print_thermal_receipt(sales_list_for_print, fis_id=fis_id, customer_name=customer,
                                           kdv_rate=18.0, discount_rate=0.0, vat_included=False,
                                           language_code=CURRENT_LANGUAGE)
-                    # PDF yedeği
-                    print_receipt(sales_list_for_print, fis_id=fis_id, customer_name=customer,
-                                 kdv_rate=18.0, discount_rate=0.0, vat_included=False,
-                                 open_after=False, show_message=False, language_code=CURRENT_LANGUAGE)
+                    # PDF yedeği (belge kaydına işlenir)
+                    render_pdf()
                     msg += "\n\nFiş termal yazıcıya gönderildi."
                 except Exception as e:
                     msg += f"\n\nYazdırma Hatası: {e}"
                     
             elif mode == 'pdf':
-                fname = print_receipt(sales_list_for_print, fis_id=fis_id, customer_name=customer,
-                                     kdv_rate=18.0, discount_rate=0.0, vat_included=False,
-                                     open_after=True, show_message=False, language_code=CURRENT_LANGUAGE)
+                fname = render_pdf()
                 if fname:
+                    try: receipt_doc_svc.open_file(fname)
+                    except Exception: pass
                     msg += f"\n\nPDF Kaydedildi:\n{fname}"
                 else:
                     msg += "\n\nPDF Kaydedilemedi!"
             
+            instrumentation.observe("checkout_total", (time.perf_counter() - t0) * 1000.0)
             return msg
 
-        show_sale_options_dialog(fis_id, sales_data, customer, total_amount, on_confirm_sale)
-    
-    # Hızlı ürün butonlarına fonksiyon bağla
-    for widget in quick_products_grid.winfo_children():
-        if isinstance(widget, tk.Frame):
-            for label in widget.winfo_children():
-                if isinstance(label, tk.Label) and CURRENT_CURRENCY not in label.cget("text"):
-                    pname = label.cget("text")
-                    widget.bind("<Button-1>", lambda e, p=pname: add_product_to_cart(p, 1))
+        show_sale_options_dialog(sales_data, customer, total_amount, on_confirm_sale)
     
     # Event bindings
     barcode_entry.bind("<Return>", barcode_scan)
@@ -5794,6 +5909,12 @@ def mount_sales(parent):
     # Klavye kısayolları
     def keyboard_shortcuts(event):
         """Klavye kısayollarını yönet"""
+        # Ekran önbellekte gizliyken kısayollar çalışmasın
+        try:
+            if not main_container.winfo_viewable():
+                return
+        except Exception:
+            return
         if event.keysym == "F7":
             # F7: Fiyat Gör
             show_price()
@@ -5873,7 +5994,15 @@ def mount_cancel_sales(parent):
     
     tree.pack(fill="both", expand=True, padx=10, pady=10)
 
-    from services import sales_service as sales_svc
+    from pos import remote
+    # Çok kasalı modda satışlar sunucudadır: liste, iptal ve iade de oradan yapılır
+    pos_server = remote.configured_client(cursor)
+    if pos_server:
+        sales_svc = remote.service(pos_server, "sales")
+        returns_svc = remote.service(pos_server, "returns")
+    else:
+        from services import sales_service as sales_svc
+        from services import returns_service as returns_svc
 
     def load():
         for r in tree.get_children(): tree.delete(r)
@@ -5891,7 +6020,7 @@ def mount_cancel_sales(parent):
         # Use list_receipts_between instead of list_recent_receipts
         results = sales_svc.list_receipts_between(cursor, f"{frm} 00:00:00", to_plus)
 
-        for fis_id, ts, sum_total, pay in results:
+        for receipt_id, fis_id, ts, sum_total, pay in results:
             ts_disp = (ts or "").replace("T"," ")
             # Ödeme yöntemi ikonlu
             if pay == 'cash' or pay == 'nakit':
@@ -5906,21 +6035,77 @@ def mount_cancel_sales(parent):
                 # Bilinmeyen veya eski kayıtlar için varsayılan
                 pay_display = "💳 " + t('credit_card') if pay != 'cash' else "💵 " + t('cash')
             
-            tree.insert("", "end", values=(fis_id, ts_disp, f"{float(sum_total):.2f} {CURRENT_CURRENCY}", pay_display))
+            tree.insert("", "end", iid=str(receipt_id), values=(fis_id, ts_disp, f"{float(sum_total):.2f} {CURRENT_CURRENCY}", pay_display))
 
     def cancel_selected():
         sel = tree.selection()
         if not sel: return messagebox.showwarning(t('warning'), t('select_item'))
-        fis_id = tree.item(sel[0])["values"][0]
+        receipt_id = int(sel[0])
         if not messagebox.askyesno(t('confirm'), t('confirm_cancel_receipt')):
             return
         try:
-            sales_svc.cancel_receipt(conn, cursor, fis_id)
+            # Kasiyer ve vardiya bu kasanın oturumundan (sunucuda oturum yok)
+            user_id, shift_id = session.stamp(None, None)
+            sales_svc.cancel_receipt(conn, cursor, receipt_id, user_id=user_id, shift_id=shift_id)
             messagebox.showinfo(t('success'), t('cancel_success'))
             load()
+        except ValueError as e:
+            messagebox.showwarning(t('warning'), t(str(e)))
         except Exception as e:
             messagebox.showerror(t('error'), f"{t('cancel_error')}\n{e}")
 
+    def return_selected():
+        """Seçili fişin satırlarından kısmi/tam iade: satır başına iade adedi girilir"""
+        sel = tree.selection()
+        if not sel: return messagebox.showwarning(t('warning'), t('select_item'))
+        receipt_id = int(sel[0])
+        try:
+            lines = [l for l in returns_svc.get_returnable(cursor, receipt_id) if l['remaining'] > 1e-9]
+        except ValueError as e:
+            return messagebox.showwarning(t('warning'), t(str(e)))
+        if not lines:
+            return messagebox.showwarning(t('warning'), t('nothing_to_return'))
+        win = tk.Toplevel(parent); win.title(f"{t('return_lines')} - {tree.item(sel[0])['values'][0]}")
+        set_theme(win)
+        frm = ttk.Frame(win, style="Card.TFrame"); frm.pack(fill="both", expand=True, padx=12, pady=12)
+        for col, head in enumerate((t('product'), t('quantity'), t('returned'), t('price'), t('return_qty'))):
+            ttk.Label(frm, text=head, font=("Segoe UI", 9, "bold")).grid(row=0, column=col, sticky="w", padx=6, pady=(0, 4))
+        entries = []
+        for i, line in enumerate(lines, 1):
+            for col, text in enumerate((line['name'], f"{line['qty']:g}", f"{line['returned']:g}", f"{line['price']:.2f}")):
+                ttk.Label(frm, text=text).grid(row=i, column=col, sticky="w", padx=6, pady=2)
+            e = ttk.Entry(frm, width=8); e.grid(row=i, column=4, padx=6, pady=2)
+            entries.append((line, e))
+        ttk.Label(frm, text=t('description')).grid(row=len(lines) + 1, column=0, sticky="w", padx=6, pady=(8, 2))
+        e_reason = ttk.Entry(frm); e_reason.grid(row=len(lines) + 1, column=1, columnspan=4, sticky="we", padx=6, pady=(8, 2))
+
+        def do_return():
+            items = []
+            try:
+                for line, e in entries:
+                    qty = float(e.get().strip().replace(",", ".") or 0)
+                    if qty < 0 or qty > line['remaining'] + 1e-9:
+                        raise ValueError
+                    if qty:
+                        items.append((line['line_id'], qty))
+            except ValueError:
+                return messagebox.showwarning(t('warning'), t('invalid_quantity'), parent=win)
+            if not items:
+                return messagebox.showwarning(t('warning'), t('nothing_to_return'), parent=win)
+            try:
+                user_id, shift_id = session.stamp(None, None)
+                _, refund = returns_svc.return_lines(conn, cursor, receipt_id, items, reason=e_reason.get().strip() or None,
+                                                     user_id=user_id, shift_id=shift_id)
+            except ValueError as ex:
+                return messagebox.showwarning(t('warning'), t(str(ex)), parent=win)
+            except Exception as ex:
+                return messagebox.showerror(t('error'), f"{t('cancel_error')}\n{ex}", parent=win)
+            messagebox.showinfo(t('success'), f"{t('return_success')}\n{t('refund_amount')}: {float(refund):.2f} {CURRENT_CURRENCY}", parent=win)
+            win.destroy()
+            load()
+
+        ttk.Button(frm, text="↩ " + t('return_lines'), command=do_return).grid(row=len(lines) + 2, column=0, columnspan=5, sticky="we", padx=6, pady=(10, 0))
+
     # Modern butonlar
     btns = ttk.Frame(parent, style="Card.TFrame")
     btns.pack(fill="x", padx=12, pady=(0,12))
@@ -5952,6 +6137,7 @@ def mount_cancel_sales(parent):
         return f"#{r:02x}{g:02x}{b:02x}"
     
     create_cancel_button(btns, "🛑 " + t('cancel_receipt'), cancel_selected, "#ef4444")
+    create_cancel_button(btns, "↩ " + t('return_lines'), return_selected, "#f59e0b")
     
     refresh_btn = tk.Button(btns, text="🔄 " + t('refresh'), command=load,
                            bg="#8b5cf6", fg="white", font=("Segoe UI", 10, "bold"),
@@ -5967,6 +6153,7 @@ def mount_cancel_sales(parent):
     load()
 
 def export_daily_report():
+    import csv, subprocess
     today = datetime.now().strftime("%Y-%m-%d")
     os.makedirs("reports", exist_ok=True)
     filename = os.path.join("reports", f"rapor_{today}.csv")
@@ -6047,6 +6234,52 @@ def show_custom_confirm_dialog(title, message, parent=None):
 # ==========================
 # Ana Pencere (tek pencere navigasyon)
 # ==========================
+# Sağ panel ekranları: anahtar -> (mount fonksiyonu, bağlı tablolar)
+# Tablolardan biri değişmediyse önbellekteki ekran yeniden kurulmadan gösterilir.
+_CASH_TABLES = ("sales", "cari_hareketler", "expenses")
+_PURCHASE_TABLES = ("purchase_documents", "purchase_items", "products", "cariler", "warehouses")
+_WAREHOUSE_TABLES = ("warehouses", "warehouse_stocks", "warehouse_movements", "products")
+SCREENS = {
+    "sales": (mount_sales, ("products", "quick_products", "settings")),
+    "cancel_sales": (mount_cancel_sales, ("sales",)),
+    "products": (mount_products, ("products", "categories", "warehouse_stocks")),
+    "kategori": (mount_kategori, ("categories", "products")),
+    "envanter_sayim": (mount_envanter_sayim, ("products", "warehouses", "warehouse_stocks", "inventory_counts")),
+    "cariler": (mount_cariler, ("cariler", "cari_hareketler")),
+    "tahsilat": (mount_tahsilat, ("cariler", "cari_hareketler")),
+    "odeme": (mount_odeme, ("cariler", "cari_hareketler")),
+    "cari_hareketler": (mount_cari_hareketler, ("cariler", "cari_hareketler")),
+    "hizmet_listesi": (mount_hizmet_listesi, ("services",)),
+    "masraf_ekle": (mount_masraf_ekle, ("expenses",)),
+    "masraf_raporu": (mount_masraf_raporu, ("expenses",)),
+    "irsaliye": (mount_irsaliye, _PURCHASE_TABLES),
+    "fatura": (mount_fatura, _PURCHASE_TABLES),
+    "irsaliye_listesi": (mount_irsaliye_listesi, _PURCHASE_TABLES),
+    "fatura_listesi": (mount_fatura_listesi, _PURCHASE_TABLES),
+    "users": (mount_users, ("users",)),
+    "personel_vardiya": (mount_personel_vardiya, ("users", "personnel_shifts")),
+    "personel_maas": (mount_personel_maas, ("users", "personnel_payments")),
+    "depo_listesi": (mount_depo_listesi, _WAREHOUSE_TABLES),
+    "depo_stok_listesi": (mount_depo_stok_listesi, _WAREHOUSE_TABLES),
+    "depo_transfer": (mount_depo_transfer, _WAREHOUSE_TABLES),
+    "depo_hareket": (mount_depo_hareket, _WAREHOUSE_TABLES),
+    "kasa_hareket": (mount_kasa_hareket, _CASH_TABLES),
+    "kasa_devir": (mount_kasa_devir, _CASH_TABLES),
+    "kasa_rapor": (mount_kasa_rapor, _CASH_TABLES),
+    "reports": (mount_reports, ("sales",)),
+    "dashboard": (mount_dashboard, None),
+    "stok_raporu": (mount_stok_raporu, ("products", "warehouse_stocks")),
+    "cari_raporu": (mount_cari_raporu, ("cariler", "cari_hareketler")),
+    "kasa_raporu": (mount_kasa_raporu, _CASH_TABLES),
+    "profit_loss_report": (mount_profit_loss_report, ("sales", "expenses", "products")),
+    "receipts": (mount_receipts, ("receipt_documents",)),
+    "quick_menu_settings": (mount_quick_menu_settings, ("quick_products", "products")),
+    "theme_settings": (mount_theme_settings, ()),
+    "backup_settings": (mount_backup_settings, None),
+    "archive": (mount_archive, ("sales", "cari_hareketler", "warehouse_movements", "expenses")),
+    "diagnostics": (mount_diagnostics, None),
+}
+
 def open_main_window(role, username):
     main = tk.Toplevel()
     main.title(f"{t('app_title')} - {role.upper()}")
@@ -6175,6 +6408,37 @@ def open_main_window(role, username):
         e_footer.insert(0, footer_val)
         e_footer.grid(row=5, column=1, pady=8, padx=(8,0), sticky="ew")
         
+        # Kasa (terminal) numarası: fiş numaraları terminal ve gün başına sıralıdır
+        from services import receipt_service as receipt_svc
+        ttk.Label(biz_frame, text=t('terminal_id'), style="TLabel").grid(row=6, column=0, sticky="w", pady=8)
+        e_terminal = ttk.Spinbox(biz_frame, from_=1, to=99, width=6)
+        e_terminal.set(receipt_svc.get_terminal_id(cursor))
+        e_terminal.grid(row=6, column=1, pady=8, padx=(8,0), sticky="w")
+        
+        # Termal yazıcı: hedef adresi ve Türkçe kod sayfası
+        from receipts import printers as receipt_printers
+        from receipts.escpos import CODEPAGES, DEFAULT_CODEPAGE
+        ttk.Label(biz_frame, text=t('printer_target'), style="TLabel").grid(row=7, column=0, sticky="w", pady=8)
+        e_printer = ttk.Entry(biz_frame, width=40)
+        e_printer.insert(0, get_setting("printer_target", receipt_printers.default_target()))
+        e_printer.grid(row=7, column=1, pady=8, padx=(8,0), sticky="ew")
+        ttk.Label(biz_frame, text=t('printer_codepage'), style="TLabel").grid(row=8, column=0, sticky="w", pady=8)
+        cb_codepage = ttk.Combobox(biz_frame, values=list(CODEPAGES), state="readonly", width=10)
+        cb_codepage.set(get_setting("printer_codepage", DEFAULT_CODEPAGE))
+        cb_codepage.grid(row=8, column=1, pady=8, padx=(8,0), sticky="w")
+        
+        # Çok kasalı mod: mağaza sunucusu adresi (boş = yerel veritabanı)
+        ttk.Label(biz_frame, text=t('pos_server'), style="TLabel").grid(row=9, column=0, sticky="w", pady=8)
+        e_pos_server = ttk.Entry(biz_frame, width=40)
+        e_pos_server.insert(0, get_setting("pos_server", ""))
+        e_pos_server.grid(row=9, column=1, pady=8, padx=(8,0), sticky="ew")
+        
+        # Çevrimdışı kasa: değişiklik günlüğünün gönderileceği merkez (tcp://adres:port veya veritabanı dosyası)
+        ttk.Label(biz_frame, text=t('sync_target'), style="TLabel").grid(row=10, column=0, sticky="w", pady=8)
+        e_sync_target = ttk.Entry(biz_frame, width=40)
+        e_sync_target.insert(0, get_setting("sync_target", ""))
+        e_sync_target.grid(row=10, column=1, pady=8, padx=(8,0), sticky="ew")
+        
         biz_frame.columnconfigure(1, weight=1)
         
         def save_business_info():
@@ -6184,7 +6448,24 @@ def open_main_window(role, username):
             cursor.execute("INSERT OR REPLACE INTO settings(key,value) VALUES('company_phone',?)", (e_phone.get().strip(),))
             cursor.execute("INSERT OR REPLACE INTO settings(key,value) VALUES('company_address',?)", (e_address.get().strip(),))
             cursor.execute("INSERT OR REPLACE INTO settings(key,value) VALUES('receipt_footer',?)", (e_footer.get().strip(),))
-            conn.commit()
+            cursor.execute("INSERT OR REPLACE INTO settings(key,value) VALUES('printer_target',?)", (e_printer.get().strip(),))
+            cursor.execute("INSERT OR REPLACE INTO settings(key,value) VALUES('printer_codepage',?)", (cb_codepage.get(),))
+            cursor.execute("INSERT OR REPLACE INTO settings(key,value) VALUES('pos_server',?)", (e_pos_server.get().strip(),))
+            cursor.execute("INSERT OR REPLACE INTO settings(key,value) VALUES('sync_target',?)", (e_sync_target.get().strip(),))
+            try:
+                receipt_svc.set_terminal_id(conn, cursor, int(e_terminal.get()))
+            except ValueError:
+                conn.commit()
+                return messagebox.showerror(t('error'), t('invalid_terminal_id'))
+            from pos import sync as journal_sync
+            journal_sync.get_worker().start().request()
+            from pos import remote
+            try:
+                pos_client = remote.configured_client(cursor)
+                if pos_client:
+                    pos_client.ping()
+            except (OSError, ValueError, remote.RemoteError) as e:
+                return messagebox.showwarning(t('warning'), f"{t('pos_server_unreachable')}\n{e}")
             messagebox.showinfo(t('success'), t('profile_saved'))
         
         btn_save_biz = tk.Button(business_tab, text=f"💾 {t('save')}", command=save_business_info,
@@ -6348,6 +6629,17 @@ def open_main_window(role, username):
     right_panel = ttk.Frame(body, style="Card.TFrame")
     right_panel.grid(row=0, column=1, sticky="nsew", padx=(0,10), pady=10)
 
+    # Ekranlar bir kez kurulur, menüden geçişte gizlenir/gösterilir
+    from repositories import table_version_repository as version_repo
+    screens = ScreenManager(right_panel, lambda: version_repo.get_versions(cursor))
+    main._screens = screens
+    instrumentation.register_source("screens", screens.stats)
+    events.subscribe(events.TABLES_CHANGED, screens.tables_changed, owner=right_panel)
+
+    def show_screen(key):
+        mount, tables = SCREENS[key]
+        return screens.show(key, mount, tables)
+
     # Üst menü butonlarını tutalım (ikon ve tam metin için)
     top_buttons = []
 
@@ -6386,8 +6678,8 @@ def open_main_window(role, username):
         return b
 
     if role == "admin":
-        mbtn(menu, "🛒 " + t('sales'), lambda: mount_sales(right_panel))
-        mbtn(menu, "🛑 " + t('cancel_sale'), lambda: mount_cancel_sales(right_panel))
+        mbtn(menu, "🛒 " + t('sales'), lambda: show_screen("sales"))
+        mbtn(menu, "🛑 " + t('cancel_sale'), lambda: show_screen("cancel_sales"))
 
         # Stok Yönetimi
         stock_header = mbtn(menu, "📦 " + t('stock_mgmt'), lambda: None)
@@ -6400,9 +6692,9 @@ def open_main_window(role, username):
                 open_section(stock_header, stock_sub, stock_visible)
         stock_header.config(command=toggle_stock)
         register_section(stock_header, stock_sub, stock_visible)
-        msub(stock_sub, t('stock_list'), lambda: mount_products(right_panel))
-        msub(stock_sub, t('category_mgmt'), lambda: mount_kategori(right_panel))
-        msub(stock_sub, t('inventory_count'), lambda: mount_envanter_sayim(right_panel))
+        msub(stock_sub, t('stock_list'), lambda: show_screen("products"))
+        msub(stock_sub, t('category_mgmt'), lambda: show_screen("kategori"))
+        msub(stock_sub, t('inventory_count'), lambda: show_screen("envanter_sayim"))
 
         # Cari Yönetim
         account_header = mbtn(menu, "💼 " + t('account_mgmt_menu'), lambda: None)
@@ -6415,10 +6707,10 @@ def open_main_window(role, username):
                 open_section(account_header, account_sub, account_visible)
         account_header.config(command=toggle_account)
         register_section(account_header, account_sub, account_visible)
-        msub(account_sub, t('cari_list'), lambda: mount_cariler(right_panel))
-        msub(account_sub, t('collection_entry'), lambda: mount_tahsilat(right_panel))
-        msub(account_sub, t('payment_entry'), lambda: mount_odeme(right_panel))
-        msub(account_sub, t('transactions'), lambda: mount_cari_hareketler(right_panel))
+        msub(account_sub, t('cari_list'), lambda: show_screen("cariler"))
+        msub(account_sub, t('collection_entry'), lambda: show_screen("tahsilat"))
+        msub(account_sub, t('payment_entry'), lambda: show_screen("odeme"))
+        msub(account_sub, t('transactions'), lambda: show_screen("cari_hareketler"))
 
         # Hizmet/Masraf Yönetimi (emoji varyasyonunu sadeleştir – boşluk hissini azalt)
         svc_header = mbtn(menu, "🛠 " + t('service_expense_mgmt'), lambda: None)
@@ -6431,9 +6723,9 @@ def open_main_window(role, username):
                 open_section(svc_header, svc_sub, svc_visible)
         svc_header.config(command=toggle_svc)
         register_section(svc_header, svc_sub, svc_visible)
-        msub(svc_sub, t('service_list'), lambda: mount_hizmet_listesi(right_panel))
-        msub(svc_sub, t('add_expense'), lambda: mount_masraf_ekle(right_panel))
-        msub(svc_sub, t('expense_report'), lambda: mount_masraf_raporu(right_panel))
+        msub(svc_sub, t('service_list'), lambda: show_screen("hizmet_listesi"))
+        msub(svc_sub, t('add_expense'), lambda: show_screen("masraf_ekle"))
+        msub(svc_sub, t('expense_report'), lambda: show_screen("masraf_raporu"))
 
         # Satın Alma Yönetimi
         purchase_header = mbtn(menu, "🧾 " + t('purchase_mgmt'), lambda: None)
@@ -6446,10 +6738,10 @@ def open_main_window(role, username):
                 open_section(purchase_header, purchase_sub, purchase_visible)
         purchase_header.config(command=toggle_purchase)
         register_section(purchase_header, purchase_sub, purchase_visible)
-        msub(purchase_sub, t('dispatch_entry'), lambda: mount_irsaliye(right_panel))
-        msub(purchase_sub, t('invoice_entry'), lambda: mount_fatura(right_panel))
-        msub(purchase_sub, t('dispatch_list'), lambda: mount_irsaliye_listesi(right_panel))
-        msub(purchase_sub, t('invoice_list'), lambda: mount_fatura_listesi(right_panel))
+        msub(purchase_sub, t('dispatch_entry'), lambda: show_screen("irsaliye"))
+        msub(purchase_sub, t('invoice_entry'), lambda: show_screen("fatura"))
+        msub(purchase_sub, t('dispatch_list'), lambda: show_screen("irsaliye_listesi"))
+        msub(purchase_sub, t('invoice_list'), lambda: show_screen("fatura_listesi"))
 
         # Personel Yönetimi
         personnel_header = mbtn(menu, "👥 " + t('personnel_mgmt'), lambda: None)
@@ -6462,9 +6754,9 @@ def open_main_window(role, username):
                 open_section(personnel_header, personnel_sub, personnel_visible)
         personnel_header.config(command=toggle_personnel)
         register_section(personnel_header, personnel_sub, personnel_visible)
-        msub(personnel_sub, t('personnel_list'), lambda: mount_users(right_panel))
-        msub(personnel_sub, t('shift_mgmt'), lambda: mount_personel_vardiya(right_panel))
-        msub(personnel_sub, t('salary_advance'), lambda: mount_personel_maas(right_panel))
+        msub(personnel_sub, t('personnel_list'), lambda: show_screen("users"))
+        msub(personnel_sub, t('shift_mgmt'), lambda: show_screen("personel_vardiya"))
+        msub(personnel_sub, t('salary_advance'), lambda: show_screen("personel_maas"))
 
         # Depo Yönetimi
         warehouse_header = mbtn(menu, "🏬 " + t('warehouse_mgmt'), lambda: None)
@@ -6477,10 +6769,10 @@ def open_main_window(role, username):
                 open_section(warehouse_header, warehouse_sub, warehouse_visible)
         warehouse_header.config(command=toggle_warehouse)
         register_section(warehouse_header, warehouse_sub, warehouse_visible)
-        msub(warehouse_sub, t('warehouse_list'), lambda: mount_depo_listesi(right_panel))
-        msub(warehouse_sub, t('stock_list'), lambda: mount_depo_stok_listesi(right_panel))
-        msub(warehouse_sub, t('transfer'), lambda: mount_depo_transfer(right_panel))
-        msub(warehouse_sub, t('warehouse_movements'), lambda: mount_depo_hareket(right_panel))
+        msub(warehouse_sub, t('warehouse_list'), lambda: show_screen("depo_listesi"))
+        msub(warehouse_sub, t('stock_list'), lambda: show_screen("depo_stok_listesi"))
+        msub(warehouse_sub, t('transfer'), lambda: show_screen("depo_transfer"))
+        msub(warehouse_sub, t('warehouse_movements'), lambda: show_screen("depo_hareket"))
 
         # Kasa Yönetimi
         cash_header = mbtn(menu, "💵 " + t('cash_mgmt'), lambda: None)
@@ -6493,9 +6785,9 @@ def open_main_window(role, username):
                 open_section(cash_header, cash_sub, cash_visible)
         cash_header.config(command=toggle_cash)
         register_section(cash_header, cash_sub, cash_visible)
-        msub(cash_sub, t('cash_movements'), lambda: mount_kasa_hareket(right_panel))
-        msub(cash_sub, t('cash_closure'), lambda: mount_kasa_devir(right_panel))
-        msub(cash_sub, t('cash_report'), lambda: mount_kasa_rapor(right_panel))
+        msub(cash_sub, t('cash_movements'), lambda: show_screen("kasa_hareket"))
+        msub(cash_sub, t('cash_closure'), lambda: show_screen("kasa_devir"))
+        msub(cash_sub, t('cash_report'), lambda: show_screen("kasa_rapor"))
 
         # Raporlar
         reports_header = mbtn(menu, "📊 " + t('reports'), lambda: None)
@@ -6508,14 +6800,15 @@ def open_main_window(role, username):
                 open_section(reports_header, reports_sub, reports_visible)
         reports_header.config(command=toggle_reports)
         register_section(reports_header, reports_sub, reports_visible)
-        msub(reports_sub, t('sales_report_menu'), lambda: mount_reports(right_panel))
-        msub(reports_sub, t('stock_report_menu'), lambda: mount_stok_raporu(right_panel))
-        msub(reports_sub, t('account_report_menu'), lambda: mount_cari_raporu(right_panel))
-        msub(reports_sub, t('cash_report_menu'), lambda: mount_kasa_raporu(right_panel))
-        msub(reports_sub, t('profit_loss_report_menu'), lambda: mount_profit_loss_report(right_panel))
+        msub(reports_sub, t('live_dashboard'), lambda: show_screen("dashboard"))
+        msub(reports_sub, t('sales_report_menu'), lambda: show_screen("reports"))
+        msub(reports_sub, t('stock_report_menu'), lambda: show_screen("stok_raporu"))
+        msub(reports_sub, t('account_report_menu'), lambda: show_screen("cari_raporu"))
+        msub(reports_sub, t('cash_report_menu'), lambda: show_screen("kasa_raporu"))
+        msub(reports_sub, t('profit_loss_report_menu'), lambda: show_screen("profit_loss_report"))
 
         # Diğer menüler
-        mbtn(menu, "🧾 " + t('receipts'), lambda: mount_receipts(right_panel))
+        mbtn(menu, "🧾 " + t('receipts'), lambda: show_screen("receipts"))
         mbtn(menu, "💾 " + t('daily_report'), export_daily_report)
         
         # Ayarlar Menüsü
@@ -6530,14 +6823,17 @@ def open_main_window(role, username):
         settings_header.config(command=toggle_settings)
         register_section(settings_header, settings_sub, settings_visible)
         
-        msub(settings_sub, t('quick_menu_settings'), lambda: mount_quick_menu_settings(right_panel))
-        msub(settings_sub, t('theme_settings'), lambda: mount_theme_settings(right_panel))
+        msub(settings_sub, t('quick_menu_settings'), lambda: show_screen("quick_menu_settings"))
+        msub(settings_sub, t('theme_settings'), lambda: show_screen("theme_settings"))
         msub(settings_sub, t('currency_settings'), lambda: show_currency_setup(force=True))
+        msub(settings_sub, t('backup_settings'), lambda: show_screen("backup_settings"))
+        msub(settings_sub, t('archive'), lambda: show_screen("archive"))
+        msub(settings_sub, t('diagnostics'), lambda: show_screen("diagnostics"))
         
     else:
-        mbtn(menu, "🛒 " + t('sales'), lambda: mount_sales(right_panel))
-        mbtn(menu, "🛑 " + t('cancel_sale'), lambda: mount_cancel_sales(right_panel))
-        mbtn(menu, "🧾 " + t('receipts'), lambda: mount_receipts(right_panel))
+        mbtn(menu, "🛒 " + t('sales'), lambda: show_screen("sales"))
+        mbtn(menu, "🛑 " + t('cancel_sale'), lambda: show_screen("cancel_sales"))
+        mbtn(menu, "🧾 " + t('receipts'), lambda: show_screen("receipts"))
 
     # Menüyü daralt/genişlet
     if "locked" not in sidebar_state:
@@ -6642,12 +6938,20 @@ def open_main_window(role, username):
     ttk.Label(footer, text=t('copyright'), style="Sub.TLabel").pack(side="left", padx=10)
     ttk.Label(footer, text=t('timestamp')+" "+datetime.now().strftime("%d.%m.%Y %H:%M"), style="Sub.TLabel").pack(side="right", padx=10)
     
-    # Varsayılan olarak satış ekranını aç
-    mount_sales(right_panel)
+    # Varsayılan olarak satış ekranını aç (pencere çizildikten sonra)
+    main.after_idle(lambda: show_screen("sales"))
+
+    # Açılışta tamamlanamayıp vazgeçilen satış niyetleri: cari kayıtları elle kontrol edilmeli
+    if role == "admin":
+        failed = intent_svc.list_failed(cursor, limit=10)
+        if failed:
+            rows = "\n".join(f"{fis} ({attempts}x): {err or '-'}" for fis, attempts, err, _ in failed)
+            main.after_idle(lambda: messagebox.showwarning(t('warning'), t('sale_intents_failed') + "\n\n" + rows, parent=main))
 
 def logout_action(window):
     if show_custom_confirm_dialog(t('exit_title'), t('confirm_logout'), window):
         window.destroy()
+        session.logout()
         login_window.deiconify()
 
 # ==========================
@@ -6662,6 +6966,8 @@ def login_action():
     if r:
         role = r[0]
         CURRENT_USER = username
+        # Satış, cari ve masraf kayıtları bu kasiyer ve açık vardiyayla damgalanır
+        session.login(cursor, username)
         
         # Son kullanıcıyı kaydet
         try:
@@ -6685,6 +6991,20 @@ def start_login_screen():
     global login_window, entry_username, entry_password, btn_toggle_pw
     login_window = tk.Tk()
     login_window.title(f"{t('app_title')} - {t('login')}")
+    # Arka plan sorgularının sonuçları bu pencerenin olay döngüsünde teslim edilir
+    get_executor().attach(login_window)
+    # Değişiklik olayları aynı döngüde; diğer bağlantıların yazımları PRAGMA data_version ile izlenir
+    from repositories import table_version_repository as version_repo
+    events.get_bus().attach(login_window, conn, lambda: version_repo.get_versions(cursor))
+    # Başka bağlantıların (senkron, sunucu, ikinci kasa) cari yazımları arama indeksini eskitir
+    from services import customer_lookup_service as lookup
+    events.subscribe(events.TABLES_CHANGED, lookup.tables_changed)
+    if not startup_profile.enabled():
+        # Zamanlanmış yedekler arka planda (ayar: backup_interval_hours)
+        backup.get_manager().start()
+        # Çevrimdışı kasa: değişiklik günlüğü merkeze arka planda gönderilir (ayar: sync_target)
+        from pos import sync as journal_sync
+        journal_sync.get_worker().start()
     set_theme(login_window); center_window(login_window, 440, 740)
 
     # Modern Dil Seçici
@@ -6800,7 +7120,19 @@ def start_login_screen():
     ttk.Label(login_window, text=f"📦 {APP_VERSION}", 
               style="Sub.TLabel",
               font=("Segoe UI", 9)).pack(side="bottom", pady=14)
+    startup_profile.mark("login_built")
+    if startup_profile.enabled():
+        startup_profile.finish(login_window)
     login_window.mainloop()
+    # Pencereler kapandı: ayar açıksa kapanış yedeği alınır ve beklenir
+    backup.get_manager().shutdown()
+    from pos import sync as journal_sync
+    journal_sync.get_worker().shutdown()
+    # Açık tutulan yazıcı bağlantıları
+    from receipts import printers as receipt_printers
+    receipt_printers.close_all()
+    from pos import remote
+    remote.close_all()
 
 # ==========================
 # ==========================
@@ -7001,13 +7333,13 @@ if __name__ == "__main__":
     except Exception as e:
         pass
     
-    # İlk çalıştırma kontrolü yap (Dil)
-    if check_first_run():
+    # İlk çalıştırma kontrolü yap (Dil) - profil modunda kurulum ekranları atlanır
+    if check_first_run() and not startup_profile.enabled():
         show_language_setup()
         load_language_preference()
         
     # Para birimi kontrolü
-    if not check_currency_set():
+    if not check_currency_set() and not startup_profile.enabled():
         show_currency_setup()
         load_currency_preference()
     
@@ -0,0 +1,482 @@
+"""Çevrimiçi veritabanı yedekleri (SQLite backup API).
+
+Kopya arka planda adım adım alınır, doğrulanır, gzip'lenir ve yanına JSON manifest
+yazılır; arşiv yılı dosyaları da eklenir. Ayarlar: backup_interval_hours, backup_keep, backup_on_close.
+
+    python -m pos.backup backup | list | verify <dosya> | restore <dosya>
+"""
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import queue
+import shutil
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+from typing import Callable, List, Optional
+
+from pos.db_handler import DB_PATH_DEFAULT
+
+BACKUP_DIR = "backups"
+PREFIX = "database_"
+SUFFIX = ".db.gz"
+ARCHIVE_TAG = ".archive_"   # database_<zaman>.archive_<yıl>.db.gz
+PAGES_PER_STEP = 256
+STEP_PAUSE_S = 0.005   # adımlar arası nefes: yazıcıya ve UI'ya yer aç
+DEFAULT_INTERVAL_HOURS = 24
+DEFAULT_KEEP = 14
+_CHUNK = 1024 * 1024
+
+
+class BackupError(Exception):
+    pass
+
+
+# --- ayarlar ---
+def load_settings(cursor) -> dict:
+    cursor.execute("SELECT key, value FROM settings WHERE key LIKE 'backup_%'")
+    raw = {k: v for k, v in cursor.fetchall()}
+
+    def num(key, default):
+        try:
+            return max(0, int(float(raw.get(key, default))))
+        except (TypeError, ValueError):
+            return default
+
+    return {
+        "interval_hours": num("backup_interval_hours", DEFAULT_INTERVAL_HOURS),
+        "keep": num("backup_keep", DEFAULT_KEEP) or 1,
+        "on_close": raw.get("backup_on_close", "1") == "1",
+    }
+
+
+def save_settings(conn, cursor, interval_hours: int, keep: int, on_close: bool) -> None:
+    for key, value in (("backup_interval_hours", str(int(interval_hours))),
+                       ("backup_keep", str(max(1, int(keep)))),
+                       ("backup_on_close", "1" if on_close else "0")):
+        cursor.execute("INSERT OR REPLACE INTO settings(key,value) VALUES(?, ?)", (key, value))
+    conn.commit()
+
+
+# --- yardımcılar ---
+def _sha256(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_CHUNK), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _integrity(path: str) -> str:
+    conn = sqlite3.connect(path)
+    try:
+        rows = conn.execute("PRAGMA integrity_check").fetchall()
+    finally:
+        conn.close()
+    return "ok" if rows == [("ok",)] else "; ".join(str(r[0]) for r in rows[:5])
+
+
+def _manifest_path(path: str) -> str:
+    return path + ".json"
+
+
+def _decompress(path: str, target: str) -> None:
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rb") as src, open(target, "wb") as dst:
+        shutil.copyfileobj(src, dst, _CHUNK)
+
+
+def _copy(src: sqlite3.Connection, raw_path: str, step=None) -> None:
+    dst = sqlite3.connect(raw_path)
+    try:
+        src.backup(dst, pages=PAGES_PER_STEP, progress=step)
+    except Exception:
+        dst.close()
+        if os.path.exists(raw_path):
+            os.remove(raw_path)
+        raise
+    dst.close()
+
+
+def _seal(raw_path: str, final_path: str, compress: bool) -> str:
+    """Kopyayı doğrula ve sıkıştır; integrity sonucunu döndürür."""
+    integrity = _integrity(raw_path)
+    if integrity != "ok":
+        os.remove(raw_path)
+        raise BackupError(f"integrity check failed: {integrity}")
+    if compress:
+        with open(raw_path, "rb") as f_in, gzip.open(final_path, "wb", compresslevel=6) as f_out:
+            shutil.copyfileobj(f_in, f_out, _CHUNK)
+        os.remove(raw_path)
+    else:
+        os.replace(raw_path, final_path)
+    return integrity
+
+
+def _archive_files(src: sqlite3.Connection) -> List[tuple]:
+    """Ana veritabanının kayıtlı arşiv dosyaları [(yıl, yol)] (eski şemada tablo yoksa boş)."""
+    try:
+        rows = src.execute("SELECT year, path FROM archive_periods ORDER BY year").fetchall()
+    except sqlite3.DatabaseError:
+        return []
+    return [(int(y), p) for y, p in rows if p and os.path.exists(p)]
+
+
+def _backup_archives(archives: List[tuple], backup_dir: str, name: str, compress: bool) -> List[dict]:
+    out = []
+    for year, path in archives:
+        raw_path = os.path.join(backup_dir, f".{name}{ARCHIVE_TAG}{year}.db.part")
+        final_path = os.path.join(backup_dir, f"{name}{ARCHIVE_TAG}{year}" + (SUFFIX if compress else ".db"))
+        arc = sqlite3.connect(path, timeout=30)
+        try:
+            _copy(arc, raw_path)
+        finally:
+            arc.close()
+        integrity = _seal(raw_path, final_path, compress)
+        out.append({"year": year, "file": os.path.basename(final_path), "name": os.path.basename(path),
+                    "size": os.path.getsize(final_path), "sha256": _sha256(final_path), "integrity": integrity})
+    return out
+
+
+def _archive_entries(path: str) -> List[dict]:
+    try:
+        with open(_manifest_path(path), encoding="utf-8") as f:
+            return list(json.load(f).get("archives") or [])
+    except (OSError, ValueError):
+        return []
+
+
+# --- yedek alma ---
+def create_backup(db_path: str = DB_PATH_DEFAULT, backup_dir: str = BACKUP_DIR, keep: int = DEFAULT_KEEP,
+                  progress: Optional[Callable[[int, int], None]] = None, compress: bool = True) -> dict:
+    """Çevrimiçi yedek al, doğrula, sıkıştır, eski yedekleri döndür. Manifesti döndürür."""
+    os.makedirs(backup_dir, exist_ok=True)
+    started = time.perf_counter()
+    stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    name = f"{PREFIX}{stamp}"
+    n = 0
+    while any(os.path.exists(os.path.join(backup_dir, name + ext)) for ext in (SUFFIX, ".db")):
+        n += 1
+        name = f"{PREFIX}{stamp}_{n}"
+    raw_path = os.path.join(backup_dir, f".{name}.db.part")
+    final_path = os.path.join(backup_dir, name + (SUFFIX if compress else ".db"))
+    pages = {"total": 0}
+
+    def step(status, remaining, total):
+        pages["total"] = total
+        if progress:
+            progress(total - remaining, total)
+        time.sleep(STEP_PAUSE_S)
+
+    src = sqlite3.connect(db_path, timeout=30)
+    try:
+        # Tek okuma işlemi: WAL anlık görüntüsü sabit kalır, yazmalar kopyayı yeniden başlatmaz
+        src.execute("BEGIN")
+        src.execute("SELECT 1 FROM sqlite_master LIMIT 1").fetchall()
+        _copy(src, raw_path, step)
+        archives = _archive_files(src)
+    finally:
+        if src.in_transaction:
+            src.rollback()
+        src.close()
+
+    integrity = _seal(raw_path, final_path, compress)
+    # Arşiv yılları: ana veritabanından silinmiş satırlar yalnızca bu dosyalarda
+    archive_entries = _backup_archives(archives, backup_dir, name, compress)
+
+    manifest = {
+        "file": os.path.basename(final_path),
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "source": os.path.abspath(db_path),
+        "pages": pages["total"],
+        "size": os.path.getsize(final_path),
+        "sha256": _sha256(final_path),
+        "integrity": integrity,
+        "compressed": compress,
+        "archives": archive_entries,
+        "seconds": round(time.perf_counter() - started, 2),
+    }
+    with open(_manifest_path(final_path), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    manifest["removed"] = rotate(backup_dir, keep)
+    return manifest
+
+
+def list_backups(backup_dir: str = BACKUP_DIR) -> List[dict]:
+    """Yedekler (yeniden eskiye). Manifesti olmayan dosyalar da listelenir."""
+    if not os.path.isdir(backup_dir):
+        return []
+    out = []
+    for fname in os.listdir(backup_dir):
+        if not fname.startswith(PREFIX) or not (fname.endswith(SUFFIX) or fname.endswith(".db")):
+            continue
+        if ARCHIVE_TAG in fname:
+            # Arşiv kopyası: ana yedeğin manifestinde listelenir
+            continue
+        path = os.path.join(backup_dir, fname)
+        info = {"file": fname, "size": os.path.getsize(path)}
+        try:
+            with open(_manifest_path(path), encoding="utf-8") as f:
+                info.update(json.load(f))
+        except (OSError, ValueError):
+            info["created_at"] = datetime.fromtimestamp(os.path.getmtime(path)).isoformat(timespec="seconds")
+        info["path"] = path
+        out.append(info)
+    # Dosya adı zaman damgası taşır; sıralama onunla yapılır
+    out.sort(key=lambda b: b["file"], reverse=True)
+    return out
+
+
+def rotate(backup_dir: str = BACKUP_DIR, keep: int = DEFAULT_KEEP) -> List[str]:
+    removed = []
+    for info in list_backups(backup_dir)[max(1, keep):]:
+        archives = [os.path.join(backup_dir, a["file"]) for a in _archive_entries(info["path"])]
+        for path in [info["path"], _manifest_path(info["path"])] + archives:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+        removed.append(info["file"])
+    return removed
+
+
+def verify_backup(path: str) -> dict:
+    """Özet (sha256) ve integrity_check ile yedeği doğrula. {'ok': bool, 'message': str}"""
+    try:
+        with open(_manifest_path(path), encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        manifest = {}
+    files = [(path, manifest.get("sha256"), "")]
+    for a in manifest.get("archives") or []:
+        files.append((os.path.join(os.path.dirname(path), a["file"]), a.get("sha256"), f"{a['file']}: "))
+    for file, sha, label in files:
+        if not os.path.exists(file):
+            return {"ok": False, "message": f"{label or os.path.basename(file) + ': '}missing"}
+        if sha and sha != _sha256(file):
+            return {"ok": False, "message": f"{label}sha256 mismatch"}
+        fd, tmp = tempfile.mkstemp(suffix=".db")
+        os.close(fd)
+        try:
+            _decompress(file, tmp)
+            integrity = _integrity(tmp)
+        except (OSError, sqlite3.DatabaseError) as e:
+            return {"ok": False, "message": f"{label}{e}"}
+        finally:
+            os.remove(tmp)
+        if integrity != "ok":
+            return {"ok": False, "message": f"{label}{integrity}"}
+    return {"ok": True, "message": "ok"}
+
+
+def restore(backup_path: str, db_path: str = DB_PATH_DEFAULT) -> str:
+    """Yedeği geri yükle (uygulama kapalıyken). Mevcut veritabanı yanına saklanır; yolunu döndürür.
+    Yedekteki arşiv yılları veritabanının yanındaki archive/ klasörüne geri konur (mevcutlar yine saklanır)."""
+    result = verify_backup(backup_path)
+    if not result["ok"]:
+        raise BackupError(f"backup failed verification: {result['message']}")
+
+    target_dir = os.path.dirname(os.path.abspath(db_path))
+    fd, tmp = tempfile.mkstemp(suffix=".restore", dir=target_dir)
+    os.close(fd)
+    _decompress(backup_path, tmp)
+
+    keep_path = ""
+    if os.path.exists(db_path):
+        # WAL'daki son işlemler de saklanan kopyaya girsin
+        conn = sqlite3.connect(db_path)
+        try:
+            conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        finally:
+            conn.close()
+        keep_path = f"{db_path}.before-restore-{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        os.replace(db_path, keep_path)
+    for ext in ("-wal", "-shm"):
+        if os.path.exists(db_path + ext):
+            os.remove(db_path + ext)
+    os.replace(tmp, db_path)
+
+    # Arşiv yolları: archive_periods ve archive_repository.archive_path ile aynı yer
+    stamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    archive_dir = os.path.join(target_dir, "archive")
+    entries = _archive_entries(backup_path)
+    if entries:
+        os.makedirs(archive_dir, exist_ok=True)
+    for a in entries:
+        target = os.path.join(archive_dir, a["name"])
+        fd, tmp = tempfile.mkstemp(suffix=".restore", dir=archive_dir)
+        os.close(fd)
+        _decompress(os.path.join(os.path.dirname(backup_path), a["file"]), tmp)
+        if os.path.exists(target):
+            os.replace(target, f"{target}.before-restore-{stamp}")
+        os.replace(tmp, target)
+    conn = sqlite3.connect(db_path)
+    try:
+        for a in entries:
+            conn.execute("UPDATE archive_periods SET path=? WHERE year=?",
+                         (os.path.join(archive_dir, a["name"]), int(a["year"])))
+        conn.commit()
+    except sqlite3.DatabaseError:
+        pass
+    finally:
+        conn.close()
+    return keep_path
+
+
+# --- arka plan yöneticisi ---
+class BackupManager:
+    """Zamanlanmış ve isteğe bağlı yedekleri tek bir arka plan iş parçacığında çalıştırır."""
+
+    def __init__(self, db_path: str = DB_PATH_DEFAULT, backup_dir: str = BACKUP_DIR):
+        self.db_path = db_path
+        self.backup_dir = backup_dir
+        self._requests: "queue.Queue[Optional[str]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self.settings = {"interval_hours": DEFAULT_INTERVAL_HOURS, "keep": DEFAULT_KEEP, "on_close": True}
+        # UI tarafından okunur (after ile yoklanır)
+        self.status = {"running": False, "done": 0, "total": 0, "last": None, "error": None}
+
+    def reload_settings(self) -> dict:
+        conn = sqlite3.connect(self.db_path)
+        try:
+            self.settings = load_settings(conn.cursor())
+        except sqlite3.DatabaseError:
+            pass
+        finally:
+            conn.close()
+        return self.settings
+
+    def _last_backup_ts(self) -> float:
+        backups = list_backups(self.backup_dir)
+        return os.path.getmtime(backups[0]["path"]) if backups else 0.0
+
+    def _seconds_until_due(self) -> Optional[float]:
+        hours = self.settings["interval_hours"]
+        if not hours:
+            return None
+        return max(0.0, self._last_backup_ts() + hours * 3600 - time.time())
+
+    def _progress(self, done: int, total: int) -> None:
+        with self._lock:
+            self.status["done"], self.status["total"] = done, total
+
+    def _backup(self, reason: str) -> None:
+        with self._lock:
+            self.status.update(running=True, done=0, total=0, error=None)
+        try:
+            manifest = create_backup(self.db_path, self.backup_dir, self.settings["keep"], progress=self._progress)
+            manifest["reason"] = reason
+            with self._lock:
+                self.status["last"] = manifest
+        except Exception as e:
+            with self._lock:
+                self.status["error"] = str(e)
+            print(f"Yedekleme hatası: {e}", file=sys.stderr)
+        finally:
+            with self._lock:
+                self.status["running"] = False
+
+    def _run(self) -> None:
+        self.reload_settings()
+        while True:
+            wait = self._seconds_until_due()
+            try:
+                reason = self._requests.get(timeout=wait)
+            except queue.Empty:
+                reason = "scheduled"
+            if reason is None:
+                break
+            if reason == "reload":
+                self.reload_settings()
+                continue
+            self._backup(reason)
+
+    def start(self) -> "BackupManager":
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="db-backup", daemon=True)
+            self._thread.start()
+        return self
+
+    def backup_now(self) -> None:
+        self.start()
+        self._requests.put("manual")
+
+    def settings_changed(self) -> None:
+        """Ayarlar kaydedildi; zamanlayıcı yeni aralığa göre beklesin."""
+        self._requests.put("reload")
+
+    def shutdown(self, final_backup: Optional[bool] = None) -> None:
+        """Kapanış: ayar açıksa son bir yedek alınır ve bitmesi beklenir."""
+        if self._thread is None or not self._thread.is_alive():
+            return
+        if final_backup is None:
+            final_backup = self.settings.get("on_close", True)
+        if final_backup:
+            self._requests.put("on_close")
+        self._requests.put(None)
+        self._thread.join(timeout=None if final_backup else 2.0)
+        self._thread = None
+
+
+_manager: Optional[BackupManager] = None
+
+
+def get_manager() -> BackupManager:
+    """Uygulama genelindeki tek yedekleme yöneticisi."""
+    global _manager
+    if _manager is None:
+        _manager = BackupManager()
+    return _manager
+
+
+# --- komut satırı ---
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="SmartPOS database backups")
+    ap.add_argument("--db", default=DB_PATH_DEFAULT)
+    ap.add_argument("--dir", default=BACKUP_DIR)
+    sub = ap.add_subparsers(dest="command", required=True)
+    p_backup = sub.add_parser("backup", help="take a backup now")
+    p_backup.add_argument("--keep", type=int, default=None)
+    sub.add_parser("list", help="list backups")
+    p_verify = sub.add_parser("verify", help="verify a backup file")
+    p_verify.add_argument("file")
+    p_restore = sub.add_parser("restore", help="restore a backup (close the app first)")
+    p_restore.add_argument("file")
+    args = ap.parse_args(argv)
+
+    try:
+        if args.command == "backup":
+            keep = args.keep
+            if keep is None:
+                conn = sqlite3.connect(args.db)
+                try:
+                    keep = load_settings(conn.cursor())["keep"]
+                except sqlite3.DatabaseError:
+                    keep = DEFAULT_KEEP
+                finally:
+                    conn.close()
+            print(json.dumps(create_backup(args.db, args.dir, keep), indent=2))
+        elif args.command == "list":
+            for b in list_backups(args.dir):
+                print(f"{b['file']}\t{b.get('created_at', '')}\t{b['size'] / 1048576:.1f} MB\t{b.get('integrity', '?')}")
+        elif args.command == "verify":
+            result = verify_backup(args.file)
+            print(f"{'OK' if result['ok'] else 'FAILED'}: {result['message']}")
+            return 0 if result["ok"] else 1
+        elif args.command == "restore":
+            kept = restore(args.file, args.db)
+            print(f"restored {args.file} -> {args.db}" + (f" (previous database kept as {kept})" if kept else ""))
+    except (BackupError, OSError, sqlite3.DatabaseError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,147 @@
+"""Tk arayüzü için arka plan veritabanı okuyucusu.
+
+Tek iş parçacığı kendi bağlantısıyla işleri sırayla çalıştırır; sonuçlar Tk
+döngüsünde after() ile teslim edilir. Aynı key ile gelen yeni istek eskisini geçersiz kılar.
+"""
+import queue
+import sqlite3
+import threading
+from typing import Any, Callable, Dict, Optional
+
+from pos import instrumentation
+from pos.db_handler import DB_PATH_DEFAULT
+
+POLL_MS = 25
+
+
+class Request:
+    __slots__ = ("fn", "on_done", "on_error", "owner", "key", "cancelled")
+
+    def __init__(self, fn, on_done, on_error, owner, key):
+        self.fn = fn
+        self.on_done = on_done
+        self.on_error = on_error
+        self.owner = owner
+        self.key = key
+        self.cancelled = False
+
+    def cancel(self) -> None:
+        self.cancelled = True
+
+
+class DBExecutor:
+    def __init__(self, db_path: str = DB_PATH_DEFAULT):
+        self.db_path = db_path
+        self._jobs: "queue.Queue[Optional[Request]]" = queue.Queue()
+        self._results: "queue.Queue[tuple]" = queue.Queue()
+        self._latest: Dict[Any, Request] = {}
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._widget = None
+
+    # --- worker ---
+    def _run(self) -> None:
+        # check_same_thread=False: tanılama izi ana iş parçacığından açılıp kapatılabilsin
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        instrumentation.attach(conn)
+        cursor = conn.cursor()
+        try:
+            while True:
+                req = self._jobs.get()
+                if req is None:
+                    break
+                if req.cancelled:
+                    continue
+                try:
+                    result = req.fn(cursor)
+                    self._results.put((req, True, result))
+                except Exception as e:
+                    self._results.put((req, False, e))
+                finally:
+                    # Okuma işleri açık işlem bırakmasın (WAL anlık görüntüsü tazelensin)
+                    if conn.in_transaction:
+                        conn.rollback()
+        finally:
+            conn.close()
+
+    def start(self) -> "DBExecutor":
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="db-executor", daemon=True)
+            self._thread.start()
+        return self
+
+    def shutdown(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            self._jobs.put(None)
+            self._thread.join(timeout=2.0)
+        self._thread = None
+
+    # --- Tk tarafı ---
+    def attach(self, widget) -> None:
+        """Sonuçları bu Tk widget'ının olay döngüsünde teslim et."""
+        self._widget = widget
+        self.start()
+        widget.after(POLL_MS, self._drain, widget)
+
+    def _drain(self, widget) -> None:
+        if widget is not self._widget:
+            return  # başka bir pencereye bağlandı
+        while True:
+            try:
+                req, ok, value = self._results.get_nowait()
+            except queue.Empty:
+                break
+            with self._lock:
+                if req.key is not None and self._latest.get(req.key) is req:
+                    del self._latest[req.key]
+            if req.cancelled:
+                continue
+            try:
+                if req.owner is not None and not req.owner.winfo_exists():
+                    continue
+            except Exception:
+                continue
+            try:
+                if ok:
+                    if req.on_done:
+                        req.on_done(value)
+                elif req.on_error:
+                    req.on_error(value)
+            except Exception:
+                pass
+        try:
+            widget.after(POLL_MS, self._drain, widget)
+        except Exception:
+            pass
+
+    def submit(self, fn: Callable[[sqlite3.Cursor], Any], on_done: Optional[Callable[[Any], None]] = None,
+               on_error: Optional[Callable[[Exception], None]] = None, owner=None, key=None) -> Request:
+        """fn(cursor) işini kuyruğa ekle. Aynı key ile gelen yeni istek eskisini iptal eder.
+        owner widget'ı yok edildiyse sonuç teslim edilmez."""
+        req = Request(fn, on_done, on_error, owner, key)
+        if key is not None:
+            with self._lock:
+                old = self._latest.get(key)
+                if old is not None:
+                    old.cancel()
+                self._latest[key] = req
+        self.start()
+        self._jobs.put(req)
+        return req
+
+    def cancel(self, key) -> None:
+        with self._lock:
+            req = self._latest.pop(key, None)
+        if req is not None:
+            req.cancel()
+
+
+_executor: Optional[DBExecutor] = None
+
+
+def get_executor() -> DBExecutor:
+    """Uygulama genelindeki tek executor."""
+    global _executor
+    if _executor is None:
+        _executor = DBExecutor()
+    return _executor
@@ -1,8 +1,46 @@
 """Database handler: centralize connection and schema initialization."""
 import sqlite3
 
+from core.money import KURUS_SQL
+
 DB_PATH_DEFAULT = "database.db"
 
+# Değişim sayacı tutulan tablolar (ekran önbelleği bunlara göre yenilenir)
+TRACKED_TABLES = (
+    "products", "categories", "sales", "cariler", "cari_hareketler", "services", "expenses",
+    "purchase_documents", "purchase_items", "personnel_shifts", "personnel_payments", "users",
+    "warehouses", "warehouse_stocks", "warehouse_movements", "quick_products",
+    "inventory_counts", "inventory_count_items", "settings", "receipt_documents", "receipt_payments",
+    "sales_returns",
+)
+
+# Para kolonları: her birinin INTEGER kuruş ikizi (<kolon>_kurus) SQLite tarafından üretilir
+MONEY_COLUMNS = {
+    "sales": ("price", "total"),
+    "cariler": ("balance",),
+    "cari_hareketler": ("tutar",),
+    "expenses": ("amount",),
+    "purchase_documents": ("total_amount",),
+    "purchase_items": ("price", "total"),
+}
+
+
+def kurus_column_ddl(col: str) -> str:
+    return f"{col}_kurus INTEGER GENERATED ALWAYS AS ({KURUS_SQL.format(col=col)}) VIRTUAL"
+
+
+def add_kurus_columns(cursor, schema: str = "main") -> None:
+    """Eksik kuruş kolonlarını ekle (VIRTUAL: yazma maliyeti yok, mevcut satırlar da hemen okunur)."""
+    for table, cols in MONEY_COLUMNS.items():
+        cursor.execute(f"PRAGMA {schema}.table_xinfo({table})")
+        have = {r[1] for r in cursor.fetchall()}
+        if not have:
+            continue
+        for col in cols:
+            if col in have and f"{col}_kurus" not in have:
+                cursor.execute(f"ALTER TABLE {schema}.{table} ADD COLUMN {kurus_column_ddl(col)}")
+
+
 def get_connection(db_path: str = DB_PATH_DEFAULT):
     conn = sqlite3.connect(db_path)
     cursor = conn.cursor()
@@ -10,12 +48,24 @@ def get_connection(db_path: str = DB_PATH_DEFAULT):
 
 
 def init_schema(conn, cursor):
+    # WAL: arka plan okuyucuları (db_executor) yazma sırasında bloklanmaz
+    try:
+        cursor.execute("PRAGMA journal_mode=WAL")
+    except sqlite3.DatabaseError:
+        pass
+
     # settings
     cursor.execute("""
     CREATE TABLE IF NOT EXISTS settings(
       key TEXT PRIMARY KEY,
       value TEXT
     )""")
+    # schema_backfills: yeni açılan türetilmiş tablolar; geçmişten doldurma şemadan sonra
+    # services/migration_service'te yapılır ve satır silinir (yarıda kalırsa sonraki açılışta tekrar)
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS schema_backfills(
+      name TEXT PRIMARY KEY
+    )""")
 
     # users
     cursor.execute("""
@@ -271,6 +321,33 @@ def init_schema(conn, cursor):
         cursor.execute("ALTER TABLE products ADD COLUMN category_id INTEGER")
         conn.commit()
 
+    # Maliyet motoru: hareketli ortalama maliyet (ürün ve depo bazında) ve
+    # satış satırına işlenen birim maliyet. Eski kayıtlar bir kez alış
+    # fiyatından doldurulur; raporlar geçmişi tekrar oynatmaz.
+    if "avg_cost" not in prod_cols:
+        cursor.execute("ALTER TABLE products ADD COLUMN avg_cost REAL")
+        cursor.execute("UPDATE products SET avg_cost = COALESCE(buy_price, 0)")
+        conn.commit()
+    cursor.execute("PRAGMA table_info(warehouse_stocks)")
+    ws_cols = {c[1] for c in cursor.fetchall()}
+    if "avg_cost" not in ws_cols:
+        cursor.execute("ALTER TABLE warehouse_stocks ADD COLUMN avg_cost REAL")
+        cursor.execute("""
+            UPDATE warehouse_stocks
+            SET avg_cost = (SELECT COALESCE(p.buy_price, 0) FROM products p WHERE p.id = warehouse_stocks.product_id)
+        """)
+        conn.commit()
+    # Ürüne göre depo stokları (olayla gelen ürün satırlarını yamamak için)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_warehouse_stocks_product ON warehouse_stocks(product_id)")
+    cursor.execute("PRAGMA table_info(sales)")
+    if "unit_cost" not in {c[1] for c in cursor.fetchall()}:
+        cursor.execute("ALTER TABLE sales ADD COLUMN unit_cost REAL")
+        cursor.execute("""
+            UPDATE sales
+            SET unit_cost = COALESCE((SELECT p.buy_price FROM products p WHERE p.name = sales.product_name), 0)
+        """)
+        conn.commit()
+
     # Seeds
     cursor.execute("INSERT OR IGNORE INTO users(username,password,role) VALUES (?,?,?)", ("admin","1234","admin"))
     cursor.execute("INSERT OR IGNORE INTO users(username,password,role) VALUES (?,?,?)", ("kasiyer","1234","cashier"))
@@ -291,6 +368,33 @@ def init_schema(conn, cursor):
         """
     )
 
+    # product_popularity (hızlı ürün paneli için sönümlü satış sayaçları)
+    cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='product_popularity'")
+    popularity_is_new = cursor.fetchone() is None
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS product_popularity(
+      product_name TEXT PRIMARY KEY,
+      day_score REAL NOT NULL DEFAULT 0,
+      week_score REAL NOT NULL DEFAULT 0,
+      total_qty REAL NOT NULL DEFAULT 0,
+      updated_at TEXT
+    )""")
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS product_popularity_hourly(
+      hour INTEGER NOT NULL,
+      product_name TEXT NOT NULL,
+      score REAL NOT NULL DEFAULT 0,
+      PRIMARY KEY (hour, product_name)
+    )""")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_popularity_day ON product_popularity(day_score)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_popularity_week ON product_popularity(week_score)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_popularity_total ON product_popularity(total_qty)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_popularity_hourly_score ON product_popularity_hourly(hour, score)")
+    if popularity_is_new:
+        # Tek seferlik: mevcut satış geçmişinden sayaçları kur
+        cursor.execute("INSERT OR IGNORE INTO schema_backfills(name) VALUES('product_popularity')")
+    conn.commit()
+
     # inventory_counts (sayım fişleri)
     cursor.execute("""
     CREATE TABLE IF NOT EXISTS inventory_counts(
@@ -313,4 +417,297 @@ def init_schema(conn, cursor):
       FOREIGN KEY (count_id) REFERENCES inventory_counts(id) ON DELETE CASCADE
     )""")
 
+    # Yıllık arşivler: kapanmış yılların satırları archive/archive_<yıl>.db dosyalarında,
+    # kayıtları ve günlük özetleri ana veritabanında
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS archive_periods(
+      year INTEGER PRIMARY KEY,
+      path TEXT NOT NULL,
+      sales_rows INTEGER DEFAULT 0,
+      cari_rows INTEGER DEFAULT 0,
+      movement_rows INTEGER DEFAULT 0,
+      expense_rows INTEGER DEFAULT 0,
+      archived_at TEXT
+    )""")
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS archive_sales_daily(
+      day TEXT NOT NULL,
+      payment_method TEXT NOT NULL,
+      revenue REAL DEFAULT 0,
+      cogs REAL DEFAULT 0,
+      lines INTEGER DEFAULT 0,
+      receipts INTEGER DEFAULT 0,
+      PRIMARY KEY (day, payment_method)
+    )""")
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS archive_cash_daily(
+      day TEXT PRIMARY KEY,
+      tahsilat REAL DEFAULT 0,
+      odeme REAL DEFAULT 0,
+      expenses REAL DEFAULT 0
+    )""")
+    # Arşivlenen günlerin ödeme türü başına net fiş ödemeleri (receipt_payments arşive taşınır)
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS archive_payments_daily(
+      day TEXT NOT NULL,
+      method TEXT NOT NULL,
+      amount_kurus INTEGER NOT NULL DEFAULT 0,
+      PRIMARY KEY (day, method)
+    ) WITHOUT ROWID""")
+
+    # Fiş numaraları: terminal ve gün başına boşluksuz sıra. Numara satışla aynı
+    # transaction'da alınır; görünen "FIS-..." metni tamsayılardan türetilir.
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS receipt_sequences(
+      terminal_id INTEGER NOT NULL,
+      day INTEGER NOT NULL,
+      last_no INTEGER NOT NULL DEFAULT 0,
+      PRIMARY KEY (terminal_id, day)
+    ) WITHOUT ROWID""")
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS receipts(
+      id INTEGER PRIMARY KEY AUTOINCREMENT,
+      terminal_id INTEGER NOT NULL,
+      day INTEGER NOT NULL,
+      no INTEGER NOT NULL,
+      legacy_fis_id TEXT,
+      created_at TEXT DEFAULT (datetime('now','localtime')),
+      UNIQUE (terminal_id, day, no)
+    )""")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_receipts_legacy ON receipts(legacy_fis_id) WHERE legacy_fis_id IS NOT NULL")
+    cursor.execute("PRAGMA table_info(receipts)")
+    if "customer_name" not in {c[1] for c in cursor.fetchall()}:
+        cursor.execute("ALTER TABLE receipts ADD COLUMN customer_name TEXT")
+        conn.commit()
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_receipts_created ON receipts(created_at)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_receipts_customer ON receipts(customer_name, created_at)")
+    cursor.execute("PRAGMA table_info(sales)")
+    if "receipt_id" not in {c[1] for c in cursor.fetchall()}:
+        cursor.execute("ALTER TABLE sales ADD COLUMN receipt_id INTEGER")
+        # Eski fişler terminal 0 altında, gün içindeki ilk satır sırasıyla numaralanır;
+        # eski rastgele numara legacy_fis_id olarak saklanır
+        cursor.execute("""
+            INSERT INTO receipts(terminal_id, day, no, legacy_fis_id, created_at)
+            SELECT 0, CAST(strftime('%Y%m%d', first_at) AS INTEGER),
+                   ROW_NUMBER() OVER (PARTITION BY date(first_at) ORDER BY first_at, fis_id),
+                   fis_id, first_at
+            FROM (SELECT fis_id, MIN(created_at) AS first_at FROM sales
+                  WHERE fis_id IS NOT NULL GROUP BY fis_id)
+        """)
+        cursor.execute("""
+            UPDATE sales SET receipt_id = r.id
+            FROM receipts r
+            WHERE r.legacy_fis_id = sales.fis_id
+        """)
+        conn.commit()
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_sales_receipt ON sales(receipt_id)")
+
+    # receipt_documents: üretilen fiş PDF'lerinin kaydı (ekran dosya sistemini taramaz)
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS receipt_documents(
+      id INTEGER PRIMARY KEY AUTOINCREMENT,
+      receipt_id INTEGER,
+      fis_id TEXT NOT NULL,
+      customer_name TEXT,
+      path TEXT NOT NULL UNIQUE,
+      size INTEGER DEFAULT 0,
+      hash TEXT NOT NULL,
+      created_at TEXT DEFAULT (datetime('now','localtime'))
+    )""")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_receipt_documents_receipt ON receipt_documents(receipt_id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_receipt_documents_hash ON receipt_documents(hash)")
+
+    # sale_intents: satış öncesi yazılan niyet kaydı (çökme sonrası kurtarma)
+    # pending -> satış ve cari kayıtları tamamlanınca done; satış hiç yazılmadıysa rolled_back;
+    # fiş iptal edildiyse canceled; cari adımı attempts kez hata verdiyse failed (bir daha denenmez)
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS sale_intents(
+      id INTEGER PRIMARY KEY AUTOINCREMENT,
+      status TEXT NOT NULL DEFAULT 'pending',
+      payload TEXT NOT NULL,
+      receipt_id INTEGER,
+      created_at TEXT DEFAULT (datetime('now','localtime')),
+      completed_at TEXT,
+      attempts INTEGER NOT NULL DEFAULT 0,
+      last_error TEXT
+    )""")
+    cursor.execute("PRAGMA table_info(sale_intents)")
+    have = {r[1] for r in cursor.fetchall()}
+    if "attempts" not in have:
+        cursor.execute("ALTER TABLE sale_intents ADD COLUMN attempts INTEGER NOT NULL DEFAULT 0")
+    if "last_error" not in have:
+        cursor.execute("ALTER TABLE sale_intents ADD COLUMN last_error TEXT")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_sale_intents_pending ON sale_intents(id) WHERE status='pending'")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_sale_intents_failed ON sale_intents(id) WHERE status='failed'")
+
+    # change_journal: kasanın merkeze gönderilecek değişiklikleri (yalnızca eklenir)
+    # terminal başına kesintisiz seq ile sıralanır; synced=1 merkez tarafından uygulandı
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS journal_sequences(
+      terminal_id INTEGER PRIMARY KEY,
+      last_seq INTEGER NOT NULL
+    )""")
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS change_journal(
+      terminal_id INTEGER NOT NULL,
+      seq INTEGER NOT NULL,
+      kind TEXT NOT NULL,
+      payload TEXT NOT NULL,
+      created_at TEXT DEFAULT (datetime('now','localtime')),
+      synced INTEGER NOT NULL DEFAULT 0,
+      PRIMARY KEY(terminal_id, seq)
+    ) WITHOUT ROWID""")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_change_journal_pending ON change_journal(terminal_id, seq) WHERE synced=0")
+
+    # Merkez tarafı: terminal başına en son uygulanan seq ve çakışma kayıtları
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS sync_state(
+      terminal_id INTEGER PRIMARY KEY,
+      last_seq INTEGER NOT NULL DEFAULT 0,
+      updated_at TEXT,
+      terminal_uuid TEXT
+    )""")
+    # terminal_uuid: terminal numarasını ilk gönderen kasanın kimliği; aynı numaralı ikinci kasa reddedilir
+    cursor.execute("PRAGMA table_info(sync_state)")
+    if "terminal_uuid" not in {r[1] for r in cursor.fetchall()}:
+        cursor.execute("ALTER TABLE sync_state ADD COLUMN terminal_uuid TEXT")
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS sync_conflicts(
+      id INTEGER PRIMARY KEY AUTOINCREMENT,
+      terminal_id INTEGER NOT NULL,
+      seq INTEGER NOT NULL,
+      kind TEXT NOT NULL,
+      detail TEXT,
+      created_at TEXT DEFAULT (datetime('now','localtime'))
+    )""")
+
+    # Para kolonlarının kuruş ikizleri (raporlar bunları tam sayı olarak toplar)
+    add_kurus_columns(cursor)
+
+    # receipt_payments: fişin ödeme kırılımı (nakit/kart/açık hesap), satışla aynı transaction'da yazılır.
+    # İptal/iade eksi tutarlı 'refund' satırıdır; kasa raporları satış satırlarına bakmadan buradan toplanır
+    cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='receipt_payments'")
+    payments_is_new = cursor.fetchone() is None
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS receipt_payments(
+      id INTEGER PRIMARY KEY AUTOINCREMENT,
+      receipt_id INTEGER NOT NULL,
+      fis_id TEXT,
+      method TEXT NOT NULL,
+      amount_kurus INTEGER NOT NULL,
+      kind TEXT NOT NULL DEFAULT 'sale',
+      created_at TEXT DEFAULT (datetime('now','localtime'))
+    )""")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_receipt_payments_receipt ON receipt_payments(receipt_id)")
+    # Gün/ödeme türü toplamları indeksten okunur (tabloya inilmez)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_receipt_payments_created ON receipt_payments(created_at, method, amount_kurus)")
+    if payments_is_new:
+        # Geçmiş fişler: satırlardaki ödeme türüyle tek ödeme (eski parçalı fişlerin kırılımı bilinmiyor)
+        cursor.execute("INSERT OR IGNORE INTO schema_backfills(name) VALUES('receipt_payments')")
+        conn.commit()
+
+    # Kasiyer ve vardiya damgası: satış, ödeme, cari hareket ve masraf yazılırken işlenir (pos/session).
+    # Vardiya kapanış raporu bu kolonlardaki indekslerden gruplu okunur, tarih aralığı taranmaz
+    for table in ("sales", "receipt_payments", "cari_hareketler", "expenses"):
+        cursor.execute(f"PRAGMA table_info({table})")
+        have = {r[1] for r in cursor.fetchall()}
+        for col in ("user_id", "shift_id"):
+            if col not in have:
+                cursor.execute(f"ALTER TABLE {table} ADD COLUMN {col} INTEGER")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_sales_shift ON sales(shift_id, user_id, canceled, quantity)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_receipt_payments_shift "
+                   "ON receipt_payments(shift_id, user_id, kind, method, receipt_id, amount_kurus)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_cari_hareketler_shift ON cari_hareketler(shift_id, islem_type, tutar_kurus)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_expenses_shift ON expenses(shift_id, amount_kurus)")
+    # Vardiya kasası: açılış, kapanışta sayılan ve beklenen nakit (kuruş)
+    cursor.execute("PRAGMA table_info(personnel_shifts)")
+    have = {r[1] for r in cursor.fetchall()}
+    for col in ("opening_kurus", "counted_kurus", "expected_kurus"):
+        if col not in have:
+            cursor.execute(f"ALTER TABLE personnel_shifts ADD COLUMN {col} INTEGER")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_personnel_shifts_open ON personnel_shifts(end_time, user_id)")
+    conn.commit()
+
+    # İadeler: satır/kısmi miktar iadesi. İade satırları sales'e eksi adet/tutarla yazılır
+    # (return_id -> sales_returns, return_of -> asıl satır), toplamlar kendiliğinden net çıkar
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS sales_returns(
+      id INTEGER PRIMARY KEY AUTOINCREMENT,
+      receipt_id INTEGER NOT NULL,
+      fis_id TEXT,
+      total_kurus INTEGER NOT NULL DEFAULT 0,
+      reason TEXT,
+      user_id INTEGER,
+      shift_id INTEGER,
+      created_at TEXT DEFAULT (datetime('now','localtime'))
+    )""")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_sales_returns_receipt ON sales_returns(receipt_id)")
+    cursor.execute("PRAGMA table_info(sales)")
+    have = {r[1] for r in cursor.fetchall()}
+    for col in ("return_id", "return_of"):
+        if col not in have:
+            cursor.execute(f"ALTER TABLE sales ADD COLUMN {col} INTEGER")
+    # Satırın iade edilen miktarı asıl satır id'sinden okunur (sadece iade satırları indekste)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_sales_return_of ON sales(return_of, canceled, quantity, total_kurus) "
+                   "WHERE return_of IS NOT NULL")
+    # Satıştan doğan cari kayıtları fişe bağlanır (iade/iptalde açık hesap borcu geri alınır)
+    cursor.execute("PRAGMA table_info(cari_hareketler)")
+    if "receipt_id" not in {r[1] for r in cursor.fetchall()}:
+        cursor.execute("ALTER TABLE cari_hareketler ADD COLUMN receipt_id INTEGER")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_cari_hareketler_receipt ON cari_hareketler(receipt_id) "
+                   "WHERE receipt_id IS NOT NULL")
+    conn.commit()
+
+    # sales_daily: gün/saat/ödeme türü başına satış özeti; sales_daily_products: gün başına ürün toplamları.
+    # Satış ve iptal ile aynı transaction'da güncellenir (canlı gösterge paneli ham satışları okumaz)
+    cursor.execute("PRAGMA table_info(sales_daily)")
+    daily_cols = {r[1] for r in cursor.fetchall()}
+    if daily_cols and "revenue_kurus" not in daily_cols:
+        # Eski REAL ciro kolonlu özet: türetilmiş veri, kuruş kolonlarıyla yeniden kurulur
+        cursor.execute("DROP TABLE sales_daily")
+        cursor.execute("DROP TABLE IF EXISTS sales_daily_products")
+    daily_is_new = "revenue_kurus" not in daily_cols
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS sales_daily(
+      day TEXT NOT NULL,
+      hour INTEGER NOT NULL,
+      payment_method TEXT NOT NULL,
+      receipts INTEGER NOT NULL DEFAULT 0,
+      items REAL NOT NULL DEFAULT 0,
+      revenue_kurus INTEGER NOT NULL DEFAULT 0,
+      returns INTEGER NOT NULL DEFAULT 0,
+      returns_kurus INTEGER NOT NULL DEFAULT 0,
+      PRIMARY KEY(day, hour, payment_method)
+    ) WITHOUT ROWID""")
+    if not daily_is_new and "returns" not in daily_cols:
+        # İade kolonları sonradan eklendi; öncesinde iade yoktu, sıfır doğru
+        cursor.execute("ALTER TABLE sales_daily ADD COLUMN returns INTEGER NOT NULL DEFAULT 0")
+        cursor.execute("ALTER TABLE sales_daily ADD COLUMN returns_kurus INTEGER NOT NULL DEFAULT 0")
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS sales_daily_products(
+      day TEXT NOT NULL,
+      product_name TEXT NOT NULL,
+      qty REAL NOT NULL DEFAULT 0,
+      revenue_kurus INTEGER NOT NULL DEFAULT 0,
+      PRIMARY KEY(day, product_name)
+    ) WITHOUT ROWID""")
+    if daily_is_new:
+        # Mevcut satış geçmişinden bir kez kur
+        cursor.execute("INSERT OR IGNORE INTO schema_backfills(name) VALUES('sales_daily')")
+
+    # table_versions: tablo başına değişim sayacı (tetikleyicilerle artar)
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS table_versions(
+      table_name TEXT PRIMARY KEY,
+      version INTEGER NOT NULL DEFAULT 0
+    )""")
+    for tbl in TRACKED_TABLES:
+        cursor.execute("INSERT OR IGNORE INTO table_versions(table_name, version) VALUES(?, 0)", (tbl,))
+        for op in ("INSERT", "UPDATE", "DELETE"):
+            cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_version_{tbl}_{op.lower()} AFTER {op} ON {tbl}
+            BEGIN
+              UPDATE table_versions SET version = version + 1 WHERE table_name = '{tbl}';
+            END""")
+
     conn.commit()
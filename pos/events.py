@@ -0,0 +1,163 @@
+"""Uygulama içi değişiklik olayları (ekranlar, önbellekler, panel).
+
+Servisler yazdıktan sonra konu ve etkilenen id'leri publish() ile kuyruğa
+atar; attach() kuyruğu Tk döngüsünde boşaltır ve aynı konunun id'lerini
+birleştirir. Başka bağlantıların yazımları PRAGMA data_version ile fark
+edilir ve TABLES_CHANGED olarak yayınlanır.
+"""
+import queue
+import threading
+from typing import Callable, Dict, Iterable, List, Optional
+
+SALE_COMMITTED = "sale_committed"     # receipt_id
+SALE_CANCELLED = "sale_cancelled"     # receipt_id
+SALE_RETURNED = "sale_returned"       # return_id (sales_returns)
+STOCK_CHANGED = "stock_changed"       # product id
+PRODUCT_UPDATED = "product_updated"   # product id (eklenen/güncellenen/silinen)
+CARI_POSTED = "cari_posted"           # cari id (hareket, bakiye veya kart değişikliği)
+TABLES_CHANGED = "tables_changed"     # tablo adı (başka bağlantıdan gelen yazım)
+
+POLL_MS = 50
+DATA_VERSION_POLL_MS = 1000
+
+
+class EventBus:
+    def __init__(self):
+        self._queue: "queue.Queue[tuple]" = queue.Queue()
+        self._subs: Dict[str, List[tuple]] = {}
+        self._lock = threading.Lock()
+        self._widget = None
+        self._conn = None
+        self._get_versions = None
+        self._data_version = None
+        self._versions: Dict[str, int] = {}
+        self.stats = {"published": 0, "delivered": 0, "external": 0}
+
+    def subscribe(self, topic: str, fn: Callable[[set], None], owner=None) -> Callable[[], None]:
+        """fn(ids) aboneliği ekle; dönen fonksiyon aboneliği kaldırır."""
+        entry = (fn, owner)
+        with self._lock:
+            self._subs.setdefault(topic, []).append(entry)
+
+        def unsubscribe():
+            with self._lock:
+                subs = self._subs.get(topic, [])
+                if entry in subs:
+                    subs.remove(entry)
+        return unsubscribe
+
+    def publish(self, topic: str, ids: Iterable) -> None:
+        with self._lock:
+            if not self._subs.get(topic):
+                return
+        ids = {i for i in ids if i is not None}
+        if ids:
+            self._queue.put((topic, ids))
+            self.stats["published"] += 1
+
+    # --- Tk tarafı ---
+    def attach(self, widget, conn=None, get_versions=None) -> None:
+        """Olayları bu widget'ın olay döngüsünde teslim et; conn verilirse dış yazımları izle."""
+        self._widget = widget
+        self._conn = conn
+        self._get_versions = get_versions
+        widget.after(POLL_MS, self._drain, widget)
+        if conn is not None and get_versions is not None:
+            self._data_version = self._read_data_version()
+            try:
+                self._versions = get_versions()
+            except Exception:
+                self._versions = {}
+            widget.after(DATA_VERSION_POLL_MS, self._watch, widget)
+
+    def _read_data_version(self) -> Optional[int]:
+        try:
+            return self._conn.execute("PRAGMA data_version").fetchone()[0]
+        except Exception:
+            return None
+
+    def _watch(self, widget) -> None:
+        if widget is not self._widget:
+            return
+        current = self._read_data_version()
+        if current is not None and current != self._data_version:
+            self._data_version = current
+            try:
+                versions = self._get_versions()
+            except Exception:
+                versions = None
+            if versions is not None:
+                changed = {tbl for tbl, v in versions.items() if self._versions.get(tbl) != v}
+                self._versions = versions
+                if changed:
+                    self.stats["external"] += 1
+                    self.publish(TABLES_CHANGED, changed)
+        try:
+            widget.after(DATA_VERSION_POLL_MS, self._watch, widget)
+        except Exception:
+            pass
+
+    def _resync_versions(self) -> None:
+        """Yerel yazımlar olaylarla teslim edildi: sürüm görüntüsünü ilerlet ki dış yazım sanılmasın.
+        data_version değiştiyse arada dış yazım var; o zaman _watch'a bırakılır."""
+        if self._get_versions is None or self._read_data_version() != self._data_version:
+            return
+        try:
+            self._versions = self._get_versions()
+        except Exception:
+            pass
+
+    def _drain(self, widget) -> None:
+        if widget is not self._widget:
+            return
+        merged: Dict[str, set] = {}
+        while True:
+            try:
+                topic, ids = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            merged.setdefault(topic, set()).update(ids)
+        if merged.keys() - {TABLES_CHANGED}:
+            self._resync_versions()
+        for topic, ids in merged.items():
+            with self._lock:
+                subs = list(self._subs.get(topic, ()))
+            for entry in subs:
+                fn, owner = entry
+                try:
+                    if owner is not None and not owner.winfo_exists():
+                        raise LookupError
+                except Exception:
+                    # Sahibi yok edilmiş ekran: aboneliği bırak
+                    with self._lock:
+                        if entry in self._subs.get(topic, []):
+                            self._subs[topic].remove(entry)
+                    continue
+                try:
+                    fn(ids)
+                    self.stats["delivered"] += 1
+                except Exception:
+                    pass
+        try:
+            widget.after(POLL_MS, self._drain, widget)
+        except Exception:
+            pass
+
+
+_bus: Optional[EventBus] = None
+
+
+def get_bus() -> EventBus:
+    """Uygulama genelindeki tek olay yolu."""
+    global _bus
+    if _bus is None:
+        _bus = EventBus()
+    return _bus
+
+
+def publish(topic: str, ids: Iterable) -> None:
+    get_bus().publish(topic, ids)
+
+
+def subscribe(topic: str, fn: Callable[[set], None], owner=None) -> Callable[[], None]:
+    return get_bus().subscribe(topic, fn, owner)
@@ -0,0 +1,251 @@
+"""Tanılama: SQL izi, repository süreleri, gecikme histogramları.
+
+enable() çağrılana kadar hiçbir şey kurulmaz (kapalıyken maliyet bir bayrak kontrolü).
+Açıkken attach() edilen bağlantılarda ifadeler sayılır, repository çağrıları zamanlanır,
+SLOW_MS'i aşanlar yavaş sorgu günlüğüne düşer.
+"""
+import functools
+import importlib
+import json
+import pkgutil
+import re
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+SLOW_MS = 20.0
+SLOW_LOG_SIZE = 100
+HISTOGRAM_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+
+_enabled = False
+_lock = threading.Lock()
+_local = threading.local()
+_conns: List = []
+_originals: Dict[tuple, Callable] = {}
+_sources: Dict[str, Callable[[], dict]] = {}
+
+_statements: Dict[str, dict] = {}   # normalized sql -> {count, timed, total_ms, max_ms}
+_repo_calls: Dict[str, dict] = {}   # module.func -> {count, total_ms, max_ms}
+_slow: deque = deque(maxlen=SLOW_LOG_SIZE)
+_histograms: Dict[str, List[int]] = {}
+
+_STR_RE = re.compile(r"'(?:[^']|'')*'")
+_NUM_RE = re.compile(r"\b\d+(?:\.\d+)?\b")
+_WS_RE = re.compile(r"\s+")
+
+
+def normalize(sql: str) -> str:
+    """Literal değerleri ? yap, boşlukları sadeleştir (istatistik anahtarı)."""
+    sql = _STR_RE.sub("?", sql)
+    sql = _NUM_RE.sub("?", sql)
+    return _WS_RE.sub(" ", sql).strip()
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+# --- SQL trace ---
+def _close_pending(now: float) -> None:
+    """Çağrı içindeki son ifadenin süresini kapat."""
+    pending = getattr(_local, "pending", None)
+    if pending is None:
+        return
+    _local.pending = None
+    sql, started = pending
+    ms = (now - started) * 1000.0
+    key = normalize(sql)
+    with _lock:
+        st = _statements.setdefault(key, {"count": 0, "timed": 0, "total_ms": 0.0, "max_ms": 0.0})
+        st["timed"] += 1
+        st["total_ms"] += ms
+        st["max_ms"] = max(st["max_ms"], ms)
+        if ms >= SLOW_MS:
+            _slow.append({"kind": "statement", "sql": sql, "ms": round(ms, 2),
+                          "at": datetime.now().isoformat(timespec="seconds")})
+
+
+def _on_trace(sql: str) -> None:
+    now = time.perf_counter()
+    key = normalize(sql)
+    with _lock:
+        st = _statements.setdefault(key, {"count": 0, "timed": 0, "total_ms": 0.0, "max_ms": 0.0})
+        st["count"] += 1
+    if getattr(_local, "depth", 0) > 0:
+        _close_pending(now)
+        _local.pending = (sql, now)
+        _local.call_sql.append(sql)
+
+
+def attach(conn) -> None:
+    """Bağlantıyı izlemeye al (etkin değilse sadece kaydeder)."""
+    if conn not in _conns:
+        _conns.append(conn)
+    if _enabled:
+        conn.set_trace_callback(_on_trace)
+
+
+# --- repository zamanlayıcıları ---
+def _wrap(qualname: str, fn: Callable) -> Callable:
+    @functools.wraps(fn)
+    def timed(*args, **kwargs):
+        depth = getattr(_local, "depth", 0)
+        if depth == 0:
+            _local.call_sql = []
+            _local.pending = None
+        _local.depth = depth + 1
+        started = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            now = time.perf_counter()
+            _local.depth = depth
+            ms = (now - started) * 1000.0
+            if depth == 0:
+                _close_pending(now)
+            with _lock:
+                rc = _repo_calls.setdefault(qualname, {"count": 0, "total_ms": 0.0, "max_ms": 0.0})
+                rc["count"] += 1
+                rc["total_ms"] += ms
+                rc["max_ms"] = max(rc["max_ms"], ms)
+                if depth == 0 and ms >= SLOW_MS:
+                    _slow.append({"kind": "repository", "name": qualname, "ms": round(ms, 2),
+                                  "sql": "; ".join(_local.call_sql[-5:]),
+                                  "at": datetime.now().isoformat(timespec="seconds")})
+    timed.__wrapped_original__ = fn
+    return timed
+
+
+def _repository_modules():
+    import repositories
+    for info in pkgutil.iter_modules(repositories.__path__):
+        yield importlib.import_module(f"repositories.{info.name}")
+
+
+def _patch_repositories() -> None:
+    for mod in _repository_modules():
+        for name, obj in list(vars(mod).items()):
+            if name.startswith("_") or not callable(obj) or getattr(obj, "__module__", None) != mod.__name__:
+                continue
+            if isinstance(obj, type):
+                continue
+            _originals[(mod.__name__, name)] = obj
+            setattr(mod, name, _wrap(f"{mod.__name__.split('.')[-1]}.{name}", obj))
+
+
+def _unpatch_repositories() -> None:
+    for (mod_name, name), fn in _originals.items():
+        setattr(importlib.import_module(mod_name), name, fn)
+    _originals.clear()
+
+
+# --- açma/kapama ---
+def enable() -> None:
+    global _enabled
+    if _enabled:
+        return
+    _enabled = True
+    _patch_repositories()
+    for conn in _conns:
+        conn.set_trace_callback(_on_trace)
+
+
+def disable() -> None:
+    global _enabled
+    if not _enabled:
+        return
+    _enabled = False
+    for conn in _conns:
+        try:
+            conn.set_trace_callback(None)
+        except Exception:
+            pass
+    _unpatch_repositories()
+
+
+def reset() -> None:
+    with _lock:
+        _statements.clear()
+        _repo_calls.clear()
+        _slow.clear()
+        _histograms.clear()
+
+
+# --- histogramlar ve dış kaynaklar ---
+def observe(name: str, ms: float) -> None:
+    """Gecikme ölçümü ekle (ör. 'checkout_total'). Kapalıyken hiçbir şey yapmaz."""
+    if not _enabled:
+        return
+    idx = len(HISTOGRAM_BUCKETS_MS)
+    for i, upper in enumerate(HISTOGRAM_BUCKETS_MS):
+        if ms <= upper:
+            idx = i
+            break
+    with _lock:
+        counts = _histograms.setdefault(name, [0] * (len(HISTOGRAM_BUCKETS_MS) + 1))
+        counts[idx] += 1
+
+
+def register_source(name: str, fn: Callable[[], dict]) -> None:
+    """Anlık görüntüye eklenecek dış ölçüm kaynağı (ör. ekran süreleri)."""
+    _sources[name] = fn
+
+
+def explain(cursor, sql: str) -> Optional[List[str]]:
+    if not sql.lstrip().upper().startswith(("SELECT", "WITH")):
+        return None
+    try:
+        cursor.execute("EXPLAIN QUERY PLAN " + sql)
+        return [str(r[-1]) for r in cursor.fetchall()]
+    except Exception as e:
+        return [f"(plan alınamadı: {e})"]
+
+
+def snapshot(cursor=None, top: int = 50) -> dict:
+    """Tüm ölçümlerin JSON'a uygun özeti; cursor verilirse yavaş SELECT'lere plan eklenir."""
+    with _lock:
+        statements = sorted(_statements.items(), key=lambda kv: kv[1]["total_ms"], reverse=True)[:top]
+        repo_calls = sorted(_repo_calls.items(), key=lambda kv: kv[1]["total_ms"], reverse=True)[:top]
+        slow = list(_slow)
+        histograms = {k: list(v) for k, v in _histograms.items()}
+
+    labels = [f"<={b}ms" for b in HISTOGRAM_BUCKETS_MS] + [f">{HISTOGRAM_BUCKETS_MS[-1]}ms"]
+    out = {
+        "enabled": _enabled,
+        "generated_at": datetime.now().isoformat(timespec="seconds"),
+        "slow_ms": SLOW_MS,
+        "statements": [
+            {"sql": sql, "count": st["count"], "timed": st["timed"], "total_ms": round(st["total_ms"], 2),
+             "avg_ms": round(st["total_ms"] / st["timed"], 3) if st["timed"] else None,
+             "max_ms": round(st["max_ms"], 2)}
+            for sql, st in statements
+        ],
+        "repository_calls": [
+            {"name": name, "count": rc["count"], "total_ms": round(rc["total_ms"], 2),
+             "avg_ms": round(rc["total_ms"] / rc["count"], 3) if rc["count"] else 0.0,
+             "max_ms": round(rc["max_ms"], 2)}
+            for name, rc in repo_calls
+        ],
+        "slow_queries": [],
+        "histograms": {name: dict(zip(labels, counts)) for name, counts in histograms.items()},
+        "sources": {},
+    }
+    for entry in slow:
+        entry = dict(entry)
+        if cursor is not None and entry.get("kind") == "statement":
+            entry["plan"] = explain(cursor, entry["sql"])
+        out["slow_queries"].append(entry)
+    for name, fn in _sources.items():
+        try:
+            out["sources"][name] = fn()
+        except Exception as e:
+            out["sources"][name] = {"error": str(e)}
+    return out
+
+
+def export_json(path: str, cursor=None) -> str:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(snapshot(cursor), f, ensure_ascii=False, indent=2)
+    return path
@@ -0,0 +1,112 @@
+"""Repository okumaları için önbellek; tablo sürüm sayaçlarıyla geçersiz olur.
+
+Anahtar: fonksiyon, argümanlar ve bağlı tabloların table_versions değeri.
+Başka süreçlerin yazımları da sürümü artırır; eski anahtarlar LRU'dan düşer.
+Açık yazma transaction'ı varken önbellek kullanılmaz.
+"""
+import functools
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Sequence
+
+from repositories import table_version_repository as version_repo
+
+MAX_ENTRIES = 256
+
+
+class QueryCache:
+    def __init__(self, max_entries: int = MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[tuple, object]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._counts = {"hits": 0, "misses": 0, "bypassed": 0, "evictions": 0}
+        self._by_name: Dict[str, list] = {}   # okuma adı -> [isabet, kaçırma]
+
+    def get(self, cursor, name: str, args: tuple, tables: Sequence[str], loader: Callable[[], object]):
+        """Önbellekteki sonucu döndür; yoksa loader() ile yükleyip sakla."""
+        if cursor.connection.in_transaction:
+            return self._bypass(loader)
+        try:
+            db_file, versions = version_repo.get_for(cursor, tables)
+        except sqlite3.Error:
+            # Şeması eski veritabanı (table_versions yok): önbelleksiz çalış
+            return self._bypass(loader)
+        if len(versions) != len(tables):
+            return self._bypass(loader)
+        key = (db_file, name, args, tuple(versions[tbl] for tbl in tables))
+        with self._lock:
+            stats = self._by_name.setdefault(name, [0, 0])
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self._counts["hits"] += 1
+                stats[0] += 1
+                return self._copy(self._entries[key])
+            self._counts["misses"] += 1
+            stats[1] += 1
+        value = loader()
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._counts["evictions"] += 1
+        return self._copy(value)
+
+    def _bypass(self, loader):
+        with self._lock:
+            self._counts["bypassed"] += 1
+        return loader()
+
+    @staticmethod
+    def _copy(value):
+        # Çağıran listeyi değiştirse de önbellekteki kopya bozulmasın
+        return list(value) if isinstance(value, list) else value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        """İsabet oranı ve sayaçlar (tanılama ekranı ve JSON dökümü için)."""
+        with self._lock:
+            lookups = self._counts["hits"] + self._counts["misses"]
+            return {
+                **self._counts,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hit_rate": round(self._counts["hits"] / lookups, 4) if lookups else 0.0,
+                "queries": {name: {"hits": h, "misses": m, "hit_rate": round(h / (h + m), 4) if h + m else 0.0}
+                            for name, (h, m) in sorted(self._by_name.items())},
+            }
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            for k in self._counts:
+                self._counts[k] = 0
+            self._by_name.clear()
+
+
+_cache: Optional[QueryCache] = None
+
+
+def get_cache() -> QueryCache:
+    """Uygulama genelindeki tek sorgu önbelleği."""
+    global _cache
+    if _cache is None:
+        _cache = QueryCache()
+    return _cache
+
+
+def cached(*tables: str):
+    """Repository okumasını önbelleğe al: fn(cursor, *args) ve bağlı olduğu tablolar."""
+    def decorator(fn):
+        name = f"{fn.__module__.split('.')[-1]}.{fn.__name__}"
+
+        @functools.wraps(fn)
+        def wrapper(cursor, *args, **kwargs):
+            key = args + tuple(sorted(kwargs.items()))
+            return get_cache().get(cursor, name, key, tables, lambda: fn(cursor, *args, **kwargs))
+        wrapper.uncached = fn
+        return wrapper
+    return decorator
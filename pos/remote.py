@@ -0,0 +1,163 @@
+"""Kasa tarafı istemci: yerel POS sunucusuna (pos.server) bağlantı havuzu.
+
+Bağlantılar açık tutulur ve paylaşılır; batch() birden çok çağrıyı tek çerçevede
+gönderir. Bağlanamazsa bir kez yeniden denenir; istek gittikten sonra kopan bağlantıda denenmez.
+
+    cs = remote.service(remote.get_client("127.0.0.1:8765"), "cari")  # cari_service ile aynı çağrı biçimi
+"""
+import itertools
+import json
+import queue
+import socket
+import sqlite3
+import threading
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from pos.server import DEFAULT_PORT
+
+CONNECT_TIMEOUT = 3.0
+REQUEST_TIMEOUT = 30.0
+
+
+class RemoteError(RuntimeError):
+    """Sunucuda çalışan servis fonksiyonunun hatası."""
+
+
+class RemoteValueError(RemoteError, ValueError):
+    """Servisin ValueError'ı (ör. 'receipt_archived'): mesajı yerel çağrıdaki gibi anahtardır."""
+
+
+def parse_address(address: str) -> Tuple[str, int]:
+    host, _, port = str(address).strip().rpartition(":")
+    if not host:
+        return port or "127.0.0.1", DEFAULT_PORT
+    return host, int(port)
+
+
+class _Conn:
+    __slots__ = ("sock", "rfile")
+
+    def __init__(self, host: str, port: int):
+        self.sock = socket.create_connection((host, port), timeout=CONNECT_TIMEOUT)
+        self.sock.settimeout(REQUEST_TIMEOUT)
+        self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.rfile = self.sock.makefile("rb")
+
+    def request(self, frame: dict) -> dict:
+        self.sock.sendall(json.dumps(frame, ensure_ascii=False).encode("utf-8") + b"\n")
+        line = self.rfile.readline()
+        if not line:
+            raise ConnectionError("sunucu bağlantıyı kapattı")
+        return json.loads(line)
+
+    def close(self) -> None:
+        try:
+            self.rfile.close()
+            self.sock.close()
+        except OSError:
+            pass
+
+
+class Client:
+    def __init__(self, address: str, pool_size: int = 4):
+        self.address = address
+        self.host, self.port = parse_address(address)
+        self._idle: "queue.LifoQueue[_Conn]" = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(pool_size)
+        self._ids = itertools.count(1)
+        self.connects = 0
+        self.frames = 0
+
+    def _connect(self) -> _Conn:
+        try:
+            c = _Conn(self.host, self.port)
+        except OSError:
+            c = _Conn(self.host, self.port)
+        self.connects += 1
+        return c
+
+    def batch(self, calls: Iterable[Sequence]) -> List[dict]:
+        """[(op, args, kwargs), ...] -> sunucunun çağrı başına sonuçları ({"ok", "value"/"error"})."""
+        frame = {"id": next(self._ids), "calls": [[c[0], list(c[1]) if len(c) > 1 else [], c[2] if len(c) > 2 else {}]
+                                                  for c in calls]}
+        with self._slots:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                conn = self._connect()
+            try:
+                reply = conn.request(frame)
+            except BaseException:
+                conn.close()
+                raise
+            self._idle.put(conn)
+        self.frames += 1
+        if "error" in reply:
+            raise RemoteError(reply["error"])
+        return reply["results"]
+
+    def call(self, op: str, *args, **kwargs):
+        result = self.batch([(op, args, kwargs)])[0]
+        if not result.get("ok"):
+            error = result.get("error") or ""
+            if error.startswith("ValueError: "):
+                raise RemoteValueError(error[len("ValueError: "):])
+            raise RemoteError(error)
+        return result.get("value")
+
+    def ping(self) -> bool:
+        return self.call("ping") == "pong"
+
+    def close(self) -> None:
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+
+
+class ServiceProxy:
+    """Servis modülünün uzak karşılığı: (conn, cursor) argümanları atlanır."""
+
+    def __init__(self, client: Client, prefix: str):
+        self._client = client
+        self._prefix = prefix
+
+    def __getattr__(self, name: str):
+        def call(*args, **kwargs):
+            while args and isinstance(args[0], (sqlite3.Connection, sqlite3.Cursor)):
+                args = args[1:]
+            return self._client.call(f"{self._prefix}.{name}", *args, **kwargs)
+        call.__name__ = name
+        return call
+
+
+def service(client: Client, prefix: str) -> ServiceProxy:
+    return ServiceProxy(client, prefix)
+
+
+_clients: Dict[str, Client] = {}
+_clients_lock = threading.Lock()
+
+
+def get_client(address: str) -> Client:
+    with _clients_lock:
+        c = _clients.get(address)
+        if c is None:
+            c = _clients[address] = Client(address)
+        return c
+
+
+def configured_client(cursor) -> Optional[Client]:
+    """settings.pos_server doluysa o sunucunun istemcisi; boşsa None (yerel veritabanı)."""
+    cursor.execute("SELECT value FROM settings WHERE key='pos_server'")
+    r = cursor.fetchone()
+    address = (r[0] if r else "") or ""
+    return get_client(address.strip()) if address.strip() else None
+
+
+def close_all() -> None:
+    with _clients_lock:
+        for c in _clients.values():
+            c.close()
+        _clients.clear()
@@ -0,0 +1,223 @@
+"""Yerel POS sunucusu (çok kasalı mod, isteğe bağlı).
+
+Mağazadaki tek veritabanının sahibi bu süreçtir; kasalar servis çağrılarını satır başına
+bir JSON çerçeve olarak TCP üzerinden gönderir (pos.remote). Çerçeve tek transaction'dır:
+bir çağrı hata verirse tamamı geri alınır. Veritabanı işleri tek iş parçacığında seri yürür.
+
+    python -m pos.server --db database.db --port 8765
+"""
+import argparse
+import asyncio
+import inspect
+import json
+import sqlite3
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Tuple
+
+from core.money import Money
+from pos.db_handler import DB_PATH_DEFAULT, init_schema
+from services import cari_service as cari_svc
+from services import customer_lookup_service as lookup
+from services import migration_service
+from services import product_service as product_svc
+from services import receipt_service as receipt_svc
+from services import returns_service as returns_svc
+from services import sale_intent_service as intent_svc
+from services import sales_service as sales_svc
+from services import sync_service as sync_svc
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+# Tek çerçeve üst sınırı (StreamReader satır sınırı)
+MAX_FRAME = 16 * 1024 * 1024
+
+# Dışarı açılan servis fonksiyonları ("modül.fonksiyon")
+EXPORTS = {
+    "product": (product_svc, ("list_products", "get_by_barcode", "get_by_id", "get_price_stock_by_name",
+                              "list_by_ids", "decrement_stock", "increment_stock")),
+    "sales": (sales_svc, ("checkout", "get_receipt_lines", "get_last_receipt", "list_recent_receipts",
+                          "list_receipts_between", "cancel_receipt")),
+    # Satış + cari kayıtları tek çağrıda (tek çerçeve, tek transaction)
+    "intent": (intent_svc, ("post_sale",)),
+    "returns": (returns_svc, ("get_returnable", "return_lines", "list_returns")),
+    "cari": (cari_svc, ("list_all", "search_by_name", "get_by_id", "get_by_name", "lookup_customers",
+                        "add_cari", "add_tahsilat", "add_odeme", "add_borc", "add_alacak", "list_hareketler")),
+    "receipt": (receipt_svc, ("label", "find")),
+    # Çevrimdışı kasaların günlük partileri (services.sync_service)
+    "sync": (sync_svc, ("apply_batch", "stock_levels")),
+}
+
+
+def build_ops() -> Dict[str, Tuple[Callable, int]]:
+    """op adı -> (fonksiyon, başa eklenecek bağlantı argümanı sayısı: 2=conn,cursor / 1=cursor)."""
+    ops = {}
+    for prefix, (module, names) in EXPORTS.items():
+        for name in names:
+            fn = getattr(module, name)
+            params = list(inspect.signature(fn).parameters)
+            handles = 2 if params[:2] == ["conn", "cursor"] else 1 if params[:1] == ["cursor"] else 0
+            ops[f"{prefix}.{name}"] = (fn, handles)
+    return ops
+
+
+def _jsonable(value):
+    if isinstance(value, (list, tuple)):
+        return [_jsonable(v) for v in value]
+    if isinstance(value, sqlite3.Row):
+        return [_jsonable(v) for v in tuple(value)]
+    if isinstance(value, Money):
+        return float(value)
+    return value
+
+
+class _FrameConnection:
+    """Çerçeve boyunca servislerin commit/rollback'ini erteleyen bağlantı sarmalayıcı."""
+
+    def __init__(self, conn):
+        self._conn = conn
+        self.rollback_requested = False
+
+    def commit(self) -> None:
+        pass
+
+    def rollback(self) -> None:
+        # Servis kendi işini geri almak istedi: çerçevenin tamamı geri alınır
+        self.rollback_requested = True
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+
+class POSServer:
+    def __init__(self, db_path: str = DB_PATH_DEFAULT, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT):
+        self.db_path = db_path
+        self.host, self.port = host, port
+        self.ops = build_ops()
+        self.db = ThreadPoolExecutor(max_workers=1, thread_name_prefix="pos-server-db")
+        self.conn = None
+        self.cursor = None
+        self.server = None
+        self.stats = {"connections": 0, "frames": 0, "calls": 0, "errors": 0}
+
+    def _open(self) -> None:
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self.cursor = self.conn.cursor()
+        init_schema(self.conn, self.cursor)
+        migration_service.run(self.conn, self.cursor)
+
+    def _close(self) -> None:
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = self.cursor = None
+
+    def _call(self, conn, op: str, args, kwargs) -> dict:
+        entry = self.ops.get(op)
+        if entry is None:
+            return {"ok": False, "error": f"KeyError: bilinmeyen işlem {op}"}
+        fn, handles = entry
+        head = (conn, self.cursor)[2 - handles:] if handles else ()
+        try:
+            return {"ok": True, "value": _jsonable(fn(*head, *(args or ()), **(kwargs or {})))}
+        except Exception as e:
+            return {"ok": False, "error": f"{type(e).__name__}: {e}"}
+
+    def _run_frame(self, calls) -> list:
+        self.stats["calls"] += len(calls)
+        conn = _FrameConnection(self.conn)
+        results, error = [], None
+        for call in calls:
+            op, args, kwargs = (list(call) + [None, None])[:3]
+            if error is not None:
+                results.append({"ok": False, "error": f"skipped: {error}"})
+                continue
+            if op == "ping":
+                results.append({"ok": True, "value": "pong"})
+                continue
+            result = self._call(conn, op, args, kwargs)
+            if not result["ok"]:
+                error = result["error"]
+            elif conn.rollback_requested:
+                error = f"{op}: rolled back"
+            results.append(result)
+        if error is None:
+            if self.conn.in_transaction:
+                self.conn.commit()
+            return results
+        # Ya hepsi ya hiçbiri: başarılı görünen çağrılar da geri alındı
+        if self.conn.in_transaction:
+            self.conn.rollback()
+        # Geri alınan çerçevede eklenen cari arama indeksine girmiş olabilir
+        lookup.invalidate()
+        self.stats["errors"] += 1
+        return [r if not r["ok"] else {"ok": False, "error": f"rolled back: {error}"} for r in results]
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.stats["connections"] += 1
+        loop = asyncio.get_running_loop()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    frame = json.loads(line)
+                    calls = frame.get("calls") or []
+                except (ValueError, AttributeError) as e:
+                    frame, calls = {}, None
+                    reply = {"id": None, "error": f"bad frame: {e}"}
+                if calls is not None:
+                    self.stats["frames"] += 1
+                    results = await loop.run_in_executor(self.db, self._run_frame, calls)
+                    reply = {"id": frame.get("id"), "results": results}
+                writer.write(json.dumps(reply, ensure_ascii=False).encode("utf-8") + b"\n")
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self) -> "POSServer":
+        await asyncio.get_running_loop().run_in_executor(self.db, self._open)
+        self.server = await asyncio.start_server(self._handle, self.host, self.port, limit=MAX_FRAME)
+        self.port = self.server.sockets[0].getsockname()[1]
+        return self
+
+    async def serve_forever(self) -> None:
+        if self.server is None:
+            await self.start()
+        async with self.server:
+            await self.server.serve_forever()
+
+    async def stop(self) -> None:
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        await asyncio.get_running_loop().run_in_executor(self.db, self._close)
+        self.db.shutdown(wait=True)
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="SmartPOS local server")
+    ap.add_argument("--db", default=DB_PATH_DEFAULT)
+    ap.add_argument("--host", default=DEFAULT_HOST)
+    ap.add_argument("--port", type=int, default=DEFAULT_PORT)
+    args = ap.parse_args(argv)
+
+    async def run():
+        server = await POSServer(args.db, args.host, args.port).start()
+        print(f"listening on {args.host}:{server.port} ({args.db})", flush=True)
+        try:
+            await server.serve_forever()
+        finally:
+            await server.stop()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,50 @@
+"""Kasadaki oturum: giriş yapan kasiyer ve açık vardiya.
+
+Servisler satış, ödeme, cari ve masraf satırlarına stamp() ile user_id/shift_id yazar;
+vardiya kapanış raporu bu indeksli kolonlardan gruplanır. Senkron ve açılıştaki kurtarma damgalamaz.
+"""
+import threading
+from typing import Optional, Tuple
+
+from repositories import personnel_repository as personnel_repo
+
+_lock = threading.Lock()
+_user_id: Optional[int] = None
+_shift_id: Optional[int] = None
+
+
+def login(cursor, username: str) -> Tuple[Optional[int], Optional[int]]:
+    """Girişte kasiyeri ve açık vardiyayı belirle."""
+    global _user_id
+    cursor.execute("SELECT id FROM users WHERE username=?", (username,))
+    row = cursor.fetchone()
+    with _lock:
+        _user_id = int(row[0]) if row else None
+    return refresh(cursor)
+
+
+def refresh(cursor) -> Tuple[Optional[int], Optional[int]]:
+    """Vardiya açılıp kapandığında açık vardiyayı yeniden oku."""
+    global _shift_id
+    shift = personnel_repo.get_open_shift(cursor, _user_id) if _user_id is not None else None
+    with _lock:
+        _shift_id = int(shift[0]) if shift else None
+        return _user_id, _shift_id
+
+
+def logout() -> None:
+    global _user_id, _shift_id
+    with _lock:
+        _user_id = _shift_id = None
+
+
+def current() -> Tuple[Optional[int], Optional[int]]:
+    with _lock:
+        return _user_id, _shift_id
+
+
+def stamp(user_id: Optional[int] = None, shift_id: Optional[int] = None) -> Tuple[Optional[int], Optional[int]]:
+    """Yazılacak (user_id, shift_id): açıkça verilmişse o (uzak kasa), yoksa oturumdaki."""
+    if user_id is None and shift_id is None:
+        return current()
+    return user_id, shift_id
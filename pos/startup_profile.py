@@ -0,0 +1,45 @@
+"""Açılış profili: `python main.py --profile-startup`.
+
+Modülün yüklenmesinden adlandırılmış işaretlere geçen süreyi kaydeder, giriş
+penceresinin ilk çiziminde tek satır JSON basıp çıkar. Kapalıyken yalnız bayrak kontrolü.
+"""
+import json
+import sys
+import time
+
+_T0 = time.perf_counter()
+_marks = []
+
+FLAG = "--profile-startup"
+# Girişte yüklenmemesi gereken ağır modüller
+HEAVY_MODULES = ("reportlab", "escpos")
+
+
+def enabled() -> bool:
+    return FLAG in sys.argv
+
+
+def mark(name: str) -> None:
+    if enabled():
+        _marks.append((name, (time.perf_counter() - _T0) * 1000.0))
+
+
+def report() -> dict:
+    return {
+        "marks_ms": {name: round(ms, 2) for name, ms in _marks},
+        "heavy_modules_loaded": sorted(m for m in HEAVY_MODULES if m in sys.modules),
+        "module_count": len(sys.modules),
+    }
+
+
+def finish(window) -> None:
+    """İlk çizimden sonra raporu yazdır ve pencereyi kapat."""
+    def _done():
+        try:
+            window.update_idletasks()
+        except Exception:
+            pass
+        mark("first_paint")
+        print(json.dumps(report()), flush=True)
+        window.after(0, window.destroy)
+    window.after_idle(_done)
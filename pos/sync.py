@@ -0,0 +1,140 @@
+"""Kasa değişiklik günlüğünün arka plan senkronu (çevrimdışı öncelikli mod).
+
+settings.sync_target varsa tek iş parçacığı kendi bağlantısıyla bekleyen kayıtları
+sync_interval_seconds'ta bir ve her satıştan sonra merkeze gönderir; hata olursa
+kayıtlar bekler, satış yerel veritabanında sürer.
+
+    python -m pos.sync status | push [--target tcp://10.0.0.5:8765 | --target central.db]
+"""
+import argparse
+import json
+import queue
+import sqlite3
+import sys
+import threading
+import time
+from typing import Optional
+
+from pos.db_handler import DB_PATH_DEFAULT
+from repositories import journal_repository as journal_repo
+from services import receipt_service as receipt_svc
+from services import sync_service as sync_svc
+
+DEFAULT_INTERVAL_S = 30
+
+
+def load_interval(cursor) -> float:
+    cursor.execute("SELECT value FROM settings WHERE key='sync_interval_seconds'")
+    r = cursor.fetchone()
+    try:
+        return max(1.0, float(r[0])) if r else DEFAULT_INTERVAL_S
+    except (TypeError, ValueError):
+        return DEFAULT_INTERVAL_S
+
+
+class SyncWorker:
+    def __init__(self, db_path: str = DB_PATH_DEFAULT):
+        self.db_path = db_path
+        self._requests: "queue.Queue[Optional[str]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        # UI tarafından okunur
+        self.status = {"pending": 0, "last_ok": None, "last": None, "error": None}
+
+    def _sync_once(self, conn, cursor) -> None:
+        try:
+            totals = sync_svc.sync(conn, cursor)
+            with self._lock:
+                self.status.update(last_ok=time.strftime("%Y-%m-%d %H:%M:%S"), last=totals, error=None)
+        except Exception as e:
+            # Merkez erişilemez: kayıtlar bekler
+            if conn.in_transaction:
+                conn.rollback()
+            with self._lock:
+                self.status["error"] = str(e)
+        finally:
+            with self._lock:
+                self.status["pending"] = journal_repo.count_pending(cursor, receipt_svc.get_terminal_id(cursor))
+
+    def _run(self) -> None:
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        cursor = conn.cursor()
+        try:
+            while True:
+                if not sync_svc.get_target(cursor):
+                    reason = self._requests.get()
+                else:
+                    try:
+                        reason = self._requests.get(timeout=load_interval(cursor))
+                    except queue.Empty:
+                        reason = "scheduled"
+                if reason is None:
+                    break
+                # Art arda gelen istekler tek gönderimde birleşir
+                while True:
+                    try:
+                        if self._requests.get_nowait() is None:
+                            return
+                    except queue.Empty:
+                        break
+                if sync_svc.get_target(cursor):
+                    self._sync_once(conn, cursor)
+        finally:
+            conn.close()
+
+    def start(self) -> "SyncWorker":
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="journal-sync", daemon=True)
+            self._thread.start()
+        return self
+
+    def request(self) -> None:
+        """Satış sonrası: bekleyen kayıtları hemen göndermeyi dene."""
+        if self._thread is not None and self._thread.is_alive():
+            self._requests.put("sale")
+
+    def shutdown(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            self._requests.put(None)
+            self._thread.join(timeout=5.0)
+        self._thread = None
+
+
+_worker: Optional[SyncWorker] = None
+
+
+def get_worker() -> SyncWorker:
+    global _worker
+    if _worker is None:
+        _worker = SyncWorker()
+    return _worker
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="SmartPOS journal sync")
+    ap.add_argument("--db", default=DB_PATH_DEFAULT)
+    sub = ap.add_subparsers(dest="command", required=True)
+    sub.add_parser("status", help="pending journal entries")
+    p_push = sub.add_parser("push", help="push pending entries now")
+    p_push.add_argument("--target", default=None)
+    args = ap.parse_args(argv)
+
+    conn = sqlite3.connect(args.db, timeout=30)
+    cursor = conn.cursor()
+    try:
+        terminal_id = receipt_svc.get_terminal_id(cursor)
+        if args.command == "status":
+            print(json.dumps({"terminal_id": terminal_id, "target": sync_svc.get_target(cursor),
+                              "pending": journal_repo.count_pending(cursor, terminal_id)}, indent=2))
+        else:
+            print(json.dumps(sync_svc.sync(conn, cursor, args.target), indent=2))
+    except (OSError, ValueError, RuntimeError, sqlite3.DatabaseError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    finally:
+        conn.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,3 +1,12 @@
 # Receipt generation and printing package
-from .pdf_generator import print_receipt
-from .thermal_printer import print_thermal_receipt
+# ReportLab / escpos are heavy; the implementations are imported on first use.
+
+
+def print_receipt(*args, **kwargs):
+    from .pdf_generator import print_receipt as _print_receipt
+    return _print_receipt(*args, **kwargs)
+
+
+def print_thermal_receipt(*args, **kwargs):
+    from .thermal_printer import print_thermal_receipt as _print_thermal_receipt
+    return _print_thermal_receipt(*args, **kwargs)
@@ -0,0 +1,59 @@
+"""ESC/POS komut tamponu.
+
+Fişin tamamı tek bytearray'e kodlanır ve yazıcıya tek seferde gönderilir;
+Türkçe karakterler seçilen kod sayfasıyla kodlanır (ESC t n).
+"""
+
+ESC = b"\x1b"
+GS = b"\x1d"
+
+# Python codec adı -> ESC t numarası (Epson tablosu)
+CODEPAGES = {
+    "cp857": 13,   # PC857 Türkçe (DOS)
+    "cp1254": 48,  # WPC1254 Türkçe (Windows)
+}
+DEFAULT_CODEPAGE = "cp857"
+
+# Kod sayfalarında olmayan karakterler
+_REPLACEMENTS = {"₺": "TL", "€": "EUR", "–": "-", "—": "-", "’": "'", "“": '"', "”": '"'}
+
+_ALIGN = {"left": 0, "center": 1, "right": 2}
+
+
+class EscPosBuffer:
+    def __init__(self, codepage: str = DEFAULT_CODEPAGE):
+        if codepage not in CODEPAGES:
+            raise ValueError(f"Desteklenmeyen kod sayfası: {codepage}")
+        self.codepage = codepage
+        self.buf = bytearray()
+        # ESC @ (sıfırla) + ESC t n (kod sayfası)
+        self.buf += ESC + b"@" + ESC + b"t" + bytes([CODEPAGES[codepage]])
+
+    def text(self, s: str) -> "EscPosBuffer":
+        for k, v in _REPLACEMENTS.items():
+            s = s.replace(k, v)
+        self.buf += s.encode(self.codepage, errors="replace")
+        return self
+
+    def line(self, s: str = "") -> "EscPosBuffer":
+        return self.text(s + "\n")
+
+    def set(self, align: str = "left", bold: bool = False, width: int = 1, height: int = 1) -> "EscPosBuffer":
+        width = min(max(int(width), 1), 8)
+        height = min(max(int(height), 1), 8)
+        self.buf += ESC + b"a" + bytes([_ALIGN.get(align, 0)])
+        self.buf += ESC + b"E" + (b"\x01" if bold else b"\x00")
+        self.buf += GS + b"!" + bytes([((width - 1) << 4) | (height - 1)])
+        return self
+
+    def feed(self, lines: int = 1) -> "EscPosBuffer":
+        self.buf += ESC + b"d" + bytes([min(max(int(lines), 0), 255)])
+        return self
+
+    def cut(self, feed: int = 3) -> "EscPosBuffer":
+        # GS V 66 n: n satır besleyip kısmi kesim
+        self.buf += GS + b"V" + bytes([66, min(max(int(feed), 0), 255)])
+        return self
+
+    def getvalue(self) -> bytes:
+        return bytes(self.buf)
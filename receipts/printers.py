@@ -0,0 +1,232 @@
+"""Fiş yazıcısı arka uçları.
+
+Hedef settings.printer_target URI'siyle seçilir: tcp://, device://, file://, win32://.
+Fiş tek tampon olarak gönderilir, kısa yazımlar tamamlanır; bağlantı açık tutulur ve
+yazıcıya henüz bayt gitmediyse bir kez yeniden açılır.
+"""
+import os
+from abc import ABC, abstractmethod
+import socket
+import threading
+from typing import Dict
+from urllib.parse import urlparse
+
+DEFAULT_PORT = 9100
+CONNECT_TIMEOUT = 3.0
+
+
+class Printer(ABC):
+    """Arka uç tabanı: open/close/is_open/_write_some alt sınıflarda."""
+
+    def __init__(self, target: str):
+        self.target = target
+        self.lock = threading.Lock()
+        self.writes = 0
+        self.bytes_sent = 0
+        # Gönderimde yazıcıya giden bayt (hata sonrası yeniden deneme kararı için)
+        self._sent = 0
+
+    @abstractmethod
+    def open(self) -> None:
+        ...
+
+    @abstractmethod
+    def close(self) -> None:
+        ...
+
+    @abstractmethod
+    def is_open(self) -> bool:
+        ...
+
+    @abstractmethod
+    def _write_some(self, data: memoryview) -> int:
+        """En fazla len(data) bayt yaz; yazılan bayt sayısını döndür."""
+
+    def _write(self, data: bytes) -> None:
+        view = memoryview(data)
+        while self._sent < len(view):
+            n = self._write_some(view[self._sent:])
+            if not n:
+                raise OSError("yazıcı veri kabul etmedi")
+            self._sent += n
+
+    def send(self, data: bytes) -> None:
+        """Tamponun tamamını gönder. Bağlantı açılamazsa ya da ilk bayttan önce koptuysa bir kez
+        yeniden bağlanılır; fişin bir kısmı gittiyse tekrar gönderilmez (başı iki kez basılmasın)."""
+        with self.lock:
+            for attempt in (1, 2):
+                self._sent = 0
+                try:
+                    if not self.is_open():
+                        self.open()
+                    self._write(data)
+                except OSError:
+                    self.close()
+                    if attempt == 2 or self._sent:
+                        raise
+                    continue
+                self.writes += 1
+                self.bytes_sent += len(data)
+                return
+
+
+class NetworkPrinter(Printer):
+    def __init__(self, target: str, host: str, port: int = DEFAULT_PORT, timeout: float = CONNECT_TIMEOUT):
+        super().__init__(target)
+        self.host, self.port, self.timeout = host, int(port), timeout
+        self.sock = None
+
+    def open(self) -> None:
+        self.sock = socket.create_connection((self.host, self.port), timeout=self.timeout)
+        self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+
+    def close(self) -> None:
+        if self.sock is not None:
+            try:
+                self.sock.close()
+            except OSError:
+                pass
+            self.sock = None
+
+    def is_open(self) -> bool:
+        """Açık tutulan soket hâlâ bağlı mı? Yazıcı bağlantıyı kapattıysa sendall hata vermeden
+        boşa yazabilir; bu yüzden bekletmeden MSG_PEEK ile EOF'a bakılır."""
+        if self.sock is None:
+            return False
+        try:
+            self.sock.setblocking(False)
+            try:
+                alive = self.sock.recv(1, socket.MSG_PEEK) != b""
+            finally:
+                self.sock.settimeout(self.timeout)
+        except BlockingIOError:
+            # Okunacak bir şey yok: bağlantı açık
+            return True
+        except OSError:
+            alive = False
+        if not alive:
+            self.close()
+        return alive
+
+    def _write_some(self, data: memoryview) -> int:
+        return self.sock.send(data)
+
+
+class DevicePrinter(Printer):
+    """Ham aygıt dosyası (ör. /dev/usb/lp0); dosya tamponsuz açılır."""
+
+    def __init__(self, target: str, path: str, mode: str = "wb"):
+        super().__init__(target)
+        self.path, self.mode = path, mode
+        self.fh = None
+
+    def open(self) -> None:
+        self.fh = open(self.path, self.mode, buffering=0)
+
+    def close(self) -> None:
+        if self.fh is not None:
+            try:
+                self.fh.close()
+            except OSError:
+                pass
+            self.fh = None
+
+    def is_open(self) -> bool:
+        return self.fh is not None
+
+    def _write_some(self, data: memoryview) -> int:
+        # Tamponsuz FileIO kısa yazabilir; kalan kısım _write döngüsünde gönderilir
+        return self.fh.write(data) or 0
+
+
+class FilePrinter(DevicePrinter):
+    """Yakalama: her fiş dosyanın sonuna eklenir."""
+
+    def __init__(self, target: str, path: str):
+        super().__init__(target, path, mode="ab")
+
+    def open(self) -> None:
+        folder = os.path.dirname(self.path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        super().open()
+
+
+class Win32Printer(Printer):
+    """Windows kuyruğu: her fiş tek RAW belge olarak WritePrinter ile yazılır."""
+
+    def __init__(self, target: str, name: str):
+        super().__init__(target)
+        self.name = name
+        self.handle = None
+
+    def open(self) -> None:
+        import win32print  # pywin32
+        self.handle = win32print.OpenPrinter(self.name)
+
+    def close(self) -> None:
+        if self.handle is not None:
+            try:
+                import win32print
+                win32print.ClosePrinter(self.handle)
+            except Exception:
+                pass
+            self.handle = None
+
+    def is_open(self) -> bool:
+        return self.handle is not None
+
+    def _write_some(self, data: memoryview) -> int:
+        import win32print
+        return win32print.WritePrinter(self.handle, bytes(data))
+
+    def _write(self, data: bytes) -> None:
+        import win32print
+        win32print.StartDocPrinter(self.handle, 1, ("SmartPOS Fiş", None, "RAW"))
+        try:
+            win32print.StartPagePrinter(self.handle)
+            super()._write(data)
+            win32print.EndPagePrinter(self.handle)
+        finally:
+            win32print.EndDocPrinter(self.handle)
+
+
+def default_target() -> str:
+    return "win32://POS-58" if os.name == "nt" else "device:///dev/usb/lp0"
+
+
+def create(target: str) -> Printer:
+    u = urlparse(target)
+    if u.scheme == "tcp":
+        if not u.hostname:
+            raise ValueError(f"Geçersiz yazıcı adresi: {target}")
+        return NetworkPrinter(target, u.hostname, u.port or DEFAULT_PORT)
+    rest = target.split("://", 1)[1] if "://" in target else target
+    if u.scheme == "device":
+        return DevicePrinter(target, rest)
+    if u.scheme == "file":
+        return FilePrinter(target, rest)
+    if u.scheme == "win32":
+        return Win32Printer(target, rest)
+    raise ValueError(f"Bilinmeyen yazıcı türü: {target}")
+
+
+_pool: Dict[str, Printer] = {}
+_pool_lock = threading.Lock()
+
+
+def get_printer(target: str) -> Printer:
+    """Hedef başına tek (açık tutulan) yazıcı nesnesi."""
+    with _pool_lock:
+        p = _pool.get(target)
+        if p is None:
+            p = _pool[target] = create(target)
+        return p
+
+
+def close_all() -> None:
+    with _pool_lock:
+        for p in _pool.values():
+            p.close()
+        _pool.clear()
@@ -0,0 +1,295 @@
+"""Yıllık arşiv veritabanları (archive_<yıl>.db) ve ana veritabanındaki özetleri.
+Arşiv dosyaları yalnız sorgu gerektirdiğinde arc_<yıl> olarak ATTACH edilir.
+"""
+import os
+import re
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from core.money import KURUS_SQL, from_kurus
+from pos.db_handler import add_kurus_columns
+
+# Arşivlenen tablolar ve tarih kolonları
+ARCHIVE_TABLES: Dict[str, str] = {
+    "sales": "created_at",
+    "cari_hareketler": "created_at",
+    "warehouse_movements": "movement_date",
+    "expenses": "created_at",
+    "receipt_payments": "created_at",
+    "sales_returns": "created_at",
+}
+ARCHIVE_DIR = "archive"
+MAX_ATTACHED = 9   # SQLite varsayılan sınırı 10 (main hariç)
+
+_SCHEMA_RE = re.compile(r"^arc_(\d{4})$")
+
+
+def schema_for(year: int) -> str:
+    return f"arc_{int(year)}"
+
+
+def archive_path(cursor, year: int) -> str:
+    """Arşiv dosyası ana veritabanının yanındaki archive/ klasöründe durur."""
+    cursor.execute("PRAGMA database_list")
+    main_file = next((r[2] for r in cursor.fetchall() if r[1] == "main"), "") or ""
+    base = os.path.dirname(os.path.abspath(main_file)) if main_file else os.getcwd()
+    return os.path.join(base, ARCHIVE_DIR, f"archive_{int(year)}.db")
+
+
+# --- dönem kayıtları ---
+def list_periods(cursor) -> List[Tuple]:
+    cursor.execute("""
+        SELECT year, path, sales_rows, cari_rows, movement_rows, expense_rows, archived_at
+        FROM archive_periods ORDER BY year
+    """)
+    return cursor.fetchall()
+
+
+def archived_years(cursor) -> List[int]:
+    cursor.execute("SELECT year FROM archive_periods ORDER BY year")
+    return [int(r[0]) for r in cursor.fetchall()]
+
+
+def years_in_range(cursor, from_dt: Optional[str], to_dt: Optional[str]) -> List[int]:
+    """Aralıkla kesişen arşiv yılları (tarih yoksa hepsi)."""
+    lo = int(str(from_dt)[:4]) if from_dt else 0
+    hi = int(str(to_dt)[:4]) if to_dt else 9999
+    cursor.execute("SELECT year FROM archive_periods WHERE year BETWEEN ? AND ? ORDER BY year", (lo, hi))
+    return [int(r[0]) for r in cursor.fetchall()]
+
+
+def record_period(cursor, year: int, path: str, counts: Dict[str, int]) -> None:
+    cursor.execute("""
+        INSERT INTO archive_periods(year, path, sales_rows, cari_rows, movement_rows, expense_rows, archived_at)
+        VALUES(?,?,?,?,?,?,datetime('now','localtime'))
+        ON CONFLICT(year) DO UPDATE SET
+            path=excluded.path,
+            sales_rows=archive_periods.sales_rows + excluded.sales_rows,
+            cari_rows=archive_periods.cari_rows + excluded.cari_rows,
+            movement_rows=archive_periods.movement_rows + excluded.movement_rows,
+            expense_rows=archive_periods.expense_rows + excluded.expense_rows,
+            archived_at=excluded.archived_at
+    """, (int(year), path, counts.get("sales", 0), counts.get("cari_hareketler", 0),
+          counts.get("warehouse_movements", 0), counts.get("expenses", 0)))
+
+
+# --- ATTACH yönetimi ---
+def attached_years(cursor) -> List[int]:
+    cursor.execute("PRAGMA database_list")
+    out = []
+    for r in cursor.fetchall():
+        m = _SCHEMA_RE.match(str(r[1]))
+        if m:
+            out.append(int(m.group(1)))
+    return out
+
+
+def attach(cursor, year: int, path: str) -> str:
+    schema = schema_for(year)
+    cursor.execute(f"ATTACH DATABASE ? AS {schema}", (path,))
+    return schema
+
+
+def detach(cursor, year: int) -> None:
+    cursor.execute(f"DETACH DATABASE {schema_for(year)}")
+
+
+def attach_years(cursor, years: Iterable[int]) -> List[str]:
+    """İstenen arşivleri bağla, gerekmeyenleri ayır. Şema adlarını döndürür."""
+    wanted = sorted(set(int(y) for y in years))
+    if len(wanted) > MAX_ATTACHED:
+        raise ValueError(f"range spans {len(wanted)} archive years; at most {MAX_ATTACHED} can be attached")
+    current = attached_years(cursor)
+    for y in current:
+        if y not in wanted:
+            detach(cursor, y)
+    if not wanted:
+        return []
+    cursor.execute("SELECT year, path FROM archive_periods WHERE year IN (%s)" % ",".join("?" * len(wanted)), wanted)
+    paths = dict(cursor.fetchall())
+    schemas = []
+    for y in wanted:
+        if y not in paths or not os.path.exists(paths[y]):
+            continue
+        if y not in current:
+            attach(cursor, y, paths[y])
+            sync_columns(cursor, schema_for(y))
+        schemas.append(schema_for(y))
+    return schemas
+
+
+def table_columns(cursor, table: str, schema: str = "main") -> List[str]:
+    cursor.execute(f"PRAGMA {schema}.table_info({table})")
+    return [r[1] for r in cursor.fetchall()]
+
+
+def sync_columns(cursor, schema: str) -> None:
+    """Ana tabloya sonradan eklenen kolonları arşive de ekle (UNION ALL kolonları hizalı kalsın)."""
+    for table in ARCHIVE_TABLES:
+        cursor.execute(f"PRAGMA main.table_info({table})")
+        main_cols = [(r[1], r[2]) for r in cursor.fetchall()]
+        have = set(table_columns(cursor, table, schema))
+        if not have:
+            # Arşiv dosyası tablo eklenmeden önce oluşmuş: boş tablo yeterli
+            create_table(cursor, schema, table)
+            continue
+        for name, col_type in main_cols:
+            if name not in have:
+                cursor.execute(f"ALTER TABLE {schema}.{table} ADD COLUMN {name} {col_type or ''}")
+    # Üretilen kuruş kolonları (table_info bunları göstermez)
+    add_kurus_columns(cursor, schema)
+
+
+def readable_columns(cursor, table: str) -> List[str]:
+    """Okunabilen kolonlar: normal + üretilen (kuruş) kolonlar; UNION ALL bunlarla kurulur."""
+    cursor.execute(f"PRAGMA main.table_xinfo({table})")
+    return [r[1] for r in cursor.fetchall() if r[6] in (0, 2, 3)]
+
+
+def source(cursor, table: str, schemas: List[str], alias: Optional[str] = None) -> str:
+    """FROM kısmı: arşiv yoksa tablonun kendisi, varsa UNION ALL alt sorgusu."""
+    alias = alias or table
+    if not schemas:
+        return f"{table} {alias}" if alias != table else table
+    cols = ", ".join(readable_columns(cursor, table))
+    parts = [f"SELECT {cols} FROM main.{table}"] + [f"SELECT {cols} FROM {s}.{table}" for s in schemas]
+    return f"({' UNION ALL '.join(parts)}) AS {alias}"
+
+
+# --- taşıma ---
+def create_tables(cursor, schema: str) -> None:
+    """Arşivde ana tabloların aynısını oluştur (kolonlar sqlite_master'daki tanımdan)."""
+    for table in ARCHIVE_TABLES:
+        create_table(cursor, schema, table)
+    cursor.execute(f"CREATE INDEX IF NOT EXISTS {schema}.idx_sales_receipt ON sales(receipt_id)")
+    cursor.execute(f"CREATE INDEX IF NOT EXISTS {schema}.idx_cari_hareketler_cari_id ON cari_hareketler(cari_id)")
+
+
+def create_table(cursor, schema: str, table: str) -> None:
+    cursor.execute("SELECT sql FROM main.sqlite_master WHERE type='table' AND name=?", (table,))
+    ddl = cursor.fetchone()[0]
+    ddl = re.sub(r"^CREATE TABLE\s+\"?%s\"?" % table, f"CREATE TABLE IF NOT EXISTS {schema}.{table}", ddl, count=1)
+    cursor.execute(ddl)
+    date_col = ARCHIVE_TABLES[table]
+    cursor.execute(f"CREATE INDEX IF NOT EXISTS {schema}.idx_{table}_{date_col} ON {table}({date_col})")
+
+
+def count_year(cursor, table: str, year: int, schema: str = "main") -> int:
+    col = ARCHIVE_TABLES[table]
+    cursor.execute(f"SELECT COUNT(*) FROM {schema}.{table} WHERE {col} >= ? AND {col} < ?",
+                   (f"{year}-01-01", f"{year + 1}-01-01"))
+    return int(cursor.fetchone()[0])
+
+
+def copy_year(cursor, table: str, year: int, schema: str) -> int:
+    """Yılın satırlarını arşive kopyala (id korunur; tekrar çalıştırılırsa atlanır)."""
+    col = ARCHIVE_TABLES[table]
+    cols = ", ".join(table_columns(cursor, table))
+    cursor.execute(f"""
+        INSERT OR IGNORE INTO {schema}.{table}({cols})
+        SELECT {cols} FROM main.{table} WHERE {col} >= ? AND {col} < ?
+    """, (f"{year}-01-01", f"{year + 1}-01-01"))
+    return cursor.rowcount
+
+
+def missing_in_archive(cursor, table: str, year: int, schema: str) -> int:
+    """Arşive ulaşmamış satır sayısı (silmeden önce 0 olmalı)."""
+    col = ARCHIVE_TABLES[table]
+    cursor.execute(f"""
+        SELECT COUNT(*) FROM main.{table} m
+        WHERE m.{col} >= ? AND m.{col} < ?
+          AND NOT EXISTS (SELECT 1 FROM {schema}.{table} a WHERE a.id = m.id)
+    """, (f"{year}-01-01", f"{year + 1}-01-01"))
+    return int(cursor.fetchone()[0])
+
+
+def delete_year(cursor, table: str, year: int) -> int:
+    col = ARCHIVE_TABLES[table]
+    cursor.execute(f"DELETE FROM main.{table} WHERE {col} >= ? AND {col} < ?",
+                   (f"{year}-01-01", f"{year + 1}-01-01"))
+    return cursor.rowcount
+
+
+def summarize_year(cursor, year: int, schema: str) -> None:
+    """Yılın günlük özetlerini arşivdeki satırlardan yeniden hesaplayıp ana veritabanına yaz."""
+    rng = (f"{year}-01-01", f"{year + 1}-01-01")
+    cursor.execute("DELETE FROM archive_sales_daily WHERE day >= ? AND day < ?", rng)
+    cursor.execute(f"""
+        INSERT INTO archive_sales_daily(day, payment_method, revenue, cogs, lines, receipts)
+        SELECT date(created_at), COALESCE(payment_method, 'cash'),
+               SUM({KURUS_SQL.format(col="total")}) / 100.0,
+               SUM({KURUS_SQL.format(col="quantity * COALESCE(unit_cost, 0)")}) / 100.0,
+               COUNT(*), COUNT(DISTINCT receipt_id)
+        FROM {schema}.sales
+        WHERE (canceled IS NULL OR canceled=0) AND created_at >= ? AND created_at < ?
+        GROUP BY date(created_at), COALESCE(payment_method, 'cash')
+    """, rng)
+    cursor.execute("DELETE FROM archive_cash_daily WHERE day >= ? AND day < ?", rng)
+    cursor.execute(f"""
+        INSERT INTO archive_cash_daily(day, tahsilat, odeme, expenses)
+        SELECT day, SUM(tahsilat), SUM(odeme), SUM(expenses) FROM (
+            SELECT date(created_at) AS day,
+                   SUM(CASE WHEN islem_type='tahsilat' THEN {KURUS_SQL.format(col="tutar")} ELSE 0 END) / 100.0 AS tahsilat,
+                   SUM(CASE WHEN islem_type='odeme' THEN {KURUS_SQL.format(col="tutar")} ELSE 0 END) / 100.0 AS odeme,
+                   0 AS expenses
+            FROM {schema}.cari_hareketler WHERE created_at >= ? AND created_at < ?
+            GROUP BY date(created_at)
+            UNION ALL
+            SELECT date(created_at), 0, 0, SUM({KURUS_SQL.format(col="amount")}) / 100.0
+            FROM {schema}.expenses WHERE created_at >= ? AND created_at < ?
+            GROUP BY date(created_at)
+        ) GROUP BY day
+    """, rng + rng)
+    cursor.execute("DELETE FROM archive_payments_daily WHERE day >= ? AND day < ?", rng)
+    cursor.execute(f"""
+        INSERT INTO archive_payments_daily(day, method, amount_kurus)
+        SELECT date(created_at), method, SUM(amount_kurus)
+        FROM {schema}.receipt_payments WHERE created_at >= ? AND created_at < ?
+        GROUP BY date(created_at), method
+    """, rng)
+
+
+# --- özet sorguları ---
+def whole_days(from_dt: str, to_dt: str) -> Optional[Tuple[str, str]]:
+    """Aralık tam günlerden oluşuyorsa (gün, gün); özetler ancak o zaman kesin sonuç verir."""
+    f_day, _, f_time = str(from_dt).partition(" ")
+    t_day, _, t_time = str(to_dt).partition(" ")
+    if f_time in ("", "00:00:00") and t_time in ("", "23:59:59"):
+        return f_day, t_day
+    return None
+
+
+def sales_summary(cursor, from_day: str, to_day: str) -> Tuple[float, float]:
+    """(ciro, satılan malın maliyeti) - arşivlenmiş günlerden."""
+    cursor.execute(f"SELECT SUM({KURUS_SQL.format(col='revenue')}), SUM({KURUS_SQL.format(col='cogs')}) "
+                   "FROM archive_sales_daily WHERE day BETWEEN ? AND ?", (from_day, to_day))
+    r = cursor.fetchone()
+    return (from_kurus(r[0]), from_kurus(r[1]))
+
+
+def payment_summary(cursor, from_day: str, to_day: str) -> Dict[str, int]:
+    """Ödeme türü başına net fiş ödemesi (kuruş) - arşivlenmiş günlerden."""
+    cursor.execute("SELECT method, SUM(amount_kurus) FROM archive_payments_daily WHERE day BETWEEN ? AND ? GROUP BY method",
+                   (from_day, to_day))
+    return {r[0]: int(r[1] or 0) for r in cursor.fetchall()}
+
+
+def unsummarized_payment_years(cursor, years: Iterable[int]) -> List[int]:
+    """Ödeme özeti olmayan (bu özetten önce arşivlenmiş) yıllar; bunlar arşiv dosyasından okunur."""
+    out = []
+    for y in years:
+        cursor.execute("SELECT 1 FROM archive_payments_daily WHERE day >= ? AND day < ? LIMIT 1",
+                       (f"{y}-01-01", f"{y + 1}-01-01"))
+        if cursor.fetchone() is None:
+            out.append(int(y))
+    return out
+
+
+def cash_summary(cursor, from_day: str, to_day: str) -> Tuple[float, float, float]:
+    """(tahsilat, ödeme, masraf) - arşivlenmiş günlerden."""
+    cursor.execute(f"""
+        SELECT SUM({KURUS_SQL.format(col="tahsilat")}), SUM({KURUS_SQL.format(col="odeme")}),
+               SUM({KURUS_SQL.format(col="expenses")})
+        FROM archive_cash_daily WHERE day BETWEEN ? AND ?
+    """, (from_day, to_day))
+    r = cursor.fetchone()
+    return (from_kurus(r[0]), from_kurus(r[1]), from_kurus(r[2]))
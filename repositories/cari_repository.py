@@ -1,5 +1,9 @@
 """Cari Repository - Database operations for accounts"""
+from core.money import from_kurus
+from repositories import archive_repository as archive_repo
+from pos.query_cache import cached
 
+@cached("cariler")
 def list_all(cursor):
     """Tüm carileri listele"""
     cursor.execute("SELECT id, name, phone, address, balance, cari_type, vergi_dairesi, vergi_no FROM cariler ORDER BY name")
@@ -15,18 +19,28 @@ def get_by_id(cursor, cari_id):
     cursor.execute("SELECT id, name, phone, address, balance, cari_type, vergi_dairesi, vergi_no FROM cariler WHERE id=?", (cari_id,))
     return cursor.fetchone()
 
+def list_by_ids(cursor, ids):
+    """Verilen carilerin satırları (ekran yaması için)"""
+    ids = [int(i) for i in ids]
+    if not ids:
+        return []
+    cursor.execute(f"SELECT id, name, phone, address, balance, cari_type, vergi_dairesi, vergi_no FROM cariler WHERE id IN ({','.join('?' * len(ids))})", ids)
+    return cursor.fetchall()
+
 def get_by_name(cursor, name):
     """İsme göre cari getir"""
     cursor.execute("SELECT id, name, phone, address, balance, cari_type, vergi_dairesi, vergi_no FROM cariler WHERE name=?", (name,))
     return cursor.fetchone()
 
-def add(conn, cursor, name, phone, address, balance, cari_type, vergi_dairesi, vergi_no):
+def add(conn, cursor, name, phone, address, balance, cari_type, vergi_dairesi, vergi_no, commit=True):
     """Yeni cari ekle"""
     cursor.execute(
         "INSERT INTO cariler(name, phone, address, balance, cari_type, vergi_dairesi, vergi_no) VALUES(?,?,?,?,?,?,?)",
         (name, phone, address, balance, cari_type, vergi_dairesi, vergi_no)
     )
-    conn.commit()
+    if commit:
+        conn.commit()
+    return cursor.lastrowid
 
 def update(conn, cursor, cari_id, name, phone, address, cari_type, vergi_dairesi, vergi_no):
     """Cari bilgilerini güncelle (bakiye hariç)"""
@@ -36,10 +50,18 @@ def update(conn, cursor, cari_id, name, phone, address, cari_type, vergi_dairesi
     )
     conn.commit()
 
-def update_balance(conn, cursor, cari_id, new_balance):
+def update_balance(conn, cursor, cari_id, new_balance, commit=True):
     """Cari bakiyesini güncelle"""
     cursor.execute("UPDATE cariler SET balance=? WHERE id=?", (new_balance, cari_id))
-    conn.commit()
+    if commit:
+        conn.commit()
+
+def adjust_balance(conn, cursor, cari_id, delta, commit=True):
+    """Bakiyeyi fark olarak değiştir (birden çok kasadan gelen kayıtlar sırasından bağımsız toplanır)"""
+    # Kuruşa yuvarlanır: ardışık float toplamları bakiyede kayma bırakmasın
+    cursor.execute("UPDATE cariler SET balance=round(COALESCE(balance,0)+?, 2) WHERE id=?", (float(delta), cari_id))
+    if commit:
+        conn.commit()
 
 def delete(conn, cursor, cari_id):
     """Cari sil"""
@@ -47,30 +69,52 @@ def delete(conn, cursor, cari_id):
     conn.commit()
 
 # Cari Hareketler
-def add_hareket(conn, cursor, cari_id, islem_type, tutar, aciklama):
-    """Cari hareketi ekle"""
+def add_hareket(conn, cursor, cari_id, islem_type, tutar, aciklama, commit=True, created_at=None,
+                user_id=None, shift_id=None, receipt_id=None):
+    """Cari hareketi ekle (satıştan doğan kayıtlarda receipt_id fişe bağlar)"""
     cursor.execute(
-        "INSERT INTO cari_hareketler(cari_id, islem_type, tutar, aciklama) VALUES(?,?,?,?)",
-        (cari_id, islem_type, tutar, aciklama)
+        "INSERT INTO cari_hareketler(cari_id, islem_type, tutar, aciklama, created_at, user_id, shift_id, receipt_id) "
+        "VALUES(?,?,?,?,COALESCE(?, datetime('now','localtime')),?,?,?)",
+        (cari_id, islem_type, tutar, aciklama, created_at, user_id, shift_id, receipt_id)
     )
-    conn.commit()
+    if commit:
+        conn.commit()
+
+def receipt_cari(cursor, receipt_id):
+    """Fişe bağlı cari hareketlerin carisi (idx_cari_hareketler_receipt) veya None"""
+    cursor.execute("SELECT cari_id FROM cari_hareketler WHERE receipt_id=? ORDER BY id LIMIT 1", (int(receipt_id),))
+    row = cursor.fetchone()
+    return row[0] if row else None
+
+def shift_totals(cursor, shift_id):
+    """Vardiyadaki hareket türü başına toplam (kuruş) {islem_type: kuruş}; idx_cari_hareketler_shift kapsar"""
+    cursor.execute(
+        "SELECT islem_type, SUM(tutar_kurus) FROM cari_hareketler WHERE shift_id=? GROUP BY islem_type",
+        (int(shift_id),)
+    )
+    return {r[0]: int(r[1] or 0) for r in cursor.fetchall()}
 
 def list_hareketler(cursor, cari_id):
-    """Carinin tüm hareketlerini listele"""
+    """Carinin tüm hareketlerini listele (arşivlenmiş yıllar dahil, en yeni arşivler)"""
+    years = archive_repo.archived_years(cursor)[-archive_repo.MAX_ATTACHED:]
+    schemas = archive_repo.attach_years(cursor, years)
     cursor.execute(
-        "SELECT id, islem_type, tutar, aciklama, created_at FROM cari_hareketler WHERE cari_id=? ORDER BY created_at DESC",
+        f"SELECT id, islem_type, tutar, aciklama, created_at FROM {archive_repo.source(cursor, 'cari_hareketler', schemas)} "
+        "WHERE cari_id=? ORDER BY created_at DESC",
         (cari_id,)
     )
     return cursor.fetchall()
 
+@cached("cariler")
 def get_total_alacak(cursor):
     """Toplam alacak"""
-    cursor.execute("SELECT SUM(balance) FROM cariler WHERE cari_type='alacakli' AND balance > 0")
+    cursor.execute("SELECT SUM(balance_kurus) FROM cariler WHERE cari_type='alacakli' AND balance > 0")
     result = cursor.fetchone()
-    return result[0] if result[0] else 0
+    return from_kurus(result[0])
 
+@cached("cariler")
 def get_total_borc(cursor):
     """Toplam borç"""
-    cursor.execute("SELECT SUM(ABS(balance)) FROM cariler WHERE cari_type='borclu' AND balance < 0")
+    cursor.execute("SELECT SUM(ABS(balance_kurus)) FROM cariler WHERE cari_type='borclu' AND balance < 0")
     result = cursor.fetchone()
-    return result[0] if result[0] else 0
+    return from_kurus(result[0])
@@ -1,7 +1,9 @@
 """Category repository: CRUD for categories table and helpers."""
 from typing import List, Tuple, Optional
+from pos.query_cache import cached
 
 
+@cached("categories")
 def list_all(cursor) -> List[Tuple[int, str, str]]:
     cursor.execute("SELECT id, name, COALESCE(color,'') FROM categories ORDER BY name")
     return [(int(r[0]), str(r[1]), str(r[2])) for r in cursor.fetchall()]
@@ -0,0 +1,55 @@
+"""Ürün ve depo başına hareketli ortalama maliyet. Commit etmez."""
+from typing import Optional, Tuple
+
+
+def get_product_cost(cursor, product_id: int) -> Optional[Tuple[float, float]]:
+    """Return (stock, avg_cost) at product level."""
+    cursor.execute(
+        "SELECT COALESCE(stock,0), COALESCE(avg_cost, buy_price, 0) FROM products WHERE id=?",
+        (int(product_id),)
+    )
+    r = cursor.fetchone()
+    return (float(r[0]), float(r[1])) if r else None
+
+
+def set_product_cost(cursor, product_id: int, avg_cost: float) -> None:
+    cursor.execute("UPDATE products SET avg_cost=? WHERE id=?", (float(avg_cost), int(product_id)))
+
+
+def get_warehouse_cost(cursor, warehouse_id: int, product_id: int) -> Optional[Tuple[float, Optional[float]]]:
+    """Return (quantity, avg_cost) for a warehouse row, avg_cost may be NULL."""
+    cursor.execute(
+        "SELECT COALESCE(quantity,0), avg_cost FROM warehouse_stocks WHERE warehouse_id=? AND product_id=?",
+        (int(warehouse_id), int(product_id))
+    )
+    r = cursor.fetchone()
+    if not r:
+        return None
+    return (float(r[0]), float(r[1]) if r[1] is not None else None)
+
+
+def set_warehouse_cost(cursor, warehouse_id: int, product_id: int, avg_cost: float) -> None:
+    cursor.execute(
+        "UPDATE warehouse_stocks SET avg_cost=? WHERE warehouse_id=? AND product_id=?",
+        (float(avg_cost), int(warehouse_id), int(product_id))
+    )
+    if cursor.rowcount == 0:
+        cursor.execute(
+            "INSERT INTO warehouse_stocks (warehouse_id, product_id, quantity, avg_cost) VALUES (?, ?, 0, ?)",
+            (int(warehouse_id), int(product_id), float(avg_cost))
+        )
+
+
+def get_sale_cost_by_name(cursor, name: str, warehouse_id: Optional[int] = None) -> Optional[float]:
+    """Unit cost for a sale line: warehouse average, then product average, then buy price."""
+    if warehouse_id:
+        cursor.execute("""
+            SELECT COALESCE(ws.avg_cost, p.avg_cost, p.buy_price, 0)
+            FROM products p
+            LEFT JOIN warehouse_stocks ws ON ws.product_id = p.id AND ws.warehouse_id = ?
+            WHERE p.name = ?
+        """, (int(warehouse_id), name))
+    else:
+        cursor.execute("SELECT COALESCE(avg_cost, buy_price, 0) FROM products WHERE name=?", (name,))
+    r = cursor.fetchone()
+    return float(r[0]) if r else None
@@ -0,0 +1,84 @@
+"""Günlük satış özeti: gün/saat/ödeme türü ve gün/ürün toplamları. Commit etmez."""
+from typing import Iterable, List, Tuple
+
+
+def add(cursor, day: str, hour: int, payment_method: str, receipts: int, items: float, revenue_kurus: int,
+        returns: int = 0, returns_kurus: int = 0) -> None:
+    """Add (possibly negative) deltas to one day/hour/payment bucket.
+    revenue_kurus is net of returns; returns/returns_kurus count the returns made in the bucket."""
+    cursor.execute(
+        """
+        INSERT INTO sales_daily(day, hour, payment_method, receipts, items, revenue_kurus, returns, returns_kurus)
+        VALUES(?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT(day, hour, payment_method) DO UPDATE SET
+            receipts = receipts + excluded.receipts,
+            items = items + excluded.items,
+            revenue_kurus = revenue_kurus + excluded.revenue_kurus,
+            returns = returns + excluded.returns,
+            returns_kurus = returns_kurus + excluded.returns_kurus
+        """,
+        (day, int(hour), payment_method, int(receipts), float(items), int(revenue_kurus), int(returns), int(returns_kurus))
+    )
+
+
+def add_products(cursor, day: str, rows: Iterable[Tuple[str, float, int]]) -> None:
+    """rows: [(ürün, adet farkı, tutar farkı (kuruş))]"""
+    cursor.executemany(
+        """
+        INSERT INTO sales_daily_products(day, product_name, qty, revenue_kurus) VALUES(?, ?, ?, ?)
+        ON CONFLICT(day, product_name) DO UPDATE SET
+            qty = qty + excluded.qty,
+            revenue_kurus = revenue_kurus + excluded.revenue_kurus
+        """,
+        [(day, name, float(qty), int(revenue_kurus)) for name, qty, revenue_kurus in rows]
+    )
+
+
+def get_day(cursor, day: str) -> List[Tuple[int, str, int, float, int]]:
+    """(hour, payment_method, receipts, items, revenue_kurus) - birincil anahtardan okunur."""
+    cursor.execute("SELECT hour, payment_method, receipts, items, revenue_kurus FROM sales_daily WHERE day=?", (day,))
+    return cursor.fetchall()
+
+
+def get_day_products(cursor, day: str) -> List[Tuple[str, float, int]]:
+    """(product_name, qty, revenue_kurus)"""
+    cursor.execute("SELECT product_name, qty, revenue_kurus FROM sales_daily_products WHERE day=? AND qty > 0", (day,))
+    return cursor.fetchall()
+
+
+def get_totals(cursor, from_day: str, to_day: str) -> Tuple[int, float, int, int, int]:
+    """(receipts, items, net revenue_kurus, returns, returns_kurus) for [from_day, to_day] - birincil anahtar aralığı."""
+    cursor.execute(
+        "SELECT TOTAL(receipts), TOTAL(items), TOTAL(revenue_kurus), TOTAL(returns), TOTAL(returns_kurus) "
+        "FROM sales_daily WHERE day BETWEEN ? AND ?",
+        (from_day, to_day)
+    )
+    r = cursor.fetchone()
+    return int(r[0]), float(r[1]), int(r[2]), int(r[3]), int(r[4])
+
+
+def rebuild(cursor) -> None:
+    """Özetleri satış tablosundan yeniden kur (tek seferlik)."""
+    cursor.execute("DELETE FROM sales_daily")
+    cursor.execute("DELETE FROM sales_daily_products")
+    cursor.execute(
+        """
+        INSERT INTO sales_daily(day, hour, payment_method, receipts, items, revenue_kurus, returns, returns_kurus)
+        SELECT date(created_at), CAST(strftime('%H', created_at) AS INTEGER), COALESCE(payment_method, 'cash'),
+               COUNT(DISTINCT CASE WHEN return_id IS NULL THEN COALESCE(receipt_id, fis_id) END),
+               TOTAL(quantity), COALESCE(SUM(total_kurus), 0),
+               COUNT(DISTINCT return_id), -COALESCE(SUM(CASE WHEN return_id IS NOT NULL THEN total_kurus END), 0)
+        FROM sales
+        WHERE (canceled IS NULL OR canceled=0) AND created_at IS NOT NULL
+        GROUP BY 1, 2, 3
+        """
+    )
+    cursor.execute(
+        """
+        INSERT INTO sales_daily_products(day, product_name, qty, revenue_kurus)
+        SELECT date(created_at), product_name, TOTAL(quantity), COALESCE(SUM(total_kurus), 0)
+        FROM sales
+        WHERE (canceled IS NULL OR canceled=0) AND created_at IS NOT NULL AND product_name IS NOT NULL
+        GROUP BY 1, 2
+        """
+    )
@@ -1,4 +1,6 @@
 """Expense & Service Repository"""
+from core.money import Money, from_kurus
+from repositories import archive_repository as archive_repo
 
 # --- SERVICES ---
 def list_services(cursor):
@@ -22,18 +24,28 @@ def list_expenses(cursor):
     cursor.execute("SELECT id, title, amount, category, description, created_at FROM expenses ORDER BY created_at DESC")
     return cursor.fetchall()
 
-def add_expense(conn, cursor, title, amount, category, description):
-    cursor.execute("INSERT INTO expenses(title, amount, category, description) VALUES(?,?,?,?)", (title, amount, category, description))
+def add_expense(conn, cursor, title, amount, category, description, user_id=None, shift_id=None):
+    cursor.execute("INSERT INTO expenses(title, amount, category, description, user_id, shift_id) VALUES(?,?,?,?,?,?)",
+                   (title, amount, category, description, user_id, shift_id))
     conn.commit()
 
+def shift_total(cursor, shift_id):
+    """Vardiyada kasadan ödenen masraf toplamı (kuruş); idx_expenses_shift kapsar"""
+    cursor.execute("SELECT SUM(amount_kurus) FROM expenses WHERE shift_id=?", (int(shift_id),))
+    return int(cursor.fetchone()[0] or 0)
+
 def delete_expense(conn, cursor, expense_id):
     cursor.execute("DELETE FROM expenses WHERE id=?", (expense_id,))
     conn.commit()
 
 def get_total_expenses(cursor, start_date=None, end_date=None):
     if start_date and end_date:
-        cursor.execute("SELECT SUM(amount) FROM expenses WHERE date(created_at) BETWEEN ? AND ?", (start_date, end_date))
+        cursor.execute("SELECT SUM(amount_kurus) FROM expenses WHERE date(created_at) BETWEEN ? AND ?", (start_date, end_date))
     else:
-        cursor.execute("SELECT SUM(amount) FROM expenses")
+        cursor.execute("SELECT SUM(amount_kurus) FROM expenses")
     result = cursor.fetchone()
-    return result[0] if result and result[0] else 0.0
+    total = from_kurus(result[0] if result else 0)
+    # Arşivlenmiş yılların masrafları günlük özetten
+    if archive_repo.years_in_range(cursor, start_date, end_date):
+        total = float(Money.of(total) + archive_repo.cash_summary(cursor, start_date or "0000-01-01", end_date or "9999-12-31")[2])
+    return total
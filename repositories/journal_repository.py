@@ -0,0 +1,99 @@
+"""Değişiklik günlüğü (kasa) ve senkron durumu (merkez).
+Commit etmez: append() kaydettiği değişikliğin transaction'ında çalışır.
+"""
+from typing import List, Optional, Tuple
+
+
+def next_seq(cursor, terminal_id: int) -> int:
+    cursor.execute(
+        """
+        INSERT INTO journal_sequences(terminal_id, last_seq) VALUES(?, 1)
+        ON CONFLICT(terminal_id) DO UPDATE SET last_seq = last_seq + 1
+        RETURNING last_seq
+        """,
+        (int(terminal_id),)
+    )
+    return int(cursor.fetchone()[0])
+
+
+def append(cursor, terminal_id: int, kind: str, payload: str, created_at: Optional[str] = None) -> int:
+    seq = next_seq(cursor, terminal_id)
+    cursor.execute(
+        "INSERT INTO change_journal(terminal_id, seq, kind, payload, created_at) "
+        "VALUES(?, ?, ?, ?, COALESCE(?, datetime('now','localtime')))",
+        (int(terminal_id), seq, kind, payload, created_at)
+    )
+    return seq
+
+
+def pending(cursor, terminal_id: int, limit: int = 500) -> List[Tuple[int, str, str, str]]:
+    """Gönderilmemiş değişiklikler (seq, kind, payload, created_at), seq sırasıyla."""
+    cursor.execute(
+        "SELECT seq, kind, payload, created_at FROM change_journal "
+        "WHERE terminal_id=? AND synced=0 ORDER BY seq LIMIT ?",
+        (int(terminal_id), int(limit))
+    )
+    return cursor.fetchall()
+
+
+def count_pending(cursor, terminal_id: int) -> int:
+    cursor.execute("SELECT COUNT(*) FROM change_journal WHERE terminal_id=? AND synced=0", (int(terminal_id),))
+    return int(cursor.fetchone()[0])
+
+
+def mark_synced(cursor, terminal_id: int, upto_seq: int) -> None:
+    cursor.execute("UPDATE change_journal SET synced=1 WHERE terminal_id=? AND synced=0 AND seq<=?",
+                   (int(terminal_id), int(upto_seq)))
+
+
+def reset_after(cursor, terminal_id: int, after_seq: int) -> int:
+    """Merkez geride kaldıysa (ör. yedekten dönüldü) sonraki kayıtlar yeniden gönderilir."""
+    cursor.execute("UPDATE change_journal SET synced=0 WHERE terminal_id=? AND synced=1 AND seq>?",
+                   (int(terminal_id), int(after_seq)))
+    return cursor.rowcount
+
+
+# --- merkez ---
+def applied_seq(cursor, terminal_id: int) -> int:
+    cursor.execute("SELECT last_seq FROM sync_state WHERE terminal_id=?", (int(terminal_id),))
+    r = cursor.fetchone()
+    return int(r[0]) if r else 0
+
+
+def set_applied_seq(cursor, terminal_id: int, seq: int) -> None:
+    cursor.execute(
+        """
+        INSERT INTO sync_state(terminal_id, last_seq, updated_at) VALUES(?, ?, datetime('now','localtime'))
+        ON CONFLICT(terminal_id) DO UPDATE SET last_seq=excluded.last_seq, updated_at=excluded.updated_at
+        """,
+        (int(terminal_id), int(seq))
+    )
+
+
+def bound_uuid(cursor, terminal_id: int) -> Optional[str]:
+    """Terminal numarasının bağlı olduğu kasa kimliği (yoksa None)."""
+    cursor.execute("SELECT terminal_uuid FROM sync_state WHERE terminal_id=?", (int(terminal_id),))
+    r = cursor.fetchone()
+    return r[0] if r else None
+
+
+def bind_uuid(cursor, terminal_id: int, terminal_uuid: str) -> None:
+    cursor.execute(
+        """
+        INSERT INTO sync_state(terminal_id, last_seq, updated_at, terminal_uuid)
+        VALUES(?, 0, datetime('now','localtime'), ?)
+        ON CONFLICT(terminal_id) DO UPDATE SET terminal_uuid=excluded.terminal_uuid
+        """,
+        (int(terminal_id), terminal_uuid)
+    )
+
+
+def add_conflict(cursor, terminal_id: int, seq: int, kind: str, detail: str) -> None:
+    cursor.execute("INSERT INTO sync_conflicts(terminal_id, seq, kind, detail) VALUES(?, ?, ?, ?)",
+                   (int(terminal_id), int(seq), kind, detail))
+
+
+def list_conflicts(cursor, limit: int = 200) -> List[Tuple]:
+    cursor.execute("SELECT id, terminal_id, seq, kind, detail, created_at FROM sync_conflicts ORDER BY id DESC LIMIT ?",
+                   (int(limit),))
+    return cursor.fetchall()
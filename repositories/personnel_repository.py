@@ -1,21 +1,39 @@
 import sqlite3
 from datetime import datetime
 
-def start_shift(cursor, user_id, note=""):
+def start_shift(cursor, user_id, note="", opening_kurus=None):
     now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     cursor.execute("""
-        INSERT INTO personnel_shifts (user_id, start_time, note)
-        VALUES (?, ?, ?)
-    """, (user_id, now, note))
+        INSERT INTO personnel_shifts (user_id, start_time, note, opening_kurus)
+        VALUES (?, ?, ?, ?)
+    """, (user_id, now, note, opening_kurus))
     return cursor.lastrowid
 
-def end_shift(cursor, shift_id):
+def end_shift(cursor, shift_id, counted_kurus=None, expected_kurus=None):
     now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     cursor.execute("""
         UPDATE personnel_shifts
-        SET end_time = ?
+        SET end_time = ?, counted_kurus = ?, expected_kurus = ?
         WHERE id = ?
-    """, (now, shift_id))
+    """, (now, counted_kurus, expected_kurus, shift_id))
+
+def get_shift(cursor, shift_id):
+    cursor.execute("""
+        SELECT s.id, s.user_id, u.username, s.start_time, s.end_time, s.opening_kurus, s.counted_kurus, s.expected_kurus
+        FROM personnel_shifts s
+        LEFT JOIN users u ON s.user_id = u.id
+        WHERE s.id = ?
+    """, (shift_id,))
+    return cursor.fetchone()
+
+def get_open_shift(cursor, user_id):
+    """Kullanıcının açık vardiyası; yoksa kasada açık olan en son vardiya (idx_personnel_shifts_open)."""
+    cursor.execute("""
+        SELECT id, user_id, start_time FROM personnel_shifts
+        WHERE end_time IS NULL
+        ORDER BY (user_id = ?) DESC, id DESC LIMIT 1
+    """, (user_id,))
+    return cursor.fetchone()
 
 def get_active_shift(cursor, user_id):
     cursor.execute("""
@@ -0,0 +1,113 @@
+"""Ürün başına sönümlü satış sayaçları (ortak epoch'a göre saklanır). Commit etmez."""
+from typing import List, Optional, Tuple
+
+_SCORE_COLUMNS = {"day": "day_score", "week": "week_score", "all": "total_qty"}
+
+
+def get_epoch(cursor) -> Optional[float]:
+    cursor.execute("SELECT value FROM settings WHERE key='popularity_epoch'")
+    r = cursor.fetchone()
+    try:
+        return float(r[0]) if r else None
+    except (TypeError, ValueError):
+        return None
+
+
+def set_epoch(cursor, epoch: float) -> None:
+    cursor.execute("INSERT OR REPLACE INTO settings(key,value) VALUES('popularity_epoch', ?)", (str(float(epoch)),))
+
+
+def add(cursor, product_name: str, qty: float, day_delta: float, week_delta: float, hour: int) -> None:
+    """Add (possibly negative) deltas; counters never drop below zero.
+    day_delta/week_delta are already weighted to the epoch by the service."""
+    params = {"name": product_name, "d": day_delta, "w": week_delta, "q": qty, "h": int(hour)}
+    cursor.execute(
+        """
+        INSERT INTO product_popularity(product_name, day_score, week_score, total_qty, updated_at)
+        VALUES(:name, MAX(0,:d), MAX(0,:w), MAX(0,:q), datetime('now','localtime'))
+        ON CONFLICT(product_name) DO UPDATE SET
+            day_score = MAX(0, day_score + :d),
+            week_score = MAX(0, week_score + :w),
+            total_qty = MAX(0, total_qty + :q),
+            updated_at = excluded.updated_at
+        """,
+        params
+    )
+    cursor.execute(
+        """
+        INSERT INTO product_popularity_hourly(hour, product_name, score)
+        VALUES(:h, :name, MAX(0,:w))
+        ON CONFLICT(hour, product_name) DO UPDATE SET
+            score = MAX(0, score + :w)
+        """,
+        params
+    )
+
+
+def rescale(cursor, day_factor: float, week_factor: float) -> None:
+    cursor.execute("UPDATE product_popularity SET day_score = day_score * ?, week_score = week_score * ?",
+                   (day_factor, week_factor))
+    cursor.execute("UPDATE product_popularity_hourly SET score = score * ?", (week_factor,))
+
+
+def clear(cursor) -> None:
+    cursor.execute("DELETE FROM product_popularity")
+    cursor.execute("DELETE FROM product_popularity_hourly")
+
+
+def top(cursor, window: str = "all", limit: int = 10) -> List[Tuple[str, float, float]]:
+    """Return [(product_name, price, score)] for existing products, best first."""
+    col = _SCORE_COLUMNS.get(window, "total_qty")
+    cursor.execute(
+        f"""
+        SELECT pp.product_name, COALESCE(p.sale_price, p.price), pp.{col}
+        FROM product_popularity pp
+        JOIN products p ON p.name = pp.product_name
+        WHERE pp.{col} > 0
+        ORDER BY pp.{col} DESC
+        LIMIT ?
+        """,
+        (int(limit),)
+    )
+    return [(str(r[0]), float(r[1] or 0), float(r[2])) for r in cursor.fetchall()]
+
+
+def top_for_hour(cursor, hour: int, limit: int = 10) -> List[Tuple[str, float, float]]:
+    cursor.execute(
+        """
+        SELECT h.product_name, COALESCE(p.sale_price, p.price), h.score
+        FROM product_popularity_hourly h
+        JOIN products p ON p.name = h.product_name
+        WHERE h.hour = ? AND h.score > 0
+        ORDER BY h.score DESC
+        LIMIT ?
+        """,
+        (int(hour), int(limit))
+    )
+    return [(str(r[0]), float(r[1] or 0), float(r[2])) for r in cursor.fetchall()]
+
+
+def sales_history_by_day_hour(cursor, since: str):
+    """Seed input: quantities grouped per product/day/hour since a date (one-time)."""
+    cursor.execute(
+        """
+        SELECT product_name, MIN(created_at), SUM(quantity)
+        FROM sales
+        WHERE (canceled IS NULL OR canceled=0) AND created_at >= ?
+        GROUP BY product_name, date(created_at), strftime('%H', created_at)
+        """,
+        (since,)
+    )
+    return cursor.fetchall()
+
+
+def sales_totals(cursor):
+    cursor.execute(
+        """
+        SELECT product_name, SUM(quantity)
+        FROM sales
+        WHERE (canceled IS NULL OR canceled=0)
+        GROUP BY product_name
+        """
+    )
+    return cursor.fetchall()
@@ -2,9 +2,11 @@
 Functions accept (conn, cursor) so callers can control transactions.
 """
 from typing import List, Tuple, Optional
+from pos.query_cache import cached
 
 # list all products ordered by ID (ascending)
 
+@cached("products", "categories")
 def list_all(cursor) -> List[Tuple[int, str, str, float, float, float, str, str]]:
     cursor.execute("""
         SELECT p.id, p.name, COALESCE(p.barcode,''), COALESCE(p.sale_price,p.price) AS sale_price, 
@@ -34,6 +36,25 @@ def search_by_name(cursor, q: str) -> List[Tuple[int, str, str, float, float, fl
         int(r[0]), str(r[1]), str(r[2]), float(r[3]), float(r[4]), float(r[5]), str(r[6]), str(r[7])
     ) for r in cursor.fetchall()]
 
+# rows by id (ekranların olayla gelen satırları yamaması için)
+
+def list_by_ids(cursor, ids) -> List[Tuple[int, str, str, float, float, float, str, str]]:
+    ids = [int(i) for i in ids]
+    if not ids:
+        return []
+    cursor.execute(f"""
+        SELECT p.id, p.name, COALESCE(p.barcode,''), COALESCE(p.sale_price,p.price),
+               p.stock, COALESCE(p.buy_price,0), COALESCE(p.unit,'adet'),
+               COALESCE(c.name,'-') AS category_name
+        FROM products p
+        LEFT JOIN categories c ON c.id = p.category_id
+        WHERE p.id IN ({",".join("?" * len(ids))})
+        ORDER BY p.id ASC
+    """, ids)
+    return [(
+        int(r[0]), str(r[1]), str(r[2]), float(r[3]), float(r[4]), float(r[5]), str(r[6]), str(r[7])
+    ) for r in cursor.fetchall()]
+
 # get product by barcode
 
 def get_by_barcode(cursor, barcode: str, warehouse_id: Optional[int] = None) -> Optional[Tuple[int, str, float, float, str]]:
@@ -109,24 +130,34 @@ def delete(conn, cursor, pid: int) -> None:
     conn.commit()
 
 
-def decrement_stock(conn, cursor, name: str, qty: float) -> None:
-    cursor.execute("UPDATE products SET stock=stock-? WHERE name=?", (float(qty), name))
-    conn.commit()
+def decrement_stock(conn, cursor, name: str, qty: float, commit: bool = True) -> Optional[int]:
+    """Returns the product id (None if no product has that name)."""
+    cursor.execute("UPDATE products SET stock=stock-? WHERE name=? RETURNING id", (float(qty), name))
+    r = cursor.fetchone()
+    if commit:
+        conn.commit()
+    return int(r[0]) if r else None
 
 
-def increment_stock(conn, cursor, name: str, qty: float) -> None:
-    cursor.execute("UPDATE products SET stock=stock+? WHERE name=?", (float(qty), name))
-    conn.commit()
+def increment_stock(conn, cursor, name: str, qty: float, commit: bool = True) -> Optional[int]:
+    """Returns the product id (None if no product has that name)."""
+    cursor.execute("UPDATE products SET stock=stock+? WHERE name=? RETURNING id", (float(qty), name))
+    r = cursor.fetchone()
+    if commit:
+        conn.commit()
+    return int(r[0]) if r else None
 
 def get_by_id(cursor, pid: int):
     cursor.execute("SELECT id, name, barcode, sale_price, stock, buy_price, unit FROM products WHERE id=?", (pid,))
     return cursor.fetchone()
 
-def update_stock(conn, cursor, pid: int, new_stock: float):
+def update_stock(conn, cursor, pid: int, new_stock: float, commit: bool = True):
     cursor.execute("UPDATE products SET stock=? WHERE id=?", (new_stock, pid))
-    conn.commit()
+    if commit:
+        conn.commit()
 
-def update_buy_price(conn, cursor, pid: int, new_price: float):
+def update_buy_price(conn, cursor, pid: int, new_price: float, commit: bool = True):
     cursor.execute("UPDATE products SET buy_price=? WHERE id=?", (new_price, pid))
-    conn.commit()
+    if commit:
+        conn.commit()
  
@@ -1,19 +1,21 @@
 """Purchase Repository"""
 
-def add_document(conn, cursor, supplier_id, doc_type, doc_number, doc_date, total_amount, description, warehouse_id=None):
+def add_document(conn, cursor, supplier_id, doc_type, doc_number, doc_date, total_amount, description, warehouse_id=None, commit=True):
     cursor.execute("""
         INSERT INTO purchase_documents(supplier_id, doc_type, doc_number, doc_date, total_amount, description, warehouse_id)
         VALUES(?,?,?,?,?,?,?)
     """, (supplier_id, doc_type, doc_number, doc_date, total_amount, description, warehouse_id))
-    conn.commit()
+    if commit:
+        conn.commit()
     return cursor.lastrowid
 
-def add_item(conn, cursor, doc_id, product_id, product_name, quantity, price, total):
+def add_item(conn, cursor, doc_id, product_id, product_name, quantity, price, total, commit=True):
     cursor.execute("""
         INSERT INTO purchase_items(doc_id, product_id, product_name, quantity, price, total)
         VALUES(?,?,?,?,?,?)
     """, (doc_id, product_id, product_name, quantity, price, total))
-    conn.commit()
+    if commit:
+        conn.commit()
 
 def list_documents(cursor, doc_type=None):
     sql = """
@@ -38,19 +40,22 @@ def get_document(cursor, doc_id):
     cursor.execute("SELECT * FROM purchase_documents WHERE id=?", (doc_id,))
     return cursor.fetchone()
 
-def delete_document(conn, cursor, doc_id):
+def delete_document(conn, cursor, doc_id, commit=True):
     cursor.execute("DELETE FROM purchase_items WHERE doc_id=?", (doc_id,))
     cursor.execute("DELETE FROM purchase_documents WHERE id=?", (doc_id,))
-    conn.commit()
+    if commit:
+        conn.commit()
 
-def update_document(conn, cursor, doc_id, supplier_id, doc_number, doc_date, total_amount, description):
+def update_document(conn, cursor, doc_id, supplier_id, doc_number, doc_date, total_amount, description, commit=True):
     cursor.execute("""
         UPDATE purchase_documents 
         SET supplier_id=?, doc_number=?, doc_date=?, total_amount=?, description=?
         WHERE id=?
     """, (supplier_id, doc_number, doc_date, total_amount, description, doc_id))
-    conn.commit()
+    if commit:
+        conn.commit()
 
-def delete_items(conn, cursor, doc_id):
+def delete_items(conn, cursor, doc_id, commit=True):
     cursor.execute("DELETE FROM purchase_items WHERE doc_id=?", (doc_id,))
-    conn.commit()
+    if commit:
+        conn.commit()
@@ -0,0 +1,61 @@
+"""Üretilen fiş PDF'lerinin kaydı. Commit etmez."""
+from typing import List, Optional, Tuple
+
+_COLUMNS = "id, receipt_id, fis_id, customer_name, path, size, hash, created_at"
+
+
+def get(cursor, doc_id: int) -> Optional[Tuple]:
+    cursor.execute(f"SELECT {_COLUMNS} FROM receipt_documents WHERE id=?", (int(doc_id),))
+    return cursor.fetchone()
+
+
+def find_by_receipt(cursor, receipt_id: int) -> Optional[Tuple]:
+    """Fişin en son üretilen belgesi."""
+    cursor.execute(f"SELECT {_COLUMNS} FROM receipt_documents WHERE receipt_id=? ORDER BY id DESC LIMIT 1",
+                   (int(receipt_id),))
+    return cursor.fetchone()
+
+
+def find_by_hash(cursor, digest: str) -> List[Tuple]:
+    cursor.execute(f"SELECT {_COLUMNS} FROM receipt_documents WHERE hash=? ORDER BY id", (digest,))
+    return cursor.fetchall()
+
+
+def upsert(cursor, receipt_id: Optional[int], fis_id: str, customer_name: str, path: str, size: int, digest: str) -> int:
+    """Aynı yola yeniden yazılan belge satırını günceller; yoksa ekler."""
+    cursor.execute(
+        """
+        INSERT INTO receipt_documents(receipt_id, fis_id, customer_name, path, size, hash, created_at)
+        VALUES(?, ?, ?, ?, ?, ?, datetime('now','localtime'))
+        ON CONFLICT(path) DO UPDATE SET
+            receipt_id=excluded.receipt_id, fis_id=excluded.fis_id, customer_name=excluded.customer_name,
+            size=excluded.size, hash=excluded.hash, created_at=excluded.created_at
+        WHERE receipt_documents.hash <> excluded.hash
+        """,
+        (receipt_id, fis_id, customer_name, path, int(size), digest)
+    )
+    cursor.execute("SELECT id FROM receipt_documents WHERE path=?", (path,))
+    return int(cursor.fetchone()[0])
+
+
+def list_page(cursor, search: str = "", before_id: Optional[int] = None, limit: int = 50) -> List[Tuple]:
+    """En yeniden eskiye bir sayfa; before_id verilirse o kaydın öncesi (id üzerinden sayfalama)."""
+    where = []
+    params = []
+    if before_id is not None:
+        where.append("id < ?")
+        params.append(int(before_id))
+    if search:
+        where.append("(fis_id LIKE ? OR customer_name LIKE ?)")
+        params += [f"%{search}%", f"%{search}%"]
+    sql = f"SELECT {_COLUMNS} FROM receipt_documents"
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    sql += " ORDER BY id DESC LIMIT ?"
+    params.append(int(limit))
+    cursor.execute(sql, params)
+    return cursor.fetchall()
+
+
+def delete(cursor, doc_id: int) -> None:
+    cursor.execute("DELETE FROM receipt_documents WHERE id=?", (int(doc_id),))
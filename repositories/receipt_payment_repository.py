@@ -0,0 +1,77 @@
+"""Receipt payment repository: how each receipt was paid (cash, card, open account).
+Amounts are integer kuruş. Refunds and cancels are negative 'refund' rows, so
+summing a day's rows gives the money that actually moved. Functions do not
+commit.
+"""
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+def add(cursor, receipt_id: int, fis_id: Optional[str], rows: Iterable[Tuple[str, int]], kind: str = "sale",
+        created_at: Optional[str] = None, user_id: Optional[int] = None, shift_id: Optional[int] = None) -> None:
+    """rows: [(ödeme türü, tutar (kuruş))]"""
+    cursor.executemany(
+        "INSERT INTO receipt_payments(receipt_id, fis_id, method, amount_kurus, kind, created_at, user_id, shift_id) "
+        "VALUES(?, ?, ?, ?, ?, COALESCE(?, datetime('now','localtime')), ?, ?)",
+        [(int(receipt_id), fis_id, method, int(kurus), kind, created_at, user_id, shift_id)
+         for method, kurus in rows if kurus]
+    )
+
+
+def net_for_receipt(cursor, receipt_id: int) -> List[Tuple[str, int]]:
+    """Fişin ödeme türü başına net tutarı (satış - iadeler), kuruş."""
+    cursor.execute(
+        "SELECT method, SUM(amount_kurus) FROM receipt_payments WHERE receipt_id=? GROUP BY method",
+        (int(receipt_id),)
+    )
+    return [(r[0], int(r[1])) for r in cursor.fetchall() if r[1]]
+
+
+def fis_id_for(cursor, receipt_id: int):
+    """Fişin ilk ödeme satırındaki fiş numarası (iade satırları için)."""
+    cursor.execute("SELECT fis_id FROM receipt_payments WHERE receipt_id=? AND fis_id IS NOT NULL LIMIT 1",
+                   (int(receipt_id),))
+    row = cursor.fetchone()
+    return row[0] if row else None
+
+
+def totals_by_method(cursor, start: str, end: str) -> Dict[str, int]:
+    """[start, end) aralığında ödeme türü başına toplam (kuruş); tek gruplu sorgu, kapsayan indeksten."""
+    cursor.execute(
+        "SELECT method, SUM(amount_kurus) FROM receipt_payments WHERE created_at >= ? AND created_at < ? GROUP BY method",
+        (start, end)
+    )
+    return {r[0]: int(r[1] or 0) for r in cursor.fetchall()}
+
+
+def shift_totals(cursor, shift_id: int) -> List[Tuple[Optional[int], str, str, int, int]]:
+    """Vardiyanın kasiyer/tür/ödeme türü başına (fiş sayısı, kuruş) toplamı; idx_receipt_payments_shift kapsar.
+    [(user_id, kind, method, fiş, kuruş)]"""
+    cursor.execute(
+        "SELECT user_id, kind, method, COUNT(DISTINCT receipt_id), SUM(amount_kurus) FROM receipt_payments "
+        "WHERE shift_id=? GROUP BY user_id, kind, method",
+        (int(shift_id),)
+    )
+    return [(r[0], r[1], r[2], int(r[3]), int(r[4] or 0)) for r in cursor.fetchall()]
+
+
+def shift_receipt_counts(cursor, shift_id: int) -> List[Tuple[Optional[int], str, int]]:
+    """Vardiyada kasiyer başına satış ve iptal fişi sayısı [(user_id, kind, fiş)] (parçalı fiş bir kez sayılır)."""
+    cursor.execute(
+        "SELECT user_id, kind, COUNT(DISTINCT receipt_id) FROM receipt_payments WHERE shift_id=? GROUP BY user_id, kind",
+        (int(shift_id),)
+    )
+    return [(r[0], r[1], int(r[2])) for r in cursor.fetchall()]
+
+
+def backfill(cursor) -> None:
+    """Ödeme kaydı olmayan (iptal edilmemiş) fişleri satırlarından tek ödeme olarak işle."""
+    cursor.execute(
+        """
+        INSERT INTO receipt_payments(receipt_id, fis_id, method, amount_kurus, kind, created_at)
+        SELECT receipt_id, MAX(fis_id), MIN(COALESCE(payment_method, 'cash')), SUM(total_kurus), 'sale', MIN(created_at)
+        FROM sales
+        WHERE receipt_id IS NOT NULL AND (canceled IS NULL OR canceled=0)
+          AND receipt_id NOT IN (SELECT receipt_id FROM receipt_payments)
+        GROUP BY receipt_id
+        """
+    )
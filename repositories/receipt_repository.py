@@ -0,0 +1,81 @@
+"""Fiş başlıkları ve terminal/gün numara sayaçları.
+Commit etmez; satış satırlarıyla aynı transaction'da çalışır.
+"""
+from typing import Iterator, Optional, Sequence, Tuple
+from repositories import archive_repository as archive_repo
+
+
+def get_terminal_id(cursor) -> Optional[int]:
+    cursor.execute("SELECT value FROM settings WHERE key='terminal_id'")
+    r = cursor.fetchone()
+    try:
+        return int(r[0]) if r else None
+    except (TypeError, ValueError):
+        return None
+
+
+def set_terminal_id(cursor, terminal_id: int) -> None:
+    cursor.execute("INSERT OR REPLACE INTO settings(key,value) VALUES('terminal_id', ?)", (str(int(terminal_id)),))
+
+
+def next_number(cursor, terminal_id: int, day: int) -> int:
+    """Terminalin o günkü bir sonraki fiş numarası (yazma kilidi altında artırılır)."""
+    cursor.execute(
+        """
+        INSERT INTO receipt_sequences(terminal_id, day, last_no) VALUES(?, ?, 1)
+        ON CONFLICT(terminal_id, day) DO UPDATE SET last_no = last_no + 1
+        RETURNING last_no
+        """,
+        (int(terminal_id), int(day))
+    )
+    return int(cursor.fetchone()[0])
+
+
+def insert(cursor, terminal_id: int, day: int, no: int, customer_name: Optional[str] = None) -> int:
+    cursor.execute(
+        "INSERT INTO receipts(terminal_id, day, no, customer_name, created_at) VALUES(?, ?, ?, ?, datetime('now','localtime'))",
+        (int(terminal_id), int(day), int(no), customer_name)
+    )
+    return int(cursor.lastrowid)
+
+
+def get(cursor, receipt_id: int) -> Optional[Tuple[int, int, int, int, Optional[str], str, Optional[str]]]:
+    """(id, terminal_id, day, no, legacy_fis_id, created_at, customer_name)"""
+    cursor.execute(
+        "SELECT id, terminal_id, day, no, legacy_fis_id, created_at, customer_name FROM receipts WHERE id=?",
+        (int(receipt_id),)
+    )
+    return cursor.fetchone()
+
+
+def find(cursor, terminal_id: int, day: int, no: int) -> Optional[int]:
+    cursor.execute("SELECT id FROM receipts WHERE terminal_id=? AND day=? AND no=?",
+                   (int(terminal_id), int(day), int(no)))
+    r = cursor.fetchone()
+    return int(r[0]) if r else None
+
+
+def find_legacy(cursor, fis_id: str) -> Optional[int]:
+    cursor.execute("SELECT id FROM receipts WHERE legacy_fis_id=?", (fis_id,))
+    r = cursor.fetchone()
+    return int(r[0]) if r else None
+
+
+def iter_with_lines(cursor, from_dt: str, to_dt: str, customer: Optional[str] = None,
+                    schemas: Sequence[str] = ()) -> Iterator[Tuple]:
+    """Aralıktaki fişlerin geçerli satırları, fiş sırasıyla (tek geçişte okunur).
+    (id, terminal_id, day, no, legacy_fis_id, customer_name, created_at, ad, adet, fiyat, tutar)"""
+    sql = f"""
+        SELECT r.id, r.terminal_id, r.day, r.no, r.legacy_fis_id, r.customer_name, r.created_at,
+               s.product_name, s.quantity, s.price, s.total
+        FROM receipts r
+        JOIN {archive_repo.source(cursor, "sales", schemas, alias="s")} ON s.receipt_id = r.id
+        WHERE r.created_at BETWEEN ? AND ?
+          AND (s.canceled IS NULL OR s.canceled=0)
+    """
+    params = [from_dt, to_dt]
+    if customer:
+        sql += " AND r.customer_name LIKE ?"
+        params.append(f"%{customer}%")
+    sql += " ORDER BY r.created_at, r.id, s.id"
+    return iter(cursor.execute(sql, params))
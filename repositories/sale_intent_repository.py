@@ -0,0 +1,67 @@
+"""Satış niyetleri (ödeme öncesi ön kayıt). Commit etmez."""
+from typing import List, Optional, Tuple
+
+
+def insert(cursor, payload: str) -> int:
+    cursor.execute("INSERT INTO sale_intents(status, payload) VALUES('pending', ?)", (payload,))
+    return int(cursor.lastrowid)
+
+
+def set_receipt(cursor, intent_id: int, receipt_id: int) -> None:
+    cursor.execute("UPDATE sale_intents SET receipt_id=? WHERE id=?", (int(receipt_id), int(intent_id)))
+
+
+def finish(cursor, intent_id: int, status: str) -> None:
+    cursor.execute(
+        "UPDATE sale_intents SET status=?, completed_at=datetime('now','localtime') WHERE id=? AND status='pending'",
+        (status, int(intent_id))
+    )
+
+
+def finish_for_receipt(cursor, receipt_id: int, status: str) -> None:
+    """Fişe bağlı bekleyen niyeti kapat (ör. fiş iptalinde)."""
+    cursor.execute(
+        "UPDATE sale_intents SET status=?, completed_at=datetime('now','localtime') "
+        "WHERE status='pending' AND receipt_id=?",
+        (status, int(receipt_id))
+    )
+
+
+def record_failure(cursor, intent_id: int, error: str, max_attempts: int) -> int:
+    """Başarısız denemeyi say; max_attempts'a ulaşınca niyet 'failed' olur. Deneme sayısını döner."""
+    cursor.execute(
+        """
+        UPDATE sale_intents SET attempts = attempts + 1, last_error = ?,
+               status = CASE WHEN attempts + 1 >= ? THEN 'failed' ELSE status END,
+               completed_at = CASE WHEN attempts + 1 >= ? THEN datetime('now','localtime') ELSE completed_at END
+        WHERE id=? AND status='pending'
+        """,
+        (str(error)[:500], int(max_attempts), int(max_attempts), int(intent_id))
+    )
+    cursor.execute("SELECT attempts FROM sale_intents WHERE id=?", (int(intent_id),))
+    row = cursor.fetchone()
+    return int(row[0]) if row else 0
+
+
+def get(cursor, intent_id: int) -> Optional[Tuple[int, str, str, Optional[int]]]:
+    """(id, status, payload, receipt_id)"""
+    cursor.execute("SELECT id, status, payload, receipt_id FROM sale_intents WHERE id=?", (int(intent_id),))
+    return cursor.fetchone()
+
+
+def list_pending(cursor) -> List[Tuple[int, str, Optional[int], str]]:
+    """Tamamlanmamış niyetler (id, payload, receipt_id, created_at); kısmi indeksten okunur."""
+    cursor.execute(
+        "SELECT id, payload, receipt_id, created_at FROM sale_intents WHERE status='pending' ORDER BY id"
+    )
+    return cursor.fetchall()
+
+
+def list_failed(cursor, limit: int = 50) -> List[Tuple[int, Optional[int], int, Optional[str], str]]:
+    """Vazgeçilen niyetler (id, receipt_id, attempts, last_error, created_at); kısmi indeksten okunur."""
+    cursor.execute(
+        "SELECT id, receipt_id, attempts, last_error, created_at FROM sale_intents WHERE status='failed' "
+        "ORDER BY id DESC LIMIT ?",
+        (int(limit),)
+    )
+    return cursor.fetchall()
@@ -1,5 +1,10 @@
 """Sales repository: raw DB operations for sales table."""
 from typing import List, Tuple
+from core.money import KURUS_SQL, Money
+from repositories import archive_repository as archive_repo
+
+# Fiş toplamından düşülecek iade tutarı (sales_returns, idx_sales_returns_receipt)
+RETURNED_KURUS = "COALESCE((SELECT SUM(sr.total_kurus) FROM sales_returns sr WHERE sr.receipt_id = s.receipt_id), 0)"
 
 def insert_line(conn, cursor,
                 fis_id: str,
@@ -9,22 +14,43 @@ def insert_line(conn, cursor,
                 total: float,
                 payment_method: str = 'cash',
                 canceled: int = 0,
-                warehouse_id: int = None) -> None:
+                warehouse_id: int = None,
+                unit_cost: float = 0.0,
+                receipt_id: int = None,
+                commit: bool = True,
+                created_at: str = None,
+                user_id: int = None,
+                shift_id: int = None,
+                return_id: int = None,
+                return_of: int = None) -> None:
+    # İade satırı: eksi adet/tutar, return_id (sales_returns) ve return_of (asıl satırın id'si) dolu
     cursor.execute(
         """
-        INSERT INTO sales(fis_id,product_name,quantity,price,total,payment_method,canceled,warehouse_id,created_at)
-        VALUES(?,?,?,?,?,?,?,?,datetime('now','localtime'))
+        INSERT INTO sales(fis_id,product_name,quantity,price,total,payment_method,canceled,warehouse_id,unit_cost,receipt_id,created_at,user_id,shift_id,return_id,return_of)
+        VALUES(?,?,?,?,?,?,?,?,?,?,COALESCE(?, datetime('now','localtime')),?,?,?,?)
         """,
-    (fis_id, product_name, float(quantity), float(price), float(total), payment_method, int(canceled), warehouse_id)
+    (fis_id, product_name, float(quantity), float(price), float(total), payment_method, int(canceled), warehouse_id, float(unit_cost or 0.0), receipt_id, created_at, user_id, shift_id, return_id, return_of)
     )
-    conn.commit()
+    if commit:
+        conn.commit()
 
 
-def get_sales_between(cursor, from_dt: str, to_dt: str) -> List[Tuple[str, str, str, float, float, float]]:
+def shift_items(cursor, shift_id: int) -> List[Tuple[int, float]]:
+    """Vardiyada kasiyer başına satılan (iptal edilmemiş) adet [(user_id, adet)]; idx_sales_shift kapsar."""
     cursor.execute(
-        """
-          SELECT fis_id, created_at, product_name, quantity, price, total
-          FROM sales
+        "SELECT user_id, SUM(quantity) FROM sales WHERE shift_id=? AND canceled=0 GROUP BY user_id",
+        (int(shift_id),)
+    )
+    return [(r[0], float(r[1] or 0)) for r in cursor.fetchall()]
+
+
+def get_sales_between(cursor, from_dt: str, to_dt: str) -> List[Tuple[str, str, str, float, float, float, int]]:
+    # Aralık arşivlenmiş bir yıla uzanıyorsa o yılın arşivi bağlanır
+    schemas = archive_repo.attach_years(cursor, archive_repo.years_in_range(cursor, from_dt, to_dt))
+    cursor.execute(
+        f"""
+          SELECT fis_id, created_at, product_name, quantity, price, total, receipt_id
+          FROM {archive_repo.source(cursor, "sales", schemas)}
           WHERE (canceled IS NULL OR canceled=0)
             AND datetime(created_at) BETWEEN datetime(?) AND datetime(?)
           ORDER BY datetime(created_at) DESC
@@ -33,24 +59,46 @@ def get_sales_between(cursor, from_dt: str, to_dt: str) -> List[Tuple[str, str,
     )
     rows = cursor.fetchall()
     return [
-        (str(r[0]), str(r[1]), str(r[2]), float(r[3]), float(r[4]), float(r[5]))
+        (str(r[0]), str(r[1]), str(r[2]), float(r[3]), float(r[4]), float(r[5]), r[6])
         for r in rows
     ]
 
 
-def list_recent_receipts(cursor, limit: int = 200) -> List[Tuple[str, str, float, str]]:
-    """Return recent unique receipts (fis_id) with date, total sum and payment method.
+def get_sales_for_receipts(cursor, receipt_ids) -> List[Tuple[str, str, str, float, float, float, int]]:
+    """get_sales_between ile aynı satırlar, yalnızca verilen fişler için (idx_sales_receipt)."""
+    ids = [int(i) for i in receipt_ids]
+    if not ids:
+        return []
+    cursor.execute(
+        f"""
+          SELECT fis_id, created_at, product_name, quantity, price, total, receipt_id
+          FROM sales
+          WHERE receipt_id IN ({",".join("?" * len(ids))})
+            AND (canceled IS NULL OR canceled=0)
+          ORDER BY datetime(created_at) DESC
+        """,
+        ids
+    )
+    return [
+        (str(r[0]), str(r[1]), str(r[2]), float(r[3]), float(r[4]), float(r[5]), r[6])
+        for r in cursor.fetchall()
+    ]
+
+
+def list_recent_receipts(cursor, limit: int = 200) -> List[Tuple[int, str, str, float, str]]:
+    """Return recent unique receipts (receipt_id, fis_id) with date, total sum and payment method.
     Note: uses MIN(payment_method) as a proxy when mixed lines exist; in practice lines share same method.
     """
     cursor.execute(
         f"""
-        SELECT fis_id,
+        SELECT receipt_id,
+               MAX(fis_id),
                MAX(created_at) as ts,
-               SUM(total) as sum_total,
+               (SUM(total_kurus) - {RETURNED_KURUS}) / 100.0 as sum_total,
                MIN(COALESCE(payment_method,'cash')) as pay
-        FROM sales
-        WHERE (canceled IS NULL OR canceled=0)
-        GROUP BY fis_id
+        FROM sales s
+        WHERE (canceled IS NULL OR canceled=0) AND return_of IS NULL
+        GROUP BY receipt_id
         ORDER BY ts DESC
         LIMIT ?
         """,
@@ -58,51 +106,151 @@ def list_recent_receipts(cursor, limit: int = 200) -> List[Tuple[str, str, float
     )
     rows = cursor.fetchall()
     return [
-        (str(r[0]), str(r[1]), float(r[2]), str(r[3]))
+        (r[0], str(r[1]), str(r[2]), float(r[3]), str(r[4]))
         for r in rows
     ]
 
 
-def get_receipts_between(cursor, from_dt: str, to_dt: str) -> List[Tuple[str, str, float, str]]:
-    """Return unique receipts (fis_id) with date, total sum and payment method within a date range."""
+def get_receipts_between(cursor, from_dt: str, to_dt: str) -> List[Tuple[int, str, str, float, str]]:
+    """Return unique receipts (receipt_id, fis_id) with date, total sum and payment method within a date range."""
+    schemas = archive_repo.attach_years(cursor, archive_repo.years_in_range(cursor, from_dt, to_dt))
     cursor.execute(
-        """
-        SELECT fis_id,
+        f"""
+        SELECT receipt_id,
+               MAX(fis_id),
                MAX(created_at) as ts,
-               SUM(total) as sum_total,
+               (SUM(total_kurus) - {RETURNED_KURUS}) / 100.0 as sum_total,
                MIN(COALESCE(payment_method,'cash')) as pay
-        FROM sales
-        WHERE (canceled IS NULL OR canceled=0)
+        FROM {archive_repo.source(cursor, "sales", schemas, alias="s")}
+        WHERE (canceled IS NULL OR canceled=0) AND return_of IS NULL
           AND datetime(created_at) BETWEEN datetime(?) AND datetime(?)
-        GROUP BY fis_id
+        GROUP BY receipt_id
         ORDER BY ts DESC
         """,
         (from_dt, to_dt)
     )
     rows = cursor.fetchall()
     return [
-        (str(r[0]), str(r[1]), float(r[2]), str(r[3]))
+        (r[0], str(r[1]), str(r[2]), float(r[3]), str(r[4]))
         for r in rows
     ]
 
 
-def cancel_receipt(conn, cursor, fis_id: str) -> None:
-    cursor.execute("UPDATE sales SET canceled=1 WHERE fis_id=? AND (canceled IS NULL OR canceled=0)", (fis_id,))
-    conn.commit()
+def get_last_receipt(cursor):
+    """Son kesilen fiş (receipt_id, fis_id) veya None."""
+    cursor.execute("SELECT receipt_id, fis_id FROM sales WHERE receipt_id IS NOT NULL ORDER BY id DESC LIMIT 1")
+    return cursor.fetchone()
+
+
+def get_active_lines(cursor, receipt_id: int) -> List[Tuple[str, float, int, str]]:
+    """İptal edilmemiş net miktarlar (ad, adet, depo, satış zamanı); iade edilen kısım düşülmüş,
+    tamamı iade edilenler yok."""
+    cursor.execute(
+        """
+        SELECT product_name, SUM(quantity), warehouse_id, MIN(CASE WHEN quantity > 0 THEN created_at END)
+        FROM sales
+        WHERE receipt_id=? AND (canceled IS NULL OR canceled=0)
+        GROUP BY product_name, warehouse_id
+        HAVING SUM(quantity) > 1e-9
+        """,
+        (int(receipt_id),)
+    )
+    return cursor.fetchall()
+
+
+def get_active_line_totals(cursor, receipt_id: int) -> List[Tuple[str, float, float, str, str, int]]:
+    """İptal edilmemiş satırlar (ad, adet, tutar, tarih, ödeme türü, iade no); günlük özetten düşmek için.
+    İade satırlarında adet ve tutar eksidir."""
+    cursor.execute(
+        """
+        SELECT product_name, quantity, total, created_at, COALESCE(payment_method,'cash'), return_id
+        FROM sales WHERE receipt_id=? AND (canceled IS NULL OR canceled=0)
+        """,
+        (int(receipt_id),)
+    )
+    return cursor.fetchall()
+
+
+def get_returnable_lines(cursor, receipt_id: int):
+    """Fişin asıl satırları ve iade edilen kısımları (idx_sales_receipt + idx_sales_return_of):
+    [(satır id, ad, adet, fiyat, tutar kuruş, depo, birim maliyet, ödeme türü, iade edilen adet, iade edilen kuruş, tarih)]"""
+    cursor.execute(
+        """
+        SELECT s.id, s.product_name, s.quantity, s.price, s.total_kurus, s.warehouse_id, s.unit_cost,
+               COALESCE(s.payment_method, 'cash'),
+               COALESCE(-SUM(r.quantity), 0), COALESCE(-SUM(r.total_kurus), 0), s.created_at
+        FROM sales s
+        LEFT JOIN sales r ON r.return_of = s.id AND (r.canceled IS NULL OR r.canceled=0)
+        WHERE s.receipt_id=? AND s.return_of IS NULL AND (s.canceled IS NULL OR s.canceled=0)
+        GROUP BY s.id
+        ORDER BY s.id
+        """,
+        (int(receipt_id),)
+    )
+    return cursor.fetchall()
+
+
+def get_return_lines(cursor, return_ids) -> List[Tuple[str, str, str, float, float, float, int]]:
+    """get_sales_between ile aynı biçimde, verilen iadelerin (eksi) satırları (fiş üzerinden idx_sales_receipt)."""
+    ids = [int(i) for i in return_ids]
+    if not ids:
+        return []
+    cursor.execute(
+        """
+          SELECT fis_id, created_at, product_name, quantity, price, total, receipt_id
+          FROM sales
+          WHERE receipt_id IN (SELECT receipt_id FROM sales_returns WHERE id IN ({marks}))
+            AND return_id IN ({marks})
+        """.format(marks=",".join("?" * len(ids))),
+        ids + ids
+    )
+    return [
+        (str(r[0]), str(r[1]), str(r[2]), float(r[3]), float(r[4]), float(r[5]), r[6])
+        for r in cursor.fetchall()
+    ]
+
+
+def get_sold_lines(cursor, receipt_id: int) -> List[Tuple[str, float, float]]:
+    """Fişin satış satırları (ad, adet, tutar); iptal edilenler dahil, iade satırları hariç."""
+    cursor.execute(
+        "SELECT product_name, quantity, total FROM sales WHERE receipt_id=? AND return_id IS NULL ORDER BY id",
+        (int(receipt_id),)
+    )
+    return cursor.fetchall()
+
+
+def is_canceled(cursor, receipt_id: int) -> bool:
+    """Fiş iptal edilmiş mi (iptal tüm satırları birlikte işaretler)."""
+    cursor.execute("SELECT 1 FROM sales WHERE receipt_id=? AND canceled=1 LIMIT 1", (int(receipt_id),))
+    return cursor.fetchone() is not None
+
+
+def cancel_receipt(conn, cursor, receipt_id: int, commit: bool = True) -> None:
+    cursor.execute("UPDATE sales SET canceled=1 WHERE receipt_id=? AND (canceled IS NULL OR canceled=0)", (int(receipt_id),))
+    if commit:
+        conn.commit()
 
 
 def get_profit_stats(cursor, from_dt: str, to_dt: str) -> Tuple[float, float]:
     """
     Returns (total_revenue, total_cost_of_goods_sold).
-    COGS is calculated based on current product buy_price.
+    COGS is the unit cost stamped on each sale line at checkout.
+    Archived years come from their daily summaries when the range is whole days.
     """
+    years = archive_repo.years_in_range(cursor, from_dt, to_dt)
+    days = archive_repo.whole_days(from_dt, to_dt)
+    archived = (0.0, 0.0)
+    schemas = []
+    if years and days:
+        archived = archive_repo.sales_summary(cursor, *days)
+    elif years:
+        schemas = archive_repo.attach_years(cursor, years)
     cursor.execute(
-        """
+        f"""
         SELECT
-            SUM(s.total) as total_revenue,
-            SUM(s.quantity * COALESCE(p.buy_price, 0)) as total_cost
-        FROM sales s
-        LEFT JOIN products p ON s.product_name = p.name
+            SUM(s.total_kurus) as total_revenue,
+            SUM({KURUS_SQL.format(col="s.quantity * COALESCE(s.unit_cost, 0)")}) as total_cost
+        FROM {archive_repo.source(cursor, "sales", schemas, alias="s")}
         WHERE (s.canceled IS NULL OR s.canceled=0)
           AND datetime(s.created_at) BETWEEN datetime(?) AND datetime(?)
         """,
@@ -110,5 +258,34 @@ def get_profit_stats(cursor, from_dt: str, to_dt: str) -> Tuple[float, float]:
     )
     row = cursor.fetchone()
     if row:
-        return (row[0] or 0.0, row[1] or 0.0)
-    return (0.0, 0.0)
+        return (float(Money(row[0] or 0) + archived[0]), float(Money(row[1] or 0) + archived[1]))
+    return archived
+
+
+def get_receipt_lines(cursor, receipt_id: int, day: int = None) -> List[Tuple[str, float, float, float]]:
+    """Fişin geçerli satırları (ad, adet, fiyat, tutar); sıcak tabloda yoksa arşivlerde aranır.
+    day (YYYYMMDD) verilirse önce o yılın arşivi denenir."""
+    sql = """
+        SELECT product_name, quantity, price, total
+        FROM {src}
+        WHERE receipt_id=? AND (canceled IS NULL OR canceled=0) AND return_of IS NULL
+        ORDER BY created_at ASC
+    """
+    cursor.execute(sql.format(src="sales"), (int(receipt_id),))
+    rows = cursor.fetchall()
+    if rows:
+        return rows
+    years = archive_repo.archived_years(cursor)
+    hint = int(day) // 10000 if day else None
+    if hint in years:
+        years.remove(hint)
+        years.insert(0, hint)
+    for year in years:
+        schemas = archive_repo.attach_years(cursor, [year])
+        if not schemas:
+            continue
+        cursor.execute(sql.format(src=f"{schemas[0]}.sales"), (int(receipt_id),))
+        rows = cursor.fetchall()
+        if rows:
+            return rows
+    return []
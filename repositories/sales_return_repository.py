@@ -0,0 +1,21 @@
+"""Fişe karşı iade belgeleri; iade satırları sales'te eksi satırdır. Commit etmez."""
+from typing import List, Optional, Tuple
+
+
+def insert(cursor, receipt_id: int, fis_id: Optional[str], total_kurus: int, reason: Optional[str] = None,
+           user_id: Optional[int] = None, shift_id: Optional[int] = None, created_at: Optional[str] = None) -> int:
+    cursor.execute(
+        "INSERT INTO sales_returns(receipt_id, fis_id, total_kurus, reason, user_id, shift_id, created_at) "
+        "VALUES(?, ?, ?, ?, ?, ?, COALESCE(?, datetime('now','localtime')))",
+        (int(receipt_id), fis_id, int(total_kurus), reason, user_id, shift_id, created_at)
+    )
+    return int(cursor.lastrowid)
+
+
+def list_for_receipt(cursor, receipt_id: int) -> List[Tuple[int, int, Optional[str], str]]:
+    """Fişin iadeleri [(id, kuruş, neden, tarih)] (idx_sales_returns_receipt)."""
+    cursor.execute(
+        "SELECT id, total_kurus, reason, created_at FROM sales_returns WHERE receipt_id=? ORDER BY id",
+        (int(receipt_id),)
+    )
+    return cursor.fetchall()
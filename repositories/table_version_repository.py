@@ -0,0 +1,19 @@
+"""Tetikleyicilerin tuttuğu tablo değişim sayaçları."""
+from typing import Dict, Sequence, Tuple
+
+
+def get_versions(cursor) -> Dict[str, int]:
+    cursor.execute("SELECT table_name, version FROM table_versions")
+    return {r[0]: int(r[1]) for r in cursor.fetchall()}
+
+
+def get_for(cursor, tables: Sequence[str]) -> Tuple[str, Dict[str, int]]:
+    """(veritabanı dosyası, {tablo: sürüm}) - istenen tabloların sayaçları, birincil anahtardan."""
+    marks = ",".join("?" for _ in tables)
+    cursor.execute(
+        f"SELECT d.file, t.table_name, t.version FROM table_versions t, pragma_database_list d "
+        f"WHERE d.name='main' AND t.table_name IN ({marks})",
+        tuple(tables)
+    )
+    rows = cursor.fetchall()
+    return (rows[0][0] if rows else ""), {r[1]: int(r[2]) for r in rows}
@@ -1,6 +1,8 @@
 import sqlite3
 from datetime import datetime
+from pos.query_cache import cached
 
+@cached("warehouses")
 def list_warehouses(cursor):
     cursor.execute("SELECT id, name, location, created_at FROM warehouses ORDER BY id DESC")
     return cursor.fetchall()
@@ -72,3 +74,21 @@ def list_all_stocks(cursor):
         ORDER BY w.name, p.name
     """)
     return cursor.fetchall()
+
+def list_stocks_for_products(cursor, product_ids, warehouse_id=None):
+    """Verilen ürünlerin depo stokları (wh_id, wh_name, product_id, p_name, qty, unit); ekran yaması için."""
+    ids = [int(i) for i in product_ids]
+    if not ids:
+        return []
+    sql = f"""
+        SELECT w.id, w.name, p.id, p.name, ws.quantity, p.unit
+        FROM warehouse_stocks ws
+        JOIN warehouses w ON ws.warehouse_id = w.id
+        JOIN products p ON ws.product_id = p.id
+        WHERE ws.product_id IN ({",".join("?" * len(ids))})
+    """
+    if warehouse_id:
+        sql += " AND ws.warehouse_id = ?"
+        ids.append(int(warehouse_id))
+    cursor.execute(sql, ids)
+    return cursor.fetchall()
@@ -0,0 +1,67 @@
+"""Arşiv: kapanmış yılları sıcak tablolardan taşır.
+
+archive_year() iki adımdır: satırlar arşiv dosyasına kopyalanıp commit edilir, sonra
+hepsinin ulaştığı doğrulanıp ana veritabanından tek transaction'da silinir.
+"""
+import os
+from datetime import datetime
+from typing import Dict, List
+
+from repositories import archive_repository as repo
+
+
+def list_periods(cursor):
+    return repo.list_periods(cursor)
+
+
+def closable_years(cursor) -> List[int]:
+    """Arşivlenebilir (bu yıldan önceki, sıcak tablolarda satırı olan) yıllar."""
+    current = datetime.now().year
+    years = set()
+    for table, col in repo.ARCHIVE_TABLES.items():
+        cursor.execute(f"SELECT DISTINCT CAST(substr({col}, 1, 4) AS INTEGER) FROM {table} WHERE {col} < ?",
+                       (f"{current}-01-01",))
+        years.update(int(r[0]) for r in cursor.fetchall() if r[0])
+    return sorted(years)
+
+
+def archive_year(conn, cursor, year: int) -> Dict[str, int]:
+    """Kapanmış bir yılı arşive taşı; tablo başına taşınan satır sayısını döndürür."""
+    year = int(year)
+    if year >= datetime.now().year:
+        raise ValueError("Sadece kapanmış (geçmiş) yıllar arşivlenebilir")
+
+    path = repo.archive_path(cursor, year)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    conn.commit()
+    repo.attach_years(cursor, [])
+    schema = repo.attach(cursor, year, path)
+    try:
+        # 1. Kopyala (arşiv dosyasında tek işlem)
+        repo.create_tables(cursor, schema)
+        repo.sync_columns(cursor, schema)
+        for table in repo.ARCHIVE_TABLES:
+            repo.copy_year(cursor, table, year, schema)
+        conn.commit()
+
+        # 2. Doğrula, özetle, sil (ana veritabanında tek işlem)
+        for table in repo.ARCHIVE_TABLES:
+            missing = repo.missing_in_archive(cursor, table, year, schema)
+            if missing:
+                raise RuntimeError(f"{table}: {missing} satır arşive kopyalanamadı")
+        repo.summarize_year(cursor, year, schema)
+        counts = {table: repo.delete_year(cursor, table, year) for table in repo.ARCHIVE_TABLES}
+        repo.record_period(cursor, year, path, counts)
+        conn.commit()
+        return counts
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        repo.detach(cursor, year)
+
+
+def vacuum(conn) -> None:
+    """Arşivlemeden sonra boşalan sayfaları geri ver (uzun sürebilir, kapanışta/boşta çalıştırın)."""
+    conn.commit()
+    conn.execute("VACUUM")
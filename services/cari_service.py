@@ -1,5 +1,9 @@
 """Cari Service - Business logic for accounts"""
+from core.money import Money
 from repositories import cari_repository as repo
+from services import customer_lookup_service as lookup
+from services import journal_service as journal_svc
+from pos import events, session
 
 def list_all(cursor):
     """Tüm carileri listele"""
@@ -15,12 +19,21 @@ def get_by_id(cursor, cari_id):
     """ID'ye göre cari getir"""
     return repo.get_by_id(cursor, cari_id)
 
+def list_by_ids(cursor, ids):
+    """ID listesine göre cariler"""
+    return repo.list_by_ids(cursor, ids)
+
 def get_by_name(cursor, name):
     """İsme göre cari getir"""
     return repo.get_by_name(cursor, name)
 
-def add_cari(conn, cursor, name, phone, address, balance, cari_type, vergi_dairesi="", vergi_no=""):
-    """Yeni cari ekle"""
+def lookup_customers(cursor, query, limit=20):
+    """Satış ekranı otomatik tamamlama: ad/telefon ön ek eşleşmeleri [(id, ad, telefon)]"""
+    return lookup.search(cursor, query, limit)
+
+def add_cari(conn, cursor, name, phone, address, balance, cari_type, vergi_dairesi="", vergi_no="", commit=True):
+    """Yeni cari ekle. commit=False ise arama indeksini çağıran, commit ettikten sonra
+    customer_lookup_service.refresh ile günceller (geri alınan cari aramada kalmasın)."""
     if not name or not name.strip():
         raise ValueError("Cari adı boş olamaz")
     
@@ -38,7 +51,11 @@ def add_cari(conn, cursor, name, phone, address, balance, cari_type, vergi_daire
     if cari_type not in ['alacakli', 'borclu']:
         cari_type = 'alacakli'
     
-    repo.add(conn, cursor, name, phone, address, balance, cari_type, vergi_dairesi, vergi_no)
+    cari_id = repo.add(conn, cursor, name, phone, address, balance, cari_type, vergi_dairesi, vergi_no, commit=commit)
+    if commit:
+        lookup.refresh(cursor, cari_id)
+    events.publish(events.CARI_POSTED, (cari_id,))
+    return cari_id
 
 def update_cari(conn, cursor, cari_id, name, phone, address, cari_type, vergi_dairesi="", vergi_no=""):
     """Cari bilgilerini güncelle"""
@@ -55,12 +72,17 @@ def update_cari(conn, cursor, cari_id, name, phone, address, cari_type, vergi_da
         cari_type = 'alacakli'
     
     repo.update(conn, cursor, cari_id, name, phone, address, cari_type, vergi_dairesi, vergi_no)
+    lookup.refresh(cursor, cari_id)
+    events.publish(events.CARI_POSTED, (int(cari_id),))
 
 def delete_cari(conn, cursor, cari_id):
     """Cari sil"""
     repo.delete(conn, cursor, cari_id)
+    lookup.remove(cari_id)
+    events.publish(events.CARI_POSTED, (int(cari_id),))
 
-def add_tahsilat(conn, cursor, cari_id, tutar, aciklama="Tahsilat"):
+def add_tahsilat(conn, cursor, cari_id, tutar, aciklama="Tahsilat", commit=True, user_id=None, shift_id=None,
+                 receipt_id=None):
     """Tahsilat ekle (alacak azalır)"""
     if tutar <= 0:
         raise ValueError("Tahsilat tutarı pozitif olmalıdır")
@@ -70,16 +92,21 @@ def add_tahsilat(conn, cursor, cari_id, tutar, aciklama="Tahsilat"):
     if not cari:
         raise ValueError("Cari bulunamadı")
     
-    current_balance = float(cari[4])
-    new_balance = current_balance - tutar
+    current_balance = Money.of(cari[4])
+    new_balance = float(current_balance - tutar)
     
     # Bakiyeyi güncelle
-    repo.update_balance(conn, cursor, cari_id, new_balance)
-    
-    # Hareketi kaydet
-    repo.add_hareket(conn, cursor, cari_id, "tahsilat", tutar, aciklama)
+    repo.update_balance(conn, cursor, cari_id, new_balance, commit=False)
+    
+    # Hareketi kaydet (bakiye ve senkron günlüğü aynı commit ile yazılır)
+    journal_svc.record_cari(cursor, cari_id, "tahsilat", tutar, aciklama)
+    user_id, shift_id = session.stamp(user_id, shift_id)
+    repo.add_hareket(conn, cursor, cari_id, "tahsilat", tutar, aciklama, commit=commit, user_id=user_id, shift_id=shift_id,
+                     receipt_id=receipt_id)
+    events.publish(events.CARI_POSTED, (int(cari_id),))
 
-def add_odeme(conn, cursor, cari_id, tutar, aciklama="Ödeme"):
+def add_odeme(conn, cursor, cari_id, tutar, aciklama="Ödeme", commit=True, user_id=None, shift_id=None,
+              receipt_id=None):
     """Ödeme ekle (borç azalır)"""
     if tutar <= 0:
         raise ValueError("Ödeme tutarı pozitif olmalıdır")
@@ -89,16 +116,21 @@ def add_odeme(conn, cursor, cari_id, tutar, aciklama="Ödeme"):
     if not cari:
         raise ValueError("Cari bulunamadı")
     
-    current_balance = float(cari[4])
-    new_balance = current_balance + tutar
+    current_balance = Money.of(cari[4])
+    new_balance = float(current_balance + tutar)
     
     # Bakiyeyi güncelle
-    repo.update_balance(conn, cursor, cari_id, new_balance)
-    
-    # Hareketi kaydet
-    repo.add_hareket(conn, cursor, cari_id, "odeme", tutar, aciklama)
+    repo.update_balance(conn, cursor, cari_id, new_balance, commit=False)
+    
+    # Hareketi kaydet (bakiye ve senkron günlüğü aynı commit ile yazılır)
+    journal_svc.record_cari(cursor, cari_id, "odeme", tutar, aciklama)
+    user_id, shift_id = session.stamp(user_id, shift_id)
+    repo.add_hareket(conn, cursor, cari_id, "odeme", tutar, aciklama, commit=commit, user_id=user_id, shift_id=shift_id,
+                     receipt_id=receipt_id)
+    events.publish(events.CARI_POSTED, (int(cari_id),))
 
-def add_borc(conn, cursor, cari_id, tutar, aciklama="Borç"):
+def add_borc(conn, cursor, cari_id, tutar, aciklama="Borç", commit=True, user_id=None, shift_id=None,
+             receipt_id=None):
     """Borç ekle"""
     if tutar <= 0:
         raise ValueError("Borç tutarı pozitif olmalıdır")
@@ -108,16 +140,21 @@ def add_borc(conn, cursor, cari_id, tutar, aciklama="Borç"):
     if not cari:
         raise ValueError("Cari bulunamadı")
     
-    current_balance = float(cari[4])
-    new_balance = current_balance - tutar
+    current_balance = Money.of(cari[4])
+    new_balance = float(current_balance - tutar)
     
     # Bakiyeyi güncelle
-    repo.update_balance(conn, cursor, cari_id, new_balance)
-    
-    # Hareketi kaydet
-    repo.add_hareket(conn, cursor, cari_id, "borc", tutar, aciklama)
+    repo.update_balance(conn, cursor, cari_id, new_balance, commit=False)
+    
+    # Hareketi kaydet (bakiye ve senkron günlüğü aynı commit ile yazılır)
+    journal_svc.record_cari(cursor, cari_id, "borc", tutar, aciklama)
+    user_id, shift_id = session.stamp(user_id, shift_id)
+    repo.add_hareket(conn, cursor, cari_id, "borc", tutar, aciklama, commit=commit, user_id=user_id, shift_id=shift_id,
+                     receipt_id=receipt_id)
+    events.publish(events.CARI_POSTED, (int(cari_id),))
 
-def add_alacak(conn, cursor, cari_id, tutar, aciklama="Alacak"):
+def add_alacak(conn, cursor, cari_id, tutar, aciklama="Alacak", commit=True, user_id=None, shift_id=None,
+               receipt_id=None):
     """Alacak ekle"""
     if tutar <= 0:
         raise ValueError("Alacak tutarı pozitif olmalıdır")
@@ -127,14 +164,18 @@ def add_alacak(conn, cursor, cari_id, tutar, aciklama="Alacak"):
     if not cari:
         raise ValueError("Cari bulunamadı")
     
-    current_balance = float(cari[4])
-    new_balance = current_balance + tutar
+    current_balance = Money.of(cari[4])
+    new_balance = float(current_balance + tutar)
     
     # Bakiyeyi güncelle
-    repo.update_balance(conn, cursor, cari_id, new_balance)
-    
-    # Hareketi kaydet
-    repo.add_hareket(conn, cursor, cari_id, "alacak", tutar, aciklama)
+    repo.update_balance(conn, cursor, cari_id, new_balance, commit=False)
+    
+    # Hareketi kaydet (bakiye ve senkron günlüğü aynı commit ile yazılır)
+    journal_svc.record_cari(cursor, cari_id, "alacak", tutar, aciklama)
+    user_id, shift_id = session.stamp(user_id, shift_id)
+    repo.add_hareket(conn, cursor, cari_id, "alacak", tutar, aciklama, commit=commit, user_id=user_id, shift_id=shift_id,
+                     receipt_id=receipt_id)
+    events.publish(events.CARI_POSTED, (int(cari_id),))
 
 def list_hareketler(cursor, cari_id):
     """Carinin hareketlerini listele"""
@@ -1,34 +1,43 @@
-from datetime import datetime
+from datetime import datetime, timedelta
+from core.money import KURUS_SQL, Money
+from repositories import archive_repository as archive_repo
+from repositories import receipt_payment_repository as payment_repo
 
 def get_cash_movements(cursor, start_date=None, end_date=None):
     # Combine Sales (Cash), Cari Tahsilat/Odeme, Expenses
     movements = []
+    # Aralık arşivlenmiş yıllara uzanıyorsa arşivler bağlanır
+    schemas = archive_repo.attach_years(cursor, archive_repo.years_in_range(cursor, start_date, end_date))
     
-    # 1. Sales (Cash)
-    query = "SELECT id, created_at, 'Satış', total, 'Giriş', fis_id FROM sales WHERE payment_method='cash' AND (canceled=0 OR canceled IS NULL)"
+    # 1. Sales (Cash) - fişlerin nakit ödemeleri (parçalı ödemenin nakit kısmı dahil); iade/iptal çıkış
+    query = f"""
+        SELECT id, created_at, CASE WHEN kind IN ('refund', 'return') THEN 'İade' ELSE 'Satış' END, ABS(amount_kurus) / 100.0,
+               CASE WHEN amount_kurus < 0 THEN 'Çıkış' ELSE 'Giriş' END, fis_id, receipt_id
+        FROM {archive_repo.source(cursor, 'receipt_payments', schemas)} WHERE method='cash'
+    """
     params = []
     if start_date:
-        query += " AND date(created_at) >= ?"
+        query += " AND created_at >= ?"
         params.append(start_date)
     if end_date:
-        query += " AND date(created_at) <= ?"
+        query += " AND created_at < date(?, '+1 day')"
         params.append(end_date)
     
     cursor.execute(query, params)
     for r in cursor.fetchall():
         movements.append({
-            'id': r[0], 'date': r[1], 'type': r[2], 'amount': r[3], 'direction': r[4], 'desc': r[5]
+            'id': r[0], 'date': r[1], 'type': r[2], 'amount': r[3], 'direction': r[4], 'desc': r[5] or f"#{r[6]}"
         })
 
     # 2. Cari Hareketler
     # islem_type: 'tahsilat' (Giriş), 'odeme' (Çıkış)
-    query = """
+    query = f"""
         SELECT ch.id, ch.created_at, 
                CASE WHEN ch.islem_type='tahsilat' THEN 'Cari Tahsilat' ELSE 'Cari Ödeme' END,
                ch.tutar,
                CASE WHEN ch.islem_type='tahsilat' THEN 'Giriş' ELSE 'Çıkış' END,
                c.name || ' - ' || COALESCE(ch.aciklama, '')
-        FROM cari_hareketler ch
+        FROM {archive_repo.source(cursor, 'cari_hareketler', schemas, alias='ch')}
         JOIN cariler c ON ch.cari_id = c.id
         WHERE ch.islem_type IN ('tahsilat', 'odeme')
     """
@@ -47,7 +56,7 @@ def get_cash_movements(cursor, start_date=None, end_date=None):
         })
 
     # 3. Expenses
-    query = "SELECT id, created_at, 'Masraf', amount, 'Çıkış', title || ' - ' || COALESCE(description,'') FROM expenses WHERE 1=1"
+    query = f"SELECT id, created_at, 'Masraf', amount, 'Çıkış', title || ' - ' || COALESCE(description,'') FROM {archive_repo.source(cursor, 'expenses', schemas)} WHERE 1=1"
     params = []
     if start_date:
         query += " AND date(created_at) >= ?"
@@ -70,28 +79,59 @@ def get_cash_summary(cursor, date=None):
     # Calculate total In/Out for a specific date (or today if None)
     if not date:
         date = datetime.now().strftime("%Y-%m-%d")
-        
-    summary = {'in': 0.0, 'out': 0.0, 'balance': 0.0}
-    
-    # Sales
-    cursor.execute("SELECT SUM(total) FROM sales WHERE payment_method='cash' AND (canceled=0 OR canceled IS NULL) AND date(created_at)=?", (date,))
-    res = cursor.fetchone()
-    summary['in'] += res[0] if res and res[0] else 0.0
-    
-    # Cari Tahsilat
-    cursor.execute("SELECT SUM(tutar) FROM cari_hareketler WHERE islem_type='tahsilat' AND date(created_at)=?", (date,))
-    res = cursor.fetchone()
-    summary['in'] += res[0] if res and res[0] else 0.0
-    
-    # Cari Ödeme
-    cursor.execute("SELECT SUM(tutar) FROM cari_hareketler WHERE islem_type='odeme' AND date(created_at)=?", (date,))
-    res = cursor.fetchone()
-    summary['out'] += res[0] if res and res[0] else 0.0
-    
-    # Expenses
-    cursor.execute("SELECT SUM(amount) FROM expenses WHERE date(created_at)=?", (date,))
-    res = cursor.fetchone()
-    summary['out'] += res[0] if res and res[0] else 0.0
-    
-    summary['balance'] = summary['in'] - summary['out']
-    return summary
+    end = (datetime.strptime(date, "%Y-%m-%d") + timedelta(days=1)).strftime("%Y-%m-%d")
+
+    # Kasa: fiş ödemeleri (tür başına), cari tahsilat/ödeme ve masraflar tek gruplu sorguda;
+    # arşivlenmiş gün ise aynı sorgu ana veritabanındaki arşiv özetlerinden okur (kuruş, tam toplam)
+    kurus = KURUS_SQL.format
+    cursor.execute(f"""
+        SELECT src, key, SUM(k) FROM (
+            SELECT 'pay' AS src, method AS key, amount_kurus AS k FROM receipt_payments
+            WHERE created_at >= ? AND created_at < ?
+            UNION ALL SELECT 'pay', method, amount_kurus FROM archive_payments_daily WHERE day = ?
+            UNION ALL SELECT 'cari', islem_type, tutar_kurus FROM cari_hareketler
+            WHERE islem_type IN ('tahsilat', 'odeme') AND created_at >= ? AND created_at < ?
+            UNION ALL SELECT 'cari', 'tahsilat', {kurus(col='tahsilat')} FROM archive_cash_daily WHERE day = ?
+            UNION ALL SELECT 'cari', 'odeme', {kurus(col='odeme')} FROM archive_cash_daily WHERE day = ?
+            UNION ALL SELECT 'expense', '', amount_kurus FROM expenses WHERE created_at >= ? AND created_at < ?
+            UNION ALL SELECT 'expense', '', {kurus(col='expenses')} FROM archive_cash_daily WHERE day = ?
+        ) GROUP BY src, key
+    """, (date, end, date, date, end, date, date, date, end, date))
+    totals = {(src, key): Money(k or 0) for src, key, k in cursor.fetchall()}
+    by_method = {key: amount for (src, key), amount in totals.items() if src == 'pay'}
+    # Ödeme özetinden önce arşivlenmiş yıl: ödemeler arşiv dosyasından
+    for year in archive_repo.unsummarized_payment_years(cursor, archive_repo.years_in_range(cursor, date, date)):
+        for method, k in _archived_payment_totals(cursor, year, date, end).items():
+            by_method[method] = by_method.get(method, Money()) + Money(k)
+
+    cash_in = by_method.get('cash', Money()) + totals.get(('cari', 'tahsilat'), Money())
+    cash_out = totals.get(('cari', 'odeme'), Money()) + totals.get(('expense', ''), Money())
+    return {'in': float(cash_in), 'out': float(cash_out), 'balance': float(cash_in - cash_out),
+            'card': float(by_method.get('credit_card', Money())),
+            'payments': {method: float(amount) for method, amount in by_method.items()}}
+
+
+def _archived_payment_totals(cursor, year, start, end):
+    schemas = archive_repo.attach_years(cursor, [year])
+    if not schemas:
+        return {}
+    cursor.execute(f"SELECT method, SUM(amount_kurus) FROM {schemas[0]}.receipt_payments "
+                   "WHERE created_at >= ? AND created_at < ? GROUP BY method", (start, end))
+    return {r[0]: int(r[1] or 0) for r in cursor.fetchall()}
+
+
+def get_payment_totals(cursor, start_date, end_date=None):
+    """Ödeme türü başına net fiş tahsilatı {tür: Money}, [start_date, end_date] günleri."""
+    end_date = end_date or start_date
+    end = (datetime.strptime(end_date, "%Y-%m-%d") + timedelta(days=1)).strftime("%Y-%m-%d")
+    totals = {method: Money(kurus) for method, kurus in payment_repo.totals_by_method(cursor, start_date, end).items()}
+    years = archive_repo.years_in_range(cursor, start_date, end_date)
+    if years:
+        # Arşivlenmiş günler özetten; özetten önce arşivlenmiş yıllar arşiv dosyasından
+        archived = archive_repo.payment_summary(cursor, start_date, end_date)
+        for year in archive_repo.unsummarized_payment_years(cursor, years):
+            for method, kurus in _archived_payment_totals(cursor, year, start_date, end).items():
+                archived[method] = archived.get(method, 0) + kurus
+        for method, kurus in archived.items():
+            totals[method] = totals.get(method, Money()) + Money(kurus)
+    return totals
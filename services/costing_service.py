@@ -0,0 +1,84 @@
+"""Maliyet: alışta güncellenen ağırlıklı hareketli ortalama.
+Satış satırına o anki ortalama yazılır; kâr raporları saklanan değerleri toplar.
+"""
+from typing import Optional
+from repositories import costing_repository as repo
+
+
+def _weighted(old_qty: float, old_avg: float, qty: float, price: float) -> float:
+    # Negatif/boş stokta eski ortalamanın ağırlığı yoktur
+    if old_qty <= 0:
+        return float(price)
+    total_qty = old_qty + qty
+    if total_qty <= 0:
+        return float(old_avg)
+    return (old_qty * old_avg + qty * price) / total_qty
+
+
+def _unweighted(cur_qty: float, cur_avg: float, qty: float, price: float) -> float:
+    rest_qty = cur_qty - qty
+    if rest_qty <= 0:
+        return float(cur_avg)
+    return max(0.0, (cur_qty * cur_avg - qty * price) / rest_qty)
+
+
+def receive(cursor, product_id: int, qty: float, unit_price: float, warehouse_id: Optional[int] = None) -> None:
+    """Mal girişi: ortalama maliyeti güncelle. Stok artırılmadan ÖNCE çağrılmalıdır."""
+    qty = float(qty)
+    unit_price = float(unit_price)
+    if not product_id or qty <= 0 or unit_price <= 0:
+        return
+
+    prod = repo.get_product_cost(cursor, product_id)
+    if prod:
+        stock, avg = prod
+        repo.set_product_cost(cursor, product_id, _weighted(stock, avg, qty, unit_price))
+
+    if warehouse_id:
+        row = repo.get_warehouse_cost(cursor, warehouse_id, product_id)
+        wh_qty, wh_avg = row if row else (0.0, None)
+        if wh_avg is None:
+            wh_avg = prod[1] if prod else unit_price
+        repo.set_warehouse_cost(cursor, warehouse_id, product_id, _weighted(wh_qty, wh_avg, qty, unit_price))
+
+
+def unreceive(cursor, product_id: int, qty: float, unit_price: float, warehouse_id: Optional[int] = None) -> None:
+    """Mal girişinin iptali: ortalamadan girişin payını çıkar. Stok azaltılmadan ÖNCE çağrılmalıdır."""
+    qty = float(qty)
+    unit_price = float(unit_price)
+    if not product_id or qty <= 0 or unit_price <= 0:
+        return
+
+    prod = repo.get_product_cost(cursor, product_id)
+    if prod:
+        stock, avg = prod
+        repo.set_product_cost(cursor, product_id, _unweighted(stock, avg, qty, unit_price))
+
+    if warehouse_id:
+        row = repo.get_warehouse_cost(cursor, warehouse_id, product_id)
+        if row and row[1] is not None:
+            repo.set_warehouse_cost(cursor, warehouse_id, product_id, _unweighted(row[0], row[1], qty, unit_price))
+
+
+def transfer(cursor, source_id: int, target_id: int, product_id: int, qty: float) -> None:
+    """Depolar arası transfer: kaynak deponun maliyetini hedefe taşı. Stoklar değişmeden ÖNCE çağrılmalıdır."""
+    qty = float(qty)
+    if qty <= 0:
+        return
+    src = repo.get_warehouse_cost(cursor, source_id, product_id)
+    src_avg = src[1] if src and src[1] is not None else None
+    if src_avg is None:
+        prod = repo.get_product_cost(cursor, product_id)
+        src_avg = prod[1] if prod else 0.0
+
+    dst = repo.get_warehouse_cost(cursor, target_id, product_id)
+    dst_qty, dst_avg = dst if dst else (0.0, None)
+    if dst_avg is None:
+        dst_avg = src_avg
+    repo.set_warehouse_cost(cursor, target_id, product_id, _weighted(dst_qty, dst_avg, qty, src_avg))
+
+
+def unit_cost_for_sale(cursor, product_name: str, warehouse_id: Optional[int] = None) -> float:
+    """Satış anındaki birim maliyet (satış satırına işlenir)."""
+    cost = repo.get_sale_cost_by_name(cursor, product_name, warehouse_id)
+    return float(cost) if cost is not None else 0.0
@@ -0,0 +1,147 @@
+"""Cari otomatik tamamlama için bellekte önek indeksi.
+
+İsimler Türkçe kurallarla katlanıp ASCII'ye çevrilir ("sukru" -> "ŞÜKRÜ"), telefonlar
+rakam olarak indekslenir; sorgu sıralı listede bisect aralığıdır. Başka bağlantıların
+yazımları indeksi düşürür (tables_changed).
+"""
+from bisect import bisect_left, insort
+from typing import Dict, List, Optional, Tuple
+from repositories import cari_repository as repo
+
+_TR_LOWER = str.maketrans({"I": "ı", "İ": "i"})
+_ASCII = str.maketrans({"ı": "i", "ş": "s", "ğ": "g", "ü": "u", "ö": "o", "ç": "c", "â": "a", "î": "i", "û": "u"})
+
+# Anahtar türleri: eşleşme sırası (tam ad > kelime > telefon)
+_NAME, _WORD, _PHONE = 0, 1, 2
+
+_keys: Optional[List[Tuple[str, int, int]]] = None   # sıralı (anahtar, tür, cari_id)
+_rows: Dict[int, Tuple[int, str, str]] = {}           # cari_id -> (id, ad, telefon)
+
+
+def fold(text) -> str:
+    """Türkçe küçük harf + ASCII katlama."""
+    return str(text or "").translate(_TR_LOWER).lower().translate(_ASCII).strip()
+
+
+def digits(text) -> str:
+    return "".join(ch for ch in str(text or "") if ch.isdigit())
+
+
+def _keys_for(cari_id: int, name: str, phone: str) -> List[Tuple[str, int, int]]:
+    out = []
+    folded = fold(name)
+    if folded:
+        out.append((folded, _NAME, cari_id))
+        words = folded.split()
+        for w in words[1:]:
+            out.append((w, _WORD, cari_id))
+    ph = digits(phone)
+    national = ph
+    if len(ph) > 10 and ph.startswith("90"):
+        national = ph[2:]
+    elif ph.startswith("0"):
+        national = ph[1:]
+    variants = {ph, national, "0" + national} if national else set()
+    for v in variants:
+        if v:
+            out.append((v, _PHONE, cari_id))
+    return out
+
+
+def _add_row(cari_id: int, name: str, phone: str) -> None:
+    _rows[cari_id] = (cari_id, name, phone or "")
+    for k in _keys_for(cari_id, name, phone):
+        insort(_keys, k)
+
+
+def _drop_row(cari_id: int) -> None:
+    row = _rows.pop(cari_id, None)
+    if row is None:
+        return
+    for k in _keys_for(cari_id, row[1], row[2]):
+        i = bisect_left(_keys, k)
+        if i < len(_keys) and _keys[i] == k:
+            del _keys[i]
+
+
+def _ensure(cursor) -> None:
+    global _keys
+    if _keys is not None:
+        return
+    _keys = []
+    _rows.clear()
+    entries = []
+    for r in repo.list_all(cursor):
+        cari_id, name, phone = int(r[0]), r[1], r[2] or ""
+        _rows[cari_id] = (cari_id, name, phone)
+        entries.extend(_keys_for(cari_id, name, phone))
+    entries.sort()
+    _keys = entries
+
+
+def invalidate() -> None:
+    """İndeksi at; bir sonraki aramada yeniden kurulur (ör. başka süreç yazdıysa)."""
+    global _keys
+    _keys = None
+    _rows.clear()
+
+
+def tables_changed(tables) -> None:
+    """events.TABLES_CHANGED aboneliği: başka bağlantı carileri değiştirdiyse indeksi at."""
+    if "cariler" in tables:
+        invalidate()
+
+
+def refresh(cursor, cari_id: int) -> None:
+    """Tek bir cariyi indekste güncelle (eklendi/değişti). İndeks kurulmadıysa bir şey yapmaz."""
+    if _keys is None or not cari_id:
+        return
+    _drop_row(int(cari_id))
+    r = repo.get_by_id(cursor, int(cari_id))
+    if r:
+        _add_row(int(r[0]), r[1], r[2] or "")
+
+
+def remove(cari_id: int) -> None:
+    if _keys is None or not cari_id:
+        return
+    _drop_row(int(cari_id))
+
+
+def search(cursor, query: str, limit: int = 20) -> List[Tuple[int, str, str]]:
+    """Ön ek eşleşmeleri [(id, ad, telefon)]; önce ad başı, sonra kelime başı, sonra telefon."""
+    _ensure(cursor)
+    q = fold(query)
+    qd = digits(query)
+    if not q:
+        return []
+
+    buckets = {_NAME: [], _WORD: [], _PHONE: []}
+    wanted = [(q, (_NAME, _WORD))]
+    # Sadece rakam (ve telefon ayırıcıları) yazıldıysa telefon ara
+    if qd and len(qd) >= 2 and not any(ch.isalpha() for ch in q):
+        wanted.append((qd, (_PHONE,)))
+
+    for prefix, kinds in wanted:
+        i = bisect_left(_keys, (prefix,))
+        while i < len(_keys):
+            key, kind, cari_id = _keys[i]
+            if not key.startswith(prefix):
+                break
+            if kind in kinds and len(buckets[kind]) < limit and cari_id not in buckets[kind]:
+                buckets[kind].append(cari_id)
+            i += 1
+            if all(len(buckets[k]) >= limit for k in kinds):
+                break
+
+    seen = set()
+    out = []
+    for kind in (_NAME, _WORD, _PHONE):
+        for cari_id in buckets[kind]:
+            if cari_id in seen:
+                continue
+            seen.add(cari_id)
+            out.append(_rows[cari_id])
+            if len(out) >= limit:
+                return out
+    return out
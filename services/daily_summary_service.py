@@ -0,0 +1,86 @@
+"""Günlük satış özeti (gün, saat, ödeme türü; gün başına ürün).
+
+Özet satırları satış, iptal ve iadeyle aynı transaction'da güncellenir; iade yapıldığı
+güne yazılır. Canlı panel sayaçlarını buradan kurar, ham satışları taramaz.
+"""
+from datetime import datetime
+from typing import Optional, Sequence, Tuple
+
+from core.money import Money, to_kurus
+from repositories import daily_summary_repository as repo
+from repositories import sales_repository as sales_repo
+
+
+def now_str() -> str:
+    return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+
+def day_hour(created_at: str) -> Tuple[str, int]:
+    ts = str(created_at).replace("T", " ")
+    try:
+        return ts[:10], int(ts[11:13])
+    except ValueError:
+        return ts[:10], 0
+
+
+def record_sale(cursor, created_at: str, payment_method: str, lines: Sequence, sign: int = 1) -> None:
+    """Satışı (sign=-1 ile iptali) özete işle. lines: [(ad, adet, fiyat, tutar)]. Commit etmez."""
+    if not lines:
+        return
+    day, hour = day_hour(created_at)
+    items = sum(float(qty) for _, qty, _, _ in lines)
+    revenue = sum(to_kurus(total) for _, _, _, total in lines)
+    repo.add(cursor, day, hour, payment_method or "cash", sign, sign * items, sign * revenue)
+    repo.add_products(cursor, day, [(name, sign * float(qty), sign * to_kurus(total)) for name, qty, _, total in lines])
+
+
+def record_return(cursor, created_at: str, payment_method: str, lines: Sequence, sign: int = 1) -> None:
+    """İadeyi (sign=-1 ile geri alınmasını) iade gününe işle. lines: [(ad, iade adedi, fiyat, iade tutarı)] (artı)."""
+    if not lines:
+        return
+    day, hour = day_hour(created_at)
+    items = sum(float(qty) for _, qty, _, _ in lines)
+    amount = sum(to_kurus(total) for _, _, _, total in lines)
+    repo.add(cursor, day, hour, payment_method or "cash", 0, -sign * items, -sign * amount, sign, sign * amount)
+    repo.add_products(cursor, day, [(name, -sign * float(qty), -sign * to_kurus(total)) for name, qty, _, total in lines])
+
+
+def record_cancel(cursor, receipt_id: int) -> list:
+    """Fişin iptal edilmemiş satırlarını özetten düş (iptal işaretlenmeden önce çağrılır).
+    Satış kendi gününden, önceki iadeler kendi günlerinden geri alınır.
+    Returns canlı sayaçlar için [(created_at, payment_method, lines, sign, receipts)] (aktif satır yoksa boş)."""
+    groups = {}
+    for name, qty, total, created_at, payment_method, return_id in sales_repo.get_active_line_totals(cursor, receipt_id):
+        key = return_id if return_id is not None else 0
+        created, pm, lines = groups.setdefault(key, (created_at, payment_method, []))
+        # İade satırları eksi kayıtlı; iade olarak artı miktarla taşınır
+        lines.append((name, abs(float(qty)), 0.0, abs(float(total))))
+    deltas = []
+    for key, (created_at, payment_method, lines) in sorted(groups.items()):
+        if key == 0:
+            record_sale(cursor, created_at, payment_method, lines, sign=-1)
+            deltas.append((created_at, payment_method, lines, -1, -1))
+        else:
+            record_return(cursor, created_at, payment_method, lines, sign=-1)
+            deltas.append((created_at, payment_method, lines, 1, 0))
+    return deltas
+
+
+def get_day(cursor, day: Optional[str] = None):
+    """(saatlik kovalar, ürün toplamları) - bir günün özeti; ciro kuruş."""
+    day = day or now_str()[:10]
+    return repo.get_day(cursor, day), repo.get_day_products(cursor, day)
+
+
+def get_totals(cursor, from_day: str, to_day: str) -> dict:
+    """[from_day, to_day] özet toplamları: fiş, adet, net ciro, iade sayısı ve iade tutarı (Money).
+    Ham satışlar taranmaz; iadeler özetlerde zaten netleşmiştir."""
+    receipts, items, revenue, returns, returns_kurus = repo.get_totals(cursor, from_day, to_day)
+    return {"receipts": receipts, "items": items, "revenue": Money(revenue), "gross": Money(revenue + returns_kurus),
+            "returns": returns, "returns_amount": Money(returns_kurus)}
+
+
+def rebuild(conn, cursor) -> None:
+    """Özetleri satış geçmişinden bir kez yeniden kur (şema migrasyonunda kullanılır)."""
+    repo.rebuild(cursor)
+    conn.commit()
@@ -1,4 +1,5 @@
 """Expense & Service Service"""
+from pos import session
 from repositories import expense_repository as repo
 
 # --- SERVICES ---
@@ -38,7 +39,8 @@ def add_expense(conn, cursor, title, amount, category, description):
     except:
         raise ValueError("Geçersiz tutar")
     
-    repo.add_expense(conn, cursor, title, amount, category, description)
+    user_id, shift_id = session.current()
+    repo.add_expense(conn, cursor, title, amount, category, description, user_id=user_id, shift_id=shift_id)
 
 def delete_expense(conn, cursor, expense_id):
     repo.delete_expense(conn, cursor, expense_id)
@@ -0,0 +1,80 @@
+"""Değişiklik günlüğü (çevrimdışı öncelikli kasa).
+
+Senkron hedefi varsa merkeze gitmesi gereken her değişiklik (satış, iptal, iade,
+stok farkı, cari) aynı transaction'da change_journal'a terminal başına boşluksuz
+seq ile yazılır. Kayıtlar yerel id değil doğal anahtar taşır.
+"""
+import json
+from typing import Iterable, Optional
+
+from repositories import journal_repository as repo
+from repositories import receipt_repository as receipt_repo
+from services import receipt_service as receipt_svc
+
+
+def enabled(cursor) -> bool:
+    cursor.execute("SELECT value FROM settings WHERE key='sync_target'")
+    r = cursor.fetchone()
+    return bool(r and (r[0] or "").strip())
+
+
+def record(cursor, kind: str, payload: dict, created_at: Optional[str] = None) -> Optional[int]:
+    """Değişikliği günlüğe ekle (commit etmez). Senkron kapalıysa None."""
+    if not enabled(cursor):
+        return None
+    return repo.append(cursor, receipt_svc.get_terminal_id(cursor), kind, json.dumps(payload, ensure_ascii=False), created_at)
+
+
+def record_sale(cursor, receipt_id: int, lines: Iterable, payment_method: str, warehouse_id: Optional[int] = None,
+                payments: Optional[Iterable] = None):
+    """payments: [(ödeme türü, kuruş)] (receipt_payments satırları)"""
+    if not enabled(cursor):
+        return None
+    _, terminal_id, day, no, _, created_at, customer_name = receipt_repo.get(cursor, receipt_id)
+    return record(cursor, "sale", {
+        "terminal_id": terminal_id, "day": day, "no": no, "customer_name": customer_name,
+        "payment_method": payment_method, "warehouse_id": warehouse_id,
+        "lines": [[name, float(qty), float(price), float(total)] for name, qty, price, total in lines],
+        "payments": [[method, int(kurus)] for method, kurus in payments or ()],
+    }, created_at)
+
+
+def record_cancel(cursor, receipt_id: int):
+    if not enabled(cursor):
+        return None
+    r = receipt_repo.get(cursor, receipt_id)
+    if not r:
+        return None
+    _, terminal_id, day, no, legacy, _, _ = r
+    return record(cursor, "cancel", {"terminal_id": terminal_id, "day": day, "no": no, "legacy_fis_id": legacy})
+
+
+def record_return(cursor, receipt_id: int, lines: Iterable, payments: Iterable, reason: Optional[str] = None):
+    """lines: [(ürün, iade adedi, iade tutarı, depo)], payments: [(ödeme türü, kuruş)] (artı, geri ödenen)"""
+    if not enabled(cursor):
+        return None
+    r = receipt_repo.get(cursor, receipt_id)
+    if not r:
+        return None
+    _, terminal_id, day, no, legacy, _, _ = r
+    return record(cursor, "return", {
+        "terminal_id": terminal_id, "day": day, "no": no, "legacy_fis_id": legacy, "reason": reason,
+        "lines": [[name, float(qty), float(amount), wh] for name, qty, amount, wh in lines],
+        "payments": [[method, int(kurus)] for method, kurus in payments],
+    })
+
+
+def record_stock(cursor, product_name: str, delta: float, warehouse_id: Optional[int] = None, reason: str = ""):
+    return record(cursor, "stock", {"product": product_name, "delta": float(delta),
+                                    "warehouse_id": warehouse_id, "reason": reason})
+
+
+def record_cari(cursor, cari_id: int, islem_type: str, tutar: float, aciklama: str):
+    if not enabled(cursor):
+        return None
+    cursor.execute("SELECT name, cari_type FROM cariler WHERE id=?", (cari_id,))
+    r = cursor.fetchone()
+    if not r:
+        return None
+    return record(cursor, "cari", {"name": r[0], "cari_type": r[1], "islem_type": islem_type,
+                                   "tutar": float(tutar), "aciklama": aciklama})
@@ -0,0 +1,91 @@
+"""Bugünün panosu için bellekteki canlı satış sayaçları.
+
+seed() günlük özetten yükler, sales_service her satış/iptali apply() ile işler; pano
+okuması sorgu gerektirmez. Başka süreçlerin satışlarında pano yeniden yüklenir.
+"""
+import heapq
+import threading
+from typing import Dict, Optional, Sequence
+
+from core.money import from_kurus, to_kurus
+from services import daily_summary_service as summary_svc
+
+
+class SalesCounters:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._reset(None)
+
+    def _reset(self, day: Optional[str]) -> None:
+        self.day = day
+        # Ciro kuruş olarak tutulur: iptaller toplamı tam sıfıra indirir
+        self.hourly: Dict[int, list] = {}     # saat -> [fiş, adet, ciro]
+        self.payments: Dict[str, list] = {}   # ödeme türü -> [fiş, ciro]
+        self.products: Dict[str, list] = {}   # ürün -> [adet, ciro]
+
+    def seed(self, cursor, day: Optional[str] = None) -> None:
+        """Sayaçları günlük özetten kur (açılışta ve dış yazımdan sonra)."""
+        day = day or summary_svc.now_str()[:10]
+        buckets, products = summary_svc.get_day(cursor, day)
+        with self._lock:
+            self._reset(day)
+            for hour, payment_method, receipts, items, revenue in buckets:
+                self._add(int(hour), payment_method, int(receipts), float(items), int(revenue))
+            for name, qty, revenue in products:
+                self.products[name] = [float(qty), int(revenue)]
+
+    def _add(self, hour: int, payment_method: str, receipts: int, items: float, revenue: int) -> None:
+        h = self.hourly.setdefault(hour, [0, 0.0, 0])
+        h[0] += receipts; h[1] += items; h[2] += revenue
+        p = self.payments.setdefault(payment_method, [0, 0])
+        p[0] += receipts; p[1] += revenue
+
+    def apply(self, created_at: str, payment_method: str, lines: Sequence, sign: int = 1,
+              receipts: Optional[int] = None) -> None:
+        """Commit edilmiş satışı (sign=-1: iptali) sayaçlara ekle. lines: [(ad, adet, fiyat, tutar)].
+        receipts: fiş sayısı farkı (varsayılan sign); iadede 0 verilir, fiş sayısı değişmez."""
+        day, hour = summary_svc.day_hour(created_at)
+        with self._lock:
+            if self.day is None or day > self.day:
+                # Gün döndü: yeni gün sıfırdan başlar
+                self._reset(day)
+            elif day < self.day:
+                return
+            items = sum(float(qty) for _, qty, _, _ in lines)
+            revenue = sum(to_kurus(total) for _, _, _, total in lines)
+            self._add(hour, payment_method or "cash", sign if receipts is None else receipts, sign * items, sign * revenue)
+            for name, qty, _, total in lines:
+                p = self.products.setdefault(name, [0.0, 0])
+                p[0] += sign * float(qty); p[1] += sign * to_kurus(total)
+                if p[0] <= 1e-9:
+                    del self.products[name]
+
+    def snapshot(self, top: int = 10) -> dict:
+        """Panel verisi: ciro, fiş sayısı, ortalama sepet, saatlik dağılım, ödeme türleri, en çok satanlar."""
+        with self._lock:
+            receipts = sum(int(v[0]) for v in self.hourly.values())
+            items = sum(v[1] for v in self.hourly.values())
+            revenue = sum(v[2] for v in self.hourly.values())
+            return {
+                "day": self.day,
+                "revenue": from_kurus(revenue),
+                "receipts": receipts,
+                "items": items,
+                "avg_basket": from_kurus(revenue) / receipts if receipts else 0.0,
+                "hourly": [(h, int(v[0]), from_kurus(v[2])) for h, v in sorted(self.hourly.items()) if v[0] or v[2]],
+                "payments": sorted(((pm, int(v[0]), from_kurus(v[1])) for pm, v in self.payments.items() if v[0]),
+                                   key=lambda r: -r[2]),
+                "top": [(name, v[0], from_kurus(v[1])) for name, v in
+                        heapq.nlargest(top, self.products.items(), key=lambda kv: kv[1][1])],
+            }
+
+
+_counters: Optional[SalesCounters] = None
+
+
+def get_counters() -> SalesCounters:
+    """Uygulama genelindeki tek sayaç nesnesi."""
+    global _counters
+    if _counters is None:
+        _counters = SalesCounters()
+    return _counters
@@ -0,0 +1,28 @@
+"""Şema sonrası geçiş: init_schema'nın yeni açtığı türetilmiş tabloları satış geçmişinden doldurur."""
+from repositories import receipt_payment_repository as payment_repo
+from services import daily_summary_service
+from services import popularity_service
+
+
+def _backfill_payments(conn, cursor) -> None:
+    payment_repo.backfill(cursor)
+    conn.commit()
+
+
+# schema_backfills adı -> doldurucu (init_schema'daki tablo sırasıyla)
+BACKFILLS = (
+    ("product_popularity", popularity_service.rebuild),
+    ("receipt_payments", _backfill_payments),
+    ("sales_daily", daily_summary_service.rebuild),
+)
+
+
+def run(conn, cursor) -> None:
+    """Bekleyen doldurmaları çalıştır; her biri bitince işaretini siler (init_schema'dan sonra çağrılır)."""
+    cursor.execute("SELECT name FROM schema_backfills")
+    pending = {r[0] for r in cursor.fetchall()}
+    for name, fill in BACKFILLS:
+        if name in pending:
+            fill(conn, cursor)
+            cursor.execute("DELETE FROM schema_backfills WHERE name=?", (name,))
+            conn.commit()
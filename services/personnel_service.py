@@ -1,12 +1,78 @@
+from core.money import Money
+from pos import session
 from repositories import personnel_repository as repo
+from repositories import receipt_payment_repository as payment_repo
+from repositories import cari_repository as cari_repo
+from repositories import expense_repository as expense_repo
+from repositories import sales_repository as sales_repo
+from repositories import users_repository as users_repo
 
-def start_shift(conn, cursor, user_id, note=""):
-    repo.start_shift(cursor, user_id, note)
+def start_shift(conn, cursor, user_id, note="", opening_cash=None):
+    """Vardiyayı kasadaki açılış nakdiyle başlat."""
+    opening = Money.of(opening_cash).kurus if opening_cash not in (None, "") else None
+    shift_id = repo.start_shift(cursor, user_id, note, opening)
     conn.commit()
+    session.refresh(cursor)
+    return shift_id
 
-def end_shift(conn, cursor, shift_id):
-    repo.end_shift(cursor, shift_id)
+def end_shift(conn, cursor, shift_id, counted_cash=None):
+    """Vardiyayı kapat; sayılan nakit verilirse beklenen nakitle birlikte saklanır. Mutabakat raporunu döndürür."""
+    report = shift_reconciliation(cursor, shift_id, counted_cash)
+    counted = report["counted"].kurus if report["counted"] is not None else None
+    repo.end_shift(cursor, shift_id, counted, report["expected"].kurus)
     conn.commit()
+    report["end"] = repo.get_shift(cursor, shift_id)[4]
+    session.refresh(cursor)
+    return report
+
+def shift_reconciliation(cursor, shift_id, counted_cash=None):
+    """Vardiya mutabakatı: beklenen ve sayılan nakit, kasiyer başına satış, iptal ve iadeler.
+    Satırlar yazılırken vardiyaya damgalandığı için her toplam shift_id indeksinden tek gruplu sorgudur."""
+    shift = repo.get_shift(cursor, shift_id)
+    if not shift:
+        raise ValueError("Vardiya bulunamadı")
+    _, _, _, start, end, opening_kurus, counted_kurus, _ = shift
+    names = {uid: name for uid, name, _ in users_repo.list_all(cursor)}
+
+    # kind: 'sale' satış, 'refund' fiş iptali, 'return' satır iadesi (eksi tutarlar)
+    payments, cash = {}, {"sale": Money(), "refund": Money(), "return": Money()}
+    cashiers = {}
+
+    def cashier(user_id):
+        return cashiers.setdefault(user_id, {"receipts": 0, "revenue": Money(), "voids": 0, "void_amount": Money(),
+                                             "returns": 0, "return_amount": Money(), "items": 0.0})
+    amount_key = {"sale": "revenue", "refund": "void_amount", "return": "return_amount"}
+    count_key = {"sale": "receipts", "refund": "voids", "return": "returns"}
+    for user_id, kind, method, _, kurus in payment_repo.shift_totals(cursor, shift_id):
+        payments[method] = payments.get(method, Money()) + Money(kurus)
+        if method == "cash":
+            cash[kind] = cash.get(kind, Money()) + Money(kurus)
+        cashier(user_id)[amount_key[kind]] += abs(Money(kurus))
+    for user_id, kind, receipts in payment_repo.shift_receipt_counts(cursor, shift_id):
+        cashier(user_id)[count_key[kind]] += receipts
+    for user_id, items in sales_repo.shift_items(cursor, shift_id):
+        if user_id in cashiers:
+            cashiers[user_id]["items"] = items
+
+    cari = cari_repo.shift_totals(cursor, shift_id)
+    opening = Money(opening_kurus or 0)
+    tahsilat, odeme = Money(cari.get("tahsilat", 0)), Money(cari.get("odeme", 0))
+    expenses = Money(expense_repo.shift_total(cursor, shift_id))
+    expected = opening + cash["sale"] + cash["refund"] + cash["return"] + tahsilat - odeme - expenses
+    if counted_cash not in (None, ""):
+        counted = Money.of(counted_cash)
+    else:
+        counted = Money(counted_kurus) if counted_kurus is not None else None
+    return {
+        "shift_id": int(shift_id), "user": names.get(shift[1], ""), "start": start, "end": end,
+        "opening": opening, "cash_sales": cash["sale"], "cash_refunds": -(cash["refund"] + cash["return"]),
+        "tahsilat": tahsilat, "odeme": odeme, "expenses": expenses,
+        "expected": expected, "counted": counted,
+        "difference": counted - expected if counted is not None else None,
+        "payments": payments,
+        "cashiers": [dict(user_id=uid, username=names.get(uid, "-"), **c)
+                     for uid, c in sorted(cashiers.items(), key=lambda kv: -kv[1]["revenue"].kurus)],
+    }
 
 def get_active_shift(cursor, user_id):
     return repo.get_active_shift(cursor, user_id)
@@ -0,0 +1,95 @@
+"""Hızlı ürünler için artımlı satış hızı sıralaması.
+
+Gün/hafta sayaçları üstel sönümlenir; satırlar zamanla güncellenmez, her artış
+2 ** ((now - epoch) / yarı_ömür) ile ağırlıklandırılır ve ilk N indeksten okunur.
+"""
+import time
+from datetime import datetime, timedelta
+from typing import List, Optional, Tuple
+from repositories import popularity_repository as repo
+
+DAY_HALF_LIFE = 86400.0
+WEEK_HALF_LIFE = 7 * 86400.0
+# 2**500 hala float aralığında; bu eşiği geçince skorlar yeni epoch'a taşınır
+_REBASE_EXPONENT = 500.0
+
+
+def _epoch(cursor, now: float) -> float:
+    epoch = repo.get_epoch(cursor)
+    if epoch is None:
+        repo.set_epoch(cursor, now)
+        return now
+    if (now - epoch) / DAY_HALF_LIFE > _REBASE_EXPONENT:
+        repo.rescale(cursor,
+                     2.0 ** (-(now - epoch) / DAY_HALF_LIFE),
+                     2.0 ** (-(now - epoch) / WEEK_HALF_LIFE))
+        repo.set_epoch(cursor, now)
+        return now
+    return epoch
+
+
+def _weights(epoch: float, ts: float) -> Tuple[float, float]:
+    return (2.0 ** ((ts - epoch) / DAY_HALF_LIFE), 2.0 ** ((ts - epoch) / WEEK_HALF_LIFE))
+
+
+def timestamp(created_at) -> Optional[float]:
+    """'YYYY-MM-DD HH:MM:SS' kayıt zamanını epoch saniyesine çevir; okunamazsa None."""
+    if not created_at:
+        return None
+    try:
+        return datetime.strptime(str(created_at)[:19].replace("T", " "), "%Y-%m-%d %H:%M:%S").timestamp()
+    except ValueError:
+        return None
+
+
+def record_sale(cursor, product_name: str, qty: float, ts: Optional[float] = None) -> None:
+    """Satış (veya negatif miktarla iptal/iade) için sayaçları güncelle. Commit etmez.
+    ts: satırın asıl satış zamanı; iptal ve iadede verilir ki aynı ağırlıkla düşülsün."""
+    if not product_name or not qty:
+        return
+    now = time.time()
+    at = now if ts is None else float(ts)
+    epoch = _epoch(cursor, now)
+    day_w, week_w = _weights(epoch, at)
+    qty = float(qty)
+    repo.add(cursor, product_name, qty, qty * day_w, qty * week_w, datetime.fromtimestamp(at).hour)
+
+
+def top_products(cursor, window: str = "all", limit: int = 10) -> List[Tuple[str, float]]:
+    """En popüler ürünler [(ad, fiyat)]; window: 'day', 'week' veya 'all'."""
+    return [(name, price) for name, price, _ in repo.top(cursor, window, limit)]
+
+
+def top_for_hour(cursor, hour: Optional[int] = None, limit: int = 10) -> List[Tuple[str, float]]:
+    """Günün saatine göre popüler ürünler; saat verisi yoksa haftalık listeye düşer."""
+    if hour is None:
+        hour = datetime.now().hour
+    rows = repo.top_for_hour(cursor, hour, limit)
+    if not rows:
+        rows = repo.top(cursor, "week", limit)
+    return [(name, price) for name, price, _ in rows]
+
+
+def rebuild(conn, cursor) -> None:
+    """Sayaçları satış geçmişinden bir kez yeniden kur (şema migrasyonunda kullanılır)."""
+    now = time.time()
+    repo.clear(cursor)
+    repo.set_epoch(cursor, now)
+
+    for name, total in repo.sales_totals(cursor):
+        if name and total:
+            repo.add(cursor, name, float(total), 0.0, 0.0, 0)
+
+    # Sadece son haftaların ağırlığı anlamlıdır; daha eskisi zaten ~0'a sönmüştür
+    since = (datetime.now() - timedelta(days=56)).strftime("%Y-%m-%d")
+    for name, created_at, qty in repo.sales_history_by_day_hour(cursor, since):
+        if not name or not qty:
+            continue
+        try:
+            dt = datetime.strptime(str(created_at)[:19].replace("T", " "), "%Y-%m-%d %H:%M:%S")
+        except ValueError:
+            continue
+        day_w, week_w = _weights(now, dt.timestamp())
+        # total_qty zaten eklendi; burada sadece sönümlü skorlar eklenir
+        repo.add(cursor, name, 0.0, float(qty) * day_w, float(qty) * week_w, dt.hour)
+    conn.commit()
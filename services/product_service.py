@@ -11,6 +11,8 @@ def list_products(cursor, filter_text: str = "") -> List[Tuple[int, str, str, fl
 
 
 from services import warehouse_service as wh_svc
+from services import journal_service as journal_svc
+from pos import events
 
 def add_product(conn, cursor, name: str, barcode: str, sale_price: float, stock: float, buy_price: float, unit: str = 'adet', category_id: Optional[int] = None, warehouse_id: Optional[int] = None) -> int:
     name = (name or "").strip()
@@ -27,7 +29,8 @@ def add_product(conn, cursor, name: str, barcode: str, sale_price: float, stock:
     if warehouse_id and stock > 0:
         wh_svc.repo.update_stock(cursor, warehouse_id, pid, float(stock))
         wh_svc.repo.add_movement(cursor, None, warehouse_id, pid, float(stock), "Açılış Stoğu", 1)
-        
+
+    events.publish(events.PRODUCT_UPDATED, (pid,))
     return pid
 
 
@@ -42,12 +45,14 @@ def update_product(conn, cursor, pid: int, name: str, barcode: str, sale_price:
     if unit not in ('adet', 'kg'):
         unit = 'adet'
     repo.update(conn, cursor, int(pid), name, barcode, float(sale_price), float(stock), float(buy_price), unit, category_id)
+    events.publish(events.PRODUCT_UPDATED, (int(pid),))
 
 
 def delete_product(conn, cursor, pid: int) -> None:
     if not pid:
         raise ValueError("id_required")
     repo.delete(conn, cursor, int(pid))
+    events.publish(events.PRODUCT_UPDATED, (int(pid),))
 
 
 def get_price_stock_by_name(cursor, name: str, warehouse_id: Optional[int] = None) -> Optional[Tuple[float, float, str]]:
@@ -60,28 +65,34 @@ def get_by_barcode(cursor, barcode: str, warehouse_id: Optional[int] = None) ->
 def get_by_id(cursor, pid: int):
     return repo.get_by_id(cursor, pid)
 
-def decrement_stock(conn, cursor, name: str, qty: float, warehouse_id: Optional[int] = None) -> None:
-    repo.decrement_stock(conn, cursor, name, float(qty))
+def list_by_ids(cursor, ids) -> List[Tuple[int, str, str, float, float, float, str, str]]:
+    return repo.list_by_ids(cursor, ids)
+
+def decrement_stock(conn, cursor, name: str, qty: float, warehouse_id: Optional[int] = None, commit: bool = True,
+                    journal: bool = True) -> Optional[int]:
+    # journal=False: değişiklik başka bir günlük kaydının (satış/iptal) parçası
+    if journal:
+        journal_svc.record_stock(cursor, name, -float(qty), warehouse_id)
+    pid = repo.decrement_stock(conn, cursor, name, float(qty), commit=commit)
     
-    if warehouse_id:
-        cursor.execute("SELECT id FROM products WHERE name=?", (name,))
-        row = cursor.fetchone()
-        if row:
-            pid = row[0]
-            current = wh_svc.repo.get_stock(cursor, warehouse_id, pid)
-            wh_svc.repo.update_stock(cursor, warehouse_id, pid, current - float(qty))
-            # Log movement (Exit)
-            wh_svc.repo.add_movement(cursor, warehouse_id, None, pid, float(qty), "Satış", 1)
-
-def increment_stock(conn, cursor, name: str, qty: float, warehouse_id: Optional[int] = None) -> None:
-    repo.increment_stock(conn, cursor, name, float(qty))
+    if warehouse_id and pid:
+        current = wh_svc.repo.get_stock(cursor, warehouse_id, pid)
+        wh_svc.repo.update_stock(cursor, warehouse_id, pid, current - float(qty))
+        # Log movement (Exit)
+        wh_svc.repo.add_movement(cursor, warehouse_id, None, pid, float(qty), "Satış", 1)
+    events.publish(events.STOCK_CHANGED, (pid,))
+    return pid
+
+def increment_stock(conn, cursor, name: str, qty: float, warehouse_id: Optional[int] = None, commit: bool = True,
+                    journal: bool = True) -> Optional[int]:
+    if journal:
+        journal_svc.record_stock(cursor, name, float(qty), warehouse_id)
+    pid = repo.increment_stock(conn, cursor, name, float(qty), commit=commit)
     
-    if warehouse_id:
-        cursor.execute("SELECT id FROM products WHERE name=?", (name,))
-        row = cursor.fetchone()
-        if row:
-            pid = row[0]
-            current = wh_svc.repo.get_stock(cursor, warehouse_id, pid)
-            wh_svc.repo.update_stock(cursor, warehouse_id, pid, current + float(qty))
-            # Log movement (Entry)
-            wh_svc.repo.add_movement(cursor, None, warehouse_id, pid, float(qty), "Satış İptal/İade", 1)
+    if warehouse_id and pid:
+        current = wh_svc.repo.get_stock(cursor, warehouse_id, pid)
+        wh_svc.repo.update_stock(cursor, warehouse_id, pid, current + float(qty))
+        # Log movement (Entry)
+        wh_svc.repo.add_movement(cursor, None, warehouse_id, pid, float(qty), "Satış İptal/İade", 1)
+    events.publish(events.STOCK_CHANGED, (pid,))
+    return pid
@@ -1,57 +1,82 @@
 """Purchase Service"""
+from core.money import Money
 from repositories import purchase_repository as repo
 from repositories import product_repository as prod_repo
 from repositories import cari_repository as cari_repo
 from services import warehouse_service as wh_svc
+from services import costing_service as costing_svc
+from services import journal_service as journal_svc
+from pos import events
+
+
+def _publish(items, supplier_id=None):
+    """Stoğu/kartı değişen ürünleri ve tedarikçiyi açık ekranlara bildir."""
+    ids = [item.get('product_id') if isinstance(item, dict) else item[4] for item in items]
+    events.publish(events.STOCK_CHANGED, ids)
+    events.publish(events.PRODUCT_UPDATED, ids)
+    if supplier_id:
+        events.publish(events.CARI_POSTED, (supplier_id,))
 
 def create_purchase(conn, cursor, supplier_id, doc_type, doc_number, doc_date, items, description="", warehouse_id=None):
     """
-    Satın alma işlemini kaydeder.
+    Satın alma işlemini kaydeder (belge, stok, maliyet ve cari tek transaction).
     items: list of dict {'product_id': int, 'name': str, 'qty': float, 'price': float}
     """
     # 1. Belgeyi oluştur
-    total_amount = sum(item['qty'] * item['price'] for item in items)
-    doc_id = repo.add_document(conn, cursor, supplier_id, doc_type, doc_number, doc_date, total_amount, description, warehouse_id)
-    
-    # 2. Kalemleri ekle ve stok güncelle
-    for item in items:
-        total = item['qty'] * item['price']
-        repo.add_item(conn, cursor, doc_id, item.get('product_id'), item['name'], item['qty'], item['price'], total)
-        
-        # Stok artır
-        if item.get('product_id'):
-            # Mevcut stok bilgisini al
-            prod = prod_repo.get_by_id(cursor, item['product_id'])
-            if prod:
-                current_stock = prod[4]
-                new_stock = current_stock + item['qty']
-                prod_repo.update_stock(conn, cursor, item['product_id'], new_stock)
-                
-                # Depo stoğunu güncelle
-                if warehouse_id:
-                    current_wh_stock = wh_svc.repo.get_stock(cursor, warehouse_id, item['product_id'])
-                    wh_svc.repo.update_stock(cursor, warehouse_id, item['product_id'], current_wh_stock + item['qty'])
-                    # Hareket kaydı
-                    wh_svc.repo.add_movement(cursor, None, warehouse_id, item['product_id'], item['qty'], f"Satın Alma: {doc_number}", 1) # User ID 1 (Admin)
+    # Belge toplamı kuruşa yuvarlanmış satır toplamlarından (kalemlerle birebir tutar)
+    total_amount = float(Money.total(Money.of(item['price']) * item['qty'] for item in items))
+    try:
+        doc_id = repo.add_document(conn, cursor, supplier_id, doc_type, doc_number, doc_date, total_amount, description, warehouse_id, commit=False)
 
-                # Alış fiyatını güncelle (isteğe bağlı, son alış fiyatı)
-                if item['price'] > 0:
-                    prod_repo.update_buy_price(conn, cursor, item['product_id'], item['price'])
+        # 2. Kalemleri ekle ve stok güncelle
+        for item in items:
+            total = float(Money.of(item['price']) * item['qty'])
+            repo.add_item(conn, cursor, doc_id, item.get('product_id'), item['name'], item['qty'], item['price'], total, commit=False)
 
-    # 3. Cari hareket işle (Eğer fatura ise borçlanma/alacaklanma durumu)
-    # İrsaliye stok etkiler, cariyi etkilemez (genelde). Fatura cariyi etkiler.
-    if doc_type == 'fatura' and supplier_id:
-        # Tedarikçiye borçlanıyoruz (Alacak ekle)
-        # Cari bakiyesi: Alacaklı (+) ise biz borçluyuz.
-        cari_repo.add_hareket(conn, cursor, supplier_id, "alacak", total_amount, f"Alış Faturası: {doc_number}")
-        
-        # Bakiyeyi güncelle
-        cari = cari_repo.get_by_id(cursor, supplier_id)
-        if cari:
-            current_balance = cari[4]
-            new_balance = current_balance + total_amount # Alacak artıyor
-            cari_repo.update_balance(conn, cursor, supplier_id, new_balance)
+            # Stok artır
+            if item.get('product_id'):
+                # Ortalama maliyet (stok artmadan önce ağırlıklandırılır)
+                costing_svc.receive(cursor, item['product_id'], item['qty'], item['price'], warehouse_id)
+
+                # Mevcut stok bilgisini al
+                prod = prod_repo.get_by_id(cursor, item['product_id'])
+                if prod:
+                    current_stock = prod[4]
+                    new_stock = current_stock + item['qty']
+                    journal_svc.record_stock(cursor, prod[1], item['qty'], warehouse_id, f"Satın Alma: {doc_number}")
+                    prod_repo.update_stock(conn, cursor, item['product_id'], new_stock, commit=False)
+
+                    # Depo stoğunu güncelle
+                    if warehouse_id:
+                        current_wh_stock = wh_svc.repo.get_stock(cursor, warehouse_id, item['product_id'])
+                        wh_svc.repo.update_stock(cursor, warehouse_id, item['product_id'], current_wh_stock + item['qty'])
+                        # Hareket kaydı
+                        wh_svc.repo.add_movement(cursor, None, warehouse_id, item['product_id'], item['qty'], f"Satın Alma: {doc_number}", 1) # User ID 1 (Admin)
+
+                    # Alış fiyatını güncelle (isteğe bağlı, son alış fiyatı)
+                    if item['price'] > 0:
+                        prod_repo.update_buy_price(conn, cursor, item['product_id'], item['price'], commit=False)
+
+        # 3. Cari hareket işle (Eğer fatura ise borçlanma/alacaklanma durumu)
+        # İrsaliye stok etkiler, cariyi etkilemez (genelde). Fatura cariyi etkiler.
+        if doc_type == 'fatura' and supplier_id:
+            # Tedarikçiye borçlanıyoruz (Alacak ekle)
+            # Cari bakiyesi: Alacaklı (+) ise biz borçluyuz.
+            journal_svc.record_cari(cursor, supplier_id, "alacak", total_amount, f"Alış Faturası: {doc_number}")
+            cari_repo.add_hareket(conn, cursor, supplier_id, "alacak", total_amount, f"Alış Faturası: {doc_number}", commit=False)
 
+            # Bakiyeyi güncelle
+            cari = cari_repo.get_by_id(cursor, supplier_id)
+            if cari:
+                current_balance = Money.of(cari[4])
+                new_balance = float(current_balance + total_amount) # Alacak artıyor
+                cari_repo.update_balance(conn, cursor, supplier_id, new_balance, commit=False)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+
+    _publish(items, supplier_id if doc_type == 'fatura' else None)
     return doc_id
 
 def list_documents(cursor, doc_type=None):
@@ -64,76 +89,111 @@ def get_document(cursor, doc_id):
     return repo.get_document(cursor, doc_id)
 
 def _revert_purchase_effects(conn, cursor, doc_id):
-    """Belgenin stok ve cari etkilerini geri alır."""
+    """Belgenin stok ve cari etkilerini geri alır. Commit etmez; çağıran tek transaction'da bitirir.
+    Commit sonrası yayın için (kalemler, tedarikçi) döner."""
     doc = repo.get_document(cursor, doc_id)
-    if not doc: return
+    if not doc: return [], None
     
     supplier_id = doc[1]
     doc_type = doc[2]
     doc_number = doc[3]
     total_amount = doc[5]
+    warehouse_id = doc[8]
     
-    # Stoktan düş
+    # Stoktan düş (giriş yapılan depodan da; depo ortalaması birlikte geri alınır)
     items = repo.get_document_items(cursor, doc_id)
     for item in items:
         product_id = item[4]
         qty = item[1]
         if product_id:
+            costing_svc.unreceive(cursor, product_id, qty, item[2], warehouse_id)
             prod = prod_repo.get_by_id(cursor, product_id)
             if prod:
                 current_stock = prod[4]
                 new_stock = current_stock - qty
-                prod_repo.update_stock(conn, cursor, product_id, new_stock)
+                journal_svc.record_stock(cursor, prod[1], -qty, warehouse_id, f"İptal: {doc_number}")
+                prod_repo.update_stock(conn, cursor, product_id, new_stock, commit=False)
+                if warehouse_id:
+                    current_wh_stock = wh_svc.repo.get_stock(cursor, warehouse_id, product_id)
+                    wh_svc.repo.update_stock(cursor, warehouse_id, product_id, current_wh_stock - qty)
+                    wh_svc.repo.add_movement(cursor, warehouse_id, None, product_id, qty, f"İptal: {doc_number}", 1)
 
     # Cariyi düzelt (Fatura ise)
     if doc_type == 'fatura' and supplier_id:
-        cari_repo.add_hareket(conn, cursor, supplier_id, "borc", total_amount, f"DÜZELTME/İPTAL - Fatura: {doc_number}")
+        journal_svc.record_cari(cursor, supplier_id, "borc", total_amount, f"DÜZELTME/İPTAL - Fatura: {doc_number}")
+        cari_repo.add_hareket(conn, cursor, supplier_id, "borc", total_amount, f"DÜZELTME/İPTAL - Fatura: {doc_number}", commit=False)
         cari = cari_repo.get_by_id(cursor, supplier_id)
         if cari:
-            current_balance = cari[4]
-            new_balance = current_balance - total_amount
-            cari_repo.update_balance(conn, cursor, supplier_id, new_balance)
+            current_balance = Money.of(cari[4])
+            new_balance = float(current_balance - total_amount)
+            cari_repo.update_balance(conn, cursor, supplier_id, new_balance, commit=False)
+
+    return items, supplier_id if doc_type == 'fatura' else None
 
 def delete_purchase(conn, cursor, doc_id):
-    """Satın alma işlemini siler ve stok/cari etkilerini geri alır."""
-    _revert_purchase_effects(conn, cursor, doc_id)
-    repo.delete_document(conn, cursor, doc_id)
+    """Satın alma işlemini siler ve stok/cari etkilerini geri alır (tek transaction)."""
+    try:
+        old_items, old_supplier = _revert_purchase_effects(conn, cursor, doc_id)
+        repo.delete_document(conn, cursor, doc_id, commit=False)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    _publish(old_items, old_supplier)
 
 def update_purchase(conn, cursor, doc_id, supplier_id, doc_number, doc_date, items, description=""):
-    """Satın alma işlemini günceller."""
-    # 1. Eski etkileri geri al
-    _revert_purchase_effects(conn, cursor, doc_id)
-    
-    # 2. Belge başlığını güncelle
-    doc = repo.get_document(cursor, doc_id)
-    doc_type = doc[2]
-    total_amount = sum(item['qty'] * item['price'] for item in items)
-    
-    repo.update_document(conn, cursor, doc_id, supplier_id, doc_number, doc_date, total_amount, description)
-    
-    # 3. Eski kalemleri sil
-    repo.delete_items(conn, cursor, doc_id)
-    
-    # 4. Yeni kalemleri ekle ve etkilerini uygula
-    for item in items:
-        total = item['qty'] * item['price']
-        repo.add_item(conn, cursor, doc_id, item.get('product_id'), item['name'], item['qty'], item['price'], total)
-        
-        # Stok artır
-        if item.get('product_id'):
-            prod = prod_repo.get_by_id(cursor, item['product_id'])
-            if prod:
-                current_stock = prod[4]
-                new_stock = current_stock + item['qty']
-                prod_repo.update_stock(conn, cursor, item['product_id'], new_stock)
-                if item['price'] > 0:
-                    prod_repo.update_buy_price(conn, cursor, item['product_id'], item['price'])
+    """Satın alma işlemini günceller. Geri alma ve yeniden uygulama tek transaction'dır:
+    yarıda kalırsa stok ve ortalama maliyet eski haliyle kalır."""
+    try:
+        # 1. Eski etkileri geri al
+        old_items, old_supplier = _revert_purchase_effects(conn, cursor, doc_id)
 
-    # 5. Yeni cari etkisini uygula (Fatura ise)
-    if doc_type == 'fatura' and supplier_id:
-        cari_repo.add_hareket(conn, cursor, supplier_id, "alacak", total_amount, f"GÜNCELLEME - Fatura: {doc_number}")
-        cari = cari_repo.get_by_id(cursor, supplier_id)
-        if cari:
-            current_balance = cari[4]
-            new_balance = current_balance + total_amount
-            cari_repo.update_balance(conn, cursor, supplier_id, new_balance)
+        # 2. Belge başlığını güncelle
+        doc = repo.get_document(cursor, doc_id)
+        doc_type = doc[2]
+        warehouse_id = doc[8]
+        # Belge toplamı kuruşa yuvarlanmış satır toplamlarından (kalemlerle birebir tutar)
+        total_amount = float(Money.total(Money.of(item['price']) * item['qty'] for item in items))
+
+        repo.update_document(conn, cursor, doc_id, supplier_id, doc_number, doc_date, total_amount, description, commit=False)
+
+        # 3. Eski kalemleri sil
+        repo.delete_items(conn, cursor, doc_id, commit=False)
+
+        # 4. Yeni kalemleri ekle ve etkilerini uygula
+        for item in items:
+            total = float(Money.of(item['price']) * item['qty'])
+            repo.add_item(conn, cursor, doc_id, item.get('product_id'), item['name'], item['qty'], item['price'], total, commit=False)
+
+            # Stok artır
+            if item.get('product_id'):
+                costing_svc.receive(cursor, item['product_id'], item['qty'], item['price'], warehouse_id)
+                prod = prod_repo.get_by_id(cursor, item['product_id'])
+                if prod:
+                    current_stock = prod[4]
+                    new_stock = current_stock + item['qty']
+                    journal_svc.record_stock(cursor, prod[1], item['qty'], warehouse_id, f"Güncelleme: {doc_number}")
+                    prod_repo.update_stock(conn, cursor, item['product_id'], new_stock, commit=False)
+                    if warehouse_id:
+                        current_wh_stock = wh_svc.repo.get_stock(cursor, warehouse_id, item['product_id'])
+                        wh_svc.repo.update_stock(cursor, warehouse_id, item['product_id'], current_wh_stock + item['qty'])
+                        wh_svc.repo.add_movement(cursor, None, warehouse_id, item['product_id'], item['qty'], f"Güncelleme: {doc_number}", 1)
+                    if item['price'] > 0:
+                        prod_repo.update_buy_price(conn, cursor, item['product_id'], item['price'], commit=False)
+
+        # 5. Yeni cari etkisini uygula (Fatura ise)
+        if doc_type == 'fatura' and supplier_id:
+            journal_svc.record_cari(cursor, supplier_id, "alacak", total_amount, f"GÜNCELLEME - Fatura: {doc_number}")
+            cari_repo.add_hareket(conn, cursor, supplier_id, "alacak", total_amount, f"GÜNCELLEME - Fatura: {doc_number}", commit=False)
+            cari = cari_repo.get_by_id(cursor, supplier_id)
+            if cari:
+                current_balance = Money.of(cari[4])
+                new_balance = float(current_balance + total_amount)
+                cari_repo.update_balance(conn, cursor, supplier_id, new_balance, commit=False)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+
+    _publish(old_items, old_supplier)
+    _publish(items, supplier_id if doc_type == 'fatura' else None)
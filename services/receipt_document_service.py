@@ -0,0 +1,87 @@
+"""Fiş PDF'leri: üretim ve receipt_documents kaydı.
+
+Fişler ekranı dizin taramaz, tabloyu listeler. Çizim deterministiktir; aynı baytlar
+başka yolda kayıtlıysa o yol döner, eksik dosya satış satırlarından yeniden çizilir.
+"""
+import hashlib
+import os
+import subprocess
+from typing import List, Optional, Tuple
+
+from repositories import receipt_document_repository as repo
+from services import receipt_service as receipt_svc
+from services import sales_service as sales_svc
+
+KDV_RATE = 18.0
+DEFAULT_CUSTOMER = "Müşteri"
+PAGE_SIZE = 50
+
+
+def file_hash(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def register(conn, cursor, receipt_id: Optional[int], fis_id: str, path: str, customer_name: str = "") -> str:
+    """Üretilen dosyayı kaydet; aynı içerik başka bir yolda zaten varsa onu döndürür."""
+    digest = file_hash(path)
+    for row in repo.find_by_hash(cursor, digest):
+        other = row[4]
+        if os.path.abspath(other) != os.path.abspath(path) and os.path.exists(other):
+            os.remove(path)
+            return other
+    repo.upsert(cursor, receipt_id, fis_id, customer_name or "", path, os.path.getsize(path), digest)
+    conn.commit()
+    return path
+
+
+def render(conn, cursor, receipt_id: int, sales_list=None, customer_name: str = None,
+           language_code: str = "tr") -> Optional[str]:
+    """Fişi PDF olarak üret ve kaydet. sales_list verilmezse satırlar veritabanından okunur."""
+    fis_id = receipt_svc.label(cursor, receipt_id)
+    customer_name = customer_name or receipt_svc.customer(cursor, receipt_id)
+    if sales_list is None:
+        sales_list = [tuple(r) for r in sales_svc.get_receipt_lines(cursor, receipt_id)]
+    if not fis_id or not sales_list:
+        return None
+    from receipts import print_receipt
+    path = print_receipt(sales_list, fis_id=fis_id, customer_name=customer_name or DEFAULT_CUSTOMER,
+                         kdv_rate=KDV_RATE, discount_rate=0.0, vat_included=False,
+                         open_after=False, show_message=False, language_code=language_code,
+                         receipt_date=receipt_svc.receipt_date(cursor, receipt_id))
+    if not path:
+        return None
+    return register(conn, cursor, receipt_id, fis_id, path, customer_name or DEFAULT_CUSTOMER)
+
+
+def ensure_document(conn, cursor, receipt_id: int, language_code: str = "tr") -> Optional[str]:
+    """Fişin kayıtlı belgesi; dosya yoksa satırlardan yeniden üretilir."""
+    doc = repo.find_by_receipt(cursor, receipt_id)
+    if doc and os.path.exists(doc[4]):
+        return doc[4]
+    return render(conn, cursor, receipt_id, customer_name=doc[3] if doc else None, language_code=language_code)
+
+
+def document_path(conn, cursor, doc_id: int, language_code: str = "tr") -> Optional[str]:
+    doc = repo.get(cursor, doc_id)
+    if not doc:
+        return None
+    if os.path.exists(doc[4]):
+        return doc[4]
+    if doc[1] is None:
+        return None
+    return render(conn, cursor, doc[1], customer_name=doc[3], language_code=language_code)
+
+
+def list_documents(cursor, search: str = "", before_id: Optional[int] = None, limit: int = PAGE_SIZE) -> List[Tuple]:
+    return repo.list_page(cursor, (search or "").strip(), before_id, limit)
+
+
+def open_file(path: str) -> None:
+    if os.name == "nt":
+        os.startfile(path)  # type: ignore
+    else:
+        subprocess.call(("open", path))
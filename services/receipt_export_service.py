@@ -0,0 +1,84 @@
+"""Toplu fiş dışa aktarma (tarih aralığı / müşteri -> tek PDF).
+
+Çizim ayrı bir süreçte yapılır, kasa arayüzü etkilenmez; sonuç stdout'a tek satır JSON döner.
+
+    python -m services.receipt_export_service --db database.db \
+        --from "2025-01-01 00:00:00" --to "2025-01-31 23:59:59" --out reports/fisler.pdf
+"""
+import argparse
+import json
+import os
+import sqlite3
+import subprocess
+import sys
+from typing import Optional
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def export(db_path: str, out_path: str, from_dt: str, to_dt: str, customer: Optional[str] = None) -> dict:
+    """Aralıktaki fişleri out_path'e yaz. Çağıran süreçte çalışır (worker tarafı)."""
+    from services import receipt_service as receipt_svc
+    from receipts.pdf_generator import render_receipts
+
+    folder = os.path.dirname(out_path)
+    if folder:
+        os.makedirs(folder, exist_ok=True)
+    conn = sqlite3.connect(db_path)
+    try:
+        cursor = conn.cursor()
+        receipts = receipt_svc.iter_receipts(cursor, from_dt, to_dt, customer)
+        return render_receipts(out_path, receipts, db_path=db_path)
+    finally:
+        conn.close()
+
+
+class ExportJob:
+    """Arka planda çalışan dışa aktarma süreci; arayüz poll() ile yoklar."""
+
+    def __init__(self, proc: subprocess.Popen, out_path: str):
+        self.proc = proc
+        self.out_path = out_path
+
+    def poll(self) -> Optional[dict]:
+        """Bitmediyse None; bittiyse sonuç sözlüğü (hata varsa RuntimeError)."""
+        if self.proc.poll() is None:
+            return None
+        out, err = self.proc.communicate()
+        if self.proc.returncode != 0:
+            raise RuntimeError((err or "").strip().splitlines()[-1] if (err or "").strip() else f"exit {self.proc.returncode}")
+        return json.loads(out.strip().splitlines()[-1])
+
+    def cancel(self) -> None:
+        if self.proc.poll() is None:
+            self.proc.kill()
+            self.proc.communicate()
+
+
+def start(db_path: str, out_path: str, from_dt: str, to_dt: str, customer: Optional[str] = None) -> ExportJob:
+    args = [sys.executable, "-m", "services.receipt_export_service",
+            "--db", os.path.abspath(db_path), "--out", os.path.abspath(out_path),
+            "--from", from_dt, "--to", to_dt]
+    if customer:
+        args += ["--customer", customer]
+    flags = getattr(subprocess, "CREATE_NO_WINDOW", 0)
+    proc = subprocess.Popen(args, cwd=ROOT, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                            text=True, encoding="utf-8", creationflags=flags)
+    return ExportJob(proc, out_path)
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--db", required=True)
+    ap.add_argument("--out", required=True)
+    ap.add_argument("--from", dest="from_dt", required=True)
+    ap.add_argument("--to", dest="to_dt", required=True)
+    ap.add_argument("--customer")
+    args = ap.parse_args(argv)
+    result = export(args.db, args.out, args.from_dt, args.to_dt, args.customer)
+    print(json.dumps(result, ensure_ascii=False))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,97 @@
+"""Fiş numaralandırma.
+
+allocate() satış transaction'ı içinde terminal ve gün başına boşluksuz numara verir;
+geri alınan satış numarasını da geri verir. "FIS-YYYYMMDD-TT-NNNN" metni bundan türetilir.
+"""
+import re
+from datetime import datetime
+from itertools import groupby
+from typing import Iterator, Optional, Tuple
+from repositories import receipt_repository as repo
+from repositories import archive_repository as archive_repo
+
+PREFIX = "FIS"
+DEFAULT_TERMINAL_ID = 1
+_LABEL_RE = re.compile(rf"^{PREFIX}-(\d{{8}})-(\d+)-(\d+)$")
+
+
+def get_terminal_id(cursor) -> int:
+    tid = repo.get_terminal_id(cursor)
+    return tid if tid and tid > 0 else DEFAULT_TERMINAL_ID
+
+
+def set_terminal_id(conn, cursor, terminal_id: int) -> None:
+    if not 1 <= int(terminal_id) <= 99:
+        raise ValueError("Terminal numarası 1-99 arasında olmalı")
+    repo.set_terminal_id(cursor, terminal_id)
+    conn.commit()
+
+
+def format_number(terminal_id: int, day: int, no: int) -> str:
+    return f"{PREFIX}-{int(day):08d}-{int(terminal_id):02d}-{int(no):04d}"
+
+
+def allocate(cursor, terminal_id: Optional[int] = None, when: Optional[datetime] = None,
+             customer_name: Optional[str] = None) -> Tuple[int, str]:
+    """Yeni fiş (receipt_id, fiş no) ayır. Commit etmez."""
+    if terminal_id is None:
+        terminal_id = get_terminal_id(cursor)
+    day = int((when or datetime.now()).strftime("%Y%m%d"))
+    no = repo.next_number(cursor, terminal_id, day)
+    receipt_id = repo.insert(cursor, terminal_id, day, no, customer_name)
+    return receipt_id, format_number(terminal_id, day, no)
+
+
+def label(cursor, receipt_id: int) -> str:
+    r = repo.get(cursor, receipt_id)
+    if not r:
+        return ""
+    _, terminal_id, day, no, legacy = r[:5]
+    return legacy or format_number(terminal_id, day, no)
+
+
+def receipt_date(cursor, receipt_id: int) -> Optional[str]:
+    r = repo.get(cursor, receipt_id)
+    return r[5] if r else None
+
+
+def receipt_day(cursor, receipt_id: int) -> Optional[int]:
+    r = repo.get(cursor, receipt_id)
+    return int(r[2]) if r and r[2] is not None else None
+
+
+def is_archived(cursor, receipt_id: int) -> bool:
+    """Fişin günü arşivlenmiş (kapanmış) bir yılda mı; satırları artık arşiv dosyasında."""
+    day = receipt_day(cursor, receipt_id)
+    if day is None:
+        return False
+    year = str(day // 10000)
+    return bool(archive_repo.years_in_range(cursor, year, year))
+
+
+def find(cursor, text: str) -> Optional[int]:
+    """Görünen fiş numarasından receipt_id (eski rastgele numaralar dahil)."""
+    text = str(text or "").strip()
+    m = _LABEL_RE.match(text)
+    if m:
+        receipt_id = repo.find(cursor, int(m.group(2)), int(m.group(1)), int(m.group(3)))
+        if receipt_id is not None:
+            return receipt_id
+    return repo.find_legacy(cursor, text) if text else None
+
+
+def customer(cursor, receipt_id: int) -> Optional[str]:
+    r = repo.get(cursor, receipt_id)
+    return r[6] if r else None
+
+
+def iter_receipts(cursor, from_dt: str, to_dt: str, customer_name: Optional[str] = None) -> Iterator[Tuple]:
+    """Aralıktaki fişler (fiş no, müşteri, tarih, [(ad, adet, fiyat, tutar)]).
+    Satırlar tek sorguda fiş sırasıyla akar; her seferinde yalnızca bir fiş bellekte tutulur."""
+    schemas = archive_repo.attach_years(cursor, archive_repo.years_in_range(cursor, from_dt, to_dt))
+    rows = repo.iter_with_lines(cursor, from_dt, to_dt, customer_name, schemas)
+    for _, group in groupby(rows, key=lambda r: r[0]):
+        first = next(group)
+        _, terminal_id, day, no, legacy, cust, created_at = first[:7]
+        lines = [tuple(first[7:])] + [tuple(r[7:]) for r in group]
+        yield legacy or format_number(terminal_id, day, no), cust, created_at, lines
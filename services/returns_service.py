@@ -0,0 +1,106 @@
+"""Satır bazında iade ve kısmi iptal.
+
+İade edilen miktar sales'e eksi satır olarak yazılır (return_of: asıl satır),
+stok satışın deposuna döner, iade tutarı fişin ödemelerine dağıtılır. Hepsi
+tek transaction'dır; satırın son kısmı kalan tutarın tamamını iade eder.
+"""
+from typing import Dict, Optional, Sequence, Tuple
+
+from core.money import Money
+from pos import events, session
+from repositories import sales_repository as sales_repo
+from repositories import sales_return_repository as repo
+from repositories import receipt_payment_repository as payment_repo
+from services import daily_summary_service as summary_svc
+from services import journal_service as journal_svc
+from services import live_sales_service as live_svc
+from services import popularity_service as popularity_svc
+from services import product_service as product_svc
+from services import receipt_service as receipt_svc
+from services import sales_service as sales_svc
+
+QTY_EPS = 1e-9
+
+
+def get_returnable(cursor, receipt_id: int):
+    """Fişin satırları ve kalan iade edilebilir miktarları:
+    [{"line_id", "name", "qty", "price", "total", "returned", "remaining", "refundable"}]"""
+    rows = sales_repo.get_returnable_lines(cursor, receipt_id)
+    if not rows and receipt_svc.is_archived(cursor, receipt_id):
+        raise ValueError("receipt_archived")
+    lines = []
+    for line_id, name, qty, price, total_kurus, _, _, _, returned, returned_kurus, _ in rows:
+        lines.append({
+            "line_id": line_id, "name": name, "qty": float(qty), "price": float(price),
+            "total": float(Money(total_kurus)), "returned": float(returned),
+            "remaining": max(float(qty) - float(returned), 0.0),
+            "refundable": float(Money(total_kurus - returned_kurus)),
+        })
+    return lines
+
+
+def return_lines(conn, cursor, receipt_id: int, items: Sequence[Tuple[int, float]], refund_method: Optional[str] = None,
+                 reason: Optional[str] = None, user_id: Optional[int] = None, shift_id: Optional[int] = None):
+    """items: [(satır id, iade adedi)]. Hepsi tek transaction; hata olursa hiçbir şey yazılmaz.
+    Returns (return_id, iade tutarı Money)."""
+    lines = {r[0]: r for r in sales_repo.get_returnable_lines(cursor, receipt_id)}
+    if not lines and receipt_svc.is_archived(cursor, receipt_id):
+        # Kapanmış yılın fişi: iade/iptal o döneme yazılamaz
+        raise ValueError("receipt_archived")
+    wanted: Dict[int, float] = {}
+    for line_id, qty in items:
+        if float(qty) > QTY_EPS:
+            wanted[int(line_id)] = wanted.get(int(line_id), 0.0) + float(qty)
+    if not wanted:
+        raise ValueError("nothing_to_return")
+
+    plan = []
+    for line_id, qty in wanted.items():
+        if line_id not in lines:
+            raise ValueError("line_not_in_receipt")
+        _, name, sold, price, total_kurus, wh_id, unit_cost, pm, returned, returned_kurus, sold_at = lines[line_id]
+        remaining = float(sold) - float(returned)
+        if qty > remaining + QTY_EPS:
+            raise ValueError("return_exceeds_sold")
+        if remaining - qty <= QTY_EPS:
+            # Satırın son kısmı: kalan tutarın tamamı (kuruş yuvarlaması birikmez)
+            qty, amount = remaining, Money(total_kurus - returned_kurus)
+        else:
+            amount = Money(total_kurus) * (qty / float(sold))
+        plan.append((line_id, name, qty, float(price), amount, wh_id, unit_cost, pm, popularity_svc.timestamp(sold_at)))
+
+    refund = Money.total(amount for _, _, _, _, amount, _, _, _, _ in plan)
+    payment_method = plan[0][7]
+    user_id, shift_id = session.stamp(user_id, shift_id)
+    created_at = summary_svc.now_str()
+    fis_id = receipt_svc.label(cursor, receipt_id) or payment_repo.fis_id_for(cursor, receipt_id)
+    try:
+        return_id = repo.insert(cursor, receipt_id, fis_id, refund.kurus, reason, user_id=user_id, shift_id=shift_id,
+                                created_at=created_at)
+        for line_id, name, qty, price, amount, wh_id, unit_cost, pm, sold_ts in plan:
+            sales_repo.insert_line(conn, cursor, fis_id, name, -qty, price, -float(amount), payment_method=pm,
+                                   warehouse_id=wh_id, unit_cost=unit_cost, receipt_id=receipt_id, commit=False,
+                                   created_at=created_at, user_id=user_id, shift_id=shift_id,
+                                   return_id=return_id, return_of=line_id)
+            product_svc.increment_stock(conn, cursor, name, qty, warehouse_id=wh_id, commit=False, journal=False)
+            popularity_svc.record_sale(cursor, name, -qty, ts=sold_ts)
+        paid = sales_svc.refund_split(payment_repo.net_for_receipt(cursor, receipt_id), refund.kurus, refund_method)
+        sales_svc.refund_payments(conn, cursor, receipt_id, paid, kind="return", user_id=user_id, shift_id=shift_id,
+                                  created_at=created_at)
+        returned = [(name, qty, price, float(amount)) for _, name, qty, price, amount, _, _, _, _ in plan]
+        summary_svc.record_return(cursor, created_at, payment_method, returned)
+        journal_svc.record_return(cursor, receipt_id, [(name, qty, float(amount), wh_id)
+                                                       for _, name, qty, _, amount, wh_id, _, _, _ in plan], paid, reason)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    live_svc.get_counters().apply(created_at, payment_method, returned, sign=-1, receipts=0)
+    events.publish(events.SALE_RETURNED, (return_id,))
+    return return_id, refund
+
+
+def list_returns(cursor, receipt_id: int):
+    """Fişin iadeleri [(id, tutar, neden, tarih)]"""
+    return [(rid, float(Money(kurus)), reason, created_at) for rid, kurus, reason, created_at in
+            repo.list_for_receipt(cursor, receipt_id)]
@@ -0,0 +1,129 @@
+"""Satış niyetleriyle çökmeye dayanıklı ödeme.
+
+post_sale() önce niyeti (sepet, ödeme, cari) commit eder, sonra satışı ve cariyi ayrı
+transaction'larda yazar. Açılışta recover() bekleyen niyetleri tamamlar ya da geri
+alınmış sayar; MAX_ATTEMPTS denemeden sonra 'failed' olur.
+"""
+import json
+import sys
+from typing import Dict, Optional, Sequence
+
+from pos import session
+from repositories import sale_intent_repository as repo
+from repositories import sales_repository as sales_repo
+from services import cari_service as cari_svc
+from services import customer_lookup_service as lookup
+from services import receipt_service as receipt_svc
+from services import sales_service as sales_svc
+
+# Cari adımı bu kadar açılışta üst üste hata verirse niyet 'failed' olur
+MAX_ATTEMPTS = 5
+
+_POSTERS = {
+    "borc": cari_svc.add_borc,
+    "alacak": cari_svc.add_alacak,
+    "tahsilat": cari_svc.add_tahsilat,
+    "odeme": cari_svc.add_odeme,
+}
+
+
+def _resolve_cari(conn, cursor, cari_id: Optional[int], cari_name: Optional[str]) -> Optional[int]:
+    if cari_id and cari_svc.get_by_id(cursor, cari_id):
+        return int(cari_id)
+    if not cari_name:
+        return None
+    found = cari_svc.get_by_name(cursor, cari_name)
+    if found:
+        return int(found[0])
+    # Yeni cari (varsayılan: borçlu), niyetin son adımıyla aynı commit'te
+    return cari_svc.add_cari(conn, cursor, cari_name, "", "", 0.0, "borclu", commit=False)
+
+
+def _finish(conn, cursor, intent_id: int, payload: dict, receipt_id: int) -> None:
+    """Cari kayıtları (fişe bağlı) + niyetin kapanışı, tek transaction."""
+    fis_id = receipt_svc.label(cursor, receipt_id)
+    cari_id = None
+    try:
+        postings = payload.get("postings") or []
+        if postings:
+            cari_id = _resolve_cari(conn, cursor, payload.get("cari_id"), payload.get("cari_name"))
+            if cari_id:
+                for islem_type, tutar, aciklama in postings:
+                    _POSTERS[islem_type](conn, cursor, cari_id, float(tutar), aciklama.format(fis_id=fis_id), commit=False,
+                                         user_id=payload.get("user_id"), shift_id=payload.get("shift_id"),
+                                         receipt_id=receipt_id)
+        repo.finish(cursor, intent_id, "done")
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    # Yeni açılan cari commit'ten sonra aramaya eklenir
+    lookup.refresh(cursor, cari_id)
+
+
+def post_sale(conn, cursor, lines: Sequence, payment_method: str = "cash", warehouse_id: Optional[int] = None,
+              customer_name: Optional[str] = None, cari_id: Optional[int] = None, cari_name: Optional[str] = None,
+              postings: Sequence = (), payments: Optional[Sequence] = None, terminal_id: Optional[int] = None,
+              user_id: Optional[int] = None, shift_id: Optional[int] = None):
+    """Satışı niyet kaydıyla yaz. postings: [(islem_type, tutar, açıklama)], açıklamada {fis_id} kullanılabilir.
+    payments: parçalı ödemede [(ödeme türü, tutar)]. Sunucu modunda kasa numarası, kasiyer ve vardiya
+    kasadan gönderilir (pos.server). Returns (receipt_id, fis_id)."""
+    # Kasiyer/vardiya niyete yazılır: açılışta tamamlanan cari kayıtları da aynı vardiyaya düşer
+    user_id, shift_id = session.stamp(user_id, shift_id)
+    payload = {
+        "lines": [[name, float(qty), float(price), float(total)] for name, qty, price, total in lines],
+        "payment_method": payment_method, "warehouse_id": warehouse_id, "customer_name": customer_name,
+        "cari_id": cari_id or None, "cari_name": cari_name, "postings": [list(p) for p in postings],
+        "payments": [list(p) for p in payments or ()], "user_id": user_id, "shift_id": shift_id,
+    }
+    intent_id = repo.insert(cursor, json.dumps(payload, ensure_ascii=False))
+    conn.commit()
+    try:
+        receipt_id, fis_id = sales_svc.checkout(conn, cursor, lines, payment_method=payment_method,
+                                                warehouse_id=warehouse_id, terminal_id=terminal_id,
+                                                customer_name=customer_name, intent_id=intent_id, payments=payments, user_id=user_id, shift_id=shift_id)
+    except Exception:
+        repo.finish(cursor, intent_id, "rolled_back")
+        conn.commit()
+        raise
+    try:
+        _finish(conn, cursor, intent_id, payload, receipt_id)
+    except Exception as e:
+        # Satış yazıldı; cari adımı niyette bekler ve açılışta yeniden denenir
+        print(f"Cari işlem hatası (niyet {intent_id}): {e}", file=sys.stderr)
+    return receipt_id, fis_id
+
+
+def recover(conn, cursor) -> Dict[str, int]:
+    """Yarım kalan satışları tamamla ya da geri al (açılışta çalışır)."""
+    result = {"finished": 0, "rolled_back": 0, "canceled": 0, "failed": 0, "gave_up": 0}
+    for intent_id, payload, receipt_id, _ in repo.list_pending(cursor):
+        if receipt_id is None:
+            # Satış transaction'ı hiç commit edilmedi: yazılmış bir şey yok
+            repo.finish(cursor, intent_id, "rolled_back")
+            conn.commit()
+            result["rolled_back"] += 1
+            continue
+        if sales_repo.is_canceled(cursor, receipt_id):
+            # Fiş iptal edildi: iptal ödemeleri geri aldı, cari kaydı artık yazılmaz
+            repo.finish(cursor, intent_id, "canceled")
+            conn.commit()
+            result["canceled"] += 1
+            continue
+        try:
+            _finish(conn, cursor, intent_id, json.loads(payload), receipt_id)
+            result["finished"] += 1
+        except Exception as e:
+            attempts = repo.record_failure(cursor, intent_id, e, MAX_ATTEMPTS)
+            conn.commit()
+            print(f"Satış niyeti {intent_id} tamamlanamadı ({attempts}/{MAX_ATTEMPTS}): {e}", file=sys.stderr)
+            result["failed"] += 1
+            if attempts >= MAX_ATTEMPTS:
+                result["gave_up"] += 1
+    return result
+
+
+def list_failed(cursor, limit: int = 50):
+    """Vazgeçilen niyetler [(fiş no, deneme, son hata, tarih)]; elle kontrol edilmeli."""
+    return [(receipt_svc.label(cursor, receipt_id) if receipt_id else "-", attempts, last_error, created_at)
+            for _, receipt_id, attempts, last_error, created_at in repo.list_failed(cursor, limit)]
@@ -1,14 +1,87 @@
 """Sales service: wrapper over sales_repository for business rules and queries."""
 from repositories import sales_repository as repo
+from repositories import sale_intent_repository as intent_repo
+from repositories import receipt_payment_repository as payment_repo
+from repositories import receipt_repository as receipt_repo
+from repositories import cari_repository as cari_repo
+from core.money import Money, to_kurus
 from services import product_service as product_svc
+from services import costing_service as costing_svc
+from services import popularity_service as popularity_svc
+from services import receipt_service as receipt_svc
+from services import journal_service as journal_svc
+from services import daily_summary_service as summary_svc
+from services import live_sales_service as live_svc
+from services import cari_service as cari_svc
+from pos import events, session
 
-def insert_sale_line(conn, cursor, fis_id: str, product_name: str, quantity: float, price: float, total: float, payment_method: str = 'cash', warehouse_id: int = None) -> None:
-    repo.insert_line(conn, cursor, fis_id, product_name, float(quantity), price, total, payment_method=payment_method, warehouse_id=warehouse_id)
+def insert_sale_line(conn, cursor, fis_id: str, product_name: str, quantity: float, price: float, total: float, payment_method: str = 'cash', warehouse_id: int = None, receipt_id: int = None, commit: bool = True, created_at: str = None, user_id: int = None, shift_id: int = None) -> None:
+    # Birim maliyet satış anında satıra işlenir (kar raporu geçmişi yeniden hesaplamaz)
+    unit_cost = costing_svc.unit_cost_for_sale(cursor, product_name, warehouse_id)
+    popularity_svc.record_sale(cursor, product_name, float(quantity))
+    repo.insert_line(conn, cursor, fis_id, product_name, float(quantity), price, total, payment_method=payment_method, warehouse_id=warehouse_id, unit_cost=unit_cost, receipt_id=receipt_id, commit=commit, created_at=created_at, user_id=user_id, shift_id=shift_id)
+
+
+def payment_rows(lines, payment_method: str = 'cash', payments=None):
+    """Fişin ödeme kırılımı [(ödeme türü, kuruş)].
+    payments yoksa tüm tutar payment_method ile ödenmiştir; parçalı ödemede [(tür, tutar)] verilir
+    ve ödenmeyen kalan açık hesaba yazılır."""
+    total = Money.total(total for _, _, _, total in lines).kurus
+    if not payments:
+        return [(payment_method or 'cash', total)]
+    rows = [(method, to_kurus(amount)) for method, amount in payments if to_kurus(amount)]
+    rest = total - sum(kurus for _, kurus in rows)
+    if rest < 0:
+        raise ValueError("payments_exceed_total")
+    if rest:
+        rows.append(('open_account', rest))
+    return rows
+
+
+def checkout(conn, cursor, lines, payment_method: str = 'cash', warehouse_id: int = None, terminal_id: int = None,
+             customer_name: str = None, intent_id: int = None, payments=None, user_id: int = None, shift_id: int = None):
+    """Satışı tek transaction'da kaydet: fiş numarası, stok düşümü, satırlar ve ödemeler.
+    lines: [(ad, adet, fiyat, tutar)]. Hata olursa hepsi geri alınır (numara dahil).
+    payments: parçalı ödemede [(ödeme türü, tutar)] (bkz. payment_rows).
+    intent_id verilirse niyet kaydına fiş aynı transaction'da işlenir (sale_intent_service).
+    user_id/shift_id verilmezse oturumdaki kasiyer ve vardiya işlenir (pos.session).
+    Returns (receipt_id, fis_id)."""
+    # Satırlar ve günlük özet aynı saat/güne düşsün
+    created_at = summary_svc.now_str()
+    paid = payment_rows(lines, payment_method, payments)
+    user_id, shift_id = session.stamp(user_id, shift_id)
+    try:
+        receipt_id, fis_id = receipt_svc.allocate(cursor, terminal_id, customer_name=customer_name)
+        for name, qty, price, total in lines:
+            product_svc.decrement_stock(conn, cursor, name, qty, warehouse_id=warehouse_id, commit=False, journal=False)
+            insert_sale_line(conn, cursor, fis_id, name, qty, price, total, payment_method=payment_method,
+                             warehouse_id=warehouse_id, receipt_id=receipt_id, commit=False, created_at=created_at,
+                             user_id=user_id, shift_id=shift_id)
+        payment_repo.add(cursor, receipt_id, fis_id, paid, created_at=created_at, user_id=user_id, shift_id=shift_id)
+        summary_svc.record_sale(cursor, created_at, payment_method, lines)
+        journal_svc.record_sale(cursor, receipt_id, lines, payment_method, warehouse_id, payments=paid)
+        if intent_id is not None:
+            intent_repo.set_receipt(cursor, intent_id, receipt_id)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    live_svc.get_counters().apply(created_at, payment_method, lines)
+    events.publish(events.SALE_COMMITTED, (receipt_id,))
+    return receipt_id, fis_id
 
 def list_sales_between(cursor, from_dt: str, to_dt: str):
     return repo.get_sales_between(cursor, from_dt, to_dt)
 
 
+def list_sales_for_receipts(cursor, receipt_ids):
+    return repo.get_sales_for_receipts(cursor, receipt_ids)
+
+
+def list_return_lines(cursor, return_ids):
+    return repo.get_return_lines(cursor, return_ids)
+
+
 def list_recent_receipts(cursor, limit: int = 200):
     return repo.list_recent_receipts(cursor, limit)
 
@@ -17,18 +90,91 @@ def list_receipts_between(cursor, from_dt: str, to_dt: str):
     return repo.get_receipts_between(cursor, from_dt, to_dt)
 
 
-def cancel_receipt(conn, cursor, fis_id: str) -> None:
-    """Mark receipt canceled and restore products stock."""
-    # get lines to restore stock
-    cursor.execute("SELECT product_name, quantity, warehouse_id FROM sales WHERE fis_id=? AND (canceled IS NULL OR canceled=0)", (fis_id,))
-    rows = cursor.fetchall()
-    for name, qty, wh_id in rows:
-        try:
-            product_svc.increment_stock(conn, cursor, name, float(qty), warehouse_id=wh_id)
-        except Exception:
-            # even if a product is missing, try to proceed
-            pass
-    repo.cancel_receipt(conn, cursor, fis_id)
+def get_receipt_lines(cursor, receipt_id: int):
+    return repo.get_receipt_lines(cursor, receipt_id, receipt_svc.receipt_day(cursor, receipt_id))
+
+
+def get_last_receipt(cursor):
+    return repo.get_last_receipt(cursor)
+
+
+def cancel_receipt(conn, cursor, receipt_id: int, user_id: int = None, shift_id: int = None) -> None:
+    """Fişi iptal et: kalan (iade edilmemiş) miktarlar asıl depolarına döner, ödemeler ve açık hesap
+    borcu geri alınır. Hepsi tek transaction; bir adım hata verirse hiçbiri yazılmaz.
+    İptal, iptal eden kasiyer ve vardiyayla damgalanır."""
+    rows = repo.get_active_lines(cursor, receipt_id)
+    if not rows:
+        raise ValueError("receipt_archived" if receipt_svc.is_archived(cursor, receipt_id) else "receipt_not_active")
+    user_id, shift_id = session.stamp(user_id, shift_id)
+    try:
+        for name, qty, wh_id, sold_at in rows:
+            product_svc.increment_stock(conn, cursor, name, float(qty), warehouse_id=wh_id, commit=False, journal=False)
+            popularity_svc.record_sale(cursor, name, -float(qty), ts=popularity_svc.timestamp(sold_at))
+        journal_svc.record_cancel(cursor, receipt_id)
+        deltas = summary_svc.record_cancel(cursor, receipt_id)
+        refund_payments(conn, cursor, receipt_id, user_id=user_id, shift_id=shift_id)
+        repo.cancel_receipt(conn, cursor, receipt_id, commit=False)
+        # Cari adımı bekleyen niyet varsa açılışta yeniden denenmesin
+        intent_repo.finish_for_receipt(cursor, receipt_id, "canceled")
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    counters = live_svc.get_counters()
+    for created_at, payment_method, lines, sign, receipts in deltas:
+        counters.apply(created_at, payment_method, lines, sign=sign, receipts=receipts)
+    events.publish(events.SALE_CANCELLED, (receipt_id,))
+
+
+def refund_split(net_rows, amount_kurus: int, method: str = None):
+    """İade tutarını fişin net ödemelerine dağıt [(ödeme türü, kuruş)].
+    method verilirse tamamı o türle; yoksa önce açık hesap (ödenmemiş kısım), sonra kart, en son nakit."""
+    if method:
+        return [(method, amount_kurus)]
+    net = dict(net_rows)
+    rows, rest = {}, int(amount_kurus)
+    for m in sorted(net, key=lambda m: (m != 'open_account', m == 'cash', m)):
+        take = min(rest, max(net[m], 0))
+        if take:
+            rows[m] = take
+            rest -= take
+    if rest:
+        # Ödeme kaydı tutmayan eski fiş: kalan nakit iade edilir
+        rows['cash'] = rows.get('cash', 0) + rest
+    return list(rows.items())
+
+
+def refund_payments(conn, cursor, receipt_id: int, rows=None, kind: str = "refund", user_id: int = None,
+                    shift_id: int = None, created_at: str = None) -> None:
+    """Fişin ödemelerini eksi satırlarla geri al (kind: 'refund' iptal, 'return' iade); rows verilmezse
+    kalan net tutarın tamamı. Açık hesaba yazılmış kısım carinin borcundan düşülür. Commit etmez."""
+    rows = payment_repo.net_for_receipt(cursor, receipt_id) if rows is None else rows
+    user_id, shift_id = session.stamp(user_id, shift_id)
+    fis_id = payment_repo.fis_id_for(cursor, receipt_id)
+    payment_repo.add(cursor, receipt_id, fis_id, [(method, -kurus) for method, kurus in rows], kind=kind,
+                     created_at=created_at, user_id=user_id, shift_id=shift_id)
+    open_account = Money(sum(kurus for method, kurus in rows if method == 'open_account'))
+    if open_account > Money():
+        cari_id = receipt_cari_id(cursor, receipt_id)
+        if cari_id:
+            desc = ("İade" if kind == "return" else "İptal") + f" - Fiş: {fis_id or receipt_id}"
+            cari_svc.add_alacak(conn, cursor, cari_id, float(open_account), desc, commit=False,
+                                user_id=user_id, shift_id=shift_id, receipt_id=receipt_id)
+
+
+def receipt_cari_id(cursor, receipt_id: int):
+    """Fişin carisi: fişe bağlı cari hareketinden; eski kayıtlarda fişteki müşteri adından."""
+    cari_id = cari_repo.receipt_cari(cursor, receipt_id)
+    if cari_id is None:
+        r = receipt_repo.get(cursor, receipt_id)
+        found = cari_repo.get_by_name(cursor, r[6]) if r and r[6] else None
+        cari_id = found[0] if found else None
+    return cari_id
+
+
+def get_receipt_payments(cursor, receipt_id: int):
+    """[(ödeme türü, net tutar)]"""
+    return [(method, float(Money(kurus))) for method, kurus in payment_repo.net_for_receipt(cursor, receipt_id)]
 
 
 def get_profit_loss_stats(cursor, from_dt: str, to_dt: str):
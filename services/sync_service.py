@@ -0,0 +1,356 @@
+"""Senkron: kasanın değişiklik günlüğünü merkez veritabanına taşır.
+
+push() bekleyen kayıtları settings.sync_target'a gönderir; merkezde apply_batch()
+bir terminalin kayıtlarını seq sırasıyla tek transaction'da uygular. Çakışan kayıtlar
+sync_conflicts'e yazılır; terminal numarası ilk gönderen kasanın terminal_uuid'ine bağlanır.
+"""
+import json
+import sqlite3
+import uuid
+from typing import Dict, List, Optional, Sequence
+
+from core.money import Money
+
+from repositories import journal_repository as repo
+from repositories import cari_repository as cari_repo
+from repositories import receipt_repository as receipt_repo
+from repositories import receipt_payment_repository as payment_repo
+from repositories import sales_repository as sales_repo
+from repositories import sales_return_repository as return_repo
+from services import costing_service as costing_svc
+from services import customer_lookup_service as lookup
+from services import daily_summary_service as summary_svc
+from services import popularity_service as popularity_svc
+from services import receipt_service as receipt_svc
+from services import warehouse_service as wh_svc
+
+BATCH_SIZE = 500
+
+# islem_type -> bakiye yönü (cari_service ile aynı)
+_CARI_SIGN = {"tahsilat": -1.0, "odeme": 1.0, "borc": -1.0, "alacak": 1.0}
+
+
+def get_target(cursor) -> str:
+    cursor.execute("SELECT value FROM settings WHERE key='sync_target'")
+    r = cursor.fetchone()
+    return (r[0] or "").strip() if r else ""
+
+
+def get_terminal_uuid(conn, cursor) -> str:
+    """Kasanın kalıcı kimliği; ilk gerektiğinde üretilip ayarlara yazılır."""
+    cursor.execute("SELECT value FROM settings WHERE key='terminal_uuid'")
+    r = cursor.fetchone()
+    if r and r[0]:
+        return r[0]
+    value = uuid.uuid4().hex
+    cursor.execute("INSERT OR REPLACE INTO settings(key, value) VALUES('terminal_uuid', ?)", (value,))
+    conn.commit()
+    return value
+
+
+# --- merkez ---
+def _product(cursor, name: str):
+    cursor.execute("SELECT id, stock FROM products WHERE name=?", (name,))
+    return cursor.fetchone()
+
+
+def _move_stock(cursor, name: str, delta: float, warehouse_id: Optional[int]) -> Optional[float]:
+    """Stoğu fark olarak uygula; yeni stok (ürün yoksa None)."""
+    row = _product(cursor, name)
+    if not row:
+        return None
+    cursor.execute("UPDATE products SET stock=COALESCE(stock,0)+? WHERE id=? RETURNING stock", (float(delta), row[0]))
+    stock = cursor.fetchone()[0]
+    if warehouse_id:
+        current = wh_svc.repo.get_stock(cursor, warehouse_id, row[0])
+        wh_svc.repo.update_stock(cursor, warehouse_id, row[0], current + float(delta))
+    return stock
+
+
+def _same_lines(existing: Sequence, lines: Sequence) -> bool:
+    def key(rows):
+        return sorted((name, round(float(qty), 3), Money(total).kurus) for name, qty, total in rows)
+    return key(existing) == key((name, qty, total) for name, qty, _, total in lines)
+
+
+def _apply_sale(conn, cursor, p: dict, created_at: str) -> List[str]:
+    cursor.execute(
+        "INSERT OR IGNORE INTO receipts(terminal_id, day, no, customer_name, created_at) VALUES(?, ?, ?, ?, ?)",
+        (p["terminal_id"], p["day"], p["no"], p.get("customer_name"), created_at)
+    )
+    if cursor.rowcount == 0:
+        # Fiş merkezde zaten var: aynı satış yeniden geldiyse atla, farklıysa kaybetme, çakışma yaz
+        fis_id = receipt_svc.format_number(p["terminal_id"], p["day"], p["no"])
+        existing = sales_repo.get_sold_lines(cursor, receipt_repo.find(cursor, p["terminal_id"], p["day"], p["no"]))
+        if _same_lines(existing, p["lines"]):
+            return []
+        return [f"{fis_id}: fiş merkezde farklı içerikle var, satış uygulanmadı: "
+                + json.dumps(p, ensure_ascii=False)]
+    receipt_id = cursor.lastrowid
+    # Merkezde de aynı terminal/gün sırası devam etsin
+    cursor.execute(
+        """
+        INSERT INTO receipt_sequences(terminal_id, day, last_no) VALUES(?, ?, ?)
+        ON CONFLICT(terminal_id, day) DO UPDATE SET last_no = MAX(last_no, excluded.last_no)
+        """,
+        (p["terminal_id"], p["day"], p["no"])
+    )
+    fis_id = receipt_svc.format_number(p["terminal_id"], p["day"], p["no"])
+    wh = p.get("warehouse_id")
+    problems = []
+    for name, qty, price, total in p["lines"]:
+        unit_cost = costing_svc.unit_cost_for_sale(cursor, name, wh)
+        popularity_svc.record_sale(cursor, name, float(qty), ts=popularity_svc.timestamp(created_at))
+        sales_repo.insert_line(conn, cursor, fis_id, name, qty, price, total, payment_method=p.get("payment_method") or "cash",
+                               warehouse_id=wh, unit_cost=unit_cost, receipt_id=receipt_id, commit=False,
+                               created_at=created_at)
+        stock = _move_stock(cursor, name, -float(qty), wh)
+        if stock is None:
+            problems.append(f"{fis_id}: ürün merkezde yok: {name}")
+        elif stock < 0:
+            problems.append(f"{fis_id}: stok eksiye düştü: {name} ({stock:g})")
+    # Eski kasa sürümlerinin kayıtlarında ödeme kırılımı yok: tek ödeme
+    payments = p.get("payments") or [[p.get("payment_method") or "cash", Money.total(l[3] for l in p["lines"]).kurus]]
+    payment_repo.add(cursor, receipt_id, fis_id, payments, created_at=created_at)
+    summary_svc.record_sale(cursor, created_at, p.get("payment_method") or "cash", p["lines"])
+    return problems
+
+
+def _apply_cancel(conn, cursor, p: dict) -> List[str]:
+    receipt_id = receipt_repo.find(cursor, p["terminal_id"], p["day"], p["no"])
+    if receipt_id is None and p.get("legacy_fis_id"):
+        receipt_id = receipt_repo.find_legacy(cursor, p["legacy_fis_id"])
+    if receipt_id is None:
+        return [f"iptal edilen fiş merkezde yok: {receipt_svc.format_number(p['terminal_id'], p['day'], p['no'])}"]
+    for name, qty, wh_id, sold_at in sales_repo.get_active_lines(cursor, receipt_id):
+        _move_stock(cursor, name, float(qty), wh_id)
+        popularity_svc.record_sale(cursor, name, -float(qty), ts=popularity_svc.timestamp(sold_at))
+    summary_svc.record_cancel(cursor, receipt_id)
+    payment_repo.add(cursor, receipt_id, None,
+                     [(method, -kurus) for method, kurus in payment_repo.net_for_receipt(cursor, receipt_id)], kind="refund")
+    sales_repo.cancel_receipt(conn, cursor, receipt_id, commit=False)
+    return []
+
+
+def _apply_return(conn, cursor, p: dict, created_at: str) -> List[str]:
+    receipt_id = receipt_repo.find(cursor, p["terminal_id"], p["day"], p["no"])
+    if receipt_id is None and p.get("legacy_fis_id"):
+        receipt_id = receipt_repo.find_legacy(cursor, p["legacy_fis_id"])
+    fis_id = receipt_svc.format_number(p["terminal_id"], p["day"], p["no"])
+    if receipt_id is None:
+        return [f"iade edilen fiş merkezde yok: {fis_id}"]
+    fis_id = p.get("legacy_fis_id") or fis_id
+    # Asıl satırlar ürün adıyla eşlenir (kalan miktarı olan ilk satır)
+    remaining = {}
+    for line_id, name, qty, price, _, wh, unit_cost, pm, returned, _, sold_at in sales_repo.get_returnable_lines(cursor, receipt_id):
+        remaining.setdefault(name, []).append([line_id, float(qty) - float(returned), price, wh, unit_cost, pm,
+                                               popularity_svc.timestamp(sold_at)])
+    amount = Money.total(l[2] for l in p["lines"])
+    return_id = return_repo.insert(cursor, receipt_id, fis_id, amount.kurus, p.get("reason"), created_at=created_at)
+    problems, returned, pm = [], [], "cash"
+    for name, qty, total, wh in p["lines"]:
+        line = next((l for l in remaining.get(name, ()) if l[1] >= float(qty) - 1e-9), None)
+        if line is None:
+            problems.append(f"{fis_id}: iade satırı merkezde eşleşmedi: {name}")
+            line = [None, 0.0, 0.0, wh, 0.0, "cash", None]
+        line[1] -= float(qty)
+        line_id, _, price, _, unit_cost, pm, sold_ts = line
+        sales_repo.insert_line(conn, cursor, fis_id, name, -float(qty), price, -float(total), payment_method=pm,
+                               warehouse_id=wh, unit_cost=unit_cost, receipt_id=receipt_id, commit=False,
+                               created_at=created_at, return_id=return_id, return_of=line_id)
+        if _move_stock(cursor, name, float(qty), wh) is None:
+            problems.append(f"{fis_id}: ürün merkezde yok: {name}")
+        popularity_svc.record_sale(cursor, name, -float(qty), ts=sold_ts)
+        returned.append((name, float(qty), price, float(total)))
+    # Açık hesap kısmının cari kaydı kasadan ayrı 'cari' kaydıyla gelir
+    payment_repo.add(cursor, receipt_id, fis_id, [(method, -kurus) for method, kurus in p.get("payments") or ()],
+                     kind="return", created_at=created_at)
+    summary_svc.record_return(cursor, created_at, pm, returned)
+    return problems
+
+
+def _apply_stock(cursor, p: dict) -> List[str]:
+    stock = _move_stock(cursor, p["product"], p["delta"], p.get("warehouse_id"))
+    if stock is None:
+        return [f"ürün merkezde yok: {p['product']}"]
+    if stock < 0:
+        return [f"stok eksiye düştü: {p['product']} ({stock:g})"]
+    return []
+
+
+def _apply_cari(conn, cursor, p: dict, created_at: str) -> List[str]:
+    found = cari_repo.get_by_name(cursor, p["name"])
+    cari_id = found[0] if found else cari_repo.add(conn, cursor, p["name"], "", "", 0.0, p.get("cari_type") or "borclu",
+                                                     "", "", commit=False)
+    cari_repo.adjust_balance(conn, cursor, cari_id, _CARI_SIGN.get(p["islem_type"], 1.0) * float(p["tutar"]), commit=False)
+    cari_repo.add_hareket(conn, cursor, cari_id, p["islem_type"], float(p["tutar"]), p.get("aciklama"),
+                          commit=False, created_at=created_at)
+    return [] if found else [f"cari merkezde yoktu, oluşturuldu: {p['name']}"]
+
+
+def apply_batch(conn, cursor, terminal_id: int, changes: Sequence[Sequence],
+                terminal_uuid: Optional[str] = None) -> Dict[str, int]:
+    """Bir terminalin günlük kayıtlarını [(seq, kind, payload, created_at)] tek transaction'da uygula.
+    Terminal numarası başka bir kasaya bağlıysa ValueError; hiçbir kayıt uygulanmaz."""
+    if not conn.in_transaction:
+        cursor.execute("BEGIN IMMEDIATE")
+    try:
+        bound = repo.bound_uuid(cursor, terminal_id)
+        if bound and bound != terminal_uuid:
+            raise ValueError(f"Terminal numarası {int(terminal_id)} merkezde başka bir kasaya ait; "
+                             f"bu kasaya farklı bir terminal numarası verin")
+        if not bound and terminal_uuid:
+            repo.bind_uuid(cursor, terminal_id, terminal_uuid)
+        last = repo.applied_seq(cursor, terminal_id)
+        applied = conflicts = 0
+        for seq, kind, payload, created_at in changes:
+            seq = int(seq)
+            if seq <= last:
+                continue
+            if seq != last + 1:
+                break
+            p = json.loads(payload) if isinstance(payload, str) else payload
+            if kind == "sale":
+                problems = _apply_sale(conn, cursor, p, created_at)
+            elif kind == "cancel":
+                problems = _apply_cancel(conn, cursor, p)
+            elif kind == "return":
+                problems = _apply_return(conn, cursor, p, created_at)
+            elif kind == "stock":
+                problems = _apply_stock(cursor, p)
+            elif kind == "cari":
+                problems = _apply_cari(conn, cursor, p, created_at)
+            else:
+                problems = [f"bilinmeyen kayıt türü: {kind}"]
+            for detail in problems:
+                repo.add_conflict(cursor, terminal_id, seq, kind, detail)
+            conflicts += len(problems)
+            applied += 1
+            last = seq
+        repo.set_applied_seq(cursor, terminal_id, last)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    if any(kind == "cari" for _, kind, _, _ in changes):
+        # Merkezde cari eklenmiş olabilir (sunucunun arama indeksi)
+        lookup.invalidate()
+    return {"applied": applied, "last_seq": last, "conflicts": conflicts}
+
+
+def stock_levels(cursor) -> List[List]:
+    cursor.execute("SELECT name, stock FROM products")
+    return [[name, stock] for name, stock in cursor.fetchall()]
+
+
+# --- kasa ---
+class _FileHub:
+    """Merkez veritabanı dosyasına doğrudan uygulama."""
+
+    def __init__(self, path: str):
+        from pos.db_handler import init_schema
+        from services import migration_service
+        self.conn = sqlite3.connect(path, timeout=30)
+        self.cursor = self.conn.cursor()
+        init_schema(self.conn, self.cursor)
+        migration_service.run(self.conn, self.cursor)
+
+    def apply_batch(self, terminal_id, changes, terminal_uuid=None):
+        return apply_batch(self.conn, self.cursor, terminal_id, changes, terminal_uuid)
+
+    def stock_levels(self):
+        return stock_levels(self.cursor)
+
+    def close(self):
+        self.conn.close()
+
+
+class _ServerHub:
+    def __init__(self, address: str):
+        from pos import remote
+        self.client = remote.get_client(address)
+
+    def apply_batch(self, terminal_id, changes, terminal_uuid=None):
+        return self.client.call("sync.apply_batch", terminal_id, [list(c) for c in changes],
+                                terminal_uuid=terminal_uuid)
+
+    def stock_levels(self):
+        return self.client.call("sync.stock_levels")
+
+    def close(self):
+        pass
+
+
+def open_hub(target: str):
+    if target.startswith("tcp://"):
+        return _ServerHub(target[len("tcp://"):])
+    return _FileHub(target[len("file://"):] if target.startswith("file://") else target)
+
+
+def push(conn, cursor, target: Optional[str] = None, batch_size: int = BATCH_SIZE, hub=None) -> Dict[str, int]:
+    """Bekleyen günlük kayıtlarını merkeze gönder. Merkez erişilemezse OSError/RemoteError yükselir;
+    kayıtlar bekler ve bir sonraki denemede yeniden gönderilir."""
+    target = target or get_target(cursor)
+    own_hub = hub is None
+    if own_hub:
+        if not target:
+            raise ValueError("Senkron hedefi tanımlı değil")
+        hub = open_hub(target)
+    terminal_id = receipt_svc.get_terminal_id(cursor)
+    terminal_uuid = get_terminal_uuid(conn, cursor)
+    totals = {"sent": 0, "applied": 0, "conflicts": 0, "batches": 0, "last_seq": 0}
+    try:
+        while True:
+            batch = repo.pending(cursor, terminal_id, batch_size)
+            if not batch:
+                break
+            result = hub.apply_batch(terminal_id, batch, terminal_uuid)
+            last = int(result["last_seq"])
+            repo.mark_synced(cursor, terminal_id, last)
+            resent = 0
+            if last < batch[0][0] - 1:
+                # Merkez daha gerideyse (yedekten dönülmüş olabilir) eksik kısım yeniden gönderilir
+                resent = repo.reset_after(cursor, terminal_id, last)
+            conn.commit()
+            totals["sent"] += len(batch)
+            totals["applied"] += int(result["applied"])
+            totals["conflicts"] += int(result["conflicts"])
+            totals["batches"] += 1
+            totals["last_seq"] = last
+            if not result["applied"] and not resent and last < batch[0][0]:
+                break  # ilerleme yok; aynı partiyi tekrar tekrar gönderme
+    finally:
+        if own_hub:
+            hub.close()
+    return totals
+
+
+def refresh_stock(conn, cursor, levels: Sequence[Sequence]) -> int:
+    """Merkez stoklarını yerel kopyaya yaz; yalnızca gönderilmemiş kayıt yokken (merkez yetkili)."""
+    terminal_id = receipt_svc.get_terminal_id(cursor)
+    if not conn.in_transaction:
+        cursor.execute("BEGIN IMMEDIATE")
+    try:
+        if repo.count_pending(cursor, terminal_id):
+            conn.rollback()
+            return 0
+        cursor.executemany("UPDATE products SET stock=? WHERE name=? AND stock IS NOT ?",
+                           [(stock, name, stock) for name, stock in levels])
+        changed = cursor.rowcount
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    return changed
+
+
+def sync(conn, cursor, target: Optional[str] = None) -> Dict[str, int]:
+    """Gönder, ardından (kuyruk boşaldıysa) merkez stoklarını al."""
+    target = target or get_target(cursor)
+    hub = open_hub(target)
+    try:
+        totals = push(conn, cursor, target, hub=hub)
+        totals["stock_refreshed"] = refresh_stock(conn, cursor, hub.stock_levels())
+    finally:
+        hub.close()
+    return totals
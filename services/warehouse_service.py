@@ -1,4 +1,6 @@
 from repositories import warehouse_repository as repo
+from services import costing_service as costing_svc
+from pos import events
 
 def list_warehouses(cursor):
     return repo.list_warehouses(cursor)
@@ -21,12 +23,18 @@ def list_warehouse_stocks(cursor, warehouse_id):
 def list_all_stocks(cursor):
     return repo.list_all_stocks(cursor)
 
+def list_stocks_for_products(cursor, product_ids, warehouse_id=None):
+    return repo.list_stocks_for_products(cursor, product_ids, warehouse_id)
+
 def transfer_stock(conn, cursor, source_id, target_id, product_id, quantity, desc, user_id):
     # 1. Check source stock
     current_source = repo.get_stock(cursor, source_id, product_id)
     if current_source < quantity:
         raise ValueError("Yetersiz stok!")
     
+    # Carry the source average cost over to the target warehouse
+    costing_svc.transfer(cursor, source_id, target_id, product_id, quantity)
+
     # 2. Decrement source
     repo.update_stock(cursor, source_id, product_id, current_source - quantity)
     
@@ -37,6 +45,7 @@ def transfer_stock(conn, cursor, source_id, target_id, product_id, quantity, des
     # 4. Record movement
     repo.add_movement(cursor, source_id, target_id, product_id, quantity, desc, user_id)
     conn.commit()
+    events.publish(events.STOCK_CHANGED, (product_id,))
 
 def list_movements(cursor):
     return repo.list_movements(cursor)
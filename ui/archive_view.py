@@ -0,0 +1,80 @@
+import tkinter as tk
+from tkinter import ttk, messagebox
+from services import archive_service as archive_svc
+from pos.db_executor import get_executor
+
+# Bu modül, Yıllık arşiv ekranının çizimini içerir.
+# Arşivleme uzun sürebileceğinden DB executor iş parçacığında çalışır.
+
+
+def mount_archive(parent, conn, cursor, t,
+                  FG_COLOR="#ffffff", BG_COLOR="#18181c", CARD_COLOR="#23232a", ACCENT="#00b0ff"):
+    for w in parent.winfo_children():
+        w.destroy()
+
+    header = ttk.Frame(parent, style="Card.TFrame"); header.pack(fill="x", padx=12, pady=(12, 8))
+    ttk.Label(header, text="🗄 " + t('archive'), style="Header.TLabel").pack(side="left", padx=8)
+
+    # Arşivlenmiş dönemler
+    list_frame = ttk.Frame(parent, style="Card.TFrame"); list_frame.pack(fill="both", expand=True, padx=12, pady=8)
+    cols = ("year", "sales", "cari", "movements", "expenses", "date", "file")
+    tree = ttk.Treeview(list_frame, columns=cols, show="headings", height=10)
+    for c, key, w, anchor in (("year", 'archive_year', 70, "center"), ("sales", 'sales', 90, "e"),
+                              ("cari", 'archive_col_cari', 90, "e"), ("movements", 'archive_col_movements', 90, "e"),
+                              ("expenses", 'archive_col_expenses', 90, "e"), ("date", 'date', 150, "w"),
+                              ("file", 'file', 300, "w")):
+        tree.heading(c, text=t(key)); tree.column(c, width=w, anchor=anchor)
+    tree.pack(fill="both", expand=True, padx=8, pady=8)
+
+    form = tk.Frame(parent, bg=CARD_COLOR, padx=20, pady=12)
+    form.pack(fill="x", padx=12, pady=(0, 12))
+    tk.Label(form, text=t('archive_closable_years'), bg=CARD_COLOR, fg=FG_COLOR, font=("Segoe UI", 10)).pack(side="left")
+    year_var = tk.StringVar()
+    year_cb = ttk.Combobox(form, textvariable=year_var, state="readonly", width=8)
+    year_cb.pack(side="left", padx=10)
+    status_var = tk.StringVar(value="")
+    tk.Label(form, textvariable=status_var, bg=CARD_COLOR, fg="#9ca3af", font=("Segoe UI", 9)).pack(side="right", padx=8)
+
+    def load():
+        for i in tree.get_children():
+            tree.delete(i)
+        for p in archive_svc.list_periods(cursor):
+            year, path, sales, cari, movements, expenses, archived_at = p
+            tree.insert("", "end", values=(year, sales, cari, movements, expenses, archived_at, path))
+        years = archive_svc.closable_years(cursor)
+        year_cb["values"] = years
+        year_var.set(str(years[0]) if years else "")
+
+    def archive_selected():
+        if not year_var.get():
+            messagebox.showwarning(t('warning'), t('archive_nothing'))
+            return
+        year = int(year_var.get())
+        if not messagebox.askyesno(t('archive'), t('archive_confirm').format(year=year)):
+            return
+        archive_btn.config(state="disabled")
+        status_var.set(t('archive_running').format(year=year))
+
+        def done(counts):
+            archive_btn.config(state="normal")
+            status_var.set("")
+            load()
+            messagebox.showinfo(t('success'), t('archive_done').format(year=year, rows=sum(counts.values())))
+
+        def failed(e):
+            archive_btn.config(state="normal")
+            status_var.set("")
+            messagebox.showerror(t('error'), str(e))
+
+        get_executor().submit(lambda cur: archive_svc.archive_year(cur.connection, cur, year),
+                              on_done=done, on_error=failed, owner=tree)
+
+    archive_btn = tk.Button(form, text="🗄 " + t('archive_year_button'), command=archive_selected, bg=ACCENT, fg="white",
+                            font=("Segoe UI", 9, "bold"), relief="flat", padx=14, pady=6, cursor="hand2", borderwidth=0)
+    archive_btn.pack(side="left", padx=4)
+    tk.Button(form, text="🔄 " + t('refresh'), command=load, bg="#6b7280", fg="white",
+              font=("Segoe UI", 9, "bold"), relief="flat", padx=14, pady=6, cursor="hand2",
+              borderwidth=0).pack(side="left", padx=4)
+
+    parent._screen_refresh = load
+    load()
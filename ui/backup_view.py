@@ -0,0 +1,128 @@
+import tkinter as tk
+from tkinter import ttk, messagebox
+from pos import backup
+
+# Bu modül, Yedekleme ayarları ekranının çizimini içerir.
+# Yedek alma işi pos.backup yöneticisinin arka plan iş parçacığında çalışır;
+# ekran ilerlemeyi after() ile yoklar.
+
+POLL_MS = 200
+
+
+def mount_backup_settings(parent, conn, cursor, t,
+                          FG_COLOR="#ffffff", BG_COLOR="#18181c", CARD_COLOR="#23232a", ACCENT="#00b0ff"):
+    for w in parent.winfo_children():
+        w.destroy()
+
+    manager = backup.get_manager()
+
+    header = ttk.Frame(parent, style="Card.TFrame"); header.pack(fill="x", padx=12, pady=(12, 8))
+    ttk.Label(header, text="💾 " + t('backup_settings'), style="Header.TLabel").pack(side="left", padx=8)
+
+    form = tk.Frame(parent, bg=CARD_COLOR, padx=20, pady=16)
+    form.pack(fill="x", padx=12, pady=8)
+
+    settings = backup.load_settings(cursor)
+    interval_var = tk.StringVar(value=str(settings["interval_hours"]))
+    keep_var = tk.StringVar(value=str(settings["keep"]))
+    on_close_var = tk.BooleanVar(value=settings["on_close"])
+
+    tk.Label(form, text=t('backup_interval_hours'), bg=CARD_COLOR, fg=FG_COLOR, font=("Segoe UI", 10)).grid(row=0, column=0, sticky="w", pady=4)
+    ttk.Spinbox(form, from_=0, to=168, textvariable=interval_var, width=8).grid(row=0, column=1, sticky="w", padx=10)
+    tk.Label(form, text=t('backup_keep'), bg=CARD_COLOR, fg=FG_COLOR, font=("Segoe UI", 10)).grid(row=1, column=0, sticky="w", pady=4)
+    ttk.Spinbox(form, from_=1, to=365, textvariable=keep_var, width=8).grid(row=1, column=1, sticky="w", padx=10)
+    ttk.Checkbutton(form, text=t('backup_on_close'), variable=on_close_var).grid(row=2, column=0, columnspan=2, sticky="w", pady=4)
+
+    def save():
+        try:
+            interval = int(float(interval_var.get()))
+            keep = int(float(keep_var.get()))
+        except ValueError:
+            messagebox.showerror(t('error'), t('invalid_amount'))
+            return
+        backup.save_settings(conn, cursor, interval, keep, on_close_var.get())
+        manager.settings_changed()
+        messagebox.showinfo(t('success'), t('saved'))
+
+    tk.Button(form, text="💾 " + t('save'), command=save, bg="#10b981", fg="white",
+              font=("Segoe UI", 9, "bold"), relief="flat", padx=14, pady=6, cursor="hand2",
+              borderwidth=0).grid(row=3, column=0, sticky="w", pady=(10, 0))
+
+    # Yedek listesi
+    list_frame = ttk.Frame(parent, style="Card.TFrame"); list_frame.pack(fill="both", expand=True, padx=12, pady=8)
+    cols = ("file", "date", "size", "integrity")
+    tree = ttk.Treeview(list_frame, columns=cols, show="headings", height=10)
+    tree.heading("file", text=t('file')); tree.column("file", width=300)
+    tree.heading("date", text=t('date')); tree.column("date", width=160)
+    tree.heading("size", text=t('size_mb')); tree.column("size", width=90, anchor="e")
+    tree.heading("integrity", text=t('backup_integrity')); tree.column("integrity", width=120, anchor="center")
+    tree.pack(fill="both", expand=True, padx=8, pady=8)
+
+    status_var = tk.StringVar(value="")
+    tk.Label(parent, textvariable=status_var, bg=BG_COLOR, fg=FG_COLOR, font=("Segoe UI", 9)).pack(anchor="w", padx=16)
+    progress = ttk.Progressbar(parent, mode="determinate", maximum=100)
+    progress.pack(fill="x", padx=16, pady=(2, 6))
+
+    paths = {}
+
+    def load_list():
+        for i in tree.get_children():
+            tree.delete(i)
+        paths.clear()
+        for b in backup.list_backups(manager.backup_dir):
+            iid = tree.insert("", "end", values=(b["file"], b.get("created_at", ""),
+                                                 f"{b['size'] / 1048576:.1f}", b.get("integrity", "?")))
+            paths[iid] = b["path"]
+
+    # Son görülen sonuç: değiştiyse (kısa süren yedekler dahil) liste tazelenir
+    seen = {"last": manager.status["last"], "error": manager.status["error"]}
+
+    def poll():
+        try:
+            if not tree.winfo_exists():
+                return
+        except Exception:
+            return
+        st = manager.status
+        if st["running"]:
+            pct = (st["done"] / st["total"] * 100) if st["total"] else 0
+            progress["value"] = pct
+            status_var.set(f"{t('backup_running')} {pct:.0f}%")
+        elif st["last"] is not seen["last"] or st["error"] != seen["error"]:
+            seen["last"], seen["error"] = st["last"], st["error"]
+            progress["value"] = 0
+            if st["error"]:
+                status_var.set(f"{t('error')}: {st['error']}")
+            elif st["last"]:
+                status_var.set(f"{t('backup_done')}: {st['last']['file']} ({st['last']['seconds']} s)")
+            load_list()
+        parent.after(POLL_MS, poll)
+
+    def backup_now():
+        manager.backup_now()
+        status_var.set(t('backup_running'))
+
+    def verify_selected():
+        sel = tree.selection()
+        if not sel:
+            messagebox.showwarning(t('warning'), t('select_item'))
+            return
+        result = backup.verify_backup(paths[sel[0]])
+        if result["ok"]:
+            messagebox.showinfo(t('success'), f"{t('backup_verified')}\n{tree.item(sel[0], 'values')[0]}")
+        else:
+            messagebox.showerror(t('error'), result["message"])
+
+    btns = ttk.Frame(parent, style="Card.TFrame"); btns.pack(fill="x", padx=12, pady=(0, 12))
+    for text, cmd, color in (("💾 " + t('backup_now'), backup_now, ACCENT),
+                             ("✔ " + t('backup_verify'), verify_selected, "#10b981"),
+                             ("🔄 " + t('refresh'), load_list, "#6b7280")):
+        tk.Button(btns, text=text, command=cmd, bg=color, fg="white", font=("Segoe UI", 9, "bold"),
+                  relief="flat", padx=14, pady=8, cursor="hand2", borderwidth=0).pack(side="left", padx=4, pady=8)
+    # Geri yükleme çalışan veritabanının üzerine yazar; uygulama kapalıyken komut satırından yapılır
+    tk.Label(btns, text=t('backup_restore_hint') + "  python -m pos.backup restore <file>",
+             bg=CARD_COLOR, fg="#9ca3af", font=("Segoe UI", 8)).pack(side="right", padx=8)
+
+    parent._screen_refresh = load_list
+    load_list()
+    poll()
@@ -0,0 +1,133 @@
+import tkinter as tk
+from datetime import datetime
+from tkinter import ttk
+from pos import events
+from services import live_sales_service as live_svc
+
+# Bu modül, günün canlı satış panelini çizer.
+# Veriler bellekteki sayaçlardan okunur (live_sales_service); satış, iptal ve
+# iade olaylarında sadece yeniden çizilir, ham satış tablosu sorgulanmaz.
+# main.py'den conn, cursor ve t fonksiyonu enjekte edilir.
+
+DAY_CHECK_MS = 60 * 1000
+
+
+def mount_dashboard(parent, conn, cursor, t,
+                    FG_COLOR="#ffffff", BG_COLOR="#18181c", CARD_COLOR="#23232a", ACCENT="#00b0ff", currency=""):
+    for w in parent.winfo_children():
+        w.destroy()
+
+    counters = live_svc.get_counters()
+
+    header = ttk.Frame(parent, style="Card.TFrame"); header.pack(fill="x", padx=12, pady=(12, 8))
+    ttk.Label(header, text="📈 " + t('live_dashboard'), style="Header.TLabel").pack(side="left", padx=8)
+    day_label = ttk.Label(header, text="", style="Sub.TLabel")
+    day_label.pack(side="right", padx=8)
+
+    # Özet kartları
+    cards = tk.Frame(parent, bg=BG_COLOR); cards.pack(fill="x", padx=12, pady=4)
+    kpi = {}
+    for i, (key, title) in enumerate((("revenue", t('today_revenue')), ("receipts", t('receipt_count')),
+                                      ("avg_basket", t('avg_basket')), ("items", t('items_sold')))):
+        card = tk.Frame(cards, bg=CARD_COLOR, padx=16, pady=12)
+        card.grid(row=0, column=i, sticky="nsew", padx=4)
+        cards.columnconfigure(i, weight=1)
+        tk.Label(card, text=title, bg=CARD_COLOR, fg=FG_COLOR, font=("Segoe UI", 9)).pack(anchor="w")
+        kpi[key] = tk.Label(card, text="-", bg=CARD_COLOR, fg=ACCENT, font=("Segoe UI", 18, "bold"))
+        kpi[key].pack(anchor="w")
+
+    body = ttk.Frame(parent, style="Card.TFrame"); body.pack(fill="both", expand=True, padx=12, pady=8)
+    body.columnconfigure(0, weight=3); body.columnconfigure(1, weight=2)
+    body.rowconfigure(1, weight=1); body.rowconfigure(3, weight=1)
+
+    # Saatlik dağılım (çubuk grafik)
+    ttk.Label(body, text=t('hourly_sales'), font=("Segoe UI", 10, "bold")).grid(row=0, column=0, sticky="w", padx=8, pady=(8, 2))
+    chart = tk.Canvas(body, bg=CARD_COLOR, highlightthickness=0, height=220)
+    chart.grid(row=1, column=0, rowspan=3, sticky="nsew", padx=8, pady=(0, 8))
+
+    def make_tree(row, title, columns, widths):
+        ttk.Label(body, text=title, font=("Segoe UI", 10, "bold")).grid(row=row, column=1, sticky="w", padx=8, pady=(8, 2))
+        tree = ttk.Treeview(body, columns=columns, show="headings", height=5)
+        for col, (head, width, anchor) in zip(columns, widths):
+            tree.heading(col, text=head)
+            tree.column(col, width=width, anchor=anchor, stretch=(anchor == "w"))
+        tree.grid(row=row + 1, column=1, sticky="nsew", padx=8, pady=(0, 8))
+        return tree
+
+    pay_tree = make_tree(0, t('payment_split'), ("method", "receipts", "revenue"),
+                         ((t('payment_method'), 140, "w"), (t('receipt_count'), 80, "center"), (t('total'), 110, "e")))
+    top_tree = make_tree(2, t('top_items'), ("product", "qty", "revenue"),
+                         ((t('product'), 180, "w"), (t('quantity'), 70, "center"), (t('total'), 110, "e")))
+
+    last = {"snap": None}
+
+    def fmt_qty(q):
+        return f"{q:.3f}" if abs(q - round(q)) > 1e-6 else str(int(round(q)))
+
+    def draw_chart(snap):
+        chart.delete("all")
+        w, h = max(chart.winfo_width(), 240), max(chart.winfo_height(), 160)
+        by_hour = {hour: revenue for hour, _, revenue in snap["hourly"]}
+        peak = max(by_hour.values(), default=0.0)
+        pad_l, pad_b, pad_t = 8, 20, 16
+        slot = (w - 2 * pad_l) / 24.0
+        for hour in range(24):
+            x0 = pad_l + hour * slot
+            revenue = by_hour.get(hour, 0.0)
+            if revenue > 0 and peak > 0:
+                bar_h = (h - pad_b - pad_t) * revenue / peak
+                chart.create_rectangle(x0 + 2, h - pad_b - bar_h, x0 + slot - 2, h - pad_b, fill=ACCENT, width=0)
+            if hour % 3 == 0:
+                chart.create_text(x0 + slot / 2, h - pad_b / 2, text=f"{hour:02d}", fill=FG_COLOR, font=("Segoe UI", 8))
+        if peak > 0:
+            chart.create_text(pad_l, pad_t / 2, text=f"{peak:.2f} {currency}".strip(), anchor="w",
+                              fill=FG_COLOR, font=("Segoe UI", 8))
+
+    def render(snap=None):
+        snap = snap or counters.snapshot()
+        last["snap"] = snap
+        day_label.config(text=snap["day"] or "")
+        kpi["revenue"].config(text=f"{snap['revenue']:.2f} {currency}".strip())
+        kpi["receipts"].config(text=str(snap["receipts"]))
+        kpi["avg_basket"].config(text=f"{snap['avg_basket']:.2f} {currency}".strip())
+        kpi["items"].config(text=fmt_qty(snap["items"]))
+        for tree in (pay_tree, top_tree):
+            for iid in tree.get_children():
+                tree.delete(iid)
+        for method, receipts, revenue in snap["payments"]:
+            pay_tree.insert("", "end", values=(t(method), receipts, f"{revenue:.2f}"))
+        for name, qty, revenue in snap["top"]:
+            top_tree.insert("", "end", values=(name, fmt_qty(qty), f"{revenue:.2f}"))
+        draw_chart(snap)
+
+    def reseed():
+        counters.seed(cursor)
+        render()
+
+    def on_tables_changed(tables):
+        # Başka süreçten gelen satış/iptal: sayaçları günlük özetten yeniden kur
+        if "sales" in tables:
+            reseed()
+
+    def check_day():
+        try:
+            if not parent.winfo_exists():
+                return
+        except Exception:
+            return
+        if counters.day != datetime.now().strftime("%Y-%m-%d"):
+            reseed()
+        parent.after(DAY_CHECK_MS, check_day)
+
+    events.subscribe(events.SALE_COMMITTED, lambda ids: render(), owner=chart)
+    events.subscribe(events.SALE_CANCELLED, lambda ids: render(), owner=chart)
+    events.subscribe(events.SALE_RETURNED, lambda ids: render(), owner=chart)
+    events.subscribe(events.TABLES_CHANGED, on_tables_changed, owner=chart)
+    chart.bind("<Configure>", lambda e: last["snap"] and draw_chart(last["snap"]))
+
+    # Ekran yöneticisi: gösterimde sadece sayaçlardan yeniden çiz
+    parent._screen_refresh = render
+    if counters.day is None:
+        counters.seed(cursor)
+    render()
+    parent.after(DAY_CHECK_MS, check_day)
@@ -0,0 +1,125 @@
+import os
+import tkinter as tk
+from datetime import datetime
+from tkinter import ttk, messagebox
+from pos import instrumentation, query_cache
+
+# Bu modül, yönetici Tanılama ekranının çizimini içerir.
+# main.py'den conn, cursor ve t fonksiyonu enjekte edilir.
+
+def mount_diagnostics(parent, conn, cursor, t,
+                      FG_COLOR="#ffffff", BG_COLOR="#18181c", CARD_COLOR="#23232a", ACCENT="#00b0ff"):
+    for w in parent.winfo_children():
+        w.destroy()
+
+    header = ttk.Frame(parent, style="Card.TFrame"); header.pack(fill="x", padx=12, pady=(12, 8))
+    ttk.Label(header, text="🩺 " + t('diagnostics'), style="Header.TLabel").pack(side="left", padx=8)
+
+    enabled_var = tk.BooleanVar(value=instrumentation.is_enabled())
+
+    def on_toggle():
+        if enabled_var.get():
+            instrumentation.enable()
+        else:
+            instrumentation.disable()
+        # Tercih kalıcı olsun (bir sonraki açılışta da etkin)
+        cursor.execute("INSERT OR REPLACE INTO settings(key,value) VALUES('diagnostics_enabled', ?)",
+                       ('1' if enabled_var.get() else '0',))
+        conn.commit()
+        refresh()
+
+    ttk.Checkbutton(header, text=t('diagnostics_enabled'), variable=enabled_var,
+                    command=on_toggle).pack(side="left", padx=16)
+    cache_label = ttk.Label(header, text="", style="Sub.TLabel")
+    cache_label.pack(side="right", padx=8)
+
+    notebook = ttk.Notebook(parent)
+    notebook.pack(fill="both", expand=True, padx=12, pady=8)
+
+    def make_tree(title, columns, widths):
+        tab = ttk.Frame(notebook, style="Card.TFrame")
+        notebook.add(tab, text=title)
+        tree = ttk.Treeview(tab, columns=columns, show="headings")
+        for col, width in zip(columns, widths):
+            tree.heading(col, text=t('diag_col_' + col))
+            tree.column(col, width=width, anchor="w" if width > 150 else "e", stretch=width > 150)
+        tree.pack(fill="both", expand=True, padx=8, pady=8)
+        return tab, tree
+
+    _, tree_sql = make_tree(t('diag_statements'), ("sql", "count", "avg_ms", "max_ms", "total_ms"), (520, 70, 80, 80, 90))
+    slow_tab, tree_slow = make_tree(t('diag_slow_queries'), ("at", "kind", "ms", "sql"), (140, 90, 70, 520))
+    plan_text = tk.Text(slow_tab, height=6, bg=CARD_COLOR, fg=FG_COLOR, relief="flat", font=("Consolas", 9))
+    plan_text.pack(fill="x", padx=8, pady=(0, 8))
+    _, tree_repo = make_tree(t('diag_repository'), ("name", "count", "avg_ms", "max_ms", "total_ms"), (320, 70, 80, 80, 90))
+    _, tree_screens = make_tree(t('diag_screens'), ("name", "count", "avg_ms", "max_ms", "last_ms"), (320, 70, 80, 80, 80))
+    _, tree_hist = make_tree(t('diag_histograms'), ("name", "bucket", "count"), (240, 120, 80))
+
+    slow_rows = {}
+
+    def fill(tree, rows):
+        for i in tree.get_children():
+            tree.delete(i)
+        return [tree.insert("", "end", values=r) for r in rows]
+
+    def refresh():
+        snap = instrumentation.snapshot(cursor)
+        fill(tree_sql, [(s["sql"], s["count"], s["avg_ms"] if s["avg_ms"] is not None else "-", s["max_ms"], s["total_ms"])
+                        for s in snap["statements"]])
+        slow_rows.clear()
+        slow = list(reversed(snap["slow_queries"]))
+        for iid, entry in zip(fill(tree_slow, [(e["at"], e["kind"], e["ms"], e.get("sql") or e.get("name", ""))
+                                               for e in slow]), slow):
+            slow_rows[iid] = entry
+        fill(tree_repo, [(r["name"], r["count"], r["avg_ms"], r["max_ms"], r["total_ms"]) for r in snap["repository_calls"]])
+
+        screen_rows = []
+        for source, data in snap["sources"].items():
+            for key, kinds in data.items():
+                if not isinstance(kinds, dict):
+                    continue
+                for kind, st in kinds.items():
+                    if isinstance(st, dict) and "count" in st:
+                        screen_rows.append((f"{source}/{key}/{kind}", st["count"], f"{st['avg_ms']:.1f}",
+                                            f"{st['max_ms']:.1f}", f"{st['last_ms']:.1f}"))
+        fill(tree_screens, screen_rows)
+        fill(tree_hist, [(name, bucket, count) for name, buckets in snap["histograms"].items()
+                         for bucket, count in buckets.items() if count])
+        cs = query_cache.get_cache().stats()
+        cache_label.config(text=t('diag_query_cache').format(rate=cs["hit_rate"] * 100, hits=cs["hits"],
+                                                             misses=cs["misses"], entries=cs["entries"]))
+
+    def on_slow_select(e=None):
+        sel = tree_slow.selection()
+        plan_text.delete("1.0", tk.END)
+        if not sel:
+            return
+        entry = slow_rows.get(sel[0], {})
+        plan = entry.get("plan")
+        plan_text.insert("1.0", entry.get("sql", "") + "\n\n" + ("\n".join(plan) if plan else "-"))
+
+    tree_slow.bind("<<TreeviewSelect>>", on_slow_select)
+
+    def export():
+        os.makedirs("reports", exist_ok=True)
+        fname = os.path.join("reports", f"diagnostics_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+        try:
+            instrumentation.export_json(fname, cursor)
+            messagebox.showinfo(t('success'), f"{t('report_saved')}\n{fname}")
+        except Exception as e:
+            messagebox.showerror(t('error'), str(e))
+
+    def reset():
+        instrumentation.reset()
+        query_cache.get_cache().reset_stats()
+        refresh()
+
+    btns = ttk.Frame(parent, style="Card.TFrame"); btns.pack(fill="x", padx=12, pady=(0, 12))
+    for text, cmd, color in (("🔄 " + t('refresh'), refresh, ACCENT),
+                             ("📤 JSON", export, "#10b981"),
+                             ("🧹 " + t('diag_reset'), reset, "#6b7280")):
+        tk.Button(btns, text=text, command=cmd, bg=color, fg="white", font=("Segoe UI", 9, "bold"),
+                  relief="flat", padx=14, pady=8, cursor="hand2", borderwidth=0).pack(side="left", padx=4, pady=8)
+
+    # Ekran yöneticisi her gösterimde tazelesin
+    parent._screen_refresh = refresh
+    refresh()
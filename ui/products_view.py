@@ -2,6 +2,8 @@ import tkinter as tk
 import sqlite3
 from tkinter import ttk, messagebox
 from services import product_service as product_svc
+from pos.db_executor import get_executor
+from pos import events
 
 # Bu modül, Ürünler ekranının çizimini içerir.
 # main.py'den conn, cursor ve t fonksiyonu enjekte edilir.
@@ -123,16 +125,59 @@ def mount_products(parent, conn, cursor, t,
     btns = ttk.Frame(parent, style="Card.TFrame"); btns.pack(fill="x", padx=12, pady=(0,12))
 
     def load(filter_text: str = ""):
+        # Arama her tuşta tetiklenir; arka planda oku, eski istekleri iptal et
+        get_executor().submit(lambda cur: product_svc.list_products(cur, filter_text),
+                              on_done=render, owner=tree, key=("products_view", id(tree)))
+
+    def row_values(idx, product):
+        pid, name, barcode, sale_price, stock, buy_price, unit, category = product
+        stock_disp = f"{int(stock)}" if str(unit).lower()=="adet" else f"{float(stock):.3f}"
+        return (idx, name, barcode, f"{float(sale_price):.2f}", stock_disp, unit, f"{float(buy_price):.2f}", category)
+
+    def render(products):
         nonlocal row_id_map
         row_id_map = {}
+        pid_rows.clear()
         for r in tree.get_children():
             tree.delete(r)
         
-        products = product_svc.list_products(cursor, filter_text)
-        for idx, (pid, name, barcode, sale_price, stock, buy_price, unit, category) in enumerate(products, 1):
-            stock_disp = f"{int(stock)}" if str(unit).lower()=="adet" else f"{float(stock):.3f}"
-            item_iid = tree.insert("", "end", values=(idx, name, barcode, f"{float(sale_price):.2f}", stock_disp, unit, f"{float(buy_price):.2f}", category))
-            row_id_map[item_iid] = pid
+        for idx, product in enumerate(products, 1):
+            item_iid = tree.insert("", "end", values=row_values(idx, product))
+            row_id_map[item_iid] = product[0]
+            pid_rows[product[0]] = item_iid
+
+    # Ürün id -> tree satırı; stok/ürün olaylarında yalnızca bu satırlar yenilenir
+    pid_rows = {}
+
+    def patch(ids, products):
+        found = {p[0]: p for p in products}
+        q = search_var.get().strip().lower()
+        renumber = False
+        for pid in ids:
+            product = found.get(pid)
+            iid = pid_rows.get(pid)
+            if product is None or (q and q not in product[1].lower()):
+                # Silindi ya da artık aramaya uymuyor
+                if iid is not None:
+                    tree.delete(iid)
+                    row_id_map.pop(iid, None); del pid_rows[pid]
+                    renumber = True
+            elif iid is not None:
+                tree.item(iid, values=row_values(tree.item(iid)["values"][0], product))
+            else:
+                # Liste id sırasında; yeni ürünler sona eklenir
+                iid = tree.insert("", "end", values=row_values(len(tree.get_children()) + 1, product))
+                row_id_map[iid] = pid; pid_rows[pid] = iid
+        if renumber:
+            for idx, iid in enumerate(tree.get_children(), 1):
+                tree.set(iid, t('seq'), idx)
+
+    def on_products_changed(ids):
+        get_executor().submit(lambda cur: product_svc.list_by_ids(cur, ids),
+                              on_done=lambda products: patch(ids, products), owner=tree)
+
+    events.subscribe(events.STOCK_CHANGED, on_products_changed, owner=tree)
+    events.subscribe(events.PRODUCT_UPDATED, on_products_changed, owner=tree)
 
     def clear_form():
         selected_id["value"] = 0
@@ -253,7 +298,7 @@ def mount_products(parent, conn, cursor, t,
         
         try:
             product_svc.add_product(conn, cursor, name, barcode, sale_price, stock, buy_price, unit=u, category_id=cat_id, warehouse_id=wh_id)
-            load(search_var.get()); clear_form()
+            clear_form()
             load_categories()  # Yenile
         except sqlite3.IntegrityError:
             messagebox.showerror(t('error'), t('duplicate_error'))
@@ -269,7 +314,6 @@ def mount_products(parent, conn, cursor, t,
         name, barcode, sale_price, stock, buy_price, u, cat_id = res
         try:
             product_svc.update_product(conn, cursor, selected_id["value"], name, barcode, sale_price, stock, buy_price, unit=u, category_id=cat_id)
-            load(search_var.get())
             load_categories()  # Yenile
         except sqlite3.IntegrityError:
             messagebox.showerror(t('error'), t('duplicate_error'))
@@ -288,7 +332,7 @@ def mount_products(parent, conn, cursor, t,
             
         try:
             product_svc.delete_product(conn, cursor, int(real_pid))
-            load(search_var.get()); clear_form()
+            clear_form()
         except Exception as e:
             messagebox.showerror(t('error'), str(e))
 
@@ -0,0 +1,213 @@
+import time
+import tkinter as tk
+from collections import deque
+
+# Bu modül, satış ekranındaki hızlı ürün ızgarasını içerir.
+# Kartlar bir havuzda tutulur; liste değişince sadece farklı olan kartlar
+# güncellenir, yeniden boyutlandırma olayları birleştirilir.
+
+CARD_BG = "#343a40"
+ADD_BG = "#28a745"
+PRICE_FG = "#ffc107"
+
+# (minimum genişlik, sütun sayısı, kart yüksekliği)
+BREAKPOINTS = ((360, 3, 65), (240, 2, 60), (0, 1, 55))
+RESIZE_DELAY_MS = 50
+FRAME_BUDGET_MS = 16.7
+DEFAULT_WIDTH = 420
+
+
+def columns_for_width(width: int):
+    """Genişliğe göre (sütun, kart yüksekliği)"""
+    for min_w, cols, card_h in BREAKPOINTS:
+        if width >= min_w:
+            return cols, card_h
+    return BREAKPOINTS[-1][1], BREAKPOINTS[-1][2]
+
+
+class QuickGrid:
+    """Kart havuzlu hızlı ürün ızgarası.
+
+    items: [{'id', 'list_code', 'name', 'price'}] - id None ise kart düzenlenemez.
+    on_click(name), on_add(), on_context(event, item) dışarıdan verilir.
+    """
+
+    def __init__(self, frame, canvas=None, on_click=None, on_add=None, on_context=None,
+                 format_price=lambda p: f"{p:g}"):
+        self.frame = frame
+        self.canvas = canvas
+        self.on_click = on_click
+        self.on_add = on_add
+        self.on_context = on_context
+        self.format_price = format_price
+
+        self._pool = []          # [{'card', 'name', 'price', 'item', 'pos'}]
+        self._active = 0
+        self._width = 0
+        self._cols = 0
+        self._card_h = 0
+        self._rows = 0
+        self._resize_job = None
+        self._add = self._make_add_card()
+
+        # Son ölçümler (ms): render = liste değişimi, layout = sadece yerleşim
+        self.timings = {"render": deque(maxlen=200), "layout": deque(maxlen=200)}
+
+        frame.bind("<Configure>", self._on_configure, add="+")
+
+    # --- kartlar ---
+    def _make_add_card(self):
+        card = tk.Frame(self.frame, bg=ADD_BG, relief="solid", bd=1, cursor="hand2", highlightthickness=0)
+        icon = tk.Label(card, text="➕", font=("Segoe UI", 16, "bold"), bg=ADD_BG, fg="white", cursor="hand2")
+        icon.place(relx=0.5, rely=0.5, anchor="center")
+        for w in (card, icon):
+            w.bind("<Button-1>", lambda e: self.on_add and self.on_add())
+        return {'card': card, 'pos': None}
+
+    def _make_card(self):
+        card = tk.Frame(self.frame, bg=CARD_BG, relief="solid", bd=1, cursor="hand2", highlightthickness=0)
+        name_label = tk.Label(card, text="", font=("Segoe UI", 7, "bold"), bg=CARD_BG, fg="white",
+                              cursor="hand2", wraplength=100, justify="center", anchor="center")
+        name_label.place(relx=0.5, rely=0.35, anchor="center")
+        price_label = tk.Label(card, text="", font=("Segoe UI", 9, "bold"), bg=CARD_BG, fg=PRICE_FG,
+                               cursor="hand2", anchor="center")
+        price_label.place(relx=0.5, rely=0.70, anchor="center")
+        slot = {'card': card, 'name': name_label, 'price': price_label, 'item': None, 'pos': None}
+
+        # Olaylar karttaki güncel ürünü okur; kart yeniden kullanıldığında tekrar bağlanmaz
+        def on_click(e):
+            if slot['item'] and self.on_click:
+                self.on_click(slot['item']['name'])
+
+        def on_context(e):
+            if slot['item'] and slot['item'].get('id') is not None and self.on_context:
+                self.on_context(e, slot['item'])
+
+        for w in (card, name_label, price_label):
+            w.bind("<Button-1>", on_click)
+        card.bind("<Button-3>", on_context)
+        return slot
+
+    # --- çizim ---
+    def render(self, items):
+        """Listeyi göster: havuzdaki kartları yeniden kullan, sadece değişen metni güncelle."""
+        t0 = time.perf_counter()
+        for i, item in enumerate(items):
+            if i >= len(self._pool):
+                self._pool.append(self._make_card())
+            slot = self._pool[i]
+            old = slot['item'] or {}
+            if old.get('name') != item['name']:
+                slot['name'].configure(text=item['name'])
+            if old.get('price') != item['price']:
+                slot['price'].configure(text=self.format_price(item['price']))
+            slot['item'] = dict(item)
+
+        # Fazla kartları gizle (yok etme)
+        for slot in self._pool[len(items):self._active]:
+            slot['card'].grid_remove()
+            slot['pos'] = None
+            slot['item'] = None
+        self._active = len(items)
+
+        self._layout()
+        self._measure("render", t0)
+
+    def names(self):
+        """Gösterilen ürün adları."""
+        return {slot['item']['name'] for slot in self._pool[:self._active] if slot['item']}
+
+    def _current_width(self):
+        width = self._width or self.frame.winfo_width()
+        if width <= 1 and self.canvas is not None:
+            width = self.canvas.winfo_width()
+        return width if width > 1 else DEFAULT_WIDTH
+
+    def _layout(self, force=False):
+        """Sadece konumu değişen kartları yeniden yerleştir."""
+        cols, card_h = columns_for_width(self._current_width())
+        if force or cols != self._cols:
+            for i in range(max(cols, self._cols)):
+                if i < cols:
+                    self.frame.grid_columnconfigure(i, weight=1, uniform="qp", minsize=0)
+                else:
+                    self.frame.grid_columnconfigure(i, weight=0, uniform="", minsize=0)
+            self._cols = cols
+
+        slots = self._pool[:self._active] + [self._add]
+        for idx, slot in enumerate(slots):
+            pos = divmod(idx, cols)
+            if slot['pos'] != pos:
+                slot['card'].grid(row=pos[0], column=pos[1], padx=2, pady=2, sticky="nsew")
+                slot['pos'] = pos
+
+        rows = (len(slots) + cols - 1) // cols
+        if force or card_h != self._card_h:
+            for r in range(rows):
+                self.frame.grid_rowconfigure(r, weight=0, minsize=card_h)
+            self._card_h = card_h
+        else:
+            for r in range(self._rows, rows):
+                self.frame.grid_rowconfigure(r, weight=0, minsize=card_h)
+        for r in range(rows, self._rows):
+            self.frame.grid_rowconfigure(r, weight=0, minsize=0)
+        self._rows = rows
+
+        if self.canvas is not None:
+            self.frame.after_idle(self._update_scrollregion)
+
+    def _update_scrollregion(self):
+        try:
+            self.canvas.configure(scrollregion=self.canvas.bbox("all"))
+        except tk.TclError:
+            pass
+
+    def relayout(self, event=None):
+        """Dışarıdan tetiklenen yerleşim (ör. menü aç/kapa)."""
+        t0 = time.perf_counter()
+        self._width = 0
+        self._layout(force=True)
+        self._measure("layout", t0)
+
+    # --- yeniden boyutlandırma ---
+    def _on_configure(self, event):
+        if event.width == self._width:
+            return
+        self._width = event.width
+        # Art arda gelen olayları birleştir: sadece son boyut için bir kez çalış
+        if self._resize_job is not None:
+            self.frame.after_cancel(self._resize_job)
+        self._resize_job = self.frame.after(RESIZE_DELAY_MS, self._apply_resize)
+
+    def _apply_resize(self):
+        self._resize_job = None
+        cols, _ = columns_for_width(self._current_width())
+        if cols == self._cols:
+            return
+        t0 = time.perf_counter()
+        self._layout()
+        self._measure("layout", t0)
+
+    # --- ölçüm ---
+    def _measure(self, key, t0):
+        """Süreyi Tk'nin bekleyen yerleşimi bittikten sonra kaydet (after_idle); yerleşim zorlanmaz."""
+        def done():
+            self.timings[key].append((time.perf_counter() - t0) * 1000.0)
+        try:
+            self.frame.after_idle(done)
+        except tk.TclError:
+            pass
+
+    def stats(self):
+        """{'render': {...}, 'layout': {...}} - ms cinsinden son/ortalama/en yüksek ve bütçe aşımı."""
+        out = {}
+        for key, values in self.timings.items():
+            vals = list(values)
+            out[key] = {
+                'count': len(vals),
+                'last_ms': vals[-1] if vals else 0.0,
+                'avg_ms': sum(vals) / len(vals) if vals else 0.0,
+                'max_ms': max(vals) if vals else 0.0,
+                'over_budget': sum(1 for v in vals if v > FRAME_BUDGET_MS),
+            }
+        return out
@@ -0,0 +1,101 @@
+import tkinter as tk
+from tkinter import ttk, messagebox
+from services import receipt_document_service as doc_svc
+
+# Bu modül, Fişler (üretilen PDF belgeleri) ekranının çizimini içerir.
+# Liste receipt_documents tablosundan sayfa sayfa okunur; dosya sistemi
+# yalnızca bir belge açılırken kontrol edilir.
+
+
+def mount_receipts(parent, conn, cursor, t,
+                   FG_COLOR="#ffffff", BG_COLOR="#18181c", CARD_COLOR="#23232a", ACCENT="#00b0ff",
+                   language_code="tr"):
+    for w in parent.winfo_children():
+        w.destroy()
+
+    header = ttk.Frame(parent, style="Card.TFrame"); header.pack(fill="x", padx=12, pady=(12, 8))
+    ttk.Label(header, text="🧾 " + t('receipts_title'), style="Header.TLabel",
+              font=("Segoe UI", 16, "bold")).pack(side="left", padx=8)
+
+    # Arama
+    filt = tk.Frame(parent, bg=CARD_COLOR)
+    filt.pack(fill="x", padx=12, pady=(0, 8))
+    tk.Label(filt, text="🔍 " + t('search'), bg=CARD_COLOR, fg=FG_COLOR, font=("Segoe UI", 10)).pack(side="left", padx=(10, 6), pady=8)
+    sv_search = tk.StringVar()
+    e_search = ttk.Entry(filt, textvariable=sv_search, width=30)
+    e_search.pack(side="left", pady=8)
+
+    body = ttk.Frame(parent, style="Card.TFrame")
+    body.pack(fill="both", expand=True, padx=12, pady=8)
+    cols = ("receipt", "customer", "date", "size")
+    tree = ttk.Treeview(body, columns=cols, show="headings", height=14)
+    tree.heading("receipt", text=t('receipt_no')); tree.column("receipt", width=220, anchor="center")
+    tree.heading("customer", text=t('customer')); tree.column("customer", width=220)
+    tree.heading("date", text=t('date')); tree.column("date", width=170, anchor="center")
+    tree.heading("size", text="KB"); tree.column("size", width=80, anchor="e")
+    tree.tag_configure('oddrow', background=BG_COLOR)
+    tree.tag_configure('evenrow', background=CARD_COLOR)
+    tree.pack(fill="both", expand=True, padx=10, pady=10)
+
+    # Sayfalama: id üzerinden (OFFSET taraması yok); geri dönüş için sayfa başları yığını
+    page = {"starts": [None], "next": None}
+    page_var = tk.StringVar(value="")
+
+    def load_page():
+        for r in tree.get_children():
+            tree.delete(r)
+        rows = doc_svc.list_documents(cursor, sv_search.get(), page["starts"][-1], doc_svc.PAGE_SIZE + 1)
+        page["next"] = rows[doc_svc.PAGE_SIZE - 1][0] if len(rows) > doc_svc.PAGE_SIZE else None
+        for i, (doc_id, _, fis_id, customer, _, size, _, created_at) in enumerate(rows[:doc_svc.PAGE_SIZE]):
+            tree.insert("", "end", iid=str(doc_id), values=(fis_id, customer or "", created_at or "", f"{(size or 0) / 1024:.1f}"),
+                        tags=('evenrow',) if i % 2 == 0 else ('oddrow',))
+        page_var.set(f"{t('page')} {len(page['starts'])}")
+        btn_prev.config(state="normal" if len(page["starts"]) > 1 else "disabled")
+        btn_next.config(state="normal" if page["next"] is not None else "disabled")
+
+    def load():
+        page["starts"] = [None]
+        load_page()
+
+    def next_page():
+        if page["next"] is not None:
+            page["starts"].append(page["next"])
+            load_page()
+
+    def prev_page():
+        if len(page["starts"]) > 1:
+            page["starts"].pop()
+            load_page()
+
+    def open_selected():
+        sel = tree.selection()
+        if not sel:
+            return messagebox.showwarning(t('warning'), t('select_item'))
+        try:
+            # Dosya silinmişse satırlardan yeniden üretilir
+            path = doc_svc.document_path(conn, cursor, int(sel[0]), language_code)
+            if not path:
+                return messagebox.showerror(t('error'), t('open_failed'))
+            doc_svc.open_file(path)
+        except Exception as e:
+            messagebox.showerror(t('error'), f"{t('open_failed')}\n{e}")
+
+    e_search.bind("<Return>", lambda e: load())
+    tree.bind("<Double-1>", lambda e: open_selected())
+
+    btns = ttk.Frame(parent, style="Card.TFrame")
+    btns.pack(fill="x", padx=12, pady=(0, 12))
+
+    def make_button(text, command, color):
+        return tk.Button(btns, text=text, command=command, bg=color, fg="white", font=("Segoe UI", 10, "bold"),
+                         activebackground=color, activeforeground="white",
+                         relief="flat", padx=16, pady=10, cursor="hand2", borderwidth=0)
+
+    make_button("🖨 " + t('open_print'), open_selected, ACCENT).pack(side="left", padx=4, pady=8)
+    make_button("🔄 " + t('refresh'), load, "#8b5cf6").pack(side="right", padx=4, pady=8)
+    btn_next = make_button("▶", next_page, "#6b7280"); btn_next.pack(side="right", padx=4, pady=8)
+    tk.Label(btns, textvariable=page_var, bg=CARD_COLOR, fg=FG_COLOR, font=("Segoe UI", 10)).pack(side="right", padx=6)
+    btn_prev = make_button("◀", prev_page, "#6b7280"); btn_prev.pack(side="right", padx=4, pady=8)
+
+    parent._screen_refresh = load
+    load()
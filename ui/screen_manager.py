@@ -0,0 +1,125 @@
+import time
+from collections import deque
+from tkinter import ttk
+
+# Bu modül, ana penceredeki sağ panel ekranlarını yönetir.
+# Her ekran kendi çerçevesinde bir kez kurulur; menüden geçişte sadece
+# gizlenir/gösterilir. Ekranın bağlı olduğu tabloların değişim sayaçları
+# (table_versions) değişmişse gösterilmeden önce yenilenir.
+#
+# Ekran, çerçevesine `_screen_refresh` fonksiyonu koyarsa yenilemede o
+# çağrılır (ör. satış ekranında sepet korunur); yoksa ekran aynı çerçevede
+# yeniden kurulur.
+#
+# Bu süreçteki yazımları ekranlar pos.events ile satır satır yamar. Başka
+# bir bağlantıdan gelen yazımlar (senkron, sunucu, ikinci kasa) için
+# tables_changed() çağrılır: görünen ekran o tablolara bağlıysa yenilenir.
+
+
+class ScreenManager:
+    def __init__(self, container, get_versions, style="Card.TFrame"):
+        self.container = container
+        self.get_versions = get_versions   # () -> {tablo: sürüm}
+        self.style = style
+        self.current = None
+        self._screens = {}   # key -> {'frame', 'mount', 'tables', 'versions'}
+        self.timings = {}    # key -> {'mount': deque, 'refresh': deque}
+
+    def _versions_for(self, tables):
+        if not tables:
+            return {}
+        try:
+            versions = self.get_versions()
+        except Exception:
+            return None
+        return {tbl: versions.get(tbl, 0) for tbl in tables}
+
+    def _record(self, key, kind, started):
+        bucket = self.timings.setdefault(key, {'mount': deque(maxlen=50), 'refresh': deque(maxlen=50)})
+        bucket[kind].append((time.perf_counter() - started) * 1000.0)
+
+    def show(self, key, mount, tables=()):
+        """Ekranı göster; ilk seferde kur, tablolar değiştiyse (tables=None ise her zaman) yenile."""
+        if self.current == key:
+            return self._screens[key]['frame']
+
+        # Mevcut ekranı gizle ve ayrıldığı andaki sürümleri sakla
+        prev = self._screens.get(self.current)
+        if prev is not None:
+            prev['frame'].pack_forget()
+            prev['versions'] = self._versions_for(prev['tables'])
+
+        screen = self._screens.get(key)
+        if screen is None:
+            frame = ttk.Frame(self.container, style=self.style)
+            frame.pack(fill="both", expand=True)
+            screen = {'frame': frame, 'mount': mount, 'versions': None,
+                      'tables': None if tables is None else tuple(tables)}
+            self._screens[key] = screen
+            self.current = key
+            started = time.perf_counter()
+            mount(frame)
+            self._record(key, 'mount', started)
+            return frame
+
+        frame = screen['frame']
+        frame.pack(fill="both", expand=True)
+        self.current = key
+        # tables=None: tabloya bağlı olmayan canlı ekran, her gösterimde yenilenir
+        if screen['tables'] is None or (
+                screen['tables'] and self._versions_for(screen['tables']) != screen['versions']):
+            self.refresh(key)
+        return frame
+
+    def refresh(self, key=None):
+        """Ekranın verisini yenile (varsayılan: görünen ekran)."""
+        key = key or self.current
+        screen = self._screens.get(key)
+        if screen is None:
+            return
+        frame = screen['frame']
+        started = time.perf_counter()
+        hook = getattr(frame, '_screen_refresh', None)
+        if callable(hook):
+            hook()
+        else:
+            screen['mount'](frame)
+        self._record(key, 'refresh', started)
+
+    def tables_changed(self, tables):
+        """Dış yazım: görünen ekran bu tablolardan birine bağlıysa yenile."""
+        screen = self._screens.get(self.current)
+        if screen is None or not screen['tables']:
+            return
+        if set(screen['tables']) & set(tables):
+            self.refresh(self.current)
+            screen['versions'] = self._versions_for(screen['tables'])
+
+    def invalidate(self, key=None):
+        """Ekranı önbellekten at; bir sonraki gösterimde sıfırdan kurulur."""
+        keys = [key] if key else list(self._screens)
+        for k in keys:
+            screen = self._screens.pop(k, None)
+            if screen is None:
+                continue
+            try:
+                screen['frame'].destroy()
+            except Exception:
+                pass
+            if self.current == k:
+                self.current = None
+
+    def stats(self):
+        """{ekran: {'mount': {...}, 'refresh': {...}}} - ms cinsinden sayı/son/ortalama/en yüksek."""
+        out = {}
+        for key, bucket in self.timings.items():
+            out[key] = {}
+            for kind, values in bucket.items():
+                vals = list(values)
+                out[key][kind] = {
+                    'count': len(vals),
+                    'last_ms': vals[-1] if vals else 0.0,
+                    'avg_ms': sum(vals) / len(vals) if vals else 0.0,
+                    'max_ms': max(vals) if vals else 0.0,
+                }
+        return out